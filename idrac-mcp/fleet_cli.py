@@ -3,6 +3,7 @@
 
 import asyncio
 import click
+import contextlib
 import json
 import sys
 import os
@@ -12,16 +13,33 @@ from pathlib import Path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from multi_server_manager import MultiServerManager
+from fleet_pool import DEFAULT_FLEET_CONCURRENCY, DEFAULT_SERVER_TIMEOUT_SECONDS
+from fleet_output import write_ndjson
 from version import __version__
 
 @click.group()
 @click.version_option(version=__version__, prog_name="iDRAC Fleet CLI")
 @click.option('--config', '-c', default='fleet_servers.json', help='Fleet configuration file')
+@click.option('--concurrency', default=DEFAULT_FLEET_CONCURRENCY, type=click.IntRange(min=1),
+              show_default=True, help='Servers queried at the same time')
+@click.option('--timeout', default=DEFAULT_SERVER_TIMEOUT_SECONDS, type=click.FloatRange(min=1),
+              show_default=True, help='Seconds each server may take before it is reported as failed')
+@click.option('--output', '-o', type=click.Choice(['text', 'ndjson']), default='text', show_default=True,
+              help='ndjson: stream one JSON record per server to stdout as it completes (other output goes to stderr)')
 @click.pass_context
-def cli(ctx, config):
+def cli(ctx, config, concurrency, timeout, output):
     """iDRAC Fleet Management CLI."""
     ctx.ensure_object(dict)
-    ctx.obj['manager'] = MultiServerManager(config)
+    ctx.obj['output'] = output
+    # In ndjson mode stdout carries only records; the manager's messages go to stderr
+    with contextlib.redirect_stdout(sys.stderr) if output == 'ndjson' else contextlib.nullcontext():
+        ctx.obj['manager'] = MultiServerManager(config, max_concurrency=concurrency, server_timeout=timeout)
+    ctx.call_on_close(ctx.obj['manager'].close)
+
+def stream_ndjson(manager, operation, names=None):
+    """Run a fleet sweep, writing one NDJSON record per server as it completes."""
+    names = manager.enabled_servers() if names is None else names
+    asyncio.run(write_ndjson(manager.stream_fleet(operation, names), len(names)))
 
 @cli.command()
 @click.pass_context
@@ -87,6 +105,8 @@ def disable(ctx, name):
 def test(ctx):
     """Test connection to all enabled servers."""
     manager = ctx.obj['manager']
+    if ctx.obj['output'] == 'ndjson':
+        return stream_ndjson(manager, 'test')
     
     async def run_test():
         results = await manager.test_all_servers()
@@ -105,6 +125,11 @@ def test(ctx):
 def info(ctx, name):
     """Get system information from servers."""
     manager = ctx.obj['manager']
+    if ctx.obj['output'] == 'ndjson':
+        if name and name not in manager.list_servers():
+            click.echo(f"❌ Server '{name}' not found", err=True)
+            return
+        return stream_ndjson(manager, 'info', [name] if name else None)
     
     async def run_info():
         if name:
@@ -151,6 +176,8 @@ def info(ctx, name):
 def health(ctx):
     """Get health status from all enabled servers."""
     manager = ctx.obj['manager']
+    if ctx.obj['output'] == 'ndjson':
+        return stream_ndjson(manager, 'health')
     
     async def run_health():
         fleet_health = await manager.get_fleet_health()
@@ -171,6 +198,8 @@ def health(ctx):
 def power(ctx):
     """Get power status from all enabled servers."""
     manager = ctx.obj['manager']
+    if ctx.obj['output'] == 'ndjson':
+        return stream_ndjson(manager, 'power')
     
     async def run_power():
         fleet_power = await manager.get_fleet_power_status()
@@ -3,6 +3,7 @@
 
 import asyncio
 import click
+import contextlib
 import json
 import sys
 import os
@@ -12,6 +13,8 @@ from pathlib import Path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from secure_multi_server_manager import SecureMultiServerManager
+from fleet_pool import DEFAULT_FLEET_CONCURRENCY, DEFAULT_SERVER_TIMEOUT_SECONDS
+from fleet_output import write_ndjson
 from version import __version__
 
 @click.group()
@@ -19,10 +22,19 @@ from version import __version__
 @click.option('--config', '-c', default='fleet_servers.json', help='Fleet configuration file')
 @click.option('--key-file', '-k', default='.fleet_key', help='Encryption key file (legacy)')
 @click.option('--password', '-p', envvar='IDRAC_FLEET_PASSWORD', help='Master password (or set IDRAC_FLEET_PASSWORD env var)')
+@click.option('--concurrency', default=DEFAULT_FLEET_CONCURRENCY, type=click.IntRange(min=1),
+              show_default=True, help='Servers queried at the same time')
+@click.option('--timeout', default=DEFAULT_SERVER_TIMEOUT_SECONDS, type=click.FloatRange(min=1),
+              show_default=True, help='Seconds each server may take before it is reported as failed')
+@click.option('--output', '-o', type=click.Choice(['text', 'ndjson']), default='text', show_default=True,
+              help='ndjson: stream one JSON record per server to stdout as it completes (other output goes to stderr)')
 @click.pass_context
-def cli(ctx, config, key_file, password):
+def cli(ctx, config, key_file, password, concurrency, timeout, output):
     """Secure iDRAC Fleet Management CLI with encrypted passwords."""
     ctx.ensure_object(dict)
+    ctx.obj['output'] = output
+    # In ndjson mode stdout carries only records; prompts and messages go to stderr
+    to_stderr = output == 'ndjson'
     
     # Prompt for password if not provided and not using legacy key file
     if password is None and not Path(key_file).exists():
@@ -30,15 +42,24 @@ def cli(ctx, config, key_file, password):
         is_first_time = not Path(config).exists()
         
         if is_first_time:
-            password = click.prompt("Enter fleet master password", hide_input=True, confirmation_prompt=True)
+            password = click.prompt("Enter fleet master password", hide_input=True, confirmation_prompt=True, err=to_stderr)
         else:
-            password = click.prompt("Enter fleet master password", hide_input=True)
+            password = click.prompt("Enter fleet master password", hide_input=True, err=to_stderr)
     
     try:
-        ctx.obj['manager'] = SecureMultiServerManager(config, key_file, password)
+        with contextlib.redirect_stdout(sys.stderr) if to_stderr else contextlib.nullcontext():
+            ctx.obj['manager'] = SecureMultiServerManager(
+                config, key_file, password, max_concurrency=concurrency, server_timeout=timeout
+            )
     except Exception as e:
-        click.echo(f"❌ Failed to initialize secure manager: {e}")
+        click.echo(f"❌ Failed to initialize secure manager: {e}", err=to_stderr)
         sys.exit(1)
+    ctx.call_on_close(ctx.obj['manager'].close)
+
+def stream_ndjson(manager, operation, names=None):
+    """Run a fleet sweep, writing one NDJSON record per server as it completes."""
+    names = manager.enabled_servers() if names is None else names
+    asyncio.run(write_ndjson(manager.stream_fleet(operation, names), len(names)))
 
 @cli.command()
 @click.pass_context
@@ -104,6 +125,8 @@ def disable(ctx, name):
 def test(ctx):
     """Test connection to all enabled servers."""
     manager = ctx.obj['manager']
+    if ctx.obj['output'] == 'ndjson':
+        return stream_ndjson(manager, 'test')
     
     async def run_test():
         results = await manager.test_all_servers()
@@ -122,6 +145,11 @@ def test(ctx):
 def info(ctx, name):
     """Get system information from servers."""
     manager = ctx.obj['manager']
+    if ctx.obj['output'] == 'ndjson':
+        if name and name not in manager.list_servers():
+            click.echo(f"❌ Server '{name}' not found", err=True)
+            return
+        return stream_ndjson(manager, 'info', [name] if name else None)
     
     async def run_info():
         if name:
@@ -168,6 +196,8 @@ def info(ctx, name):
 def health(ctx):
     """Get health status from all enabled servers."""
     manager = ctx.obj['manager']
+    if ctx.obj['output'] == 'ndjson':
+        return stream_ndjson(manager, 'health')
     
     async def run_health():
         fleet_health = await manager.get_fleet_health()
@@ -188,6 +218,8 @@ def health(ctx):
 def power(ctx):
     """Get power status from all enabled servers."""
     manager = ctx.obj['manager']
+    if ctx.obj['output'] == 'ndjson':
+        return stream_ndjson(manager, 'power')
     
     async def run_power():
         fleet_power = await manager.get_fleet_power_status()
@@ -0,0 +1,413 @@
+"""Redfish event ingest: a local listener for iDRAC push events.
+
+IDracClient caches system information for a TTL and only invalidates it
+after its own power operations. With event ingest, every iDRAC pushes its
+events to this process instead:
+
+- EventReceiver is a small threaded HTTP(S) listener. It accepts Redfish
+  event payloads at ``path`` and maps each payload to a server by its
+  subscription Context, a random token per server; payloads with an unknown
+  Context are rejected
+- every event is classified (power, lifecycle, alert, other) and kept in a
+  bounded in-memory feed that can be queried per server and category
+- EventIngest subscribes each client at /redfish/v1/EventService/Subscriptions
+  and invalidates a server's cached state when a power, lifecycle or alert
+  event arrives for it; stop() deletes the subscriptions again
+
+Example usage:
+    receiver = EventReceiver(port=8443, certfile="listener.pem", keyfile="listener.key")
+    ingest = EventIngest(receiver, destination_host="mcp.example.com")
+    ingest.start({"server1": client1, "server2": client2})  # or start_background()
+    ...
+    receiver.recent_events(server_id="server1", category="power")
+    ingest.stop()
+"""
+
+import json
+import secrets
+import ssl
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence
+
+# Try relative import first, fall back to absolute
+try:
+    from .idrac_client import IDracClient, debug_print
+except ImportError:
+    # Fallback for direct execution
+    import sys
+    import os
+    sys.path.append(os.path.dirname(__file__))
+    from idrac_client import IDracClient, debug_print
+
+# Listener defaults
+DEFAULT_EVENT_LISTEN_HOST = '0.0.0.0'
+DEFAULT_EVENT_LISTEN_PORT = 8443
+DEFAULT_EVENT_PATH = '/redfish/events'
+
+# Events kept in the recent-event feed (all servers together)
+DEFAULT_MAX_EVENTS = 1000
+
+# Largest accepted event payload; iDRAC events are a few KiB
+MAX_EVENT_BODY_BYTES = 256 * 1024
+
+# Seconds stop() waits for background subscribing to finish
+SUBSCRIBE_STOP_TIMEOUT_SECONDS = 30
+
+# Event categories; all but 'other' invalidate the server's cached state
+EVENT_CATEGORIES = ('power', 'lifecycle', 'alert', 'other')
+
+# Dell message registry prefixes (last MessageId segment, e.g. 'IDRAC.2.9.SYS1003')
+POWER_MESSAGE_PREFIXES = ('SYS', 'PWR', 'PSU')
+LIFECYCLE_MESSAGE_PREFIXES = ('LC', 'JCP', 'SUP', 'RED', 'UEFI')
+
+EventCallback = Callable[[Dict[str, Any]], None]
+
+
+def classify_event(event: Dict[str, Any]) -> str:
+    """Return the category of one Redfish event record."""
+    message_id = str(event.get('MessageId') or '')
+    message_key = message_id.rsplit('.', 1)[-1].upper()
+    if message_key.startswith(POWER_MESSAGE_PREFIXES) or 'POWER' in message_id.upper():
+        return 'power'
+    if message_key.startswith(LIFECYCLE_MESSAGE_PREFIXES):
+        return 'lifecycle'
+    if event.get('EventType') == 'Alert' or event.get('Severity') in ('Warning', 'Critical'):
+        return 'alert'
+    return 'other'
+
+
+def parse_event_payload(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Flatten a Redfish Event payload into one feed record per event.
+
+    Raises:
+        ValueError: If the payload is not a Redfish Event
+    """
+    events = payload.get('Events')
+    if not isinstance(events, list):
+        raise ValueError("Payload has no 'Events' array")
+
+    received_at = datetime.now(timezone.utc).isoformat()
+    records = []
+    for event in events:
+        if not isinstance(event, dict):
+            continue
+        origin = event.get('OriginOfCondition')
+        if isinstance(origin, dict):
+            origin = origin.get('@odata.id')
+        records.append({
+            "received_at": received_at,
+            "timestamp": event.get('EventTimestamp'),
+            "category": classify_event(event),
+            "event_type": event.get('EventType'),
+            "event_id": event.get('EventId'),
+            "message_id": event.get('MessageId'),
+            "severity": event.get('Severity') or event.get('MessageSeverity'),
+            "message": event.get('Message'),
+            "message_args": event.get('MessageArgs', []),
+            "origin": origin,
+        })
+    return records
+
+
+class _EventRequestHandler(BaseHTTPRequestHandler):
+    """Accepts Redfish event POSTs and hands them to the EventReceiver."""
+
+    server_version = "iDRAC-MCP-Events/1.0"
+
+    # Seconds a connection may stay idle (also bounds the TLS handshake)
+    timeout = 10
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            length = -1
+        if length <= 0 or length > MAX_EVENT_BODY_BYTES:
+            self._reply(413 if length > MAX_EVENT_BODY_BYTES else 400)
+            return
+        body = self.rfile.read(length)
+        self._reply(self.server.receiver.ingest(self.path, body))
+
+    def _reply(self, status: int) -> None:
+        self.send_response(status)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        debug_print(f"Event listener: {self.address_string()} {format % args}")
+
+
+class EventReceiver:
+    """Local listener for Redfish push events, with a recent-event feed.
+
+    Thread-safe: registrations and the feed are guarded by one lock;
+    callbacks run on the listener's request threads.
+    """
+
+    def __init__(self, host: str = DEFAULT_EVENT_LISTEN_HOST, port: int = DEFAULT_EVENT_LISTEN_PORT,
+                 path: str = DEFAULT_EVENT_PATH, certfile: Optional[str] = None,
+                 keyfile: Optional[str] = None, max_events: int = DEFAULT_MAX_EVENTS):
+        """
+        Initialize the receiver (call start() to listen).
+
+        Args:
+            host: Address to listen on
+            port: Port to listen on (0 picks a free port)
+            path: URL path events are accepted at
+            certfile: TLS certificate (PEM); without it the listener speaks plain HTTP,
+                which iDRAC9 does not deliver to
+            keyfile: TLS private key (PEM), if not included in certfile
+            max_events: Events kept in the feed
+        """
+        self.host = host
+        self.port = port
+        self.path = path
+        self.certfile = certfile
+        self.keyfile = keyfile
+        self._lock = threading.Lock()
+        self._events: Deque[Dict[str, Any]] = deque(maxlen=max_events)
+        self._contexts: Dict[str, str] = {}
+        self._callbacks: Dict[str, EventCallback] = {}
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def scheme(self) -> str:
+        """'https' if the listener uses TLS, else 'http'."""
+        return 'https' if self.certfile else 'http'
+
+    def start(self) -> None:
+        """Start listening on a background thread.
+
+        Raises:
+            OSError: If the address cannot be bound
+            ssl.SSLError: If the certificate or key cannot be loaded
+        """
+        if self._httpd is not None:
+            return
+        httpd = ThreadingHTTPServer((self.host, self.port), _EventRequestHandler)
+        httpd.daemon_threads = True
+        httpd.receiver = self
+        if self.certfile:
+            try:
+                context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+                context.load_cert_chain(self.certfile, self.keyfile)
+            except (OSError, ssl.SSLError):
+                httpd.server_close()
+                raise
+            # Handshakes run on the request threads, so a stalled client cannot block accept()
+            httpd.socket = context.wrap_socket(httpd.socket, server_side=True, do_handshake_on_connect=False)
+        else:
+            debug_print("WARNING: Event listener runs without TLS; iDRAC9 only delivers events over https")
+
+        self.port = httpd.server_address[1]
+        self._httpd = httpd
+        self._thread = threading.Thread(target=httpd.serve_forever, name="idrac-events", daemon=True)
+        self._thread.start()
+        debug_print(f"Event listener on {self.scheme}://{self.host}:{self.port}{self.path}")
+
+    def stop(self) -> None:
+        """Stop listening."""
+        httpd, self._httpd = self._httpd, None
+        if httpd is not None:
+            httpd.shutdown()
+            httpd.server_close()
+            self._thread.join(timeout=5)
+            debug_print("Event listener stopped")
+
+    def register(self, server_id: str, callback: Optional[EventCallback] = None) -> str:
+        """Accept events for a server.
+
+        Args:
+            server_id: Server the events belong to
+            callback: Called with each of the server's feed records
+
+        Returns:
+            The Context token to subscribe with
+        """
+        context = secrets.token_urlsafe(24)
+        with self._lock:
+            for old_context in [c for c, s in self._contexts.items() if s == server_id]:
+                del self._contexts[old_context]
+            self._contexts[context] = server_id
+            if callback is not None:
+                self._callbacks[server_id] = callback
+        return context
+
+    def unregister(self, server_id: str) -> None:
+        """Stop accepting events for a server."""
+        with self._lock:
+            for context in [c for c, s in self._contexts.items() if s == server_id]:
+                del self._contexts[context]
+            self._callbacks.pop(server_id, None)
+
+    def ingest(self, path: str, body: bytes) -> int:
+        """Process one POSTed event payload.
+
+        Returns:
+            HTTP status for the sender
+        """
+        if path.split('?', 1)[0].rstrip('/') != self.path.rstrip('/'):
+            return 404
+        try:
+            payload = json.loads(body)
+            records = parse_event_payload(payload)
+        except (ValueError, AttributeError, TypeError) as e:
+            debug_print(f"Rejected event payload: {e}")
+            return 400
+
+        with self._lock:
+            server_id = self._contexts.get(payload.get('Context'))
+            if server_id is None:
+                return 403
+            callback = self._callbacks.get(server_id)
+            for record in records:
+                record["server_id"] = server_id
+                self._events.append(record)
+
+        debug_print(f"Received {len(records)} event(s) from {server_id}")
+        if callback is not None:
+            for record in records:
+                try:
+                    callback(record)
+                except Exception as e:
+                    debug_print(f"Event callback for {server_id} failed: {e}")
+        return 204
+
+    def recent_events(self, server_id: Optional[str] = None, category: Optional[str] = None,
+                      limit: int = 50) -> List[Dict[str, Any]]:
+        """Return the most recent events, newest first.
+
+        Args:
+            server_id: Only events of this server
+            category: Only events of this category (see EVENT_CATEGORIES)
+            limit: Maximum number of events
+        """
+        with self._lock:
+            events = list(self._events)
+        matches = []
+        for record in reversed(events):
+            if server_id is not None and record["server_id"] != server_id:
+                continue
+            if category is not None and record["category"] != category:
+                continue
+            matches.append(record)
+            if len(matches) >= limit:
+                break
+        return matches
+
+
+class EventIngest:
+    """Subscribes iDRACs to an EventReceiver and keeps their caches current."""
+
+    def __init__(self, receiver: EventReceiver, destination_host: str,
+                 event_types: Optional[Sequence[str]] = None):
+        """
+        Initialize the ingest.
+
+        Args:
+            receiver: Listener the iDRACs post to
+            destination_host: Host name or address of this machine as reachable from the iDRACs
+            event_types: Redfish event types to subscribe to (default: Alert)
+        """
+        self.receiver = receiver
+        self.destination_host = destination_host
+        self.event_types = event_types
+        self._lock = threading.Lock()
+        self._subscriptions: Dict[str, tuple] = {}
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def destination(self) -> str:
+        """Subscription destination URL of the receiver."""
+        return f"{self.receiver.scheme}://{self.destination_host}:{self.receiver.port}{self.receiver.path}"
+
+    def start(self, clients: Dict[str, IDracClient]) -> Dict[str, Dict[str, Any]]:
+        """Start the receiver and subscribe every client.
+
+        Returns:
+            Subscription result per server
+        """
+        self.receiver.start()
+        return self._subscribe_all(clients)
+
+    def start_background(self, clients: Dict[str, IDracClient]) -> None:
+        """Start the receiver, then subscribe every client on a background thread.
+
+        Raises:
+            OSError: If the listener cannot be started
+        """
+        self.receiver.start()
+        self._thread = threading.Thread(
+            target=self._subscribe_all, args=(dict(clients),), name="idrac-event-subscribe", daemon=True
+        )
+        self._thread.start()
+
+    def _subscribe_all(self, clients: Dict[str, IDracClient]) -> Dict[str, Dict[str, Any]]:
+        results = {}
+        for server_id, client in clients.items():
+            if self._stopping.is_set():
+                break
+            results[server_id] = self.subscribe(server_id, client)
+        return results
+
+    def subscribe(self, server_id: str, client: IDracClient) -> Dict[str, Any]:
+        """Subscribe one client; its events invalidate its cached state."""
+        if self._stopping.is_set():
+            return {"host": client.host, "status": "error", "error": "Event ingest is stopping",
+                    "message": "Event ingest is stopping"}
+
+        def on_event(record: Dict[str, Any]) -> None:
+            if record["category"] != 'other':
+                client.invalidate_cache()
+
+        context = self.receiver.register(server_id, on_event)
+        result = client.create_event_subscription(self.destination, context, self.event_types)
+        if result.get("status") != "success":
+            self.receiver.unregister(server_id)
+            debug_print(f"Event subscription for {server_id} failed: {result.get('error')}")
+            return result
+
+        with self._lock:
+            # stop() sets the flag under this lock: either it sees this
+            # subscription, or the subscription is withdrawn here
+            stopped = self._stopping.is_set()
+            if not stopped:
+                self._subscriptions[server_id] = (client, result.get("subscription"))
+        if stopped:
+            self.receiver.unregister(server_id)
+            if result.get("subscription") and client.session is not None:
+                client.delete_event_subscription(result["subscription"])
+            return {"host": client.host, "status": "error", "error": "Event ingest is stopping",
+                    "message": "Event ingest stopped while subscribing"}
+        return result
+
+    def stop(self) -> None:
+        """Delete all subscriptions (best effort) and stop the receiver.
+
+        Waits for background subscribing to finish first, so the clients
+        must still be open.
+        """
+        with self._lock:
+            self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout=SUBSCRIBE_STOP_TIMEOUT_SECONDS)
+            if self._thread.is_alive():
+                debug_print("Event subscribing did not finish in time; its subscription is withdrawn when it does")
+        with self._lock:
+            subscriptions, self._subscriptions = self._subscriptions, {}
+        for server_id, (client, subscription_uri) in subscriptions.items():
+            self.receiver.unregister(server_id)
+            if subscription_uri and client.session is not None:
+                client.delete_event_subscription(subscription_uri)
+        self.receiver.stop()
+
+    def status(self) -> Dict[str, Any]:
+        """Subscribed servers and the listener destination."""
+        with self._lock:
+            servers = sorted(self._subscriptions)
+        return {"destination": self.destination, "subscribed_servers": servers}
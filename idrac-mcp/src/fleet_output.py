@@ -0,0 +1,51 @@
+"""NDJSON output for fleet sweeps.
+
+Writes one JSON object per line and per server to stdout as soon as the
+server completes, e.g.
+
+    {"server": "r740-01", "status": "success", "data": {"power_state": "On", ...}}
+    {"server": "r740-07", "status": "error", "message": "No response from 'r740-07' within 30s"}
+
+so that large sweeps can be piped into jq or a log shipper. A progress line
+is kept up to date on stderr.
+
+Example usage:
+    summary = await write_ndjson(manager.stream_fleet("power"), total=len(manager.enabled_servers()))
+"""
+
+import json
+import sys
+from typing import Any, AsyncIterator, Dict, Optional, TextIO, Tuple
+
+
+async def write_ndjson(results: AsyncIterator[Tuple[str, Dict[str, Any]]], total: int,
+                       out: Optional[TextIO] = None, progress: Optional[TextIO] = None) -> Dict[str, int]:
+    """Write streamed fleet results as NDJSON records.
+
+    Args:
+        results: (server name, result) pairs, e.g. from stream_fleet()
+        total: Number of servers in the sweep (for the progress line)
+        out: Stream for the records (default: stdout)
+        progress: Stream for the progress line (default: stderr)
+
+    Returns:
+        Counts of 'success' and 'error' results
+    """
+    out = out or sys.stdout
+    progress = progress or sys.stderr
+    summary = {"success": 0, "error": 0}
+
+    async for name, result in results:
+        record = {"server": name, **result}
+        out.write(json.dumps(record, default=str) + "\n")
+        out.flush()
+
+        summary["success" if result.get("status") == "success" else "error"] += 1
+        done = summary["success"] + summary["error"]
+        progress.write(f"\r[{done}/{total}] {summary['success']} ok, {summary['error']} failed")
+        progress.flush()
+
+    if total:
+        progress.write("\n")
+        progress.flush()
+    return summary
@@ -0,0 +1,254 @@
+"""Concurrent fleet operations on a pool of long-lived iDRAC clients.
+
+Used by MultiServerManager and SecureMultiServerManager:
+
+- one IDracClient per server name, created on first use and reused across
+  sweeps (keeps TCP/TLS connections and Redfish sessions alive)
+- a sweep runs up to ``max_concurrency`` servers at a time on a dedicated
+  thread pool (IDracClient is synchronous)
+- each server gets ``server_timeout`` seconds; a dead BMC is reported as an
+  error instead of stalling the sweep
+- ``stream`` yields each server's result as soon as it completes, holding at
+  most ``max_concurrency`` results at a time regardless of fleet size
+
+Example usage:
+    pool = FleetClientPool(max_concurrency=32, server_timeout=30)
+    results = await pool.run(["r740-01", "r740-02"], manager.get_server_config, fleet_power_status)
+    pool.close()
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Optional, Tuple
+
+# Try relative import first, fall back to absolute
+try:
+    from .idrac_client import IDracClient
+except ImportError:
+    # Fallback for direct execution
+    import sys
+    import os
+    sys.path.append(os.path.dirname(__file__))
+    from idrac_client import IDracClient
+
+# Servers queried at the same time during a fleet sweep
+DEFAULT_FLEET_CONCURRENCY = 32
+
+# Seconds one server may take per fleet operation before it is reported as failed
+DEFAULT_SERVER_TIMEOUT_SECONDS = 30
+
+FleetOperation = Callable[[str, IDracClient], Dict[str, Any]]
+
+
+def fleet_test_connection(name: str, client: IDracClient) -> Dict[str, Any]:
+    """Fleet operation: test the connection to one server."""
+    result = client.test_connection()
+    if result.get("status") != "connected":
+        return {
+            "status": "error",
+            "server": name,
+            "data": result,
+            "message": f"Server '{name}' connection failed: {result.get('message')}"
+        }
+    return {
+        "status": "success",
+        "server": name,
+        "data": result,
+        "message": f"Server '{name}' connection successful"
+    }
+
+
+def fleet_system_info(name: str, client: IDracClient) -> Dict[str, Any]:
+    """Fleet operation: system information of one server."""
+    result = client.get_system_info()
+    if "system_info" not in result:
+        raise RuntimeError(result.get("error", result.get("message")))
+    return {"status": "success", "data": result["system_info"]}
+
+
+def fleet_health(name: str, client: IDracClient) -> Dict[str, Any]:
+    """Fleet operation: overall health of one server (always read fresh)."""
+    result = client.get_system_info(use_cache=False)
+    if "system_info" not in result:
+        raise RuntimeError(result.get("error", result.get("message")))
+    return {"status": "success", "data": {"overall_health": result["system_info"]["health"]}}
+
+
+def fleet_power_status(name: str, client: IDracClient) -> Dict[str, Any]:
+    """Fleet operation: power state and consumption of one server."""
+    result = client.get_power_status()
+    if "error" in result:
+        raise RuntimeError(result["error"])
+    return {"status": "success", "data": {"power_state": result["power_status"], **result.get("power_info", {})}}
+
+
+# Fleet operations by name, as used by the fleet CLIs
+FLEET_OPERATIONS: Dict[str, FleetOperation] = {
+    "test": fleet_test_connection,
+    "info": fleet_system_info,
+    "health": fleet_health,
+    "power": fleet_power_status,
+}
+
+
+class FleetClientPool:
+    """Long-lived IDracClients keyed by server name, plus a bounded sweep runner.
+
+    Thread-safe: clients are created and dropped under one lock.
+    """
+
+    def __init__(self, max_concurrency: int = DEFAULT_FLEET_CONCURRENCY,
+                 server_timeout: float = DEFAULT_SERVER_TIMEOUT_SECONDS):
+        """
+        Initialize the pool.
+
+        Args:
+            max_concurrency: Servers queried at the same time
+            server_timeout: Seconds one server may take per operation
+
+        Raises:
+            ValueError: If a limit is not positive
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if server_timeout <= 0:
+            raise ValueError("server_timeout must be positive")
+        self.max_concurrency = max_concurrency
+        self.server_timeout = server_timeout
+        self._lock = threading.Lock()
+        self._clients: Dict[str, IDracClient] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def get(self, name: str, get_config: Callable[[str], Optional[Dict[str, Any]]]) -> IDracClient:
+        """Return the client of a server, creating it on first use.
+
+        Args:
+            name: Server name
+            get_config: Returns the (decrypted) config of a server name; only
+                called when the client does not exist yet
+
+        Raises:
+            ValueError: If the server is unknown or its config is invalid
+        """
+        with self._lock:
+            client = self._clients.get(name)
+            if client is None:
+                config = get_config(name)
+                if not config:
+                    raise ValueError(f"Server '{name}' not found")
+                client = IDracClient(config)
+                self._clients[name] = client
+            return client
+
+    def discard(self, name: str) -> None:
+        """Close and forget a server's client (call when its config changes)."""
+        with self._lock:
+            client = self._clients.pop(name, None)
+        if client is not None:
+            client.close()
+
+    def close(self) -> None:
+        """Close all clients and stop the worker threads."""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+            executor, self._executor = self._executor, None
+        for client in clients:
+            client.close()
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Return the worker thread pool, creating it on first use."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency, thread_name_prefix="idrac-fleet"
+                )
+            return self._executor
+
+    async def run(self, names: Iterable[str], get_config: Callable[[str], Optional[Dict[str, Any]]],
+                  operation: FleetOperation) -> Dict[str, Dict[str, Any]]:
+        """Run an operation on many servers concurrently.
+
+        Args:
+            names: Server names
+            get_config: Returns the (decrypted) config of a server name
+            operation: Called as operation(name, client) on a worker thread
+
+        Returns:
+            Results keyed by server name, in the order given; failures and
+            timeouts are {"status": "error", "server": ..., "message": ...}
+        """
+        names = list(names)
+        results = {name: result async for name, result in self.stream(names, get_config, operation)}
+        return {name: results[name] for name in names}
+
+    async def stream(self, names: Iterable[str], get_config: Callable[[str], Optional[Dict[str, Any]]],
+                     operation: FleetOperation) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Run an operation on many servers, yielding (name, result) as each completes.
+
+        ``max_concurrency`` workers take names from ``names`` one at a time,
+        so neither the names nor the results are held for the whole fleet.
+
+        Args:
+            names: Server names (any iterable, consumed lazily)
+            get_config: Returns the (decrypted) config of a server name
+            operation: Called as operation(name, client) on a worker thread
+
+        Yields:
+            (server name, result) in completion order; see run() for the result shape
+        """
+        executor = self._get_executor()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        pending = iter(names)
+        completed: asyncio.Queue = asyncio.Queue(maxsize=self.max_concurrency)
+
+        async def worker():
+            # The iterator is shared: each name is taken by exactly one worker
+            for name in pending:
+                result = await self._run_one(executor, semaphore, name, get_config, operation)
+                await completed.put((name, result))
+            await completed.put(None)
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(self.max_concurrency)]
+        try:
+            running = len(workers)
+            while running:
+                item = await completed.get()
+                if item is None:
+                    running -= 1
+                else:
+                    yield item
+        finally:
+            for task in workers:
+                task.cancel()
+
+    async def _run_one(self, executor: ThreadPoolExecutor, semaphore: asyncio.Semaphore, name: str,
+                       get_config: Callable[[str], Optional[Dict[str, Any]]],
+                       operation: FleetOperation) -> Dict[str, Any]:
+        """Run the operation on one server within the concurrency limit and timeout."""
+        await semaphore.acquire()
+        future = asyncio.get_running_loop().run_in_executor(
+            executor, self._call, name, get_config, operation
+        )
+        # The slot is freed when the thread finishes, not at the timeout, so
+        # hung servers cannot oversubscribe the worker threads
+        future.add_done_callback(lambda _: semaphore.release())
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), self.server_timeout)
+        except asyncio.TimeoutError:
+            return {
+                "status": "error",
+                "server": name,
+                "message": f"No response from '{name}' within {self.server_timeout}s"
+            }
+
+    def _call(self, name: str, get_config: Callable[[str], Optional[Dict[str, Any]]],
+              operation: FleetOperation) -> Dict[str, Any]:
+        """Worker thread body; never raises."""
+        try:
+            return operation(name, self.get(name, get_config))
+        except Exception as e:
+            return {"status": "error", "server": name, "message": str(e)}
@@ -12,7 +12,8 @@ Example usage:
         "protocol": "https",
         "username": "admin",
         "password": "<your-password>",  # Set via environment variable
-        "ssl_verify": False
+        "ssl_verify": False,
+        "auth_mode": "session"  # Optional: log in once, reuse X-Auth-Token
     }
     client = IDracClient(config)
 
@@ -22,20 +23,40 @@ Example usage:
 """
 
 import sys
+import threading
 import warnings
-from typing import Any, Dict, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Union
+from urllib.parse import urlsplit
 
 import requests
 from requests.auth import HTTPBasicAuth
 from urllib3.exceptions import InsecureRequestWarning
 
-from src.utils.validation import validate_idrac_config
+from src.exceptions import IDracAPIError, IDracAuthenticationError
+from src.utils.validation import validate_idrac_config, AUTH_MODES
 from src.utils.resilience import CachedResponse, DEFAULT_CACHE_TTL_SECONDS
 
 # Request timeout configuration
 # Balance between responsiveness and reliability for iDRAC API calls
 DEFAULT_REQUEST_TIMEOUT_SECONDS = 10
 
+# Redfish SessionService collection; POSTing credentials here creates a session
+REDFISH_SESSIONS_ENDPOINT = '/redfish/v1/SessionService/Sessions'
+
+# Concurrent member requests when a collection cannot be expanded server-side.
+# Kept low: iDRAC serves only a handful of requests in parallel
+DEFAULT_MEMBER_FETCH_WORKERS = 4
+
+# Redfish resources of the embedded system
+SYSTEM_ENDPOINT = '/redfish/v1/Systems/System.Embedded.1'
+FIRMWARE_INVENTORY_ENDPOINT = '/redfish/v1/UpdateService/FirmwareInventory'
+EVENT_SUBSCRIPTIONS_ENDPOINT = '/redfish/v1/EventService/Subscriptions'
+
+# Event types subscribed to by default; iDRAC delivers power, hardware and
+# Lifecycle Controller messages as Alert events
+DEFAULT_EVENT_TYPES = ('Alert',)
+
 
 def debug_print(message: str) -> None:
     """Print debug messages to stderr to avoid interfering with MCP protocol."""
@@ -69,11 +90,19 @@ class IDracClient:
     1. Config dictionary: IDracClient({"host": ..., "port": ..., ...})
     2. Keyword args: IDracClient(host="...", port=..., protocol="...", username="...", password="...", ssl_verify=...)
 
+    Two authentication modes are available:
+    - "basic" (default): HTTP Basic auth on every request
+    - "session": one Redfish SessionService login, after which requests carry
+      the X-Auth-Token header. iDRAC does not re-validate the credentials on
+      every request, which makes calls considerably faster. An expired session
+      is re-created transparently and close() logs the session out.
+
     Attributes:
         host: iDRAC hostname or IP address
         port: iDRAC port (usually 443)
         protocol: Protocol to use ('https' recommended)
         ssl_verify: Whether to verify SSL certificates
+        auth_mode: Authentication mode ('basic' or 'session')
         base_url: Full base URL for API calls
         session: Requests session with auth and headers configured
     """
@@ -85,18 +114,24 @@ class IDracClient:
         protocol: Optional[str] = None,
         username: Optional[str] = None,
         password: Optional[str] = None,
-        ssl_verify: bool = False
+        ssl_verify: bool = False,
+        auth_mode: str = "basic"
     ):
         """Initialize the iDRAC client.
 
         Args:
             host: Either a config dict with keys (host, port, protocol,
-                username, password, ssl_verify) OR the hostname/IP string.
+                username, password, ssl_verify, auth_mode) OR the hostname/IP string.
             port: iDRAC port (usually 443) - required if host is a string
             protocol: Protocol to use ('https' recommended) - required if host is a string
             username: iDRAC username - required if host is a string
             password: iDRAC password - required if host is a string
             ssl_verify: Whether to verify SSL certificates (default: False for self-signed)
+            auth_mode: 'basic' (HTTP Basic auth on every request) or 'session'
+                (Redfish session with X-Auth-Token)
+
+        Raises:
+            ValueError: If the configuration is invalid
         """
         # Support both config dict and keyword args for backwards compatibility
         if isinstance(host, dict):
@@ -109,6 +144,7 @@ class IDracClient:
             self.username = validated['username']
             self.password = validated['password']
             self.ssl_verify = validated.get('ssl_verify', False)
+            self.auth_mode = validated.get('auth_mode', 'basic')
         else:
             # Keyword/positional arguments
             if port is None or protocol is None or username is None or password is None:
@@ -122,6 +158,9 @@ class IDracClient:
             self.username = username
             self.password = password
             self.ssl_verify = ssl_verify
+            if auth_mode not in AUTH_MODES:
+                raise ValueError(f"auth_mode must be one of: {', '.join(AUTH_MODES)}")
+            self.auth_mode = auth_mode
             # Store config dict for backwards compatibility
             self.config = {
                 "host": self.host,
@@ -129,12 +168,16 @@ class IDracClient:
                 "protocol": self.protocol,
                 "username": self.username,
                 "password": self.password,
-                "ssl_verify": self.ssl_verify
+                "ssl_verify": self.ssl_verify,
+                "auth_mode": self.auth_mode
             }
 
         self.base_url = f"{self.protocol}://{self.host}:{self.port}"
         self.session = requests.Session()
         
+        # ProtocolFeaturesSupported of the service root, read on first collection query
+        self._protocol_features: Optional[Dict[str, Any]] = None
+
         # Response caching for static data (Issue #173)
         # System info rarely changes, cache for 5 minutes by default
         self._system_info_cache: Optional[CachedResponse[Dict[str, Any]]] = None
@@ -142,8 +185,17 @@ class IDracClient:
             self.config.get('cache_ttl_seconds', DEFAULT_CACHE_TTL_SECONDS)
         )
 
-        # Use explicit HTTPBasicAuth for better compatibility
-        self.auth = HTTPBasicAuth(self.username, self.password)
+        # Redfish session state (auth_mode='session'); the lock serializes logins
+        self._session_lock = threading.Lock()
+        self._session_token: Optional[str] = None
+        self._session_uri: Optional[str] = None
+
+        if self.auth_mode == 'session':
+            # Credentials are only sent to SessionService; requests carry X-Auth-Token
+            self.auth = None
+        else:
+            # Use explicit HTTPBasicAuth for better compatibility
+            self.auth = HTTPBasicAuth(self.username, self.password)
         self.session.auth = self.auth
         self.session.verify = self.ssl_verify
 
@@ -161,15 +213,18 @@ class IDracClient:
         debug_print(f"SSL Verify: {self.ssl_verify}")
         safe_headers = redact_sensitive_headers(dict(self.session.headers))
         debug_print(f"Session headers: {safe_headers}")
-        debug_print(f"Auth type: {type(self.auth).__name__}")
+        debug_print(f"Auth type: {type(self.auth).__name__ if self.auth else 'X-Auth-Token session'}")
 
     def close(self) -> None:
         """Close the session and release resources.
 
         Should be called when the client is no longer needed to prevent
-        resource leaks (file descriptors, TCP connections).
+        resource leaks (file descriptors, TCP connections). In session mode
+        the Redfish session is deleted first, so it does not hold one of the
+        iDRAC's limited session slots until it times out.
         """
         if self.session is not None:
+            self._delete_session()
             try:
                 self.session.close()
                 debug_print(f"Closed iDRAC client session for {self.host}")
@@ -221,6 +276,86 @@ class IDracClient:
                 warnings.filterwarnings('ignore', category=InsecureRequestWarning)
             return handler(url, timeout=DEFAULT_REQUEST_TIMEOUT_SECONDS, **kwargs)
 
+    def _session_url(self, uri: str) -> str:
+        """Return the absolute URL of a session URI (Location may be relative)."""
+        if uri.startswith(('http://', 'https://')):
+            return uri
+        return f"{self.base_url}{uri}"
+
+    @staticmethod
+    def _resource_path(uri: str) -> str:
+        """Return the path of a resource URI (a Location header may be an absolute URL)."""
+        if uri.startswith(('http://', 'https://')):
+            parts = urlsplit(uri)
+            return f"{parts.path}?{parts.query}" if parts.query else parts.path
+        return uri
+
+    def _ensure_session(self, stale_token: Optional[str] = None) -> str:
+        """Return the current session token, logging in to SessionService if needed.
+
+        Args:
+            stale_token: Token that was just rejected with 401. A new session is
+                only created if it is still the current one; another thread may
+                already have replaced it.
+
+        Returns:
+            The X-Auth-Token now set on the session
+
+        Raises:
+            IDracAuthenticationError: If the login is rejected or returns no token
+        """
+        with self._session_lock:
+            if self._session_token and self._session_token != stale_token:
+                return self._session_token
+
+            self._session_token = None
+            self._session_uri = None
+            self.session.headers.pop('X-Auth-Token', None)
+
+            debug_print("Creating Redfish session")
+            response = self._execute_http_request(
+                'POST',
+                f"{self.base_url}{REDFISH_SESSIONS_ENDPOINT}",
+                json={"UserName": self.username, "Password": self.password}
+            )
+            token = response.headers.get('X-Auth-Token')
+            if response.status_code not in (200, 201) or not token:
+                raise IDracAuthenticationError(
+                    f"Failed to create Redfish session: HTTP {response.status_code}"
+                )
+
+            location = response.headers.get('Location')
+            if not location:
+                try:
+                    location = response.json().get('@odata.id')
+                except ValueError:
+                    location = None
+
+            self._session_token = token
+            self._session_uri = location
+            self.session.headers['X-Auth-Token'] = token
+            debug_print(f"Created Redfish session: {location}")
+            return token
+
+    def _delete_session(self) -> None:
+        """Log out of the Redfish session, if one is open (best effort)."""
+        with self._session_lock:
+            uri = self._session_uri
+            has_token = self._session_token is not None
+            self._session_token = None
+            self._session_uri = None
+        if not has_token:
+            return
+
+        try:
+            if uri:
+                response = self._execute_http_request('DELETE', self._session_url(uri))
+                debug_print(f"Deleted Redfish session: HTTP {response.status_code}")
+        except Exception as e:
+            debug_print(f"Error deleting Redfish session for {self.host}: {e}")
+        finally:
+            self.session.headers.pop('X-Auth-Token', None)
+
     def _make_request(self, method: str, endpoint: str, **kwargs) -> requests.Response:
         """Make a request with proper error handling and debugging.
 
@@ -243,6 +378,7 @@ class IDracClient:
         debug_print(f"Session headers: {safe_headers}")
 
         try:
+            token = self._ensure_session() if self.auth_mode == 'session' else None
             response = self._execute_http_request(method, url, **kwargs)
 
             debug_print(f"Response status: {response.status_code}")
@@ -250,7 +386,14 @@ class IDracClient:
             debug_print(f"Response headers: {safe_response_headers}")
             debug_print(f"Response has cookies: {len(response.cookies)} cookies")
 
-            if response.status_code == 401:
+            if response.status_code == 401 and self.auth_mode == 'session':
+                debug_print("401 Unauthorized - Redfish session expired, creating a new one")
+                self._ensure_session(stale_token=token)
+                # The rejected token failed authentication before the request was
+                # processed, so every method can be retried safely
+                response = self._execute_http_request(method, url, **kwargs)
+                debug_print(f"Retry response status: {response.status_code}")
+            elif response.status_code == 401:
                 debug_print("401 Unauthorized - attempting to re-authenticate")
                 # Clear any existing cookies and re-authenticate
                 self.session.cookies.clear()
@@ -273,6 +416,117 @@ class IDracClient:
             debug_print(f"Request error: {e}")
             raise
 
+    def get_protocol_features(self) -> Dict[str, Any]:
+        """Return which Redfish query parameters the service supports.
+
+        Reads ProtocolFeaturesSupported from the service root once per client;
+        services that do not publish it (older iDRAC firmware) are treated as
+        supporting neither $expand nor $select.
+
+        Returns:
+            Dict with 'expand' (the $expand value to use, or None) and 'select' (bool)
+        """
+        if self._protocol_features is not None:
+            return self._protocol_features
+
+        try:
+            response = self._make_request('GET', '/redfish/v1/')
+            if response.status_code != 200:
+                raise IDracAPIError(f"HTTP {response.status_code}")
+            features = response.json().get('ProtocolFeaturesSupported') or {}
+        except (requests.exceptions.RequestException, ValueError, IDracAPIError) as e:
+            # Not cached: the next query tries again
+            debug_print(f"Could not read ProtocolFeaturesSupported: {e}")
+            return {"expand": None, "select": False}
+
+        expand_query = features.get('ExpandQuery') or {}
+        expand = None
+        if expand_query.get('ExpandAll'):
+            expand = '*($levels=1)' if expand_query.get('Levels') else '*'
+        elif expand_query.get('NoLinks'):
+            expand = '.($levels=1)' if expand_query.get('Levels') else '.'
+
+        self._protocol_features = {"expand": expand, "select": bool(features.get('SelectQuery'))}
+        debug_print(f"Redfish query support: {self._protocol_features}")
+        return self._protocol_features
+
+    def get_collection(self, endpoint: str, select: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """Fetch all members of a Redfish collection.
+
+        Uses one ``$expand`` request (with ``$select``) where the service
+        supports it, instead of one request per member. Otherwise, or if the
+        expanded response is rejected or incomplete, the members are fetched
+        concurrently.
+
+        Args:
+            endpoint: Collection URI (e.g., '/redfish/v1/UpdateService/FirmwareInventory')
+            select: Only return these member properties (all if None)
+
+        Returns:
+            List of member resources, reduced to ``select`` (plus '@odata.id')
+
+        Raises:
+            requests.exceptions.RequestException: On network errors
+            IDracAPIError: If the collection cannot be read
+        """
+        features = self.get_protocol_features()
+        members: List[Dict[str, Any]] = []
+        data = None
+
+        if features["expand"]:
+            # Built by hand: some iDRAC firmware does not decode a percent-encoded '$'
+            query = f"$expand={features['expand']}"
+            if select and features["select"]:
+                query += f"&$select={','.join(select)}"
+            response = self._make_request('GET', f"{endpoint}?{query}")
+            if response.status_code == 200:
+                data = response.json()
+                if 'Members' not in data:
+                    # $select was applied to the collection itself rather than its members
+                    debug_print(f"Expanded query of {endpoint} returned no Members")
+                    data = None
+            else:
+                # Some firmware rejects $expand on particular collections
+                debug_print(f"Expanded query of {endpoint} failed: HTTP {response.status_code}")
+
+        if data is None:
+            response = self._make_request('GET', endpoint)
+            if response.status_code != 200:
+                raise IDracAPIError(f"Failed to read {endpoint}: HTTP {response.status_code}")
+            data = response.json()
+
+        # Members that came back as bare links (not expanded) are fetched individually
+        links = []
+        for member in data.get('Members', []):
+            if set(member) - {'@odata.id'}:
+                members.append(member)
+            elif member.get('@odata.id'):
+                links.append(member['@odata.id'])
+        if links:
+            debug_print(f"Fetching {len(links)} member(s) of {endpoint} individually")
+            members.extend(self._fetch_members(links))
+
+        if select:
+            keep = set(select) | {'@odata.id'}
+            members = [{k: v for k, v in member.items() if k in keep} for member in members]
+        return members
+
+    def _fetch_members(self, uris: List[str]) -> List[Dict[str, Any]]:
+        """GET collection members concurrently; members that fail are skipped."""
+        def fetch(uri: str) -> Optional[Dict[str, Any]]:
+            try:
+                response = self._make_request('GET', uri)
+                if response.status_code == 200:
+                    return response.json()
+                debug_print(f"Skipping member {uri}: HTTP {response.status_code}")
+            except (requests.exceptions.RequestException, ValueError) as e:
+                debug_print(f"Skipping member {uri}: {e}")
+            return None
+
+        with ThreadPoolExecutor(max_workers=min(DEFAULT_MEMBER_FETCH_WORKERS, len(uris))) as executor:
+            results = list(executor.map(fetch, uris))
+        return [member for member in results if member is not None]
+
     def test_connection(self) -> Dict[str, Any]:
         """Test connection to iDRAC server.
 
@@ -568,3 +822,170 @@ class IDracClient:
                 "error": str(e),
                 "message": f"Error sending restart command: {str(e)}"
             }
+
+    def _get_inventory(self, name: str, collections: Dict[str, tuple]) -> Dict[str, Any]:
+        """Read several collections into one result dict (shared by the inventory methods).
+
+        Args:
+            name: Human-readable inventory name for messages
+            collections: Result key -> (collection endpoint, selected properties)
+
+        Returns:
+            Dict with one list per collection key, or error details
+        """
+        try:
+            result: Dict[str, Any] = {"host": self.host}
+            for key, (endpoint, select) in collections.items():
+                result[key] = self.get_collection(endpoint, select=select)
+            result["message"] = f"{name} retrieved successfully"
+            return result
+        except Exception as e:
+            return {
+                "host": self.host,
+                "error": str(e),
+                "message": f"Error retrieving {name.lower()}: {str(e)}"
+            }
+
+    def get_hardware_inventory(self) -> Dict[str, Any]:
+        """Get processors and memory modules of the server.
+
+        Returns:
+            Dict with 'processors' and 'memory' lists
+        """
+        return self._get_inventory("Hardware inventory", {
+            "processors": (f"{SYSTEM_ENDPOINT}/Processors", [
+                "Id", "Model", "Manufacturer", "TotalCores", "TotalThreads", "MaxSpeedMHz", "Status"
+            ]),
+            "memory": (f"{SYSTEM_ENDPOINT}/Memory", [
+                "Id", "CapacityMiB", "MemoryDeviceType", "OperatingSpeedMhz", "Manufacturer",
+                "PartNumber", "SerialNumber", "Status"
+            ]),
+        })
+
+    def get_storage_controllers(self) -> Dict[str, Any]:
+        """Get storage subsystems with their controllers and drive links.
+
+        Returns:
+            Dict with a 'storage' list
+        """
+        return self._get_inventory("Storage controllers", {
+            "storage": (f"{SYSTEM_ENDPOINT}/Storage", [
+                "Id", "Name", "StorageControllers", "Drives", "Status"
+            ]),
+        })
+
+    def get_firmware_versions(self) -> Dict[str, Any]:
+        """Get installed firmware versions of all components.
+
+        Returns:
+            Dict with a 'firmware' list
+        """
+        return self._get_inventory("Firmware versions", {
+            "firmware": (FIRMWARE_INVENTORY_ENDPOINT, [
+                "Id", "Name", "Version", "Updateable", "Status"
+            ]),
+        })
+
+    def get_network_config(self) -> Dict[str, Any]:
+        """Get the server's Ethernet interfaces.
+
+        Returns:
+            Dict with an 'interfaces' list
+        """
+        return self._get_inventory("Network configuration", {
+            "interfaces": (f"{SYSTEM_ENDPOINT}/EthernetInterfaces", [
+                "Id", "Name", "MACAddress", "SpeedMbps", "LinkStatus", "IPv4Addresses",
+                "IPv6Addresses", "Status"
+            ]),
+        })
+
+    def create_event_subscription(self, destination: str, context: str,
+                                  event_types: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """Subscribe a listener to the iDRAC's Redfish EventService.
+
+        Subscriptions left over for the same destination (e.g., by a process
+        that did not shut down cleanly) are deleted first: iDRAC allows only
+        a few subscriptions and would otherwise deliver every event twice.
+
+        Args:
+            destination: URL the iDRAC POSTs events to (iDRAC9 requires https)
+            context: Opaque string echoed in every event, identifies this server
+            event_types: Redfish event types (default: Alert)
+
+        Returns:
+            Dict with the subscription URI, or error details
+        """
+        try:
+            for subscription in self.get_collection(EVENT_SUBSCRIPTIONS_ENDPOINT, select=["Destination"]):
+                if subscription.get("Destination") == destination:
+                    debug_print(f"Deleting stale event subscription {subscription['@odata.id']}")
+                    self._make_request('DELETE', subscription['@odata.id'])
+
+            payload = {
+                "Destination": destination,
+                "Protocol": "Redfish",
+                "Context": context,
+                "EventTypes": list(event_types or DEFAULT_EVENT_TYPES)
+            }
+            response = self._make_request('POST', EVENT_SUBSCRIPTIONS_ENDPOINT, json=payload)
+            if response.status_code not in [200, 201]:
+                return {
+                    "host": self.host,
+                    "status": "error",
+                    "error": f"Failed to create event subscription: HTTP {response.status_code}",
+                    "message": "Failed to subscribe to events"
+                }
+
+            subscription_uri = response.headers.get('Location')
+            if not subscription_uri:
+                try:
+                    subscription_uri = response.json().get('@odata.id')
+                except ValueError:
+                    subscription_uri = None
+            if subscription_uri:
+                # _make_request prepends base_url, so keep only the path
+                subscription_uri = self._resource_path(subscription_uri)
+            return {
+                "host": self.host,
+                "status": "success",
+                "subscription": subscription_uri,
+                "message": "Subscribed to events"
+            }
+        except Exception as e:
+            return {
+                "host": self.host,
+                "status": "error",
+                "error": str(e),
+                "message": f"Error subscribing to events: {str(e)}"
+            }
+
+    def delete_event_subscription(self, subscription_uri: str) -> Dict[str, Any]:
+        """Delete an event subscription created by create_event_subscription.
+
+        Args:
+            subscription_uri: URI returned as 'subscription'
+
+        Returns:
+            Dict with operation result
+        """
+        try:
+            response = self._make_request('DELETE', self._resource_path(subscription_uri))
+            if response.status_code in [200, 202, 204, 404]:
+                return {
+                    "host": self.host,
+                    "status": "success",
+                    "message": "Event subscription deleted"
+                }
+            return {
+                "host": self.host,
+                "status": "error",
+                "error": f"Failed to delete event subscription: HTTP {response.status_code}",
+                "message": "Failed to delete event subscription"
+            }
+        except Exception as e:
+            return {
+                "host": self.host,
+                "status": "error",
+                "error": str(e),
+                "message": f"Error deleting event subscription: {str(e)}"
+            }
@@ -1,10 +1,9 @@
 """Secure multi-server manager for iDRAC fleet management with encrypted passwords."""
 
-import asyncio
 import json
 import os
 import base64
-from typing import Dict, List, Any, Optional
+from typing import AsyncIterator, Dict, List, Any, Optional, Tuple
 from pathlib import Path
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
@@ -17,29 +16,42 @@ PBKDF2_ITERATIONS = 480000
 
 # Try relative import first, fall back to absolute
 try:
-    from .idrac_client import IDracClient
+    from .fleet_pool import (
+        FleetClientPool, DEFAULT_FLEET_CONCURRENCY, DEFAULT_SERVER_TIMEOUT_SECONDS,
+        fleet_test_connection, fleet_system_info, fleet_health, fleet_power_status,
+        FLEET_OPERATIONS,
+    )
 except ImportError:
     # Fallback for direct execution
     import sys
     import os
     sys.path.append(os.path.dirname(__file__))
-    from idrac_client import IDracClient
+    from fleet_pool import (
+        FleetClientPool, DEFAULT_FLEET_CONCURRENCY, DEFAULT_SERVER_TIMEOUT_SECONDS,
+        fleet_test_connection, fleet_system_info, fleet_health, fleet_power_status,
+        FLEET_OPERATIONS,
+    )
 
 class SecureMultiServerManager:
     """Manages multiple iDRAC servers with encrypted password storage."""
     
-    def __init__(self, config_file: str = "fleet_servers.json", key_file: str = ".fleet_key", master_password: Optional[str] = None):
+    def __init__(self, config_file: str = "fleet_servers.json", key_file: str = ".fleet_key", master_password: Optional[str] = None,
+                 max_concurrency: int = DEFAULT_FLEET_CONCURRENCY,
+                 server_timeout: float = DEFAULT_SERVER_TIMEOUT_SECONDS):
         """Initialize the secure multi-server manager.
         
         Args:
             config_file: Path to the encrypted servers configuration file
             key_file: Path to the encryption key file (deprecated, kept for backward compatibility)
             master_password: Master password for deriving encryption key (required for new setup)
+            max_concurrency: Servers queried at the same time by fleet operations
+            server_timeout: Seconds one server may take per fleet operation
         """
         self.config_file = Path(config_file)
         self.key_file = Path(key_file)
         self.fernet = None
         self.servers = {}
+        self.pool = FleetClientPool(max_concurrency, server_timeout)
         self.salt = None  # Salt for key derivation
         self._initialize_encryption(master_password)
         self.load_config()
@@ -190,6 +202,7 @@ class SecureMultiServerManager:
             protocol: Protocol (http/https)
             ssl_verify: Whether to verify SSL certificates
         """
+        self.pool.discard(name)
         self.servers[name] = {
             "host": host,
             "port": port,
@@ -231,6 +244,7 @@ class SecureMultiServerManager:
         """
         if name in self.servers:
             del self.servers[name]
+            self.pool.discard(name)
             self.save_config()
             print(f"✅ Removed server '{name}'")
         else:
@@ -265,11 +279,20 @@ class SecureMultiServerManager:
         """
         if name in self.servers:
             self.servers[name]["enabled"] = False
+            self.pool.discard(name)
             self.save_config()
             print(f"✅ Disabled server '{name}'")
         else:
             print(f"❌ Server '{name}' not found")
     
+    def enabled_servers(self) -> List[str]:
+        """Names of all enabled servers."""
+        return [name for name, config in self.servers.items() if config.get("enabled", True)]
+    
+    def close(self):
+        """Close the pooled iDRAC clients."""
+        self.pool.close()
+    
     async def test_server(self, name: str) -> Dict[str, Any]:
         """Test connection to a specific server.
         
@@ -279,140 +302,81 @@ class SecureMultiServerManager:
         Returns:
             Test result
         """
-        config = self.get_server_config(name)
-        if not config:
+        if name not in self.servers:
             return {
                 "status": "error",
                 "message": f"Server '{name}' not found"
             }
         
-        if not config.get("enabled", True):
+        if not self.servers[name].get("enabled", True):
             return {
                 "status": "error",
                 "message": f"Server '{name}' is disabled"
             }
         
-        try:
-            async with IDracClient(config) as client:
-                result = await client.test_connection()
-                return {
-                    "status": "success",
-                    "server": name,
-                    "data": result,
-                    "message": f"Server '{name}' connection successful"
-                }
-        except Exception as e:
-            return {
-                "status": "error",
-                "server": name,
-                "message": f"Server '{name}' connection failed: {e}"
-            }
+        results = await self.pool.run([name], self.get_server_config, fleet_test_connection)
+        return results[name]
     
     async def test_all_servers(self) -> Dict[str, Any]:
-        """Test connection to all enabled servers.
+        """Test connection to all enabled servers concurrently.
         
         Returns:
             Results for all servers
         """
-        results = {}
-        enabled_servers = [name for name, config in self.servers.items() 
-                          if config.get("enabled", True)]
-        
+        enabled_servers = self.enabled_servers()
         print(f"🔍 Testing {len(enabled_servers)} enabled servers...")
-        
-        for name in enabled_servers:
-            print(f"  Testing {name}...")
-            result = await self.test_server(name)
-            results[name] = result
-        
-        return results
+        return await self.pool.run(enabled_servers, self.get_server_config, fleet_test_connection)
     
     async def get_fleet_system_info(self) -> Dict[str, Any]:
-        """Get system information from all enabled servers.
+        """Get system information from all enabled servers concurrently.
         
         Returns:
             System information for all servers
         """
-        results = {}
-        enabled_servers = [name for name, config in self.servers.items() 
-                          if config.get("enabled", True)]
-        
+        enabled_servers = self.enabled_servers()
         print(f"📊 Getting system info from {len(enabled_servers)} servers...")
-        
-        for name in enabled_servers:
-            try:
-                config = self.get_server_config(name)
-                async with IDracClient(config) as client:
-                    system_info = await client.get_system_info()
-                    results[name] = {
-                        "status": "success",
-                        "data": system_info["data"]
-                    }
-            except Exception as e:
-                results[name] = {
-                    "status": "error",
-                    "message": str(e)
-                }
-        
-        return results
+        return await self.pool.run(enabled_servers, self.get_server_config, fleet_system_info)
     
     async def get_fleet_health(self) -> Dict[str, Any]:
-        """Get health status from all enabled servers.
+        """Get health status from all enabled servers concurrently.
         
         Returns:
             Health information for all servers
         """
-        results = {}
-        enabled_servers = [name for name, config in self.servers.items() 
-                          if config.get("enabled", True)]
-        
+        enabled_servers = self.enabled_servers()
         print(f"🏥 Getting health status from {len(enabled_servers)} servers...")
-        
-        for name in enabled_servers:
-            try:
-                config = self.get_server_config(name)
-                async with IDracClient(config) as client:
-                    health = await client.get_system_health()
-                    results[name] = {
-                        "status": "success",
-                        "data": health["data"]
-                    }
-            except Exception as e:
-                results[name] = {
-                    "status": "error",
-                    "message": str(e)
-                }
-        
-        return results
+        return await self.pool.run(enabled_servers, self.get_server_config, fleet_health)
     
     async def get_fleet_power_status(self) -> Dict[str, Any]:
-        """Get power status from all enabled servers.
+        """Get power status from all enabled servers concurrently.
         
         Returns:
             Power status for all servers
         """
-        results = {}
-        enabled_servers = [name for name, config in self.servers.items() 
-                          if config.get("enabled", True)]
-        
+        enabled_servers = self.enabled_servers()
         print(f"⚡ Getting power status from {len(enabled_servers)} servers...")
+        return await self.pool.run(enabled_servers, self.get_server_config, fleet_power_status)
+    
+    def stream_fleet(self, operation: str,
+                     names: Optional[List[str]] = None) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Run a fleet operation, yielding (server name, result) as each server completes.
         
-        for name in enabled_servers:
-            try:
-                config = self.get_server_config(name)
-                async with IDracClient(config) as client:
-                    power = await client.get_power_status()
-                    results[name] = {
-                        "status": "success",
-                        "data": power["data"]
-                    }
-            except Exception as e:
-                results[name] = {
-                    "status": "error",
-                    "message": str(e)
-                }
-        
-        return results
+        Args:
+            operation: One of 'test', 'info', 'health', 'power'
+            names: Servers to query (default: all enabled servers)
+            
+        Returns:
+            Async iterator of (server name, result); results have the same
+            shape as those of the get_fleet_* methods
+            
+        Raises:
+            ValueError: If the operation is unknown
+        """
+        if operation not in FLEET_OPERATIONS:
+            raise ValueError(f"Unknown fleet operation '{operation}'")
+        if names is None:
+            names = self.enabled_servers()
+        return self.pool.stream(names, self.get_server_config, FLEET_OPERATIONS[operation])
     
     def create_sample_config(self):
         """Create a sample server configuration file."""
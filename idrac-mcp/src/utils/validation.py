@@ -6,6 +6,10 @@ from typing import Dict, Any, Optional
 from pydantic import BaseModel, field_validator
 
 
+# Authentication modes supported by IDracClient
+AUTH_MODES = ('basic', 'session')
+
+
 class IDracConfig(BaseModel):
     """Configuration model for iDRAC connection."""
     
@@ -16,6 +20,7 @@ class IDracConfig(BaseModel):
     password: str
     ssl_verify: bool = False
     ssl_cert_path: Optional[str] = None
+    auth_mode: str = "basic"
     
     @field_validator('host')
     @classmethod
@@ -37,6 +42,13 @@ class IDracConfig(BaseModel):
         if v not in ['http', 'https']:
             raise ValueError('Protocol must be either http or https')
         return v
+    
+    @field_validator('auth_mode')
+    @classmethod
+    def validate_auth_mode(cls, v):
+        if v not in AUTH_MODES:
+            raise ValueError(f'auth_mode must be one of: {", ".join(AUTH_MODES)}')
+        return v
 
 
 class PowerOperation(BaseModel):
@@ -0,0 +1,325 @@
+"""Tests for the Redfish event listener, subscriptions and cache invalidation."""
+
+import datetime
+import json
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from src.event_service import EventIngest, EventReceiver, MAX_EVENT_BODY_BYTES, classify_event
+from src.idrac_client import IDracClient, EVENT_SUBSCRIPTIONS_ENDPOINT
+
+
+def _event(message_id, severity="OK", message="", event_type="Alert"):
+    return {
+        "EventType": event_type,
+        "EventId": "8679",
+        "EventTimestamp": "2025-01-15T10:30:00-06:00",
+        "MessageId": message_id,
+        "Severity": severity,
+        "Message": message,
+        "MessageArgs": [],
+        "OriginOfCondition": {"@odata.id": "/redfish/v1/Systems/System.Embedded.1"},
+    }
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class FakeBMC:
+    """Stands in for the iDRAC EventService and posts events to its subscribers."""
+
+    def __init__(self, client):
+        self.client = client
+        self.lock = threading.Lock()
+        self.subscriptions = {}
+        self.created = 0
+        self.deleted = []
+        self.reject_subscription = False
+        self.absolute_location = False
+        self.posting = threading.Event()
+        self.hold = None
+
+    def _response(self, status, headers=None, body=None):
+        response = Mock()
+        response.status_code = status
+        response.headers = headers or {}
+        response.cookies = {}
+        response.json.return_value = body or {}
+        return response
+
+    def __call__(self, method, url, **kwargs):
+        path = url.replace(self.client.base_url, "")
+        if path == EVENT_SUBSCRIPTIONS_ENDPOINT and method == "POST" and self.hold is not None:
+            self.posting.set()
+            self.hold.wait(5)
+        with self.lock:
+            if path == "/redfish/v1/":
+                return self._response(200, body={})
+            if path == EVENT_SUBSCRIPTIONS_ENDPOINT and method == "GET":
+                return self._response(200, body={"Members": [{"@odata.id": uri} for uri in self.subscriptions]})
+            if path == EVENT_SUBSCRIPTIONS_ENDPOINT and method == "POST":
+                if self.reject_subscription:
+                    return self._response(400)
+                self.created += 1
+                uri = f"{EVENT_SUBSCRIPTIONS_ENDPOINT}/{self.created}"
+                self.subscriptions[uri] = {"@odata.id": uri, **kwargs["json"]}
+                location = f"{self.client.base_url}{uri}" if self.absolute_location else uri
+                return self._response(201, {"Location": location})
+            if path in self.subscriptions and method == "GET":
+                return self._response(200, body=self.subscriptions[path])
+            if path in self.subscriptions and method == "DELETE":
+                del self.subscriptions[path]
+                self.deleted.append(path)
+                return self._response(204)
+            return self._response(404)
+
+    def post(self, *events, context=None, **kwargs):
+        """Deliver events to every subscriber, as the iDRAC does."""
+        statuses = []
+        for subscription in list(self.subscriptions.values()):
+            payload = {
+                "@odata.type": "#Event.v1_4_0.Event",
+                "Context": context or subscription["Context"],
+                "Events": list(events),
+            }
+            statuses.append(requests.post(subscription["Destination"], json=payload, timeout=5, **kwargs).status_code)
+        return statuses
+
+
+@pytest.fixture
+def receiver():
+    receiver = EventReceiver(host="127.0.0.1", port=0)
+    yield receiver
+    receiver.stop()
+
+
+@pytest.fixture
+def client(mock_idrac_config):
+    return IDracClient(mock_idrac_config)
+
+
+@pytest.fixture
+def bmc(client):
+    fake = FakeBMC(client)
+    with patch.object(client.session, "request", side_effect=fake):
+        yield fake
+
+
+@pytest.fixture
+def ingest(receiver):
+    return EventIngest(receiver, "127.0.0.1")
+
+
+class TestClassification:
+    """Test cases for event categories."""
+
+    @pytest.mark.parametrize("event, category", [
+        (_event("IDRAC.2.9.SYS1003", message="System CPU Resetting."), "power"),
+        (_event("IDRAC.2.9.PSU0003", severity="Critical"), "power"),
+        (_event("IDRAC.2.9.JCP037"), "lifecycle"),
+        (_event("IDRAC.2.9.SUP0518"), "lifecycle"),
+        (_event("IDRAC.2.9.TMP0118", severity="Warning"), "alert"),
+        (_event("IDRAC.2.9.USR0030", event_type="StatusChange"), "other"),
+    ])
+    def test_classify_event(self, event, category):
+        assert classify_event(event) == category
+
+
+class TestEventReceiver:
+    """Test cases for the listener."""
+
+    def _url(self, receiver, path=None):
+        return f"http://127.0.0.1:{receiver.port}{path or receiver.path}"
+
+    def test_unknown_context_is_rejected(self, receiver):
+        receiver.start()
+        receiver.register("server1")
+        payload = {"Context": "guess", "Events": [_event("IDRAC.2.9.SYS1003")]}
+        response = requests.post(self._url(receiver), json=payload, timeout=5)
+
+        assert response.status_code == 403
+        assert receiver.recent_events() == []
+
+    def test_invalid_requests(self, receiver):
+        receiver.start()
+        context = receiver.register("server1")
+        url = self._url(receiver)
+
+        assert requests.post(url, data=b"not json", timeout=5).status_code == 400
+        assert requests.post(url, json={"Context": context}, timeout=5).status_code == 400
+        assert requests.post(self._url(receiver, "/other"), json={"Context": context, "Events": []},
+                             timeout=5).status_code == 404
+        assert requests.post(url, data=b"x" * (MAX_EVENT_BODY_BYTES + 1), timeout=5).status_code == 413
+
+    def test_feed_is_bounded_and_newest_first(self):
+        receiver = EventReceiver(max_events=3)
+        context = receiver.register("server1")
+        for index in range(5):
+            body = json.dumps({"Context": context, "Events": [_event(f"IDRAC.2.9.LC{index:04d}")]})
+            assert receiver.ingest(receiver.path, body.encode()) == 204
+
+        assert [e["message_id"] for e in receiver.recent_events()] == [
+            "IDRAC.2.9.LC0004", "IDRAC.2.9.LC0003", "IDRAC.2.9.LC0002"
+        ]
+
+    def test_tls_listener(self, tmp_path):
+        x509 = pytest.importorskip("cryptography.x509")
+        from cryptography.hazmat.primitives import hashes, serialization
+        from cryptography.hazmat.primitives.asymmetric import ec
+
+        key = ec.generate_private_key(ec.SECP256R1())
+        name = x509.Name([x509.NameAttribute(x509.NameOID.COMMON_NAME, "localhost")])
+        now = datetime.datetime.now(datetime.timezone.utc)
+        cert = (x509.CertificateBuilder().subject_name(name).issuer_name(name).public_key(key.public_key())
+                .serial_number(x509.random_serial_number()).not_valid_before(now)
+                .not_valid_after(now + datetime.timedelta(days=1)).sign(key, hashes.SHA256()))
+        certfile, keyfile = tmp_path / "listener.pem", tmp_path / "listener.key"
+        certfile.write_bytes(cert.public_bytes(serialization.Encoding.PEM))
+        keyfile.write_bytes(key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                                              serialization.NoEncryption()))
+
+        receiver = EventReceiver(host="127.0.0.1", port=0, certfile=str(certfile), keyfile=str(keyfile))
+        receiver.start()
+        try:
+            context = receiver.register("server1")
+            payload = {"Context": context, "Events": [_event("IDRAC.2.9.SYS1003")]}
+            response = requests.post(f"https://127.0.0.1:{receiver.port}{receiver.path}", json=payload,
+                                     verify=False, timeout=5)
+        finally:
+            receiver.stop()
+
+        assert receiver.scheme == "https"
+        assert response.status_code == 204
+        assert receiver.recent_events()[0]["category"] == "power"
+
+
+class TestEventIngest:
+    """Test cases for subscriptions and cache invalidation."""
+
+    def test_subscribes_and_invalidates_cache(self, client, bmc, ingest):
+        results = ingest.start({"server1": client})
+
+        assert results["server1"]["status"] == "success"
+        subscription = bmc.subscriptions[results["server1"]["subscription"]]
+        assert subscription["Destination"] == ingest.destination
+        assert subscription["EventTypes"] == ["Alert"]
+
+        with patch.object(client, "invalidate_cache") as invalidate:
+            assert bmc.post(_event("IDRAC.2.9.SYS1003", message="System CPU Resetting.")) == [204]
+            invalidate.assert_called_once_with()
+            assert bmc.post(_event("IDRAC.2.9.USR0030", event_type="StatusChange")) == [204]
+            invalidate.assert_called_once_with()
+
+        events = ingest.receiver.recent_events(server_id="server1")
+        assert [e["category"] for e in events] == ["other", "power"]
+        assert events[1]["message"] == "System CPU Resetting."
+        assert events[1]["origin"] == "/redfish/v1/Systems/System.Embedded.1"
+        assert ingest.receiver.recent_events(category="power", limit=5) == events[1:]
+        assert ingest.receiver.recent_events(server_id="server2") == []
+
+    def test_stale_subscription_is_replaced(self, client, bmc, ingest):
+        ingest.start({"server1": client})
+        old_context = next(iter(bmc.subscriptions.values()))["Context"]
+        ingest.subscribe("server1", client)
+
+        assert bmc.deleted == [f"{EVENT_SUBSCRIPTIONS_ENDPOINT}/1"]
+        assert list(bmc.subscriptions) == [f"{EVENT_SUBSCRIPTIONS_ENDPOINT}/2"]
+        assert bmc.post(_event("IDRAC.2.9.SYS1003"), context=old_context) == [403]
+
+    def test_failed_subscription(self, client, bmc, ingest):
+        bmc.reject_subscription = True
+        results = ingest.start({"server1": client})
+
+        assert results["server1"]["status"] == "error"
+        assert "HTTP 400" in results["server1"]["error"]
+        assert ingest.status()["subscribed_servers"] == []
+
+    def test_stop_deletes_subscriptions(self, client, bmc, ingest):
+        ingest.start({"server1": client})
+        destination = ingest.destination
+        ingest.stop()
+
+        assert bmc.subscriptions == {}
+        assert bmc.deleted == [f"{EVENT_SUBSCRIPTIONS_ENDPOINT}/1"]
+        with pytest.raises(requests.ConnectionError):
+            requests.post(destination, json={"Context": "x", "Events": []}, timeout=5)
+
+    def test_absolute_location_is_deleted(self, client, bmc, ingest):
+        """An absolute Location header is stored as a path, so stop() can delete it."""
+        bmc.absolute_location = True
+        results = ingest.start({"server1": client})
+        ingest.stop()
+
+        assert results["server1"]["subscription"] == f"{EVENT_SUBSCRIPTIONS_ENDPOINT}/1"
+        assert bmc.subscriptions == {}
+
+    def test_stop_waits_for_background_subscribing(self, client, bmc, ingest):
+        """A subscription that completes after stop() began is deleted, not leaked."""
+        bmc.hold = threading.Event()
+        ingest.start_background({"server1": client})
+        assert bmc.posting.wait(5)
+
+        stopper = threading.Thread(target=ingest.stop)
+        stopper.start()
+        assert _wait_for(ingest._stopping.is_set)
+        bmc.hold.set()
+        stopper.join(5)
+
+        assert not stopper.is_alive()
+        assert bmc.created == 1
+        assert bmc.subscriptions == {}
+        assert ingest.status()["subscribed_servers"] == []
+        assert ingest.subscribe("server1", client)["status"] == "error"
+        assert bmc.created == 1
+
+
+class TestEventTool:
+    """Test cases for the get_recent_events tool."""
+
+    def test_disabled_by_default(self, mock_multi_server_config):
+        from working_mcp_server import WorkingIDracMCPServer
+
+        server = WorkingIDracMCPServer(mock_multi_server_config)
+        result = server._call_tool("get_recent_events", {})
+
+        assert server.event_ingest is None
+        assert result["isError"] is True
+        assert "not enabled" in result["content"][0]["text"]
+
+    def test_missing_destination_host(self, mock_multi_server_config):
+        from working_mcp_server import WorkingIDracMCPServer
+
+        with pytest.raises(ValueError, match="destination_host"):
+            WorkingIDracMCPServer(dict(mock_multi_server_config, events={"enabled": True}))
+
+    def test_query(self, mock_multi_server_config):
+        from working_mcp_server import WorkingIDracMCPServer
+
+        server = WorkingIDracMCPServer(mock_multi_server_config)
+        server.event_ingest = EventIngest(EventReceiver(), "10.0.0.5")
+        receiver = server.event_ingest.receiver
+        for server_id, message_id in [("server1", "IDRAC.2.9.SYS1003"), ("server2", "IDRAC.2.9.SYS1003"),
+                                      ("server1", "IDRAC.2.9.JCP037")]:
+            context = receiver.register(server_id)
+            body = json.dumps({"Context": context, "Events": [_event(message_id)]}).encode()
+            assert receiver.ingest(receiver.path, body) == 204
+
+        result = server._call_tool("get_recent_events", {"server_id": "server1", "category": "power"})
+        data = json.loads(result["content"][0]["text"])
+        assert data["destination"] == "http://10.0.0.5:8443/redfish/events"
+        assert data["count"] == 1
+        assert data["events"][0]["server_id"] == "server1"
+
+        assert server._call_tool("get_recent_events", {"limit": 0})["isError"] is True
+        assert server._call_tool("get_recent_events", {"category": "thermal"})["isError"] is True
+        assert server._call_tool("get_recent_events", {"server_id": "missing"})["isError"] is True
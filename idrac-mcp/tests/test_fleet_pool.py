@@ -0,0 +1,232 @@
+"""Tests for concurrent fleet operations on pooled iDRAC clients."""
+
+import io
+import json
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+
+from src.fleet_output import write_ndjson
+from src.fleet_pool import FleetClientPool, fleet_power_status, fleet_test_connection
+from src.multi_server_manager import MultiServerManager
+
+# Blocking time of one fake BMC call
+CALL_SECONDS = 0.1
+
+
+class FakeFleet:
+    """Counts clients and concurrent calls; servers named 'dead-*' hang."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.created = []
+        self.closed = []
+        self.active = 0
+        self.peak = 0
+        self.release = threading.Event()
+
+    def client(self, config):
+        fleet = self
+
+        class FakeClient:
+            host = config["host"]
+
+            def _call(self, result):
+                with fleet.lock:
+                    fleet.active += 1
+                    fleet.peak = max(fleet.peak, fleet.active)
+                try:
+                    if self.host.startswith("dead"):
+                        fleet.release.wait(5)
+                    time.sleep(CALL_SECONDS)
+                    return result
+                finally:
+                    with fleet.lock:
+                        fleet.active -= 1
+
+            def test_connection(self):
+                return self._call({"status": "connected", "host": self.host})
+
+            def get_power_status(self):
+                return self._call({"host": self.host, "power_status": "On", "power_info": {"power_supplies": 2}})
+
+            def close(self):
+                fleet.closed.append(self.host)
+
+        with self.lock:
+            self.created.append(config["host"])
+        return FakeClient()
+
+
+@pytest.fixture
+def fleet():
+    fake = FakeFleet()
+    with patch("src.fleet_pool.IDracClient", side_effect=fake.client):
+        yield fake
+    fake.release.set()
+
+
+def _manager(tmp_path, count, dead=0, **kwargs):
+    servers = {
+        f"server{i:03d}": {
+            "host": f"dead-{i}" if i < dead else f"10.0.0.{i}",
+            "port": 443, "protocol": "https", "username": "root", "password": "x",
+            "ssl_verify": False, "enabled": True,
+        }
+        for i in range(count)
+    }
+    config_file = tmp_path / "servers.json"
+    config_file.write_text(json.dumps({"servers": servers}))
+    return MultiServerManager(str(config_file), **kwargs)
+
+
+class TestFleetClientPool:
+    """Test cases for the client pool."""
+
+    def test_invalid_limits(self):
+        with pytest.raises(ValueError):
+            FleetClientPool(max_concurrency=0)
+        with pytest.raises(ValueError):
+            FleetClientPool(server_timeout=0)
+
+    async def test_unknown_server_is_an_error(self, fleet):
+        pool = FleetClientPool()
+        results = await pool.run(["missing"], lambda name: None, fleet_test_connection)
+
+        assert results["missing"] == {"status": "error", "server": "missing", "message": "Server 'missing' not found"}
+        pool.close()
+
+    async def test_operation_errors_are_results(self, fleet):
+        def failing(name, client):
+            raise RuntimeError("HTTP 500")
+
+        pool = FleetClientPool()
+        results = await pool.run(["a"], lambda name: {"host": "10.0.0.1"}, failing)
+
+        assert results["a"]["status"] == "error"
+        assert results["a"]["message"] == "HTTP 500"
+        pool.close()
+
+
+class TestFleetSweeps:
+    """Test cases for concurrent manager sweeps."""
+
+    async def test_sweep_runs_concurrently_within_limit(self, tmp_path, fleet):
+        manager = _manager(tmp_path, 40, max_concurrency=10)
+        started = time.monotonic()
+        results = await manager.get_fleet_power_status()
+        elapsed = time.monotonic() - started
+
+        assert len(results) == 40
+        assert all(r == {"status": "success", "data": {"power_state": "On", "power_supplies": 2}}
+                   for r in results.values())
+        assert fleet.peak == 10
+        # Serial execution would take 40 * CALL_SECONDS (4s)
+        assert elapsed < 40 * CALL_SECONDS / 4
+        manager.close()
+
+    async def test_clients_are_reused(self, tmp_path, fleet):
+        manager = _manager(tmp_path, 5)
+        await manager.test_all_servers()
+        await manager.get_fleet_power_status()
+
+        assert len(fleet.created) == 5
+        manager.close()
+        assert sorted(fleet.closed) == sorted(fleet.created)
+
+    async def test_dead_server_does_not_stall_sweep(self, tmp_path, fleet):
+        manager = _manager(tmp_path, 6, dead=1, server_timeout=0.5)
+        started = time.monotonic()
+        results = await manager.test_all_servers()
+
+        assert time.monotonic() - started < 2
+        assert results["server000"]["status"] == "error"
+        assert "within 0.5s" in results["server000"]["message"]
+        assert all(results[f"server{i:03d}"]["status"] == "success" for i in range(1, 6))
+        manager.close()
+
+    async def test_config_changes_drop_client(self, tmp_path, fleet):
+        manager = _manager(tmp_path, 2)
+        await manager.test_all_servers()
+        manager.disable_server("server001")
+        results = await manager.test_all_servers()
+
+        assert list(results) == ["server000"]
+        assert fleet.closed == ["10.0.0.1"]
+        assert (await manager.test_server("server001"))["message"] == "Server 'server001' is disabled"
+        manager.close()
+
+    def test_power_status_error(self):
+        class Client:
+            def get_power_status(self):
+                return {"host": "10.0.0.1", "power_status": "unknown", "error": "Failed to get power status: HTTP 503"}
+
+        with pytest.raises(RuntimeError, match="HTTP 503"):
+            fleet_power_status("a", Client())
+
+
+class TestFleetStreaming:
+    """Test cases for streamed sweeps and NDJSON output."""
+
+    async def test_results_stream_in_completion_order(self, tmp_path, fleet):
+        manager = _manager(tmp_path, 4, dead=1, server_timeout=0.5)
+        names = [name async for name, _ in manager.stream_fleet("test")]
+
+        # The hung server finishes last
+        assert sorted(names) == ["server000", "server001", "server002", "server003"]
+        assert names[-1] == "server000"
+        manager.close()
+
+    async def test_stream_consumes_names_lazily(self, fleet):
+        taken = []
+
+        def names():
+            for i in range(20):
+                taken.append(i)
+                yield f"server{i:03d}"
+
+        pool = FleetClientPool(max_concurrency=4)
+        stream = pool.stream(names(), lambda name: {"host": name}, fleet_test_connection)
+        await stream.__anext__()
+
+        # Workers hold at most one name each, plus a bounded backlog of results
+        assert len(taken) <= 4 * 2 + 1
+        await stream.aclose()
+        pool.close()
+
+    async def test_unknown_operation(self, tmp_path, fleet):
+        manager = _manager(tmp_path, 1)
+        with pytest.raises(ValueError):
+            manager.stream_fleet("reboot")
+
+    async def test_write_ndjson(self, tmp_path, fleet):
+        manager = _manager(tmp_path, 3, dead=1, server_timeout=0.5)
+        out, progress = io.StringIO(), io.StringIO()
+        summary = await write_ndjson(manager.stream_fleet("power"), 3, out=out, progress=progress)
+
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert summary == {"success": 2, "error": 1}
+        assert {r["server"]: r["status"] for r in records} == {
+            "server000": "error", "server001": "success", "server002": "success"
+        }
+        assert progress.getvalue().endswith("[3/3] 2 ok, 1 failed\n")
+        manager.close()
+
+    def test_cli_ndjson_output(self, tmp_path, fleet):
+        from fleet_cli import cli
+
+        config_file = _manager(tmp_path, 3).config_file
+        # The CLI imports the pool module from src/ directly
+        with patch("fleet_pool.IDracClient", side_effect=fleet.client):
+            result = CliRunner().invoke(cli, ["--config", str(config_file), "--output", "ndjson", "power"])
+
+        assert result.exit_code == 0
+        # stdout holds only the records; status messages and progress go to stderr
+        records = [json.loads(line) for line in result.stdout.splitlines()]
+        assert sorted(r["server"] for r in records) == ["server000", "server001", "server002"]
+        assert all(r["data"]["power_state"] == "On" for r in records)
+        assert "Loaded 3 servers" in result.stderr
+        assert "3 ok, 0 failed" in result.stderr
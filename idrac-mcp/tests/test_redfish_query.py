@@ -0,0 +1,184 @@
+"""Tests for $expand/$select collection queries and the concurrent fallback."""
+
+import json
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.idrac_client import IDracClient, FIRMWARE_INVENTORY_ENDPOINT, SYSTEM_ENDPOINT
+
+
+def _firmware(index):
+    return {
+        "@odata.id": f"{FIRMWARE_INVENTORY_ENDPOINT}/Installed-{index}",
+        "Id": f"Installed-{index}",
+        "Name": f"Component {index}",
+        "Version": f"1.{index}.0",
+        "Updateable": True,
+        "ReleaseDate": "2024-01-01T00:00:00Z",
+    }
+
+
+class FakeRedfish:
+    """Firmware inventory of 12 components; query support is configurable."""
+
+    def __init__(self, expand=True, select=True, delay=0.0):
+        self.features = {}
+        if expand:
+            self.features["ExpandQuery"] = {"ExpandAll": True, "Levels": True, "MaxLevels": 1}
+        if select:
+            self.features["SelectQuery"] = True
+        self.members = [_firmware(i) for i in range(12)]
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.urls = []
+        self.active = 0
+        self.peak = 0
+        self.reject_expand = False
+        self.missing = set()
+
+    def _response(self, status, body=None):
+        response = Mock()
+        response.status_code = status
+        response.headers = {}
+        response.cookies = {}
+        response.json.return_value = body or {}
+        return response
+
+    def __call__(self, url, **kwargs):
+        path = url.split(":443", 1)[1]
+        with self.lock:
+            self.urls.append(path)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay)
+            return self._route(path)
+        finally:
+            with self.lock:
+                self.active -= 1
+
+    def _route(self, path):
+        endpoint, _, query = path.partition("?")
+        if endpoint == "/redfish/v1/":
+            return self._response(200, {"ProtocolFeaturesSupported": self.features})
+        if endpoint == FIRMWARE_INVENTORY_ENDPOINT:
+            if query and self.reject_expand:
+                return self._response(400)
+            if "$expand" in query:
+                members = self.members
+                if "$select=" in query:
+                    keep = set(query.split("$select=")[1].split(",")) | {"@odata.id"}
+                    members = [{k: v for k, v in m.items() if k in keep} for m in members]
+                return self._response(200, {"Members": members})
+            return self._response(200, {"Members": [{"@odata.id": m["@odata.id"]} for m in self.members]})
+        for member in self.members:
+            if member["@odata.id"] == endpoint and endpoint not in self.missing:
+                return self._response(200, member)
+        return self._response(404)
+
+
+@pytest.fixture
+def client(mock_idrac_config):
+    return IDracClient(mock_idrac_config)
+
+
+def _serve(client, fake):
+    return patch.object(client.session, "get", side_effect=fake)
+
+
+class TestCollectionQuery:
+    """Test cases for get_collection."""
+
+    def test_expand_and_select_in_one_request(self, client):
+        fake = FakeRedfish()
+        with _serve(client, fake):
+            members = client.get_collection(FIRMWARE_INVENTORY_ENDPOINT, select=["Id", "Version"])
+
+        assert fake.urls == [
+            "/redfish/v1/",
+            f"{FIRMWARE_INVENTORY_ENDPOINT}?$expand=*($levels=1)&$select=Id,Version",
+        ]
+        assert len(members) == 12
+        assert set(members[0]) == {"@odata.id", "Id", "Version"}
+
+    def test_protocol_features_are_read_once(self, client):
+        fake = FakeRedfish()
+        with _serve(client, fake):
+            client.get_collection(FIRMWARE_INVENTORY_ENDPOINT)
+            client.get_collection(FIRMWARE_INVENTORY_ENDPOINT)
+
+        assert fake.urls.count("/redfish/v1/") == 1
+
+    def test_expand_without_select_is_projected_locally(self, client):
+        fake = FakeRedfish(select=False)
+        with _serve(client, fake):
+            members = client.get_collection(FIRMWARE_INVENTORY_ENDPOINT, select=["Version"])
+
+        assert fake.urls[-1] == f"{FIRMWARE_INVENTORY_ENDPOINT}?$expand=*($levels=1)"
+        assert set(members[0]) == {"@odata.id", "Version"}
+
+    def test_fallback_fetches_members_concurrently(self, client):
+        fake = FakeRedfish(expand=False, select=False, delay=0.05)
+        with _serve(client, fake):
+            started = time.monotonic()
+            members = client.get_collection(FIRMWARE_INVENTORY_ENDPOINT, select=["Id", "Version"])
+            elapsed = time.monotonic() - started
+
+        assert [m["Id"] for m in members] == [f"Installed-{i}" for i in range(12)]
+        assert len(fake.urls) == 14
+        assert fake.peak == 4
+        # One by one would take 14 * 0.05s
+        assert elapsed < 0.5
+
+    def test_rejected_expand_falls_back(self, client):
+        fake = FakeRedfish()
+        fake.reject_expand = True
+        with _serve(client, fake):
+            members = client.get_collection(FIRMWARE_INVENTORY_ENDPOINT)
+
+        assert len(members) == 12
+        assert fake.urls[2] == FIRMWARE_INVENTORY_ENDPOINT
+
+    def test_failing_member_is_skipped(self, client):
+        fake = FakeRedfish(expand=False)
+        fake.missing = {fake.members[3]["@odata.id"]}
+        with _serve(client, fake):
+            members = client.get_collection(FIRMWARE_INVENTORY_ENDPOINT)
+
+        assert len(members) == 11
+
+
+class TestInventory:
+    """Test cases for the inventory methods and tools."""
+
+    def test_firmware_versions(self, client):
+        with _serve(client, FakeRedfish()):
+            result = client.get_firmware_versions()
+
+        assert result["firmware"][0] == {
+            "@odata.id": f"{FIRMWARE_INVENTORY_ENDPOINT}/Installed-0",
+            "Id": "Installed-0", "Name": "Component 0", "Version": "1.0.0", "Updateable": True,
+        }
+        assert "successfully" in result["message"]
+
+    def test_inventory_error(self, client):
+        with _serve(client, FakeRedfish()):
+            result = client.get_hardware_inventory()
+
+        assert f"{SYSTEM_ENDPOINT}/Processors: HTTP 404" in result["error"]
+
+    def test_tool_dispatch(self, mock_multi_server_config):
+        from working_mcp_server import WorkingIDracMCPServer
+
+        server = WorkingIDracMCPServer(mock_multi_server_config)
+        with patch.object(server.idrac_clients["server1"], "get_network_config",
+                          return_value={"host": "192.168.1.100", "interfaces": []}) as method:
+            result = server._call_tool("get_network_config", {"server_id": "server1"})
+
+        method.assert_called_once_with()
+        assert json.loads(result["content"][0]["text"])["interfaces"] == []
+        assert {"get_hardware_inventory", "get_storage_controllers", "get_firmware_versions",
+                "get_network_config"} <= {tool["name"] for tool in server.tools}
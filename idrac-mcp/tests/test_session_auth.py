@@ -0,0 +1,140 @@
+"""Tests for Redfish SessionService (X-Auth-Token) authentication."""
+
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.exceptions import IDracAuthenticationError
+from src.idrac_client import IDracClient, REDFISH_SESSIONS_ENDPOINT
+
+
+class FakeRedfish:
+    """Stands in for the iDRAC: issues session tokens and checks them on every request."""
+
+    def __init__(self, client):
+        self.client = client
+        self.lock = threading.Lock()
+        self.logins = 0
+        self.sessions = {}
+        self.deleted = []
+        self.requests = []
+        self.reject_login = False
+
+    def _response(self, status, headers=None, body=None):
+        response = Mock()
+        response.status_code = status
+        response.headers = headers or {}
+        response.cookies = {}
+        response.json.return_value = body or {}
+        return response
+
+    def expire_all(self):
+        self.sessions.clear()
+
+    def __call__(self, method, url, **kwargs):
+        path = url.replace(self.client.base_url, "")
+        with self.lock:
+            self.requests.append((method, path, self.client.session.auth))
+            if method == "POST" and path == REDFISH_SESSIONS_ENDPOINT:
+                if self.reject_login:
+                    return self._response(401)
+                time.sleep(0.05)
+                self.logins += 1
+                token = f"token-{self.logins}"
+                uri = f"{REDFISH_SESSIONS_ENDPOINT}/{self.logins}"
+                self.sessions[token] = uri
+                return self._response(201, {"X-Auth-Token": token, "Location": uri})
+
+            if self.client.session.headers.get("X-Auth-Token") not in self.sessions:
+                return self._response(401)
+            if method == "DELETE" and path.startswith(REDFISH_SESSIONS_ENDPOINT):
+                self.deleted.append(path)
+                self.sessions = {t: u for t, u in self.sessions.items() if u != path}
+                return self._response(200)
+            return self._response(200, body={"PowerState": "On"})
+
+
+@pytest.fixture
+def client(mock_idrac_config):
+    return IDracClient(dict(mock_idrac_config, auth_mode="session"))
+
+
+@pytest.fixture
+def bmc(client):
+    fake = FakeRedfish(client)
+    with patch.object(client.session, "request", side_effect=fake):
+        yield fake
+
+
+class TestSessionAuth:
+    """Test cases for session login, reuse, renewal and logout."""
+
+    def test_basic_is_the_default(self, mock_idrac_config):
+        client = IDracClient(mock_idrac_config)
+
+        assert client.auth_mode == "basic"
+        assert client.session.auth is not None
+
+    def test_invalid_auth_mode(self, mock_idrac_config):
+        with pytest.raises(ValueError):
+            IDracClient(dict(mock_idrac_config, auth_mode="token"))
+        with pytest.raises(ValueError):
+            IDracClient(host="10.0.0.1", port=443, protocol="https", username="root",
+                        password="x", auth_mode="token")
+
+    def test_logs_in_once_and_reuses_token(self, client, bmc):
+        for _ in range(3):
+            assert client.get_power_status()["power_status"] == "On"
+
+        assert bmc.logins == 1
+        login = bmc.requests[0]
+        assert login[:2] == ("POST", REDFISH_SESSIONS_ENDPOINT)
+        # No request carries Basic credentials
+        assert all(auth is None for _, _, auth in bmc.requests)
+
+    def test_expired_session_is_recreated(self, client, bmc):
+        client.get_power_status()
+        bmc.expire_all()
+
+        assert client.get_power_status()["power_status"] == "On"
+        assert bmc.logins == 2
+
+    def test_expired_session_retries_actions(self, client, bmc):
+        client.get_power_status()
+        bmc.expire_all()
+
+        assert client.power_on()["status"] == "success"
+        posts = [path for method, path, _ in bmc.requests if method == "POST" and "Reset" in path]
+        assert len(posts) == 2
+
+    def test_concurrent_requests_share_one_login(self, client, bmc):
+        threads = [threading.Thread(target=client.get_power_status) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert bmc.logins == 1
+
+    def test_rejected_login(self, client, bmc):
+        bmc.reject_login = True
+
+        with pytest.raises(IDracAuthenticationError):
+            client._make_request("GET", "/redfish/v1/")
+        assert client.test_connection()["status"] == "error"
+
+    def test_close_deletes_session(self, client, bmc):
+        client.get_power_status()
+        session = client.session
+        client.close()
+
+        assert bmc.deleted == [f"{REDFISH_SESSIONS_ENDPOINT}/1"]
+        assert "X-Auth-Token" not in session.headers
+        assert client.session is None
+
+    def test_close_without_session_sends_nothing(self, client, bmc):
+        client.close()
+
+        assert bmc.requests == []
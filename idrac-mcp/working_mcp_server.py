@@ -20,6 +20,14 @@ from src.idrac_client import (
     redact_sensitive_headers,
     DEFAULT_REQUEST_TIMEOUT_SECONDS,
 )
+from src.event_service import (
+    EventIngest,
+    EventReceiver,
+    EVENT_CATEGORIES,
+    DEFAULT_EVENT_LISTEN_HOST,
+    DEFAULT_EVENT_LISTEN_PORT,
+    DEFAULT_MAX_EVENTS,
+)
 
 # Check for --version flag before any other imports that might fail
 if len(sys.argv) > 1 and sys.argv[1] in ('--version', '-v'):
@@ -178,7 +186,8 @@ class WorkingIDracMCPServer:
                 "protocol": server_config.get("protocol", "https"),
                 "username": server_config["username"],
                 "password": server_config["password"],
-                "ssl_verify": server_config.get("ssl_verify", False)
+                "ssl_verify": server_config.get("ssl_verify", False),
+                "auth_mode": server_config.get("auth_mode", "basic")
             }
             
             debug_print(f"Configured server '{server_id}': {self.servers[server_id]['name']} at {self.servers[server_id]['protocol']}://{self.servers[server_id]['host']}:{self.servers[server_id]['port']}")
@@ -215,9 +224,16 @@ class WorkingIDracMCPServer:
                 protocol=server_config["protocol"],
                 username=server_config["username"],
                 password=server_config["password"],
-                ssl_verify=server_config["ssl_verify"]
+                ssl_verify=server_config["ssl_verify"],
+                auth_mode=server_config["auth_mode"]
             )
         
+        # Optional Redfish event ingest (config section "events")
+        self.event_ingest: Optional[EventIngest] = None
+        events_config = config.get('events') or {}
+        if events_config.get('enabled', False):
+            self.event_ingest = self._start_event_ingest(events_config)
+        
         self.tools = [
             {
                 "name": "list_servers",
@@ -303,6 +319,127 @@ class WorkingIDracMCPServer:
                     "additionalProperties": False
                 }
             },
+            {
+                "name": "get_hardware_inventory",
+                "description": (
+                    "Get processor and memory inventory.\n\n"
+                    "Returns per-component details:\n"
+                    "- Processors: model, cores, threads, speed, health\n"
+                    "- Memory modules: capacity, type, speed, part number, health\n\n"
+                    "Example: Query the default server:\n"
+                    '  {}'
+                ),
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {
+                        "server_id": {
+                            "type": "string",
+                            "description": "ID of the server to query (optional, uses default if not specified)"
+                        }
+                    },
+                    "required": [],
+                    "additionalProperties": False
+                }
+            },
+            {
+                "name": "get_storage_controllers",
+                "description": (
+                    "Get storage subsystems and controllers.\n\n"
+                    "Returns each storage subsystem with:\n"
+                    "- Its controllers (model, firmware, health)\n"
+                    "- Links to the attached drives\n\n"
+                    "Example: Query the default server:\n"
+                    '  {}'
+                ),
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {
+                        "server_id": {
+                            "type": "string",
+                            "description": "ID of the server to query (optional, uses default if not specified)"
+                        }
+                    },
+                    "required": [],
+                    "additionalProperties": False
+                }
+            },
+            {
+                "name": "get_firmware_versions",
+                "description": (
+                    "Get installed firmware versions.\n\n"
+                    "Returns name, version and updateability of every\n"
+                    "component in the firmware inventory (BIOS, iDRAC, NICs, RAID, ...).\n\n"
+                    "Example: Query the default server:\n"
+                    '  {}'
+                ),
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {
+                        "server_id": {
+                            "type": "string",
+                            "description": "ID of the server to query (optional, uses default if not specified)"
+                        }
+                    },
+                    "required": [],
+                    "additionalProperties": False
+                }
+            },
+            {
+                "name": "get_network_config",
+                "description": (
+                    "Get the server's Ethernet interfaces.\n\n"
+                    "Returns MAC address, link status, speed and IPv4/IPv6\n"
+                    "addresses of every system Ethernet interface.\n\n"
+                    "Example: Query the default server:\n"
+                    '  {}'
+                ),
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {
+                        "server_id": {
+                            "type": "string",
+                            "description": "ID of the server to query (optional, uses default if not specified)"
+                        }
+                    },
+                    "required": [],
+                    "additionalProperties": False
+                }
+            },
+            {
+                "name": "get_recent_events",
+                "description": (
+                    "Get recent events pushed by the iDRACs (newest first).\n\n"
+                    "Requires event ingest to be enabled (\"events\" in config.json).\n"
+                    "Events are categorized as:\n"
+                    "- power: power state changes and power supply events\n"
+                    "- lifecycle: Lifecycle Controller, job and update events\n"
+                    "- alert: other warnings and critical alerts\n\n"
+                    "Example: Power events of one server:\n"
+                    '  {"server_id": "server1", "category": "power"}'
+                ),
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {
+                        "server_id": {
+                            "type": "string",
+                            "description": "Only events of this server (optional, all servers if not specified)"
+                        },
+                        "category": {
+                            "type": "string",
+                            "enum": list(EVENT_CATEGORIES),
+                            "description": "Only events of this category (optional)"
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "minimum": 1,
+                            "maximum": DEFAULT_MAX_EVENTS,
+                            "description": "Maximum number of events (default: 50)"
+                        }
+                    },
+                    "required": [],
+                    "additionalProperties": False
+                }
+            },
             {
                 "name": "power_on",
                 "description": (
@@ -413,12 +550,70 @@ class WorkingIDracMCPServer:
         ]
         debug_print(f"Created {len(self.tools)} tools")
 
+    def _start_event_ingest(self, events_config: Dict[str, Any]) -> EventIngest:
+        """Start the event listener and subscribe all servers in the background.
+
+        Raises:
+            ValueError: If destination_host is missing
+            OSError: If the listener cannot be started
+        """
+        destination_host = events_config.get("destination_host")
+        if not destination_host:
+            raise ValueError("'events.destination_host' is required when event ingest is enabled")
+
+        receiver = EventReceiver(
+            host=events_config.get("listen_host", DEFAULT_EVENT_LISTEN_HOST),
+            port=int(events_config.get("listen_port", DEFAULT_EVENT_LISTEN_PORT)),
+            certfile=events_config.get("certfile"),
+            keyfile=events_config.get("keyfile"),
+        )
+        ingest = EventIngest(receiver, destination_host, events_config.get("event_types"))
+        # Subscribing makes requests to every iDRAC; don't hold up the MCP handshake
+        ingest.start_background(self.idrac_clients)
+        return ingest
+
+    def _get_recent_events(self, arguments: Dict[str, Any]) -> tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Query the recent-event feed; returns (result, error_response)."""
+        if self.event_ingest is None:
+            return None, self._create_error_response(
+                "Error: Event ingest is not enabled. Set \"events\": {\"enabled\": true, ...} in config.json."
+            )
+
+        server_id = None
+        if "server_id" in arguments:
+            server_id, error = self._validate_and_get_server_id(arguments)
+            if error:
+                return None, error
+
+        category = arguments.get("category")
+        if category is not None and category not in EVENT_CATEGORIES:
+            return None, self._create_error_response(
+                f"Error: category must be one of: {', '.join(EVENT_CATEGORIES)}"
+            )
+
+        limit = arguments.get("limit", 50)
+        if isinstance(limit, bool) or not isinstance(limit, int) or not 1 <= limit <= DEFAULT_MAX_EVENTS:
+            return None, self._create_error_response(
+                f"Error: limit must be an integer between 1 and {DEFAULT_MAX_EVENTS}"
+            )
+
+        events = self.event_ingest.receiver.recent_events(server_id=server_id, category=category, limit=limit)
+        return {**self.event_ingest.status(), "count": len(events), "events": events}, None
+
     def cleanup(self) -> None:
         """Clean up all iDRAC client sessions.
 
         Should be called during server shutdown to properly release resources
         (file descriptors, TCP connections) for all managed iDRAC clients.
+        Event subscriptions are deleted first, while the clients are still open.
         """
+        if self.event_ingest is not None:
+            try:
+                self.event_ingest.stop()
+            except Exception as e:
+                debug_print(f"Error stopping event ingest: {e}")
+            self.event_ingest = None
+
         debug_print("Cleaning up iDRAC client sessions...")
         for server_id, client in self.idrac_clients.items():
             try:
@@ -489,6 +684,30 @@ class WorkingIDracMCPServer:
                 if error:
                     return error
                 result = self.idrac_clients[server_id].get_power_status()
+            elif name == "get_hardware_inventory":
+                server_id, error = self._validate_and_get_server_id(arguments)
+                if error:
+                    return error
+                result = self.idrac_clients[server_id].get_hardware_inventory()
+            elif name == "get_storage_controllers":
+                server_id, error = self._validate_and_get_server_id(arguments)
+                if error:
+                    return error
+                result = self.idrac_clients[server_id].get_storage_controllers()
+            elif name == "get_firmware_versions":
+                server_id, error = self._validate_and_get_server_id(arguments)
+                if error:
+                    return error
+                result = self.idrac_clients[server_id].get_firmware_versions()
+            elif name == "get_network_config":
+                server_id, error = self._validate_and_get_server_id(arguments)
+                if error:
+                    return error
+                result = self.idrac_clients[server_id].get_network_config()
+            elif name == "get_recent_events":
+                result, error = self._get_recent_events(arguments)
+                if error:
+                    return error
             elif name == "power_on":
                 server_id, error = self._validate_and_get_server_id(arguments)
                 if error:
@@ -5,6 +5,7 @@ __author__ = "Your Name"
 __email__ = "your.email@example.com"
 
 from .proxmox_client import ProxmoxClient
+from .async_proxmox_client import AsyncProxmoxClient
 from .auth import AuthManager
 
-__all__ = ["ProxmoxClient", "AuthManager"]
+__all__ = ["ProxmoxClient", "AsyncProxmoxClient", "AuthManager"]
@@ -0,0 +1,1051 @@
+"""Asynchronous Proxmox API client built on aiohttp.
+
+AsyncProxmoxClient mirrors the public API of the synchronous ProxmoxClient
+(same method names, arguments and return shapes) but never blocks the event
+loop, so one process can serve many concurrent callers. It is intended for
+the async resource handlers in src/resources and the HTTP server.
+
+Several clients can share one aiohttp connector (and therefore one TCP/TLS
+connection pool) by passing the same ``connector``; the client does not close
+a connector it did not create.
+
+Example usage:
+    async with AsyncProxmoxClient(
+        host="proxmox.example.com", port=8006, protocol="https",
+        username="root", password="secret", realm="pam", ssl_verify=False
+    ) as client:
+        vms = await client.list_vms()
+"""
+
+import asyncio
+import json
+import re
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import aiohttp
+
+from .exceptions import (
+    ProxmoxConnectionError,
+    ProxmoxAuthenticationError,
+    ProxmoxAPIError,
+    ProxmoxTimeoutError,
+    ProxmoxValidationError,
+    ProxmoxResourceNotFoundError,
+    ProxmoxConfigurationError
+)
+from .proxmox_client import ProxmoxClient, build_api_token, debug_print
+from .utils.resilience import (
+    create_circuit_breaker,
+    create_retry_decorator,
+    call_with_circuit_breaker_async,
+    CachedResponse,
+    DEFAULT_CACHE_TTL_SECONDS,
+)
+
+# Maximum number of per-node requests in flight during an all-nodes query
+DEFAULT_MAX_CONCURRENT_NODE_REQUESTS = 10
+
+# Errors that a single API call may raise and that are reported in result dicts
+_API_ERRORS = (ProxmoxConnectionError, ProxmoxTimeoutError, ProxmoxAuthenticationError, ProxmoxAPIError)
+
+# Disk sizes as accepted by the container/VM config models (e.g. "10G", "512M")
+_DISK_SIZE = re.compile(r'^(\d+)([KMGTP]?)$')
+_GIB_PER_UNIT = {"K": 1 / 1024 ** 2, "M": 1 / 1024, "G": 1, "": 1, "T": 1024, "P": 1024 ** 2}
+
+
+def _disk_size_gib(disk_size: str) -> Optional[float]:
+    """Convert a disk size string to GiB, or None if it is malformed."""
+    match = _DISK_SIZE.match(str(disk_size))
+    if not match:
+        return None
+    return int(match.group(1)) * _GIB_PER_UNIT[match.group(2)]
+
+
+class AsyncProxmoxClient:
+    """Asynchronous client for interacting with Proxmox VE API.
+
+    Safe for concurrent use from many tasks on the same event loop. Ticket
+    refresh is serialized with an asyncio.Lock, and all-nodes queries run in
+    parallel under a semaphore. Authentication happens lazily on the first
+    request (or explicitly via ``authenticate()``).
+
+    The client supports the async context manager protocol:
+        async with AsyncProxmoxClient(...) as client:
+            await client.list_vms()
+    """
+
+    # Maximum number of retries for VMID conflicts during VM creation
+    VMID_CONFLICT_MAX_RETRIES = ProxmoxClient.VMID_CONFLICT_MAX_RETRIES
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        protocol: str,
+        username: Optional[str],
+        password: Optional[str],
+        realm: str = "pve",
+        ssl_verify: bool = False,
+        ticket_expiry_seconds: int = 7200,
+        connector: Optional[aiohttp.BaseConnector] = None,
+        max_concurrent_node_requests: int = DEFAULT_MAX_CONCURRENT_NODE_REQUESTS,
+        api_token: Optional[str] = None
+    ):
+        """
+        Initialize the async Proxmox client.
+
+        Args:
+            host: Proxmox hostname or IP address
+            port: Proxmox API port (usually 8006)
+            protocol: Protocol to use ('https' or 'http')
+            username: Proxmox username
+            password: Proxmox password
+            realm: Authentication realm (default: "pve" for Proxmox VE)
+            ssl_verify: Whether to verify SSL certificates (default: False for self-signed)
+            ticket_expiry_seconds: Proxmox ticket expiry time in seconds (default: 7200 = 2 hours)
+            connector: Optional aiohttp connector shared with other clients.
+                If omitted, the client creates and owns its own connector.
+            max_concurrent_node_requests: Limit on parallel per-node requests
+                during all-nodes queries
+            api_token: Proxmox API token (see ProxmoxClient); skips the ticket
+                handshake, CSRF token and re-authentication
+
+        Raises:
+            ProxmoxConfigurationError: If required parameters are empty or invalid
+        """
+        # Validate required parameters
+        if not host:
+            raise ProxmoxConfigurationError("host cannot be empty")
+        if api_token:
+            api_token = build_api_token(api_token, username, realm)
+        else:
+            if not username:
+                raise ProxmoxConfigurationError("username cannot be empty")
+            if not password:
+                raise ProxmoxConfigurationError("password cannot be empty")
+        if not protocol:
+            raise ProxmoxConfigurationError("protocol cannot be empty")
+        if protocol not in ('http', 'https'):
+            raise ProxmoxConfigurationError(f"protocol must be 'http' or 'https', got '{protocol}'")
+        if max_concurrent_node_requests < 1:
+            raise ProxmoxConfigurationError("max_concurrent_node_requests must be at least 1")
+
+        self.host = host
+        self.port = port
+        self.protocol = protocol
+        self.username = username
+        self.password = password
+        self.realm = realm
+        self.ssl_verify = ssl_verify
+        self.base_url = f"{protocol}://{host}:{port}/api2/json"
+        self.auth_url = f"{self.base_url}/access/ticket"
+        self._api_token = api_token
+
+        # Session is created lazily because aiohttp needs a running event loop
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._connector = connector
+        self._owns_connector = connector is None
+
+        # Timeout configuration (seconds)
+        self.timeout = aiohttp.ClientTimeout(total=30)
+
+        # Authentication state. The ticket is sent as an explicit cookie header
+        # rather than through a cookie jar so a shared connector never leaks it.
+        self._ticket: Optional[str] = None
+        self._csrf_token: Optional[str] = None
+        self._ticket_expiry_seconds = ticket_expiry_seconds
+        self._ticket_refresh_threshold = int(self._ticket_expiry_seconds * 0.9)
+        self._ticket_obtained_at: Optional[float] = None
+        # Lock to prevent concurrent ticket refresh attempts
+        self._auth_lock = asyncio.Lock()
+
+        # Bounded parallelism for all-nodes queries
+        self.max_concurrent_node_requests = max_concurrent_node_requests
+        self._node_semaphore = asyncio.Semaphore(max_concurrent_node_requests)
+
+        # Retry configuration
+        self.retry_max_attempts = 3
+        self.retry_min_wait = 1.0
+        self.retry_max_wait = 10.0
+
+        # Circuit breaker configuration
+        self.circuit_breaker_enabled = True
+        self.circuit_breaker = create_circuit_breaker(
+            fail_max=5,
+            timeout_duration=60,
+            name=f"proxmox_async_{host}"
+        )
+
+        # Create retry decorator (tenacity supports coroutine functions)
+        retry_decorator = create_retry_decorator(
+            max_attempts=self.retry_max_attempts,
+            min_wait=self.retry_min_wait,
+            max_wait=self.retry_max_wait,
+            retry_exceptions=(
+                ProxmoxConnectionError,
+                ProxmoxTimeoutError,
+                aiohttp.ClientConnectorError,
+                aiohttp.ServerTimeoutError,
+            )
+        )
+        # Apply decorator once during initialization for efficiency
+        self._retried_execute_request = retry_decorator(self._execute_request)
+
+        # Cluster-wide inventory (see ProxmoxClient.use_cluster_resources)
+        self.use_cluster_resources = True
+        self._cluster_resources_available = True
+
+        # Response caching for static data (Issue #173)
+        self._version_cache: Optional[CachedResponse[Dict[str, Any]]] = None
+        self._cache_ttl_seconds: int = DEFAULT_CACHE_TTL_SECONDS
+        # Lock to prevent duplicate version fetches when the cache expires
+        self._cache_lock = asyncio.Lock()
+
+        debug_print("Created async Proxmox client (connection details redacted)")
+        if not ssl_verify:
+            debug_print("WARNING: SSL verification is disabled. This should only be used in development or with trusted self-signed certificates.")
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the HTTP session, creating it on first use."""
+        if self.session is None or self.session.closed:
+            if self._connector is None or self._connector.closed:
+                self._connector = aiohttp.TCPConnector(
+                    limit=100,
+                    limit_per_host=100,
+                    ttl_dns_cache=300
+                )
+                self._owns_connector = True
+            self.session = aiohttp.ClientSession(
+                connector=self._connector,
+                connector_owner=self._owns_connector,
+                timeout=self.timeout,
+                cookie_jar=aiohttp.DummyCookieJar(),
+                headers={
+                    'Accept': 'application/json',
+                    'User-Agent': 'Proxmox-MCP-Server/1.0'
+                }
+            )
+        return self.session
+
+    @property
+    def _ssl(self) -> Optional[bool]:
+        """Per-request SSL argument (False disables certificate verification)."""
+        return None if self.ssl_verify else False
+
+    async def authenticate(self) -> None:
+        """Authenticate with Proxmox and store the ticket and CSRF token.
+
+        Does nothing when the client uses an API token.
+
+        Raises:
+            ProxmoxAuthenticationError: If credentials are rejected
+            ProxmoxConnectionError: If Proxmox cannot be reached
+            ProxmoxTimeoutError: If the request times out
+            ProxmoxAPIError: If the response is malformed
+        """
+        if self._api_token:
+            return
+        # Handle realm properly - use default "pve" if not specified or empty
+        if self.realm and self.realm.strip():
+            username = f"{self.username}@{self.realm}"
+        else:
+            username = self.username
+
+        try:
+            async with self._get_session().post(
+                self.auth_url,
+                data={'username': username, 'password': self.password},
+                ssl=self._ssl
+            ) as response:
+                if response.status == 401:
+                    debug_print("Authentication failed - invalid credentials")
+                    raise ProxmoxAuthenticationError(f"Invalid credentials: HTTP {response.status}")
+                if response.status >= 400:
+                    text = await response.text()
+                    debug_print(f"HTTP error during authentication: {response.status}")
+                    raise ProxmoxAPIError(f"HTTP error during authentication: {response.status} - {text}")
+                auth_result = await response.json(content_type=None)
+        except asyncio.TimeoutError as e:
+            debug_print(f"Timeout during authentication: {e}")
+            raise ProxmoxTimeoutError(f"Authentication request timed out: {e}") from e
+        except aiohttp.ClientError as e:
+            debug_print(f"Connection error during authentication: {e}")
+            raise ProxmoxConnectionError(f"Failed to connect to Proxmox: {e}") from e
+        except json.JSONDecodeError as e:
+            debug_print(f"Failed to parse authentication response: {e}")
+            raise ProxmoxAPIError(f"Invalid JSON in authentication response: {e}") from e
+
+        data = auth_result.get('data') if isinstance(auth_result, dict) else None
+        if not data:
+            raise ProxmoxAuthenticationError("Authentication failed - no ticket received")
+        try:
+            self._ticket = data['ticket']
+        except KeyError as e:
+            debug_print(f"Missing expected field in authentication response: {e}")
+            raise ProxmoxAPIError(f"Invalid authentication response format: {e}") from e
+        self._csrf_token = data.get('CSRFPreventionToken')
+        self._ticket_obtained_at = time.time()
+        debug_print("Authentication successful")
+
+    def _is_ticket_expired(self) -> bool:
+        """Check if the authentication ticket needs refresh (never with an API token)."""
+        if self._api_token:
+            return False
+        if self._ticket_obtained_at is None:
+            return True
+        elapsed = time.time() - self._ticket_obtained_at
+        return elapsed >= self._ticket_refresh_threshold
+
+    async def _ensure_valid_ticket(self) -> None:
+        """Ensure we have a valid ticket, refreshing it at most once concurrently."""
+        # Fast path: check without lock first
+        if not self._is_ticket_expired():
+            return
+
+        # Slow path: acquire lock and double-check
+        async with self._auth_lock:
+            if self._is_ticket_expired():
+                debug_print("Authentication ticket expired or expiring soon, refreshing...")
+                await self.authenticate()
+
+    async def _reauthenticate(self, stale_ticket: Optional[str]) -> None:
+        """Re-authenticate after a 401 unless another task already did."""
+        async with self._auth_lock:
+            if self._ticket == stale_ticket:
+                await self.authenticate()
+
+    def _auth_headers(self, method: str) -> Dict[str, str]:
+        """Build the auth headers (API token, or ticket cookie plus CSRF header for writes)."""
+        if self._api_token:
+            return {'Authorization': f"PVEAPIToken={self._api_token}"}
+        headers = {}
+        if self._ticket:
+            headers['Cookie'] = f"PVEAuthCookie={self._ticket}"
+        if method != 'GET' and self._csrf_token:
+            headers['CSRFPreventionToken'] = self._csrf_token
+        return headers
+
+    async def close(self) -> None:
+        """Close the session and release resources.
+
+        A connector passed in by the caller is left open for its other users.
+        """
+        if self.session is not None:
+            try:
+                await self.session.close()
+                debug_print(f"Closed async Proxmox client session for {self.host}")
+            except Exception as e:
+                debug_print(f"Error closing session for {self.host}: {e}")
+            finally:
+                self.session = None
+        elif self._owns_connector and self._connector is not None:
+            await self._connector.close()
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit - ensures session is closed."""
+        await self.close()
+        return False
+
+    async def _execute_request(self, method: str, url: str, _auth_retry: bool = True, **kwargs) -> Dict[str, Any]:
+        """
+        Execute the actual HTTP request (internal method with retry logic).
+
+        This method is decorated with retry logic and should not be called directly.
+        Use _make_request instead.
+
+        Args:
+            method: HTTP method
+            url: Full URL
+            _auth_retry: Internal flag - if True, will retry once on 401 after re-auth
+            **kwargs: Additional arguments to pass to aiohttp (data, params)
+
+        Returns:
+            Parsed JSON response body
+
+        Raises:
+            ProxmoxValidationError: If method is invalid
+            ProxmoxConnectionError: If connection fails
+            ProxmoxTimeoutError: If request times out
+            ProxmoxAuthenticationError: If authentication fails (after retry)
+            ProxmoxResourceNotFoundError: If resource not found
+            ProxmoxAPIError: If API returns error
+        """
+        method = method.upper()
+        if method not in ('GET', 'POST', 'PUT', 'DELETE'):
+            raise ProxmoxValidationError(f"Unsupported HTTP method: {method}")
+
+        ticket = self._ticket
+        try:
+            async with self._get_session().request(
+                method, url, headers=self._auth_headers(method), ssl=self._ssl, **kwargs
+            ) as response:
+                status = response.status
+                text = await response.text()
+        except asyncio.TimeoutError as e:
+            debug_print(f"Request timeout for {method} {url}: {e}")
+            raise ProxmoxTimeoutError(f"Request timed out: {e}") from e
+        except aiohttp.ClientError as e:
+            debug_print(f"Connection error for {method} {url}: {e}")
+            raise ProxmoxConnectionError(f"Failed to connect to Proxmox: {e}") from e
+
+        if status == 401:
+            # On 401, attempt re-authentication and retry once (API tokens cannot be refreshed)
+            if _auth_retry and not self._api_token:
+                debug_print(f"Got 401 for {method} {url}, attempting re-authentication...")
+                try:
+                    await self._reauthenticate(ticket)
+                except (ProxmoxAuthenticationError, ProxmoxConnectionError) as auth_e:
+                    debug_print(f"Re-authentication failed: {auth_e}")
+                    raise ProxmoxAuthenticationError(f"Authentication failed after retry: HTTP {status}") from auth_e
+                return await self._execute_request(method, url, _auth_retry=False, **kwargs)
+            debug_print(f"Authentication error for {method} {url} (after retry)")
+            raise ProxmoxAuthenticationError(f"Authentication required: HTTP {status}")
+        if status == 404:
+            debug_print(f"Resource not found for {method} {url}")
+            raise ProxmoxResourceNotFoundError(f"Resource not found: HTTP {status} - {text}")
+        if status >= 400:
+            debug_print(f"HTTP error for {method} {url}: {status}")
+            raise ProxmoxAPIError(f"HTTP error {status}: {text}")
+
+        if not text:
+            return {}
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError as e:
+            debug_print(f"Failed to parse response for {method} {url}: {e}")
+            raise ProxmoxAPIError(f"Invalid JSON response: {e}") from e
+
+    async def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+        """Make a request with retry logic and circuit breaker.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint
+            **kwargs: Additional arguments to pass to aiohttp
+
+        Returns:
+            Parsed JSON response body
+        """
+        # Ensure we have a valid ticket before making the request
+        await self._ensure_valid_ticket()
+
+        url = f"{self.base_url}{endpoint}"
+        debug_print(f"Making async {method} request to: {endpoint}")
+
+        if self.circuit_breaker_enabled and self.circuit_breaker:
+            return await call_with_circuit_breaker_async(
+                self.circuit_breaker, self._retried_execute_request, method, url, **kwargs
+            )
+        return await self._retried_execute_request(method, url, **kwargs)
+
+    async def _make_request_no_retry(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+        """Make a request WITHOUT retry logic for non-idempotent operations.
+
+        See ProxmoxClient._make_request_no_retry for the rationale.
+        """
+        await self._ensure_valid_ticket()
+
+        url = f"{self.base_url}{endpoint}"
+        debug_print(f"Making async {method} request (no retry) to: {endpoint}")
+
+        if self.circuit_breaker_enabled and self.circuit_breaker:
+            return await call_with_circuit_breaker_async(
+                self.circuit_breaker, self._execute_request, method, url, **kwargs
+            )
+        return await self._execute_request(method, url, **kwargs)
+
+    async def test_connection(self) -> Dict[str, Any]:
+        """Test connection to Proxmox."""
+        try:
+            version_data = await self._make_request('GET', '/version')
+            return {
+                "status": "success",
+                "version": version_data.get('data', {}),
+                "message": "Connection successful"
+            }
+        except _API_ERRORS as e:
+            debug_print(f"Connection test failed: {e}")
+            return {
+                "status": "error",
+                "error": str(e),
+                "message": "Connection failed"
+            }
+
+    async def list_nodes(self) -> List[Dict[str, Any]]:
+        """List all nodes in the cluster."""
+        nodes_data = await self._make_request('GET', '/nodes')
+        return nodes_data.get('data', [])
+
+    async def get_cluster_status(self) -> List[Dict[str, Any]]:
+        """Get cluster membership and quorum entries from /cluster/status."""
+        status_data = await self._make_request('GET', '/cluster/status')
+        return status_data.get('data', [])
+
+    async def get_node_info(self, node: str) -> Dict[str, Any]:
+        """Get detailed information (CPU, memory, uptime, versions) about a node."""
+        node_data = await self._make_request('GET', f'/nodes/{node}/status')
+        return node_data.get('data', {})
+
+    async def get_cluster_resources(self, resource_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get the cluster-wide resource index from /cluster/resources.
+
+        Args:
+            resource_type: Optional filter ('vm', 'storage', 'node', 'sdn')
+
+        Returns:
+            List of resource dicts as returned by Proxmox
+        """
+        kwargs = {"params": {"type": resource_type}} if resource_type else {}
+        resources_data = await self._make_request('GET', '/cluster/resources', **kwargs)
+        resources = resources_data.get('data')
+        if not isinstance(resources, list):
+            raise ProxmoxAPIError("Invalid cluster resources response: 'data' is not a list")
+        return resources
+
+    async def _fetch_node_items(self, node_name: str, path: str) -> Tuple[str, List[Dict[str, Any]], Optional[str]]:
+        """Fetch one per-node collection (qemu, lxc or storage) under the node semaphore.
+
+        Returns:
+            Tuple of (node_name, items, error_message)
+        """
+        async with self._node_semaphore:
+            try:
+                data = await self._make_request('GET', f'/nodes/{node_name}/{path}')
+            except _API_ERRORS as e:
+                debug_print(f"Failed to get {path} from node {node_name}: {e}")
+                return (node_name, [], str(e))
+        items = data.get('data', [])
+        for item in items:
+            item['node'] = node_name
+        return (node_name, items, None)
+
+    async def _fan_out_nodes(
+        self, fetch_node: Callable[[str], Awaitable[Tuple[str, List[Dict[str, Any]], Optional[str]]]]
+    ) -> Tuple[List[Dict[str, Any]], List[str], List[Dict[str, str]], int]:
+        """Run a per-node fetch against every node concurrently.
+
+        Returns:
+            Tuple of (items, successful_nodes, failed_nodes, node_count)
+        """
+        items: List[Dict[str, Any]] = []
+        failed_nodes: List[Dict[str, str]] = []
+        successful_nodes: List[str] = []
+        nodes = await self.list_nodes()
+
+        valid_nodes = []
+        for node_info in nodes:
+            node_name = node_info.get("node")
+            if not node_name or not isinstance(node_name, str):
+                debug_print(f"Skipping node with invalid/missing name: {node_info}")
+                failed_nodes.append({"node": "unknown", "error": "Missing or invalid node name in response"})
+            else:
+                valid_nodes.append(node_name)
+
+        for node_name, node_items, error in await asyncio.gather(*(fetch_node(n) for n in valid_nodes)):
+            if error:
+                failed_nodes.append({"node": node_name, "error": error})
+            else:
+                items.extend(node_items)
+                successful_nodes.append(node_name)
+
+        return items, successful_nodes, failed_nodes, len(nodes)
+
+    async def _list_from_cluster_resources(
+        self, kind: str
+    ) -> Optional[Tuple[List[Dict[str, Any]], List[str], List[Dict[str, str]], int]]:
+        """Build an all-node listing from one /cluster/resources call.
+
+        Same semantics as ProxmoxClient._list_from_cluster_resources.
+        """
+        if not (self.use_cluster_resources and self._cluster_resources_available):
+            return None
+
+        try:
+            resources = await self.get_cluster_resources()
+        except ProxmoxResourceNotFoundError as e:
+            debug_print(f"Cluster resources endpoint not available, using per-node queries: {e}")
+            self._cluster_resources_available = False
+            return None
+        except (ProxmoxConnectionError, ProxmoxTimeoutError, ProxmoxAPIError) as e:
+            debug_print(f"Cluster resources query failed, using per-node queries: {e}")
+            return None
+
+        failed_nodes: List[Dict[str, str]] = []
+        successful_nodes: List[str] = []
+        node_count = 0
+        for resource in resources:
+            if resource.get("type") != "node":
+                continue
+            node_count += 1
+            node_name = resource.get("node")
+            if not node_name or not isinstance(node_name, str):
+                failed_nodes.append({"node": "unknown", "error": "Missing or invalid node name in response"})
+            elif resource.get("status") != "online":
+                failed_nodes.append({"node": node_name, "error": f"Node status is {resource.get('status', 'unknown')}"})
+            else:
+                successful_nodes.append(node_name)
+
+        online = set(successful_nodes)
+        if kind == 'storage':
+            items = [
+                ProxmoxClient._normalize_cluster_storage(r) for r in resources
+                if r.get("type") == "storage" and r.get("node") in online
+            ]
+        else:
+            items = [
+                ProxmoxClient._normalize_cluster_guest(r) for r in resources
+                if r.get("type") == kind and r.get("node") in online
+            ]
+        return items, successful_nodes, failed_nodes, node_count
+
+    async def _list_all_nodes(self, kind: str, label: str, include_metadata: bool) -> Any:
+        """Shared implementation of the all-nodes branch of list_vms/containers/storage."""
+        inventory = await self._list_from_cluster_resources(kind)
+        if inventory is None:
+            inventory = await self._fan_out_nodes(lambda n: self._fetch_node_items(n, kind))
+        items, successful_nodes, failed_nodes, node_count = inventory
+
+        # If ALL nodes failed (and we had nodes to query), raise an error
+        if node_count and failed_nodes and len(failed_nodes) == node_count:
+            error_details = "; ".join([f"{n['node']}: {n['error']}" for n in failed_nodes])
+            raise ProxmoxAPIError(f"Failed to get {label} from all nodes: {error_details}")
+
+        if failed_nodes:
+            failed_names = [n["node"] for n in failed_nodes]
+            debug_print(f"WARNING: Partial failure - could not get {label} from nodes: {failed_names}")
+
+        if include_metadata:
+            return {
+                "data": items,
+                "successful_nodes": successful_nodes,
+                "failed_nodes": failed_nodes,
+                "partial_failure": len(failed_nodes) > 0
+            }
+        return items
+
+    async def list_vms(self, node: str = None, include_metadata: bool = False) -> Any:
+        """List all virtual machines (see ProxmoxClient.list_vms)."""
+        if node:
+            vms_data = await self._make_request('GET', f'/nodes/{node}/qemu')
+            return vms_data.get('data', [])
+        return await self._list_all_nodes('qemu', 'VMs', include_metadata)
+
+    async def list_containers(self, node: str = None, include_metadata: bool = False) -> Any:
+        """List all containers (see ProxmoxClient.list_containers)."""
+        if node:
+            containers_data = await self._make_request('GET', f'/nodes/{node}/lxc')
+            return containers_data.get('data', [])
+        return await self._list_all_nodes('lxc', 'containers', include_metadata)
+
+    async def list_storage(self, node: str = None, include_metadata: bool = False) -> Any:
+        """List all storage pools (see ProxmoxClient.list_storage)."""
+        if node:
+            storage_data = await self._make_request('GET', f'/nodes/{node}/storage')
+            return storage_data.get('data', [])
+        return await self._list_all_nodes('storage', 'storage', include_metadata)
+
+    async def get_vm_info(self, node: str, vmid: int) -> Dict[str, Any]:
+        """Get detailed information about a specific VM."""
+        vm_data = await self._make_request('GET', f'/nodes/{node}/qemu/{vmid}/status/current')
+        return vm_data.get('data', {})
+
+    async def get_container_info(self, node: str, vmid: int) -> Dict[str, Any]:
+        """Get detailed information about a specific container."""
+        container_data = await self._make_request('GET', f'/nodes/{node}/lxc/{vmid}/status/current')
+        return container_data.get('data', {})
+
+    async def _post_action(self, endpoint: str, success_message: str, error_message: str) -> Dict[str, Any]:
+        """POST a lifecycle action and wrap the outcome in a status dict."""
+        try:
+            result = await self._make_request('POST', endpoint)
+            return {
+                "status": "success",
+                "message": success_message,
+                "data": result.get('data', {})
+            }
+        except _API_ERRORS as e:
+            return {
+                "status": "error",
+                "error": str(e),
+                "message": error_message
+            }
+
+    async def start_vm(self, node: str, vmid: int) -> Dict[str, Any]:
+        """Start a virtual machine."""
+        return await self._post_action(
+            f'/nodes/{node}/qemu/{vmid}/status/start',
+            f"VM {vmid} started successfully", f"Failed to start VM {vmid}"
+        )
+
+    async def stop_vm(self, node: str, vmid: int) -> Dict[str, Any]:
+        """Stop a virtual machine."""
+        return await self._post_action(
+            f'/nodes/{node}/qemu/{vmid}/status/stop',
+            f"VM {vmid} stopped successfully", f"Failed to stop VM {vmid}"
+        )
+
+    async def shutdown_vm(self, node: str, vmid: int) -> Dict[str, Any]:
+        """Gracefully shut down a virtual machine via ACPI."""
+        return await self._post_action(
+            f'/nodes/{node}/qemu/{vmid}/status/shutdown',
+            f"VM {vmid} shutdown initiated", f"Failed to shut down VM {vmid}"
+        )
+
+    async def suspend_vm(self, node: str, vmid: int) -> Dict[str, Any]:
+        """Suspend a running virtual machine."""
+        return await self._post_action(
+            f'/nodes/{node}/qemu/{vmid}/status/suspend',
+            f"VM {vmid} suspended successfully", f"Failed to suspend VM {vmid}"
+        )
+
+    async def resume_vm(self, node: str, vmid: int) -> Dict[str, Any]:
+        """Resume a suspended virtual machine."""
+        return await self._post_action(
+            f'/nodes/{node}/qemu/{vmid}/status/resume',
+            f"VM {vmid} resumed successfully", f"Failed to resume VM {vmid}"
+        )
+
+    async def start_container(self, node: str, vmid: int) -> Dict[str, Any]:
+        """Start a container."""
+        return await self._post_action(
+            f'/nodes/{node}/lxc/{vmid}/status/start',
+            f"Container {vmid} started successfully", f"Failed to start container {vmid}"
+        )
+
+    async def stop_container(self, node: str, vmid: int) -> Dict[str, Any]:
+        """Stop a container."""
+        return await self._post_action(
+            f'/nodes/{node}/lxc/{vmid}/status/stop',
+            f"Container {vmid} stopped successfully", f"Failed to stop container {vmid}"
+        )
+
+    async def delete_vm(self, node: str, vmid: int) -> Dict[str, Any]:
+        """Delete a virtual machine (no retry, see ProxmoxClient.delete_vm)."""
+        try:
+            result = await self._make_request_no_retry("DELETE", f"/nodes/{node}/qemu/{vmid}")
+            return {
+                "status": "success",
+                "message": f"VM {vmid} deleted successfully",
+                "data": result.get('data', {})
+            }
+        except _API_ERRORS as e:
+            return {
+                "status": "error",
+                "message": f"Exception deleting VM: {str(e)}"
+            }
+
+    async def delete_container(self, node: str, vmid: int) -> Dict[str, Any]:
+        """Delete a container (no retry, see ProxmoxClient.delete_container)."""
+        try:
+            result = await self._make_request_no_retry("DELETE", f"/nodes/{node}/lxc/{vmid}")
+            return {
+                "status": "success",
+                "message": f"Container {vmid} deleted successfully",
+                "data": result.get('data', {})
+            }
+        except _API_ERRORS as e:
+            return {
+                "status": "error",
+                "message": f"Exception deleting container: {str(e)}"
+            }
+
+    async def get_version(self, use_cache: bool = True) -> Dict[str, Any]:
+        """Get Proxmox version information.
+
+        Args:
+            use_cache: If True, return cached data if available and valid.
+                      Set to False to force a fresh API call.
+        """
+        # Fast path: check cache without lock
+        if use_cache and self._version_cache and self._version_cache.is_valid():
+            debug_print("Returning cached version info")
+            return self._version_cache.data
+
+        async with self._cache_lock:
+            # Double-check after acquiring lock (another task may have refreshed)
+            if use_cache and self._version_cache and self._version_cache.is_valid():
+                return self._version_cache.data
+            try:
+                version_data = await self._make_request("GET", "/version")
+            except _API_ERRORS as e:
+                return {
+                    "status": "error",
+                    "message": f"Exception getting version: {str(e)}"
+                }
+            result = {
+                "status": "success",
+                "version": version_data.get("data", {}),
+                "message": "Version information retrieved successfully"
+            }
+            self._version_cache = CachedResponse(result, self._cache_ttl_seconds)
+            return result
+
+    def invalidate_cache(self) -> None:
+        """Invalidate all cached responses."""
+        if self._version_cache:
+            self._version_cache.invalidate()
+        debug_print("All caches invalidated")
+
+    async def get_node_status(self, node: str) -> Dict[str, Any]:
+        """Get detailed status and resource usage for a specific node."""
+        try:
+            status_data = await self._make_request("GET", f"/nodes/{node}/status")
+            return {
+                "status": "success",
+                "node_status": status_data.get("data", {}),
+                "message": f"Node status retrieved for {node}"
+            }
+        except _API_ERRORS as e:
+            return {
+                "status": "error",
+                "message": f"Exception getting node status: {str(e)}"
+            }
+
+    async def get_vm_status(self, node: str, vmid: int) -> Dict[str, Any]:
+        """Get current status and resource usage of a VM."""
+        try:
+            status_data = await self._make_request("GET", f"/nodes/{node}/qemu/{vmid}/status/current")
+            return {
+                "status": "success",
+                "vm_status": status_data.get("data", {}),
+                "message": f"VM status retrieved for {vmid} on {node}"
+            }
+        except _API_ERRORS as e:
+            return {
+                "status": "error",
+                "message": f"Exception getting VM status: {str(e)}"
+            }
+
+    async def create_vm(self, node: str, name: str, vmid: int = None, cores: int = 1, memory: int = 512) -> Dict[str, Any]:
+        """Create a new virtual machine (see ProxmoxClient.create_vm)."""
+        if vmid is not None:
+            return await self._create_vm_with_vmid(node, name, vmid, cores, memory)
+        return await self._create_with_next_vmid(
+            "VM", lambda allocated: self._create_vm_with_vmid(node, name, allocated, cores, memory)
+        )
+
+    async def _create_with_next_vmid(
+        self, kind: str, create: Callable[[int], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Run create(vmid) with the next free VMID, retrying on VMID conflicts."""
+        last_error = None
+        for attempt in range(self.VMID_CONFLICT_MAX_RETRIES):
+            try:
+                allocated_vmid = await self._get_next_vmid()
+            except _API_ERRORS as e:
+                return {
+                    "status": "error",
+                    "message": f"Exception creating {kind}: {str(e)}"
+                }
+            debug_print(f"Attempting {kind} creation with VMID {allocated_vmid} (attempt {attempt + 1}/{self.VMID_CONFLICT_MAX_RETRIES})")
+            result = await create(allocated_vmid)
+            if result.get("status") == "error":
+                error_msg = result.get("message", "").lower()
+                if "already exists" in error_msg or ("vmid" in error_msg and "in use" in error_msg):
+                    debug_print(f"VMID {allocated_vmid} conflict detected, retrying...")
+                    last_error = result.get("message")
+                    continue
+            return result
+
+        return {
+            "status": "error",
+            "message": f"Failed to create {kind} after {self.VMID_CONFLICT_MAX_RETRIES} attempts due to VMID conflicts. Last error: {last_error}"
+        }
+
+    async def _create_vm_with_vmid(self, node: str, name: str, vmid: int, cores: int, memory: int) -> Dict[str, Any]:
+        """Internal method to create a VM with a specific VMID."""
+        config = {
+            "vmid": str(vmid),
+            "name": name,
+            "cores": str(cores),
+            "memory": str(memory),
+            "sockets": "1"
+        }
+        try:
+            await self._make_request("POST", f"/nodes/{node}/qemu", data=config)
+        except _API_ERRORS as e:
+            return {
+                "status": "error",
+                "message": f"Exception creating VM: {str(e)}"
+            }
+        return {
+            "status": "success",
+            "vmid": vmid,
+            "message": f"VM {name} created successfully with ID {vmid}"
+        }
+
+    async def create_container(
+        self,
+        node: str,
+        name: str,
+        ostemplate: str,
+        vmid: int = None,
+        cores: int = 1,
+        memory: int = 512,
+        storage: str = "local-lvm",
+        disk_size: str = "10G",
+        password: Optional[str] = None,
+        ssh_keys: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Create a new LXC container.
+
+        Args:
+            node: Node name where the container will be created
+            name: Container hostname
+            ostemplate: OS template volume, e.g. "local:vztmpl/debian-12-standard_12.2-1_amd64.tar.zst"
+            vmid: Optional container ID. If not specified, auto-allocates next available.
+            cores: Number of CPU cores (default: 1)
+            memory: Memory in MB (default: 512)
+            storage: Storage for the root filesystem (default: local-lvm)
+            disk_size: Root filesystem size, number with optional K/M/G/T/P suffix
+                (default: 10G; a bare number is GiB)
+            password: Optional root password
+            ssh_keys: Optional SSH public keys for root
+
+        Returns:
+            Dict with status, vmid (on success), and message
+        """
+        size_gib = _disk_size_gib(disk_size)
+        if not size_gib:
+            return {
+                "status": "error",
+                "message": f"Invalid disk size: {disk_size!r}"
+            }
+        config = {
+            "hostname": name,
+            "ostemplate": ostemplate,
+            "cores": str(cores),
+            "memory": str(memory),
+            "rootfs": f"{storage}:{size_gib:g}",
+        }
+        if password:
+            config["password"] = password
+        if ssh_keys:
+            config["ssh-public-keys"] = ssh_keys
+
+        async def create(container_vmid: int) -> Dict[str, Any]:
+            try:
+                result = await self._make_request("POST", f"/nodes/{node}/lxc", data=dict(config, vmid=str(container_vmid)))
+            except _API_ERRORS as e:
+                return {
+                    "status": "error",
+                    "message": f"Exception creating container: {str(e)}"
+                }
+            return {
+                "status": "success",
+                "vmid": container_vmid,
+                "data": result.get("data"),
+                "message": f"Container {name} created successfully with ID {container_vmid}"
+            }
+
+        if vmid is not None:
+            return await create(vmid)
+        return await self._create_with_next_vmid("container", create)
+
+    async def _get_next_vmid(self) -> int:
+        """Get the next available VMID (see ProxmoxClient._get_next_vmid).
+
+        The fallback scan queries every node's qemu and lxc lists concurrently.
+        """
+        try:
+            data = await self._make_request("GET", "/cluster/nextid")
+            next_id = data.get("data")
+            if next_id is not None:
+                debug_print(f"Got suggested VMID {next_id} from cluster API")
+                return int(next_id)
+        except _API_ERRORS as e:
+            debug_print(f"Cluster nextid API failed: {e}")
+
+        debug_print("Cluster nextid API failed, falling back to cluster-wide manual calculation")
+        try:
+            vms, _, _, _ = await self._fan_out_nodes(lambda n: self._fetch_node_items(n, 'qemu'))
+            containers, _, _, _ = await self._fan_out_nodes(lambda n: self._fetch_node_items(n, 'lxc'))
+        except _API_ERRORS as e:
+            raise ProxmoxAPIError(f"Unable to determine next available VMID: {e}") from e
+
+        all_vmids = {int(g["vmid"]) for g in vms + containers if g.get("vmid") is not None}
+        if all_vmids:
+            return max(all_vmids) + 1
+        return 100
+
+    async def get_storage_usage(self, node: str = None) -> Dict[str, Any]:
+        """Get storage usage and capacity information (see ProxmoxClient.get_storage_usage)."""
+        try:
+            if node:
+                storage = await self.list_storage(node)
+                return {
+                    "status": "success",
+                    "storage": storage,
+                    "count": len(storage),
+                    "message": f"Storage usage retrieved for node {node}"
+                }
+            storage_result = await self._fan_out_nodes(lambda n: self._fetch_node_items(n, 'storage'))
+            all_storage, _, failed_nodes, _ = storage_result
+            result = {
+                "status": "success",
+                "storage": all_storage,
+                "count": len(all_storage),
+                "message": "Storage usage retrieved from all nodes"
+            }
+            if failed_nodes:
+                result["warning"] = f"Failed to query nodes: {[n['node'] for n in failed_nodes]}"
+            return result
+        except _API_ERRORS as e:
+            return {
+                "status": "error",
+                "message": f"Exception getting storage usage: {str(e)}"
+            }
+
+    async def create_snapshot(self, node: str, vmid: int, snapname: str, description: str = "") -> Dict[str, Any]:
+        """Create a snapshot of a VM or container."""
+        data = {"snapname": snapname, "description": description}
+        try:
+            for guest_type, label in (("qemu", "VM"), ("lxc", "Container")):
+                try:
+                    result = await self._make_request("POST", f"/nodes/{node}/{guest_type}/{vmid}/snapshot", data=data)
+                    return {
+                        "status": "success",
+                        "message": f"{label} snapshot {snapname} created successfully for {label.lower()} {vmid}",
+                        "data": result.get("data")
+                    }
+                except (ProxmoxResourceNotFoundError, ProxmoxAPIError) as e:
+                    debug_print(f"{label} snapshot creation failed: {e}")
+            return {
+                "status": "error",
+                "message": f"Failed to create snapshot for {vmid} on {node}"
+            }
+        except _API_ERRORS as e:
+            return {
+                "status": "error",
+                "message": f"Exception creating snapshot: {str(e)}"
+            }
+
+    async def list_snapshots(self, node: str, vmid: int) -> Dict[str, Any]:
+        """List snapshots for a VM or container."""
+        try:
+            for guest_type, label in (("qemu", "VM"), ("lxc", "Container")):
+                try:
+                    snapshot_data = await self._make_request("GET", f"/nodes/{node}/{guest_type}/{vmid}/snapshot")
+                    snapshots = snapshot_data.get("data", [])
+                    return {
+                        "status": "success",
+                        "snapshots": snapshots,
+                        "count": len(snapshots),
+                        "message": f"{label} snapshots retrieved for {label.lower()} {vmid}"
+                    }
+                except (ProxmoxResourceNotFoundError, ProxmoxAPIError) as e:
+                    debug_print(f"{label} snapshot listing failed: {e}")
+            return {
+                "status": "error",
+                "message": f"Failed to list snapshots for {vmid} on {node}"
+            }
+        except _API_ERRORS as e:
+            return {
+                "status": "error",
+                "message": f"Exception listing snapshots: {str(e)}"
+            }
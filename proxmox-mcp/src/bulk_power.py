@@ -0,0 +1,199 @@
+"""Bulk power operations (start, stop, shutdown, suspend) on many guests.
+
+Targets are resolved once from the cluster inventory (see guest_selection).
+Each action is submitted on the client's node executor, which caps the
+requests in flight both globally and per node. Optionally the runner then
+waits for all resulting tasks with one batched TaskTracker wait.
+
+Guests that are already in the requested state are skipped instead of
+generating a no-op task.
+"""
+
+from concurrent.futures import as_completed
+from typing import Any, Dict, Iterable, List, Optional
+
+from .exceptions import (
+    ProxmoxConnectionError,
+    ProxmoxAuthenticationError,
+    ProxmoxAPIError,
+    ProxmoxResourceNotFoundError,
+    ProxmoxTimeoutError,
+    ProxmoxValidationError,
+)
+from .guest_selection import GUEST_TYPE_ALL, GUEST_TYPES, has_selector, list_guests, select_guests
+from .task_tracker import DEFAULT_TASK_TIMEOUT_SECONDS, MAX_TASKS_PER_WAIT, TASK_STATE_COMPLETED, TASK_STATE_RUNNING
+
+# Supported actions mapped to the guest states in which they are a no-op
+BULK_POWER_ACTIONS = {
+    "start": ("running",),
+    "stop": ("stopped",),
+    "shutdown": ("stopped",),
+    "suspend": ("stopped", "paused", "suspended"),
+}
+
+# Maximum number of guests a single bulk operation may target
+MAX_BULK_TARGETS = MAX_TASKS_PER_WAIT
+
+# Per-target result states
+RESULT_SUBMITTED = "submitted"
+RESULT_SKIPPED = "skipped"
+RESULT_ERROR = "error"
+RESULT_OK = "ok"
+RESULT_FAILED = "failed"
+RESULT_RUNNING = "running"
+
+
+class BulkPowerRunner:
+    """Runs one power action against a set of guests with bounded concurrency."""
+
+    def __init__(self, client: Any):
+        """
+        Initialize the runner.
+
+        Args:
+            client: ProxmoxClient used for inventory, requests and task tracking
+        """
+        self.client = client
+
+    def run(
+        self,
+        action: str,
+        vmids: Optional[Iterable[int]] = None,
+        node: Optional[str] = None,
+        tag: Optional[str] = None,
+        name_pattern: Optional[str] = None,
+        guest_type: str = GUEST_TYPE_ALL,
+        wait: bool = False,
+        timeout: float = DEFAULT_TASK_TIMEOUT_SECONDS
+    ) -> Dict[str, Any]:
+        """Apply a power action to every selected guest.
+
+        Args:
+            action: 'start', 'stop', 'shutdown' or 'suspend'
+            vmids: Explicit VMIDs to target
+            node: Only guests on this node
+            tag: Only guests with this tag
+            name_pattern: Shell-style guest name pattern
+            guest_type: 'qemu', 'lxc' or 'all'
+            wait: Wait for the submitted tasks to finish
+            timeout: Maximum seconds to wait when wait is True
+
+        Returns:
+            Dict with a summary of counts and one result row per target
+
+        Raises:
+            ProxmoxValidationError: If the action, guest type or selectors are invalid,
+                or too many guests are selected
+        """
+        if action not in BULK_POWER_ACTIONS:
+            raise ProxmoxValidationError(f"Unsupported bulk action: {action}")
+        if guest_type not in GUEST_TYPES:
+            raise ProxmoxValidationError(f"guest_type must be one of {list(GUEST_TYPES)}")
+        if not has_selector(vmids, node, tag, name_pattern):
+            raise ProxmoxValidationError("At least one of vmids, node, tag or name_pattern is required")
+
+        vmids = sorted({int(v) for v in vmids}) if vmids else None
+        targets = select_guests(list_guests(self.client), vmids, node, tag, name_pattern, guest_type)
+        if len(targets) > MAX_BULK_TARGETS:
+            raise ProxmoxValidationError(
+                f"Selection matches {len(targets)} guests; at most {MAX_BULK_TARGETS} can be targeted at once"
+            )
+
+        rows: List[Dict[str, Any]] = []
+        if vmids:
+            found = {t["vmid"] for t in targets}
+            for vmid in vmids:
+                if vmid not in found:
+                    rows.append({
+                        "vmid": vmid, "name": None, "node": None, "type": None,
+                        "result": RESULT_ERROR, "upid": None,
+                        "error": "Guest not found or excluded by selectors"
+                    })
+
+        to_submit = []
+        for target in targets:
+            if target["status"] in BULK_POWER_ACTIONS[action]:
+                rows.append(self._row(target, RESULT_SKIPPED, error=f"Already {target['status']}"))
+            else:
+                to_submit.append(target)
+
+        rows.extend(self._submit_all(action, to_submit))
+
+        upids = [row["upid"] for row in rows if row["upid"]]
+        if wait and upids:
+            self._apply_task_results(rows, self.client.wait_for_tasks(upids, timeout))
+
+        rows.sort(key=lambda r: r["vmid"])
+        summary = {"targets": len(rows)}
+        for row in rows:
+            summary[row["result"]] = summary.get(row["result"], 0) + 1
+        if rows:
+            message = f"Bulk {action}: " + ", ".join(f"{v} {k}" for k, v in summary.items() if k != "targets")
+        else:
+            message = f"Bulk {action}: no guests matched"
+
+        return {
+            "status": "success",
+            "action": action,
+            "waited": bool(wait and upids),
+            "summary": summary,
+            "results": rows,
+            "message": message
+        }
+
+    @staticmethod
+    def _row(target: Dict[str, Any], result: str, upid: Optional[str] = None, error: Optional[str] = None) -> Dict[str, Any]:
+        """Build one per-target result row."""
+        return {
+            "vmid": target["vmid"],
+            "name": target["name"],
+            "node": target["node"],
+            "type": target["type"],
+            "result": result,
+            "upid": upid,
+            "error": error,
+        }
+
+    def _submit_all(self, action: str, targets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Submit the action for every target on the node executor."""
+        if not targets:
+            return []
+        executor = self.client._get_node_executor()
+        futures = [executor.submit(t["node"], self._submit_one, action, t) for t in targets]
+        return [future.result() for future in as_completed(futures)]
+
+    def _submit_one(self, action: str, target: Dict[str, Any]) -> Dict[str, Any]:
+        """POST one power action and return its result row."""
+        endpoint = f"/nodes/{target['node']}/{target['type']}/{target['vmid']}/status/{action}"
+        try:
+            response = self.client._make_request("POST", endpoint)
+            upid = response.json().get("data")
+        except (ProxmoxConnectionError, ProxmoxTimeoutError, ProxmoxAuthenticationError, ProxmoxAPIError,
+                ProxmoxResourceNotFoundError) as e:
+            return self._row(target, RESULT_ERROR, error=str(e))
+        except ValueError as e:
+            return self._row(target, RESULT_ERROR, error=f"Invalid JSON response: {e}")
+        return self._row(target, RESULT_SUBMITTED, upid=upid if isinstance(upid, str) else None)
+
+    @staticmethod
+    def _apply_task_results(rows: List[Dict[str, Any]], wait_result: Dict[str, Any]) -> None:
+        """Merge task outcomes from wait_for_tasks into the result rows."""
+        if wait_result.get("status") != "success":
+            for row in rows:
+                if row["upid"]:
+                    row["error"] = wait_result.get("message")
+            return
+        tasks = {t["upid"]: t for t in wait_result["tasks"]}
+        for row in rows:
+            task = tasks.get(row["upid"])
+            if task is None:
+                continue
+            row["exitstatus"] = task["exitstatus"]
+            row["duration_seconds"] = task["duration_seconds"]
+            if task["state"] == TASK_STATE_RUNNING:
+                row["result"] = RESULT_RUNNING
+            elif task["state"] == TASK_STATE_COMPLETED:
+                row["result"] = RESULT_OK
+            else:
+                row["result"] = RESULT_FAILED
+                row["error"] = task["exitstatus"]
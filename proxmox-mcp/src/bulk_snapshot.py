@@ -0,0 +1,401 @@
+"""Bulk snapshot creation and retention pruning for many guests.
+
+Targets are resolved once from the cluster inventory (see guest_selection).
+Snapshot creation and deletion run as Proxmox tasks, which are I/O heavy on
+the node's storage, so BulkSnapshotRunner schedules them itself instead of
+firing everything at once:
+
+- at most ``max_per_node`` snapshot tasks run per node, and a guest never
+  has more than one (Proxmox locks the guest while a snapshot task runs)
+- each batch of ready requests is submitted on the client's node executor,
+  and all running tasks are checked with one TaskTracker pass per tick;
+  a finished task frees its slot for the next request on that node
+- prune() fetches the snapshot lists of all selected guests in parallel,
+  then deletes every snapshot that neither is among the ``keep_last`` newest
+  nor is younger than ``keep_within_hours``; ``name_prefix`` restricts the
+  policy to snapshots created by automation (e.g. "auto-")
+
+Example usage:
+    runner = BulkSnapshotRunner(client)
+    runner.create("pre-upgrade", tag="prod", max_per_node=2)
+    runner.prune(keep_last=3, keep_within_hours=48, tag="prod", name_prefix="auto-")
+"""
+
+import time
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote
+
+from .bulk_power import (
+    RESULT_ERROR,
+    RESULT_FAILED,
+    RESULT_OK,
+    RESULT_RUNNING,
+    RESULT_SKIPPED,
+    RESULT_SUBMITTED,
+)
+from .exceptions import (
+    ProxmoxConnectionError,
+    ProxmoxAuthenticationError,
+    ProxmoxAPIError,
+    ProxmoxResourceNotFoundError,
+    ProxmoxTimeoutError,
+    ProxmoxValidationError,
+)
+from .guest_selection import GUEST_TYPE_ALL, GUEST_TYPE_VM, GUEST_TYPES, has_selector, list_guests, select_guests
+from .task_tracker import MAX_TASKS_PER_WAIT, TASK_STATE_COMPLETED, TASK_STATE_RUNNING
+from .utils.validation import validate_snapshot_name
+
+try:
+    from .utils.mcp_logging import get_logger
+    logger = get_logger(__name__)
+except ImportError:
+    import logging
+    logger = logging.getLogger(__name__)
+
+# Default and maximum snapshot tasks running at once per node
+DEFAULT_SNAPSHOTS_PER_NODE = 4
+MAX_SNAPSHOTS_PER_NODE = 32
+
+# Maximum number of guests a single bulk snapshot or prune may target
+MAX_SNAPSHOT_TARGETS = MAX_TASKS_PER_WAIT
+
+# Default time a bulk snapshot or prune may run before remaining work is skipped
+DEFAULT_BULK_SNAPSHOT_TIMEOUT_SECONDS = 1800
+
+# Seconds between task checks while snapshot tasks are running
+SNAPSHOT_POLL_INTERVAL_SECONDS = 1.0
+
+# Pseudo-snapshot Proxmox lists for the guest's running state
+CURRENT_SNAPSHOT = "current"
+
+# Result of a deletion that a dry run would perform
+RESULT_PLANNED = "planned"
+
+
+class BulkSnapshotRunner:
+    """Creates and prunes snapshots of many guests with per-node task limits."""
+
+    def __init__(self, client: Any, poll_interval: float = SNAPSHOT_POLL_INTERVAL_SECONDS):
+        """
+        Initialize the runner.
+
+        Args:
+            client: ProxmoxClient used for inventory, requests and task tracking
+            poll_interval: Seconds between task checks
+        """
+        self.client = client
+        self.poll_interval = poll_interval
+
+    def _select(self, vmids, node, tag, name_pattern, guest_type) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Resolve the targets; returns (guests, error rows for VMIDs not found)."""
+        if guest_type not in GUEST_TYPES:
+            raise ProxmoxValidationError(f"guest_type must be one of {list(GUEST_TYPES)}")
+        if not has_selector(vmids, node, tag, name_pattern):
+            raise ProxmoxValidationError("At least one of vmids, node, tag or name_pattern is required")
+
+        vmids = sorted({int(v) for v in vmids}) if vmids else None
+        guests = select_guests(list_guests(self.client), vmids, node, tag, name_pattern, guest_type)
+        if len(guests) > MAX_SNAPSHOT_TARGETS:
+            raise ProxmoxValidationError(
+                f"Selection matches {len(guests)} guests; at most {MAX_SNAPSHOT_TARGETS} can be targeted at once"
+            )
+        missing = []
+        if vmids:
+            found = {g["vmid"] for g in guests}
+            missing = [
+                self._row({"vmid": v, "name": None, "node": None, "type": None}, None, RESULT_ERROR,
+                          error="Guest not found or excluded by selectors")
+                for v in vmids if v not in found
+            ]
+        return guests, missing
+
+    @staticmethod
+    def _check_common(max_per_node: int, timeout: float) -> None:
+        """Validate the limits shared by create and prune."""
+        if isinstance(max_per_node, bool) or not isinstance(max_per_node, int) \
+                or not 1 <= max_per_node <= MAX_SNAPSHOTS_PER_NODE:
+            raise ProxmoxValidationError(f"max_per_node must be between 1 and {MAX_SNAPSHOTS_PER_NODE}")
+        if isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or timeout <= 0:
+            raise ProxmoxValidationError("timeout must be a positive number of seconds")
+
+    def create(
+        self,
+        snapname: str,
+        vmids: Optional[Iterable[int]] = None,
+        node: Optional[str] = None,
+        tag: Optional[str] = None,
+        name_pattern: Optional[str] = None,
+        guest_type: str = GUEST_TYPE_ALL,
+        description: str = "",
+        vmstate: bool = False,
+        max_per_node: int = DEFAULT_SNAPSHOTS_PER_NODE,
+        timeout: float = DEFAULT_BULK_SNAPSHOT_TIMEOUT_SECONDS
+    ) -> Dict[str, Any]:
+        """Snapshot every selected guest under the same name.
+
+        Args:
+            snapname: Snapshot name
+            vmids: Explicit VMIDs to target
+            node: Only guests on this node
+            tag: Only guests with this tag
+            name_pattern: Shell-style guest name pattern
+            guest_type: 'qemu', 'lxc' or 'all'
+            description: Snapshot description
+            vmstate: Include the RAM of running VMs
+            max_per_node: Snapshot tasks running at once per node
+            timeout: Seconds after which guests not yet snapshotted are skipped
+
+        Returns:
+            Dict with a summary of counts and one result row per guest
+
+        Raises:
+            ProxmoxValidationError: If the name, selectors or limits are invalid,
+                or too many guests are selected
+        """
+        if not validate_snapshot_name(snapname):
+            raise ProxmoxValidationError(f"Invalid snapshot name: {snapname!r}")
+        self._check_common(max_per_node, timeout)
+        guests, rows = self._select(vmids, node, tag, name_pattern, guest_type)
+
+        ops = []
+        for guest in guests:
+            data = {"snapname": snapname}
+            if description:
+                data["description"] = description
+            if vmstate and guest["type"] == GUEST_TYPE_VM:
+                data["vmstate"] = 1
+            endpoint = f"/nodes/{guest['node']}/{guest['type']}/{guest['vmid']}/snapshot"
+            ops.append(("POST", endpoint, data, self._row(guest, snapname, RESULT_SUBMITTED)))
+        rows.extend(self._run_tasks(ops, max_per_node, timeout))
+        return self._result(f"Bulk snapshot '{snapname}'", rows)
+
+    def prune(
+        self,
+        keep_last: Optional[int] = None,
+        keep_within_hours: Optional[float] = None,
+        vmids: Optional[Iterable[int]] = None,
+        node: Optional[str] = None,
+        tag: Optional[str] = None,
+        name_pattern: Optional[str] = None,
+        guest_type: str = GUEST_TYPE_ALL,
+        name_prefix: Optional[str] = None,
+        max_per_node: int = DEFAULT_SNAPSHOTS_PER_NODE,
+        dry_run: bool = False,
+        timeout: float = DEFAULT_BULK_SNAPSHOT_TIMEOUT_SECONDS
+    ) -> Dict[str, Any]:
+        """Delete the snapshots of the selected guests that the policy does not keep.
+
+        A snapshot is kept if it is one of the keep_last newest of its guest
+        or younger than keep_within_hours; snapshots without a creation time
+        are always kept.
+
+        Args:
+            keep_last: Newest snapshots to keep per guest
+            keep_within_hours: Keep snapshots younger than this
+            vmids, node, tag, name_pattern, guest_type: Guest selection
+            name_prefix: Only snapshots whose name starts with this are
+                considered (others are never deleted)
+            max_per_node: Deletion tasks running at once per node
+            dry_run: Only report what would be deleted
+            timeout: Seconds after which remaining deletions are skipped
+
+        Returns:
+            Dict with the policy, per-guest snapshot counts, a summary and
+            one result row per deletion
+
+        Raises:
+            ProxmoxValidationError: If the policy, selectors or limits are invalid
+        """
+        if keep_last is None and keep_within_hours is None:
+            raise ProxmoxValidationError("At least one of keep_last or keep_within_hours is required")
+        if keep_last is not None and (isinstance(keep_last, bool) or not isinstance(keep_last, int) or keep_last < 0):
+            raise ProxmoxValidationError("keep_last must be a non-negative integer")
+        if keep_within_hours is not None and (isinstance(keep_within_hours, bool)
+                                              or not isinstance(keep_within_hours, (int, float))
+                                              or keep_within_hours <= 0):
+            raise ProxmoxValidationError("keep_within_hours must be a positive number")
+        if name_prefix is not None and not validate_snapshot_name(name_prefix):
+            raise ProxmoxValidationError(f"Invalid snapshot name prefix: {name_prefix!r}")
+        self._check_common(max_per_node, timeout)
+        guests, rows = self._select(vmids, node, tag, name_pattern, guest_type)
+
+        cutoff = time.time() - keep_within_hours * 3600 if keep_within_hours is not None else None
+        executor = self.client._get_node_executor()
+        futures = [executor.submit(g["node"], self._list_snapshots, g) for g in guests]
+        ops = []
+        guest_rows = []
+        for future in futures:
+            guest, snapshots, error = future.result()
+            if error:
+                rows.append(self._row(guest, None, RESULT_ERROR, error=f"Listing snapshots failed: {error}"))
+                continue
+            delete = self._expired(snapshots, keep_last, cutoff, name_prefix)
+            guest_rows.append({
+                "vmid": guest["vmid"], "name": guest["name"], "node": guest["node"],
+                "snapshots": len(snapshots), "delete": len(delete),
+            })
+            for snap in delete:
+                endpoint = (f"/nodes/{guest['node']}/{guest['type']}/{guest['vmid']}"
+                            f"/snapshot/{quote(snap['name'], safe='')}")
+                row = self._row(guest, snap["name"], RESULT_PLANNED if dry_run else RESULT_SUBMITTED)
+                row["snaptime"] = snap.get("snaptime")
+                ops.append(("DELETE", endpoint, None, row))
+
+        if dry_run:
+            rows.extend(op[3] for op in ops)
+        else:
+            rows.extend(self._run_tasks(ops, max_per_node, timeout))
+        result = self._result("Snapshot prune" + (" (dry run)" if dry_run else ""), rows)
+        result["dry_run"] = dry_run
+        result["policy"] = {"keep_last": keep_last, "keep_within_hours": keep_within_hours, "name_prefix": name_prefix}
+        result["guests"] = sorted(guest_rows, key=lambda g: g["vmid"])
+        return result
+
+    def _list_snapshots(self, guest: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]], Optional[str]]:
+        """Fetch one guest's snapshots without the 'current' entry (runs on the node executor)."""
+        endpoint = f"/nodes/{guest['node']}/{guest['type']}/{guest['vmid']}/snapshot"
+        try:
+            data = self.client._make_request("GET", endpoint).json().get("data") or []
+        except (ProxmoxConnectionError, ProxmoxTimeoutError, ProxmoxAuthenticationError, ProxmoxAPIError,
+                ProxmoxResourceNotFoundError) as e:
+            return guest, [], str(e)
+        except ValueError as e:
+            return guest, [], f"Invalid JSON response: {e}"
+        return guest, [s for s in data if isinstance(s, dict) and s.get("name") not in (None, CURRENT_SNAPSHOT)], None
+
+    @staticmethod
+    def _expired(snapshots: List[Dict[str, Any]], keep_last: Optional[int], cutoff: Optional[float],
+                 name_prefix: Optional[str]) -> List[Dict[str, Any]]:
+        """Snapshots of one guest the retention policy does not keep, oldest first."""
+        managed = [s for s in snapshots if not name_prefix or s["name"].startswith(name_prefix)]
+        dated = sorted((s for s in managed if s.get("snaptime")), key=lambda s: -int(s["snaptime"]))
+        keep = set()
+        if keep_last is not None:
+            keep.update(s["name"] for s in dated[:keep_last])
+        if cutoff is not None:
+            keep.update(s["name"] for s in dated if int(s["snaptime"]) >= cutoff)
+        return [s for s in reversed(dated) if s["name"] not in keep]
+
+    @staticmethod
+    def _row(guest: Dict[str, Any], snapname: Optional[str], result: str, upid: Optional[str] = None,
+             error: Optional[str] = None) -> Dict[str, Any]:
+        """Build one result row."""
+        return {
+            "vmid": guest["vmid"],
+            "name": guest["name"],
+            "node": guest["node"],
+            "type": guest["type"],
+            "snapname": snapname,
+            "result": result,
+            "upid": upid,
+            "error": error,
+        }
+
+    @staticmethod
+    def _result(label: str, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Summarize result rows."""
+        rows.sort(key=lambda r: (r["vmid"], r.get("snaptime") or 0))
+        summary = {"targets": len(rows)}
+        for row in rows:
+            summary[row["result"]] = summary.get(row["result"], 0) + 1
+        if rows:
+            message = f"{label}: " + ", ".join(f"{v} {k}" for k, v in summary.items() if k != "targets")
+        else:
+            message = f"{label}: nothing to do"
+        return {"status": "success", "summary": summary, "results": rows, "message": message}
+
+    def _run_tasks(self, ops: List[Tuple[str, str, Optional[Dict[str, Any]], Dict[str, Any]]],
+                   max_per_node: int, timeout: float) -> List[Dict[str, Any]]:
+        """Submit task-creating requests within the per-node and per-guest limits until all finish.
+
+        Args:
+            ops: (method, endpoint, data, result row) per request, in submission order
+            max_per_node: Tasks running at once per node
+            timeout: Seconds after which unsubmitted requests are skipped and
+                running tasks are reported as still running
+
+        Returns:
+            The result rows, updated with task outcomes
+        """
+        pending = deque(ops)
+        active: Dict[str, Dict[str, Any]] = {}
+        per_node: Dict[str, int] = {}
+        busy_guests = set()
+        deadline = time.monotonic() + timeout
+        executor = self.client._get_node_executor()
+
+        while pending or active:
+            if time.monotonic() >= deadline:
+                break
+            batch = []
+            for op in list(pending):
+                row = op[3]
+                if per_node.get(row["node"], 0) >= max_per_node or row["vmid"] in busy_guests:
+                    continue
+                pending.remove(op)
+                batch.append(op)
+                per_node[row["node"]] = per_node.get(row["node"], 0) + 1
+                busy_guests.add(row["vmid"])
+
+            futures = [executor.submit(op[3]["node"], self._submit_one, op) for op in batch]
+            for future in futures:
+                row = future.result()
+                if row["upid"]:
+                    active[row["upid"]] = row
+                else:
+                    per_node[row["node"]] -= 1
+                    busy_guests.discard(row["vmid"])
+
+            if not active:
+                continue
+            result = self.client.wait_for_tasks(list(active), 0)
+            if result.get("status") == "success":
+                for task in result["tasks"]:
+                    if task["state"] == TASK_STATE_RUNNING:
+                        continue
+                    row = active.pop(task["upid"])
+                    per_node[row["node"]] -= 1
+                    busy_guests.discard(row["vmid"])
+                    row["exitstatus"] = task["exitstatus"]
+                    row["duration_seconds"] = task["duration_seconds"]
+                    if task["state"] == TASK_STATE_COMPLETED:
+                        row["result"] = RESULT_OK
+                    else:
+                        row["result"] = RESULT_FAILED
+                        row["error"] = task["exitstatus"]
+            else:
+                logger.warning(f"Snapshot task check failed: {result.get('message')}")
+            if active and (not pending or all(per_node.get(op[3]["node"], 0) >= max_per_node
+                                              or op[3]["vmid"] in busy_guests for op in pending)):
+                # Nothing can be submitted until a task finishes
+                time.sleep(self.poll_interval)
+
+        for row in active.values():
+            row["result"] = RESULT_RUNNING
+        for op in pending:
+            op[3]["result"] = RESULT_SKIPPED
+            op[3]["error"] = "Timed out before the request was sent"
+        return [op[3] for op in ops]
+
+    def _submit_one(self, op: Tuple[str, str, Optional[Dict[str, Any]], Dict[str, Any]]) -> Dict[str, Any]:
+        """Send one request and record its UPID (or error) in the row."""
+        method, endpoint, data, row = op
+        try:
+            kwargs = {"data": data} if data is not None else {}
+            upid = self.client._make_request(method, endpoint, **kwargs).json().get("data")
+        except (ProxmoxConnectionError, ProxmoxTimeoutError, ProxmoxAuthenticationError, ProxmoxAPIError,
+                ProxmoxResourceNotFoundError) as e:
+            row["result"] = RESULT_ERROR
+            row["error"] = str(e)
+            return row
+        except ValueError as e:
+            row["result"] = RESULT_ERROR
+            row["error"] = f"Invalid JSON response: {e}"
+            return row
+        if isinstance(upid, str) and upid:
+            row["upid"] = upid
+        else:
+            # No task to track: treat the request itself as the outcome
+            row["result"] = RESULT_OK
+        return row
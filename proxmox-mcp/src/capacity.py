@@ -0,0 +1,380 @@
+"""Cluster capacity summary and node placement recommendations.
+
+CapacityPlanner answers "which node has room for this guest?" without the
+caller querying every node itself:
+
+- ``GET /nodes/{node}/status`` and ``GET /nodes/{node}/storage`` are fetched
+  for all nodes in parallel on the client's node executor
+- the resulting snapshot is cached for ``cache_ttl`` seconds, so a burst of
+  creates costs one cluster scan
+- each node's free CPU (cores not in use), free memory and free space per
+  storage are derived from the snapshot
+- recommend_node() keeps the nodes with enough CPUs, free memory and
+  storage, and ranks them by the smallest remaining headroom fraction (CPU
+  or memory) after placement, which spreads guests across the cluster
+- reserve() subtracts a placement from the cached snapshot, so back-to-back
+  placements inside one cache window see each other; reserve_best() ranks
+  and reserves in one step, so concurrent placements cannot pick the same
+  headroom, and release() hands back a placement that was not used
+
+Example usage:
+    planner = CapacityPlanner(client)
+    best = planner.recommend_node(cores=4, memory=8192, storage_gb=50)
+"""
+
+import json
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .exceptions import (
+    ProxmoxConnectionError,
+    ProxmoxAuthenticationError,
+    ProxmoxAPIError,
+    ProxmoxResourceNotFoundError,
+    ProxmoxTimeoutError,
+    ProxmoxValidationError,
+)
+from .utils.validation import (
+    MAX_CPU_CORES,
+    MAX_MEMORY_MB,
+    is_valid_storage_name,
+)
+
+try:
+    from .utils.mcp_logging import get_logger
+    logger = get_logger(__name__)
+except ImportError:
+    import logging
+    logger = logging.getLogger(__name__)
+
+# Seconds a capacity snapshot is reused before nodes are queried again
+DEFAULT_CAPACITY_CACHE_SECONDS = 15
+
+# Storage content type that can hold VM disks
+DISK_CONTENT_TYPE = "images"
+
+# Number of ranked candidates returned by recommend_node
+MAX_CANDIDATES = 5
+
+_MIB = 1024 * 1024
+_GIB = 1024 * _MIB
+
+
+def _node_capacity(node: str, status: Dict[str, Any], storages: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Derive headroom figures from a node's /status and /storage data."""
+    cpus = int((status.get("cpuinfo") or {}).get("cpus") or 0)
+    cpu_usage = float(status.get("cpu") or 0.0)
+    memory = status.get("memory") or {}
+    mem_total = int(memory.get("total") or 0)
+    mem_used = int(memory.get("used") or 0)
+
+    storage = {}
+    for entry in storages:
+        if not entry.get("storage") or not entry.get("active", 1) or not entry.get("enabled", 1):
+            continue
+        content = [c.strip() for c in str(entry.get("content", "")).split(",") if c.strip()]
+        storage[entry["storage"]] = {
+            "type": entry.get("type"),
+            "shared": bool(entry.get("shared")),
+            "disk_images": DISK_CONTENT_TYPE in content,
+            "total_gb": round(int(entry.get("total") or 0) / _GIB, 2),
+            "free_gb": round(int(entry.get("avail") or 0) / _GIB, 2),
+        }
+
+    return {
+        "node": node,
+        "cpus": cpus,
+        "cpu_usage": round(cpu_usage, 4),
+        "cpu_free_cores": round(cpus * max(0.0, 1.0 - cpu_usage), 2),
+        "memory_total_mb": mem_total // _MIB,
+        "memory_free_mb": max(0, mem_total - mem_used) // _MIB,
+        "loadavg": status.get("loadavg"),
+        "storage": storage,
+    }
+
+
+class CapacityPlanner:
+    """Cached per-node headroom and placement ranking.
+
+    Thread-safe: the snapshot is replaced and adjusted under one lock, and
+    only one thread refreshes an expired snapshot while others wait for it.
+    """
+
+    def __init__(self, client: Any, cache_ttl: float = DEFAULT_CAPACITY_CACHE_SECONDS):
+        """
+        Initialize the planner. No request is made until the first query.
+
+        Args:
+            client: ProxmoxClient used for the node queries
+            cache_ttl: Seconds a snapshot is reused
+        """
+        self.client = client
+        self.cache_ttl = cache_ttl
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._nodes: Dict[str, Dict[str, Any]] = {}
+        self._failed: List[Dict[str, str]] = []
+        self._fetched_at: Optional[float] = None
+        # Bumped on every refresh; reservations only apply to their own snapshot
+        self._generation = 0
+
+    def _fetch_node(self, node: str) -> Tuple[str, List[Dict[str, Any]], Optional[str]]:
+        """Fetch status and storage of one node (runs on the node executor)."""
+        try:
+            status = self.client._make_request('GET', f'/nodes/{node}/status').json().get('data') or {}
+            storages = self.client._make_request('GET', f'/nodes/{node}/storage').json().get('data') or []
+        except json.JSONDecodeError as e:
+            return (node, [], f"JSON parse error: {e}")
+        except (ProxmoxConnectionError, ProxmoxTimeoutError, ProxmoxAuthenticationError, ProxmoxAPIError,
+                ProxmoxResourceNotFoundError) as e:
+            logger.debug(f"Failed to get capacity of node {node}: {e}")
+            return (node, [], str(e))
+        return (node, [_node_capacity(node, status, storages)], None)
+
+    def snapshot(self, max_age: Optional[float] = None) -> Dict[str, Any]:
+        """Get the per-node capacity snapshot, refreshing it when expired.
+
+        Args:
+            max_age: Maximum acceptable age in seconds (default: cache_ttl;
+                0 forces a refresh)
+
+        Returns:
+            Dict with nodes (node name -> capacity), failed_nodes and age_seconds
+
+        Raises:
+            ProxmoxAPIError: If the node list cannot be read or every node fails;
+                also connection/timeout/auth errors
+        """
+        self._ensure_fresh(max_age)
+        with self._lock:
+            return {
+                "nodes": {name: dict(node, storage=dict(node["storage"])) for name, node in self._nodes.items()},
+                "failed_nodes": list(self._failed),
+                "age_seconds": round(time.monotonic() - self._fetched_at, 3),
+            }
+
+    def _ensure_fresh(self, max_age: Optional[float] = None) -> None:
+        """Refresh the snapshot if it is older than max_age (default: cache_ttl)."""
+        max_age = self.cache_ttl if max_age is None else max_age
+        if not self._is_fresh(max_age):
+            with self._refresh_lock:
+                # Another thread may have refreshed while we waited
+                if not self._is_fresh(max_age):
+                    self._refresh()
+
+    def _is_fresh(self, max_age: float) -> bool:
+        with self._lock:
+            return self._fetched_at is not None and time.monotonic() - self._fetched_at < max_age
+
+    def _refresh(self) -> None:
+        items, successful, failed, node_count = self.client._fan_out_nodes(self._fetch_node)
+        if node_count and not successful:
+            raise ProxmoxAPIError(f"Failed to get capacity from all {node_count} nodes: {failed}")
+        with self._lock:
+            self._nodes = {item["node"]: item for item in items}
+            self._failed = failed
+            self._fetched_at = time.monotonic()
+            self._generation += 1
+        if failed:
+            logger.warning(f"Capacity snapshot is missing {len(failed)} node(s): {[f['node'] for f in failed]}")
+
+    def invalidate(self) -> None:
+        """Drop the cached snapshot; the next query refreshes it."""
+        with self._lock:
+            self._fetched_at = None
+
+    def reserve(self, node: str, cores: int, memory: int, storage: Optional[str] = None,
+                storage_gb: float = 0) -> Dict[str, Any]:
+        """Subtract a placement from the cached snapshot until the next refresh.
+
+        Returns:
+            The reservation, for release()
+        """
+        with self._lock:
+            return self._reserve_locked(node, cores, memory, storage, storage_gb)
+
+    def _reserve_locked(self, node: str, cores: int, memory: int, storage: Optional[str],
+                        storage_gb: float) -> Dict[str, Any]:
+        reservation = {
+            "node": node,
+            "cores": cores,
+            "memory": memory,
+            "storage": storage,
+            "storage_gb": storage_gb,
+            "generation": self._generation,
+        }
+        self._adjust(reservation, -1)
+        return reservation
+
+    def release(self, reservation: Dict[str, Any]) -> None:
+        """Hand back a reservation whose guest was not created.
+
+        Other reservations stay in place. A reservation made before the last
+        refresh is already gone from the snapshot and is ignored.
+        """
+        with self._lock:
+            if reservation["generation"] == self._generation:
+                self._adjust(reservation, 1)
+
+    def _adjust(self, reservation: Dict[str, Any], sign: int) -> None:
+        """Add (sign=1) or subtract (sign=-1) a reservation; the lock must be held."""
+        capacity = self._nodes.get(reservation["node"])
+        if capacity is None:
+            return
+        capacity["cpu_free_cores"] = round(max(0.0, capacity["cpu_free_cores"] + sign * reservation["cores"]), 2)
+        capacity["memory_free_mb"] = max(0, capacity["memory_free_mb"] + sign * reservation["memory"])
+        storage = reservation["storage"]
+        if storage and storage in capacity["storage"] and reservation["storage_gb"]:
+            entry = dict(capacity["storage"][storage])
+            entry["free_gb"] = round(max(0.0, entry["free_gb"] + sign * reservation["storage_gb"]), 2)
+            capacity["storage"] = dict(capacity["storage"], **{storage: entry})
+
+    def summary(self) -> Dict[str, Any]:
+        """Get per-node headroom plus cluster totals."""
+        snapshot = self.snapshot()
+        nodes = sorted(snapshot["nodes"].values(), key=lambda n: n["node"])
+        return {
+            "nodes": nodes,
+            "totals": {
+                "nodes": len(nodes),
+                "cpus": sum(n["cpus"] for n in nodes),
+                "cpu_free_cores": round(sum(n["cpu_free_cores"] for n in nodes), 2),
+                "memory_total_mb": sum(n["memory_total_mb"] for n in nodes),
+                "memory_free_mb": sum(n["memory_free_mb"] for n in nodes),
+            },
+            "failed_nodes": snapshot["failed_nodes"],
+            "age_seconds": snapshot["age_seconds"],
+        }
+
+    def recommend_node(self, cores: int = 1, memory: int = 512, storage_gb: float = 0,
+                       storage: Optional[str] = None) -> Dict[str, Any]:
+        """Rank the nodes that can fit a new guest.
+
+        Args:
+            cores: vCPUs of the guest; a node needs at least this many CPUs.
+                CPU is overcommitted, so busy CPUs lower a node's rank but do
+                not exclude it; memory and storage are hard limits
+            memory: Memory of the guest in MB
+            storage_gb: Disk space needed in GB (0 = no storage requirement)
+            storage: Storage that must hold the disk (default: any active
+                storage on the node that accepts disk images)
+
+        Returns:
+            Dict with the best node (None if nothing fits), the ranked
+            candidates and the reason each other node was rejected
+
+        Raises:
+            ProxmoxValidationError: If a requirement is out of range
+        """
+        self._validate_requirements(cores, memory, storage_gb, storage)
+        self._ensure_fresh()
+        with self._lock:
+            return self._recommend_locked(cores, memory, storage_gb, storage)
+
+    def reserve_best(self, cores: int = 1, memory: int = 512, storage_gb: float = 0,
+                     storage: Optional[str] = None) -> Dict[str, Any]:
+        """Pick the best node for a new guest and reserve it in the same step.
+
+        Ranking and reservation happen under one lock, so concurrent callers
+        see each other's placements. Arguments and result are as for
+        recommend_node(), plus "reservation" (None if nothing fits) to
+        release() if the guest is not created.
+
+        Raises:
+            ProxmoxValidationError: If a requirement is out of range
+        """
+        self._validate_requirements(cores, memory, storage_gb, storage)
+        self._ensure_fresh()
+        with self._lock:
+            result = self._recommend_locked(cores, memory, storage_gb, storage)
+            result["reservation"] = None
+            if result["node"] is not None:
+                result["reservation"] = self._reserve_locked(
+                    result["node"], cores, memory, result["storage"], storage_gb
+                )
+            return result
+
+    @staticmethod
+    def _validate_requirements(cores: int, memory: int, storage_gb: float, storage: Optional[str]) -> None:
+        if isinstance(cores, bool) or not isinstance(cores, int) or not 1 <= cores <= MAX_CPU_CORES:
+            raise ProxmoxValidationError(f"cores must be between 1 and {MAX_CPU_CORES}")
+        if isinstance(memory, bool) or not isinstance(memory, int) or not 1 <= memory <= MAX_MEMORY_MB:
+            raise ProxmoxValidationError(f"memory must be between 1 and {MAX_MEMORY_MB} MB")
+        if isinstance(storage_gb, bool) or not isinstance(storage_gb, (int, float)) or storage_gb < 0:
+            raise ProxmoxValidationError("storage_gb must be a non-negative number")
+        if storage is not None and not is_valid_storage_name(storage):
+            raise ProxmoxValidationError(f"Invalid storage name: {storage!r}")
+
+    def _recommend_locked(self, cores: int, memory: int, storage_gb: float,
+                          storage: Optional[str]) -> Dict[str, Any]:
+        """Rank the current snapshot; the lock must be held."""
+        candidates, rejected = self.rank_nodes(self._nodes, cores, memory, storage_gb, storage)
+        return {
+            "node": candidates[0]["node"] if candidates else None,
+            "storage": candidates[0]["storage"] if candidates else None,
+            "candidates": candidates[:MAX_CANDIDATES],
+            "rejected": rejected,
+            "failed_nodes": list(self._failed),
+            # None if invalidate() ran since the refresh
+            "age_seconds": round(time.monotonic() - self._fetched_at, 3) if self._fetched_at is not None else None,
+        }
+
+    @classmethod
+    def rank_nodes(cls, nodes: Dict[str, Dict[str, Any]], cores: int, memory: int, storage_gb: float = 0,
+                   storage: Optional[str] = None) -> Tuple[List[Dict[str, Any]], List[Dict[str, str]]]:
+        """Rank snapshot nodes for a guest, best first.
+
+        Args:
+            nodes: Node name -> capacity, as in snapshot()["nodes"]
+            cores: vCPUs of the guest
+            memory: Memory of the guest in MB
+            storage_gb: Disk space needed in GB (0 = no storage requirement)
+            storage: Storage that must hold the disk (optional)
+
+        Returns:
+            Tuple of (candidates sorted by score, rejected nodes with reasons)
+        """
+        candidates = []
+        rejected = []
+        for name, node in sorted(nodes.items()):
+            reason, chosen_storage = cls._check_fit(node, cores, memory, storage_gb, storage)
+            if reason:
+                rejected.append({"node": name, "reason": reason})
+                continue
+            cpu_left = (node["cpu_free_cores"] - cores) / node["cpus"]
+            mem_left = (node["memory_free_mb"] - memory) / node["memory_total_mb"]
+            candidates.append({
+                "node": name,
+                "score": round(min(cpu_left, mem_left), 4),
+                "storage": chosen_storage,
+                "cpu_free_cores": node["cpu_free_cores"],
+                "memory_free_mb": node["memory_free_mb"],
+            })
+        candidates.sort(key=lambda c: (-c["score"], c["node"]))
+        return candidates, rejected
+
+    @staticmethod
+    def _check_fit(node: Dict[str, Any], cores: int, memory: int, storage_gb: float,
+                   storage: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+        """Return (rejection reason or None, storage the disk would use)."""
+        if node["cpus"] < cores:
+            return f"only {node['cpus']} CPUs", None
+        if not node["memory_total_mb"] or node["memory_free_mb"] < memory:
+            return f"only {node['memory_free_mb']} MB memory free", None
+        if not storage_gb and not storage:
+            return None, None
+
+        if storage:
+            entry = node["storage"].get(storage)
+            if entry is None:
+                return f"storage '{storage}' not available", None
+            if entry["free_gb"] < storage_gb:
+                return f"only {entry['free_gb']} GB free on '{storage}'", None
+            return None, storage
+
+        usable = [(entry["free_gb"], name) for name, entry in node["storage"].items()
+                  if entry["disk_images"] and entry["free_gb"] >= storage_gb]
+        if not usable:
+            return f"no disk-image storage with {storage_gb} GB free", None
+        return None, max(usable)[1]
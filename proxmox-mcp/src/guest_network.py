@@ -0,0 +1,385 @@
+"""Guest IP discovery through the QEMU guest agent, with a reverse IP index.
+
+Proxmox only knows a VM's addresses through its guest agent
+(``GET /nodes/{node}/qemu/{vmid}/agent/network-get-interfaces``), one
+request per VM; containers report theirs through
+``GET /nodes/{node}/lxc/{vmid}/interfaces``. GuestNetworkIndex answers
+"which guest owns 10.1.2.3" without crawling the cluster on every question:
+
+- running guests are queried in parallel on the client's node executor,
+  each request with a short timeout and without retries, since agents are
+  often not installed or not running; agent errors are reported per guest
+  and never count towards the client's circuit breaker
+- every guest's answer (addresses or agent error) is cached for ``ttl``
+  seconds; a discovery only queries guests whose entry is missing, stale
+  or on another node (migrated)
+- a reverse index maps each address to the guests reporting it, so lookups
+  are a dict access; a lookup only triggers a discovery if the index was
+  never built, or the address is unknown and the index is stale
+- loopback, link-local and unspecified addresses are ignored
+
+Example usage:
+    index = GuestNetworkIndex(client)
+    index.discover(tag="prod")
+    index.lookup("10.1.2.3")["matches"]
+"""
+
+import ipaddress
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .exceptions import (
+    ProxmoxConnectionError,
+    ProxmoxAuthenticationError,
+    ProxmoxAPIError,
+    ProxmoxTimeoutError,
+    ProxmoxResourceNotFoundError,
+    ProxmoxValidationError,
+)
+from .guest_selection import GUEST_TYPE_ALL, GUEST_TYPE_VM, GUEST_TYPES, list_guests, select_guests
+
+try:
+    from .utils.mcp_logging import get_logger
+    logger = get_logger(__name__)
+except ImportError:
+    import logging
+    logger = logging.getLogger(__name__)
+
+# Seconds a guest's addresses (or agent error) are reused before it is queried again
+GUEST_NETWORK_TTL_SECONDS = 300
+
+# Timeout of a single guest agent request; a missing agent must not hold up the others
+GUEST_AGENT_TIMEOUT_SECONDS = 3.0
+
+# Parsed lookup arguments (IPv4 or IPv6)
+IPAddress = Union[ipaddress.IPv4Address, ipaddress.IPv6Address]
+IPNetwork = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+# Interfaces that never carry a guest's own address
+_IGNORED_INTERFACES = ("lo",)
+
+
+def parse_address(address: str) -> Tuple[Optional[IPAddress], Optional[IPNetwork]]:
+    """Parse a lookup argument: a single address or a network in CIDR notation.
+
+    Returns:
+        (address, None) or (None, network)
+
+    Raises:
+        ProxmoxValidationError: If the value is neither
+    """
+    if not isinstance(address, str) or not address.strip():
+        raise ProxmoxValidationError(f"Invalid IP address: {address!r}")
+    try:
+        if "/" in address:
+            return None, ipaddress.ip_network(address.strip(), strict=False)
+        return ipaddress.ip_address(address.strip()), None
+    except ValueError as e:
+        raise ProxmoxValidationError(f"Invalid IP address: {address!r}") from e
+
+
+def _usable(ip: IPAddress) -> bool:
+    """Whether an address identifies the guest (not loopback/link-local/unspecified)."""
+    return not (ip.is_loopback or ip.is_link_local or ip.is_unspecified)
+
+
+def _qemu_interfaces(data: Any) -> List[Dict[str, Any]]:
+    """Reduce a network-get-interfaces answer to name, MAC and addresses per interface."""
+    result = data.get("result") if isinstance(data, dict) else data
+    interfaces = []
+    for entry in result if isinstance(result, list) else []:
+        if not isinstance(entry, dict):
+            continue
+        addresses = []
+        for addr in entry.get("ip-addresses") or []:
+            if isinstance(addr, dict) and addr.get("ip-address"):
+                prefix = addr.get("prefix")
+                addresses.append(f"{addr['ip-address']}/{prefix}" if prefix is not None else addr["ip-address"])
+        interfaces.append({"name": entry.get("name"), "mac": entry.get("hardware-address"), "addresses": addresses})
+    return interfaces
+
+
+def _lxc_interfaces(data: Any) -> List[Dict[str, Any]]:
+    """Reduce a container's interface list (inet/inet6 strings or ip-addresses) to the same shape."""
+    interfaces = []
+    for entry in data if isinstance(data, list) else []:
+        if not isinstance(entry, dict):
+            continue
+        if entry.get("ip-addresses"):
+            reduced = _qemu_interfaces([entry])[0]
+            reduced["mac"] = entry.get("hwaddr") or reduced["mac"]
+            interfaces.append(reduced)
+            continue
+        addresses = [entry[key] for key in ("inet", "inet6") if entry.get(key)]
+        interfaces.append({"name": entry.get("name"), "mac": entry.get("hwaddr"), "addresses": addresses})
+    return interfaces
+
+
+def _clean_interfaces(interfaces: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Drop ignored interfaces and unusable or malformed addresses."""
+    cleaned = []
+    for iface in interfaces:
+        if iface["name"] in _IGNORED_INTERFACES:
+            continue
+        addresses = []
+        for value in iface["addresses"]:
+            try:
+                ip = ipaddress.ip_interface(value).ip
+            except ValueError:
+                continue
+            if _usable(ip):
+                addresses.append(value)
+        if addresses:
+            cleaned.append({**iface, "addresses": addresses})
+    return cleaned
+
+
+class _GuestAddresses:
+    """Cached discovery result of one guest."""
+
+    def __init__(self, guest: Dict[str, Any], interfaces: List[Dict[str, Any]], error: Optional[str]):
+        self.vmid = guest["vmid"]
+        self.name = guest["name"]
+        self.node = guest["node"]
+        self.type = guest["type"]
+        self.interfaces = interfaces
+        self.error = error
+        self.fetched_at = time.monotonic()
+
+    def ips(self) -> List[str]:
+        """Addresses of all interfaces, without prefix length."""
+        return [str(ipaddress.ip_interface(a).ip) for iface in self.interfaces for a in iface["addresses"]]
+
+    def to_dict(self, now: float) -> Dict[str, Any]:
+        """Result row for this guest."""
+        return {
+            "vmid": self.vmid,
+            "name": self.name,
+            "node": self.node,
+            "type": self.type,
+            "ips": self.ips(),
+            "interfaces": self.interfaces,
+            "error": self.error,
+            "age_seconds": round(now - self.fetched_at, 3),
+        }
+
+
+class GuestNetworkIndex:
+    """Caches guest addresses and indexes them by IP.
+
+    Thread-safe: the cache and the reverse index are replaced under one lock;
+    agent requests are made without it.
+    """
+
+    def __init__(self, client: Any, ttl: float = GUEST_NETWORK_TTL_SECONDS,
+                 agent_timeout: float = GUEST_AGENT_TIMEOUT_SECONDS):
+        """
+        Initialize the index. No request is made until the first discovery.
+
+        Args:
+            client: ProxmoxClient used for the inventory and agent requests
+            ttl: Seconds a guest's discovery result is reused
+            agent_timeout: Timeout of a single agent request in seconds
+        """
+        self.client = client
+        self.ttl = ttl
+        self.agent_timeout = agent_timeout
+        self._lock = threading.Lock()
+        self._entries: Dict[int, _GuestAddresses] = {}
+        self._by_ip: Dict[str, List[Tuple[int, str, Optional[str], str]]] = {}
+        # Monotonic time of the last cluster-wide discovery (None: never)
+        self._indexed_at: Optional[float] = None
+
+    def discover(
+        self,
+        vmids: Optional[Iterable[int]] = None,
+        node: Optional[str] = None,
+        tag: Optional[str] = None,
+        name_pattern: Optional[str] = None,
+        guest_type: str = GUEST_TYPE_ALL,
+        refresh: bool = False
+    ) -> Dict[str, Any]:
+        """Discover the addresses of running guests; all guests if no selector is given.
+
+        Args:
+            vmids: Explicit VMIDs
+            node: Only guests on this node
+            tag: Only guests with this tag
+            name_pattern: Shell-style guest name pattern
+            guest_type: 'qemu', 'lxc' or 'all'
+            refresh: Query every selected guest even if its cached result is fresh
+
+        Returns:
+            Dict with a summary of counts and one row per running guest
+            (addresses, interfaces, agent error and age of the result)
+
+        Raises:
+            ProxmoxValidationError: If guest_type is invalid
+            ProxmoxAPIError: If the inventory cannot be listed; also connection/timeout/auth errors
+        """
+        if guest_type not in GUEST_TYPES:
+            raise ProxmoxValidationError(f"guest_type must be one of {list(GUEST_TYPES)}")
+        everything = not (vmids or node or tag or name_pattern) and guest_type == GUEST_TYPE_ALL
+        guests = list_guests(self.client)
+        selected = select_guests(guests, vmids, node, tag, name_pattern, guest_type)
+        running = [g for g in selected if g["status"] == "running"]
+
+        now = time.monotonic()
+        with self._lock:
+            stale = [
+                g for g in running
+                if refresh or g["vmid"] not in self._entries
+                or self._entries[g["vmid"]].node != g["node"]
+                or now - self._entries[g["vmid"]].fetched_at >= self.ttl
+            ]
+
+        fetched = self._query(stale)
+
+        with self._lock:
+            for entry in fetched:
+                self._entries[entry.vmid] = entry
+            # Stopped guests no longer hold their addresses; after a full
+            # discovery, guests that were removed are dropped as well
+            gone = {g["vmid"] for g in selected if g["status"] != "running"}
+            if everything:
+                alive = {g["vmid"] for g in guests}
+                gone.update(v for v in self._entries if v not in alive)
+            for vmid in gone:
+                self._entries.pop(vmid, None)
+            self._rebuild()
+            if everything:
+                self._indexed_at = time.monotonic()
+            now = time.monotonic()
+            rows = [self._entries[g["vmid"]].to_dict(now) for g in running if g["vmid"] in self._entries]
+
+        summary = {
+            "guests": len(rows),
+            "queried": len(stale),
+            "cached": len(rows) - len(stale),
+            "with_addresses": sum(1 for row in rows if row["ips"]),
+            "agent_errors": sum(1 for row in rows if row["error"]),
+            "not_running": len(selected) - len(running),
+        }
+        logger.debug(f"Guest IP discovery: {summary}")
+        return {
+            "status": "success",
+            "summary": summary,
+            "guests": rows,
+            "message": f"{summary['with_addresses']} of {len(rows)} running guest(s) reported addresses "
+                       f"({summary['queried']} queried, {summary['agent_errors']} agent error(s))",
+        }
+
+    def lookup(self, address: str) -> Dict[str, Any]:
+        """Find the guests that report an address, or any address in a network.
+
+        Answered from the reverse index. The cluster is only discovered if
+        the index was never built, or nothing matched and the last full
+        discovery is older than ttl (only stale guests are queried then).
+
+        Args:
+            address: IP address ('10.1.2.3') or network ('10.1.2.0/24')
+
+        Returns:
+            Dict with the matching guests (VMID, name, node, interface, MAC,
+            address with prefix) and the age of the index
+
+        Raises:
+            ProxmoxValidationError: If the address is invalid
+            ProxmoxAPIError: If a discovery was needed and the inventory cannot be listed
+        """
+        ip, network = parse_address(address)
+        refreshed = False
+        if self._indexed_at is None:
+            self.discover()
+            refreshed = True
+        matches = self._match(ip, network)
+        if not matches and not refreshed and time.monotonic() - self._indexed_at >= self.ttl:
+            self.discover()
+            refreshed = True
+            matches = self._match(ip, network)
+
+        with self._lock:
+            indexed_guests = len(self._entries)
+            errors = sum(1 for entry in self._entries.values() if entry.error)
+        result = {
+            "status": "success",
+            "address": str(ip or network),
+            "matches": matches,
+            "refreshed": refreshed,
+            "index_age_seconds": round(time.monotonic() - self._indexed_at, 3),
+            "indexed_guests": indexed_guests,
+        }
+        owners = {m["vmid"] for m in matches}
+        if ip is not None and len(owners) > 1:
+            result["warning"] = f"Address is reported by {len(owners)} guests (duplicate IP?)"
+        if not matches:
+            result["message"] = f"No guest reports {result['address']}"
+            if errors:
+                result["message"] += f"; {errors} running guest(s) could not be queried (no guest agent?)"
+        return result
+
+    def _match(self, ip: Optional[IPAddress], network: Optional[IPNetwork]) -> List[Dict[str, Any]]:
+        """Index entries for an address, or for every address inside a network."""
+        with self._lock:
+            if ip is not None:
+                hits = [(str(ip), owner) for owner in self._by_ip.get(str(ip), [])]
+            else:
+                hits = [
+                    (key, owner) for key, owners in self._by_ip.items()
+                    if ipaddress.ip_address(key) in network for owner in owners
+                ]
+            now = time.monotonic()
+            matches = []
+            for key, (vmid, iface, mac, cidr) in hits:
+                entry = self._entries[vmid]
+                matches.append({
+                    "ip": key,
+                    "address": cidr,
+                    "vmid": vmid,
+                    "name": entry.name,
+                    "node": entry.node,
+                    "type": entry.type,
+                    "interface": iface,
+                    "mac": mac,
+                    "age_seconds": round(now - entry.fetched_at, 3),
+                })
+        matches.sort(key=lambda m: (ipaddress.ip_address(m["ip"]).version, ipaddress.ip_address(m["ip"]), m["vmid"]))
+        return matches
+
+    def _rebuild(self) -> None:
+        """Rebuild the reverse index from the cache (lock held)."""
+        by_ip: Dict[str, List[Tuple[int, str, Optional[str], str]]] = {}
+        for vmid in sorted(self._entries):
+            for iface in self._entries[vmid].interfaces:
+                for cidr in iface["addresses"]:
+                    key = str(ipaddress.ip_interface(cidr).ip)
+                    by_ip.setdefault(key, []).append((vmid, iface["name"], iface["mac"], cidr))
+        self._by_ip = by_ip
+
+    def _query(self, guests: List[Dict[str, Any]]) -> List[_GuestAddresses]:
+        """Query the agents of many guests in parallel on the node executor."""
+        if not guests:
+            return []
+        executor = self.client._get_node_executor()
+        futures = [executor.submit(g["node"], self._query_one, g) for g in guests]
+        return [future.result() for future in futures]
+
+    def _query_one(self, guest: Dict[str, Any]) -> _GuestAddresses:
+        """Fetch one guest's interfaces; errors are recorded, not raised."""
+        if guest["type"] == GUEST_TYPE_VM:
+            endpoint = f"/nodes/{guest['node']}/qemu/{guest['vmid']}/agent/network-get-interfaces"
+        else:
+            endpoint = f"/nodes/{guest['node']}/lxc/{guest['vmid']}/interfaces"
+        try:
+            response = self.client._make_guest_request('GET', endpoint, timeout=self.agent_timeout)
+            data = response.json().get("data")
+        except ProxmoxTimeoutError:
+            return _GuestAddresses(guest, [], f"No answer within {self.agent_timeout}s")
+        except (ProxmoxConnectionError, ProxmoxAuthenticationError, ProxmoxResourceNotFoundError,
+                ProxmoxAPIError) as e:
+            return _GuestAddresses(guest, [], str(e))
+        except ValueError as e:
+            return _GuestAddresses(guest, [], f"Invalid JSON response: {e}")
+        parse = _qemu_interfaces if guest["type"] == GUEST_TYPE_VM else _lxc_interfaces
+        return _GuestAddresses(guest, _clean_interfaces(parse(data)), None)
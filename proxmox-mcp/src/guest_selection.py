@@ -0,0 +1,137 @@
+"""Guest (VM and container) inventory and selector matching.
+
+Bulk tools address guests either by an explicit VMID list or by selectors:
+node, tag and a shell-style name pattern. Selectors are combined with AND.
+
+Example usage:
+    guests = list_guests(client)
+    targets = select_guests(guests, node="pve1", tag="web", name_pattern="web-*")
+"""
+
+import fnmatch
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+from .exceptions import (
+    ProxmoxConnectionError,
+    ProxmoxAPIError,
+    ProxmoxTimeoutError,
+    ProxmoxResourceNotFoundError,
+)
+
+# Guest type filter values accepted by selectors
+GUEST_TYPE_ALL = "all"
+GUEST_TYPE_VM = "qemu"
+GUEST_TYPE_CONTAINER = "lxc"
+GUEST_TYPES = (GUEST_TYPE_ALL, GUEST_TYPE_VM, GUEST_TYPE_CONTAINER)
+
+# Proxmox stores tags as one string separated by ';' (older versions also use ',' or spaces)
+_TAG_SEPARATORS = re.compile(r'[;,\s]+')
+
+
+def _parse_tags(tags: Any) -> List[str]:
+    """Split a Proxmox tag string into a list of tags."""
+    if isinstance(tags, list):
+        return [str(t) for t in tags if t]
+    if not tags:
+        return []
+    return [t for t in _TAG_SEPARATORS.split(str(tags)) if t]
+
+
+def _normalize_guest(item: Dict[str, Any], guest_type: Optional[str] = None) -> Dict[str, Any]:
+    """Reduce a guest listing entry to the fields selectors and bulk tools use."""
+    return {
+        "vmid": int(item["vmid"]),
+        "name": item.get("name", ""),
+        "node": item.get("node"),
+        "type": guest_type or item.get("type", GUEST_TYPE_VM),
+        "status": item.get("status"),
+        "tags": _parse_tags(item.get("tags")),
+        "template": bool(item.get("template")),
+        "maxcpu": int(item.get("maxcpu") or item.get("cpus") or 0),
+        "maxmem": int(item.get("maxmem") or 0),
+    }
+
+
+def list_guests(client: Any) -> List[Dict[str, Any]]:
+    """List every VM and container in the cluster.
+
+    Uses a single /cluster/resources request and falls back to the per-node
+    list_vms/list_containers queries if that endpoint is unavailable.
+
+    Args:
+        client: ProxmoxClient
+
+    Returns:
+        List of dicts with vmid, name, node, type ('qemu' or 'lxc'), status,
+        tags (list), template (bool), maxcpu and maxmem (bytes)
+    """
+    try:
+        resources = client.get_cluster_resources("vm")
+    except (ProxmoxResourceNotFoundError, ProxmoxConnectionError, ProxmoxTimeoutError, ProxmoxAPIError):
+        resources = None
+
+    if resources is not None:
+        return [
+            _normalize_guest(r) for r in resources
+            if r.get("type") in (GUEST_TYPE_VM, GUEST_TYPE_CONTAINER) and r.get("vmid") is not None
+        ]
+
+    guests = [_normalize_guest(vm, GUEST_TYPE_VM) for vm in client.list_vms() if vm.get("vmid") is not None]
+    guests.extend(
+        _normalize_guest(ct, GUEST_TYPE_CONTAINER) for ct in client.list_containers() if ct.get("vmid") is not None
+    )
+    return guests
+
+
+def has_selector(
+    vmids: Optional[Iterable[int]] = None,
+    node: Optional[str] = None,
+    tag: Optional[str] = None,
+    name_pattern: Optional[str] = None
+) -> bool:
+    """Check whether at least one targeting criterion was given."""
+    return bool(vmids) or bool(node) or bool(tag) or bool(name_pattern)
+
+
+def select_guests(
+    guests: List[Dict[str, Any]],
+    vmids: Optional[Iterable[int]] = None,
+    node: Optional[str] = None,
+    tag: Optional[str] = None,
+    name_pattern: Optional[str] = None,
+    guest_type: str = GUEST_TYPE_ALL,
+    include_templates: bool = False
+) -> List[Dict[str, Any]]:
+    """Filter guests by VMID list and selectors (all criteria must match).
+
+    Args:
+        guests: Output of list_guests
+        vmids: Only these VMIDs
+        node: Only guests on this node
+        tag: Only guests carrying this tag (case-insensitive)
+        name_pattern: Shell-style pattern matched against the guest name
+        guest_type: 'qemu', 'lxc' or 'all'
+        include_templates: Whether templates can be selected
+
+    Returns:
+        Matching guests sorted by VMID
+    """
+    wanted = {int(v) for v in vmids} if vmids else None
+    tag = tag.lower() if tag else None
+    selected = []
+    for guest in guests:
+        if wanted is not None and guest["vmid"] not in wanted:
+            continue
+        if node and guest["node"] != node:
+            continue
+        if guest_type != GUEST_TYPE_ALL and guest["type"] != guest_type:
+            continue
+        if tag and tag not in (t.lower() for t in guest["tags"]):
+            continue
+        if name_pattern and not fnmatch.fnmatchcase(guest["name"] or "", name_pattern):
+            continue
+        if guest["template"] and not include_templates:
+            continue
+        selected.append(guest)
+    return sorted(selected, key=lambda g: g["vmid"])
@@ -1,9 +1,30 @@
-"""HTTP server for Proxmox MCP Server."""
+"""HTTP server for Proxmox MCP Server.
+
+Serves the tools of the stdio server (working_proxmox_server.py) over
+HTTP: tool definitions and dispatch come from the same
+WorkingProxmoxMCPServer, configured from environment variables instead of
+config.json. That script lives next to src/ rather than inside it, so this
+module puts the project directory on sys.path before importing it; the
+script must ship alongside src/ (the Docker image copies both).
+
+ProxmoxClient is synchronous, so every call that touches Proxmox (tool
+calls, the health check, startup) runs in a sized thread pool and the event
+loop only awaits it. Concurrent callers are served in parallel up to
+MAX_CONCURRENT_REQUESTS; a bounded number more may wait for a worker, and
+requests beyond that are answered with 503 instead of queueing without limit.
+
+Example usage:
+    PROXMOX_HOST=pve.example.com PROXMOX_API_TOKEN=root@pam!mcp=... \\
+    SECRET_KEY=... python -m src.http_server
+"""
 
 import asyncio
-import json
+import functools
 import os
-from typing import Any, Dict, Optional
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, List, Optional
 
 from fastapi import FastAPI, HTTPException, Depends, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -11,12 +32,22 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import uvicorn
 
-from .server import ProxmoxMCPServer
+# working_proxmox_server.py is a top-level script; make it importable whatever
+# the current directory is (python -m src.http_server, uvicorn from elsewhere)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from working_proxmox_server import PENDING_REQUESTS_PER_WORKER, WorkingProxmoxMCPServer
 from .auth import AuthManager
-from .utils.mcp_logging import get_logger, setup_logging
+from .exceptions import ProxmoxError
+from .utils.mcp_logging import get_logger, setup_mcp_logging
 
 logger = get_logger(__name__)
 
+# Worker threads for blocking Proxmox calls. Higher than the stdio default:
+# an HTTP front end serves several callers, and the client's node executor
+# still bounds the requests each Proxmox node receives.
+DEFAULT_HTTP_MAX_CONCURRENT_REQUESTS = 16
+
 # Security
 security = HTTPBearer()
 
@@ -36,25 +67,35 @@ class ToolCallResponse(BaseModel):
     content: str
     error: Optional[str] = None
 
-# FastAPI app
-app = FastAPI(
-    title="Proxmox MCP Server",
-    description="HTTP-based Model Context Protocol server for Proxmox VE management",
-    version="1.0.0"
-)
-
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
 
 # Global variables
-proxmox_server: Optional[ProxmoxMCPServer] = None
+proxmox_server: Optional[WorkingProxmoxMCPServer] = None
 auth_manager: Optional[AuthManager] = None
+executor: Optional[ThreadPoolExecutor] = None
+# Tool definitions never change at runtime; listed once at startup
+tool_definitions: List[Dict[str, Any]] = []
+# Blocking calls submitted to the executor and not finished yet (event loop only)
+pending_calls = 0
+
+
+def load_env_config() -> Dict[str, Any]:
+    """Build the server configuration from environment variables.
+
+    Keys match config.json of the stdio server, so WorkingProxmoxMCPServer
+    uses them unchanged; secret_key is only used by the HTTP layer.
+    """
+    return {
+        "host": os.getenv("PROXMOX_HOST"),
+        "port": int(os.getenv("PROXMOX_PORT", "8006")),
+        "protocol": os.getenv("PROXMOX_PROTOCOL", "https"),
+        "username": os.getenv("PROXMOX_USERNAME"),
+        "password": os.getenv("PROXMOX_PASSWORD"),
+        "api_token": os.getenv("PROXMOX_API_TOKEN") or None,
+        "realm": os.getenv("PROXMOX_REALM", "pve"),
+        "ssl_verify": os.getenv("PROXMOX_SSL_VERIFY", "true").lower() == "true",
+        "max_concurrent_requests": os.getenv("MAX_CONCURRENT_REQUESTS", str(DEFAULT_HTTP_MAX_CONCURRENT_REQUESTS)),
+        "secret_key": os.getenv("SECRET_KEY"),
+    }
 
 
 def get_auth_manager() -> AuthManager:
@@ -64,13 +105,36 @@ def get_auth_manager() -> AuthManager:
     return auth_manager
 
 
-def get_proxmox_server() -> ProxmoxMCPServer:
+def get_proxmox_server() -> WorkingProxmoxMCPServer:
     """Get the Proxmox MCP server."""
-    if proxmox_server is None:
+    if proxmox_server is None or executor is None:
         raise HTTPException(status_code=500, detail="Proxmox server not initialized")
     return proxmox_server
 
 
+async def run_blocking(func: Callable[..., Any], *args: Any) -> Any:
+    """Run a blocking call in the worker pool without blocking the event loop.
+
+    Raises:
+        HTTPException: 503 if every worker is busy and the backlog is full
+    """
+    global pending_calls
+    if executor is None:
+        raise HTTPException(status_code=500, detail="Proxmox server not initialized")
+    max_workers = proxmox_server.max_concurrent_requests if proxmox_server else 1
+    if pending_calls >= max_workers * (1 + PENDING_REQUESTS_PER_WORKER):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server busy, retry later",
+            headers={"Retry-After": "1"},
+        )
+    pending_calls += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(executor, functools.partial(func, *args))
+    finally:
+        pending_calls -= 1
+
+
 async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Dict[str, Any]:
     """Verify JWT token and return payload."""
     auth_mgr = get_auth_manager()
@@ -84,53 +148,99 @@ async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(secur
     return payload
 
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize the server on startup."""
-    global proxmox_server, auth_manager
-    
-    # Setup logging
-    setup_logging(
-        level=os.getenv("LOG_LEVEL", "INFO"),
-        format_type=os.getenv("LOG_FORMAT", "json")
-    )
-    
-    # Configuration
-    config = {
-        "host": os.getenv("PROXMOX_HOST"),
-        "port": int(os.getenv("PROXMOX_PORT", "8006")),
-        "protocol": os.getenv("PROXMOX_PROTOCOL", "https"),
-        "username": os.getenv("PROXMOX_USERNAME"),
-        "password": os.getenv("PROXMOX_PASSWORD"),
-        "api_token": os.getenv("PROXMOX_API_TOKEN"),
-        "realm": os.getenv("PROXMOX_REALM", "pve"),
-        "verify_ssl": os.getenv("PROXMOX_SSL_VERIFY", "true").lower() == "true",
-        "secret_key": os.getenv("SECRET_KEY"),
-    }
-    
+async def start_server(config: Dict[str, Any]) -> None:
+    """Create the worker pool, the auth manager and the MCP server.
+
+    Configuration errors are logged and leave the server uninitialized, so
+    the process stays up and /health reports the problem.
+    """
+    global proxmox_server, auth_manager, executor, tool_definitions
+
     # Validate required configuration
     if not config["host"]:
         logger.error("PROXMOX_HOST environment variable is required")
         return
-    
+
     if not config["api_token"] and (not config["username"] or not config["password"]):
         logger.error("Either PROXMOX_API_TOKEN or PROXMOX_USERNAME/PROXMOX_PASSWORD is required")
         return
-    
+
     if not config["secret_key"]:
         logger.error("SECRET_KEY environment variable is required")
         return
-    
+
     try:
-        # Initialize components
+        # Initialize components; the server tests the connection, so build it off the loop
         auth_manager = AuthManager(config)
-        proxmox_server = ProxmoxMCPServer(config)
-        
-        logger.info("Proxmox MCP HTTP server initialized successfully")
-    except Exception as e:
+        loop = asyncio.get_running_loop()
+        server = await loop.run_in_executor(None, WorkingProxmoxMCPServer, config)
+        executor = ThreadPoolExecutor(
+            max_workers=server.max_concurrent_requests, thread_name_prefix="mcp-http"
+        )
+        tool_definitions = server._list_tools()["tools"]
+        proxmox_server = server
+
+        logger.info(
+            f"Proxmox MCP HTTP server initialized with {len(tool_definitions)} tools "
+            f"and {server.max_concurrent_requests} workers"
+        )
+    except ProxmoxError as e:
         logger.error(f"Failed to initialize server: {e}")
 
 
+async def stop_server() -> None:
+    """Cancel queued calls and release the Proxmox client."""
+    global proxmox_server, executor
+    pool, executor = executor, None
+    server, proxmox_server = proxmox_server, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+    if server is not None:
+        server.cleanup()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize the server on startup and clean up on shutdown."""
+    # Setup logging
+    setup_mcp_logging("proxmox-mcp", level=os.getenv("LOG_LEVEL", "INFO"))
+
+    await start_server(load_env_config())
+    try:
+        yield
+    finally:
+        await stop_server()
+
+
+# FastAPI app
+app = FastAPI(
+    title="Proxmox MCP Server",
+    description="HTTP-based Model Context Protocol server for Proxmox VE management",
+    version="1.0.0",
+    lifespan=lifespan
+)
+
+# CORS middleware
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+
+async def dispatch_tool(name: str, arguments: Optional[Dict[str, Any]]) -> ToolCallResponse:
+    """Run a tool of the MCP server in the worker pool and flatten its text content."""
+    server = get_proxmox_server()
+    result = await run_blocking(server._call_tool, name, arguments or {})
+
+    content = "".join(item.get("text", "") for item in result.get("content", []) if item.get("type") == "text")
+    if result.get("isError"):
+        return ToolCallResponse(content=content, error=content)
+    return ToolCallResponse(content=content)
+
+
 @app.get("/")
 async def root():
     """Root endpoint with server information."""
@@ -145,36 +255,42 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
+    if proxmox_server is None or proxmox_server.proxmox_client is None:
+        return {"status": "error", "message": "Server not initialized"}
+
     try:
-        if proxmox_server is None:
-            return {"status": "error", "message": "Server not initialized"}
-        
         # Test Proxmox connection
-        connection_test = await proxmox_server.proxmox_client.test_connection()
-        
-        return {
-            "status": "healthy" if connection_test["status"] == "success" else "unhealthy",
-            "proxmox_connection": connection_test,
-            "timestamp": asyncio.get_event_loop().time()
-        }
+        connection_test = await run_blocking(proxmox_server.proxmox_client.test_connection)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Health check failed: {e}")
         return {"status": "error", "message": str(e)}
 
+    return {
+        "status": "healthy" if connection_test["status"] == "success" else "unhealthy",
+        "proxmox_connection": connection_test,
+        "pending_calls": pending_calls,
+        "max_concurrent_requests": proxmox_server.max_concurrent_requests,
+        "timestamp": asyncio.get_running_loop().time()
+    }
+
 
 @app.post("/auth/login")
 async def login(request: LoginRequest):
     """Login endpoint to get JWT token."""
     auth_mgr = get_auth_manager()
-    
-    # For now, we'll use a simple authentication
-    # In production, you might want to validate against Proxmox or a user database
-    expected_credentials = {
-        "username": os.getenv("MCP_USERNAME", "admin"),
-        "password_hash": auth_mgr.get_password_hash(os.getenv("MCP_PASSWORD", "admin"))
-    }
-    
-    if auth_mgr.authenticate_user(request.username, request.password, expected_credentials):
+
+    def check_credentials() -> bool:
+        # bcrypt is deliberately slow: keep it off the event loop
+        expected_credentials = {
+            "username": os.getenv("MCP_USERNAME", "admin"),
+            "password_hash": auth_mgr.get_password_hash(os.getenv("MCP_PASSWORD", "admin"))
+        }
+        return auth_mgr.authenticate_user(request.username, request.password, expected_credentials)
+
+    # Not run_blocking: login must not depend on Proxmox or queue behind tool calls
+    if await asyncio.get_running_loop().run_in_executor(None, check_credentials):
         token_data = {
             "sub": request.username,
             "type": "user",
@@ -194,14 +310,14 @@ async def login(request: LoginRequest):
 async def create_token(request: TokenRequest):
     """Create a token using admin token."""
     auth_mgr = get_auth_manager()
-    
+
     # Validate admin token (you might want to implement proper admin token validation)
     if request.admin_token != os.getenv("ADMIN_TOKEN", "admin-token-change-this"):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid admin token"
         )
-    
+
     token_data = {
         "sub": "admin",
         "type": "admin",
@@ -229,18 +345,8 @@ async def mcp_initialize(payload: Dict[str, Any] = Depends(verify_token)):
 @app.post("/mcp/tools/list")
 async def mcp_list_tools(payload: Dict[str, Any] = Depends(verify_token)):
     """List available MCP tools."""
-    server = get_proxmox_server()
-    
-    # Get tools from the server
-    tools = []
-    for tool_name, tool_info in server.server._tools.items():
-        tools.append({
-            "name": tool_name,
-            "description": tool_info["description"],
-            "inputSchema": tool_info["inputSchema"]
-        })
-    
-    return {"tools": tools}
+    get_proxmox_server()
+    return {"tools": tool_definitions}
 
 
 @app.post("/mcp/tools/call")
@@ -249,50 +355,14 @@ async def mcp_call_tool(
     payload: Dict[str, Any] = Depends(verify_token)
 ):
     """Call an MCP tool."""
-    server = get_proxmox_server()
-    
-    try:
-        # Create a mock MCP request
-        from mcp.types import CallToolRequest
-        mcp_request = CallToolRequest(
-            name=request.name,
-            arguments=request.arguments or {}
-        )
-        
-        # Call the tool
-        result = await server._call_tool(mcp_request)
-        
-        # Extract content from result
-        content = ""
-        if result.content:
-            for item in result.content:
-                if hasattr(item, 'text'):
-                    content += item.text
-        
-        return ToolCallResponse(content=content)
-        
-    except Exception as e:
-        logger.error(f"Error calling tool {request.name}: {e}")
-        return ToolCallResponse(
-            content="",
-            error=str(e)
-        )
+    return await dispatch_tool(request.name, request.arguments)
 
 
 @app.get("/tools")
 async def list_tools(payload: Dict[str, Any] = Depends(verify_token)):
     """List available tools (alternative endpoint)."""
-    server = get_proxmox_server()
-    
-    tools = []
-    for tool_name, tool_info in server.server._tools.items():
-        tools.append({
-            "name": tool_name,
-            "description": tool_info["description"],
-            "inputSchema": tool_info["inputSchema"]
-        })
-    
-    return {"tools": tools}
+    get_proxmox_server()
+    return {"tools": tool_definitions}
 
 
 @app.post("/tools/{tool_name}")
@@ -302,31 +372,8 @@ async def call_tool(
     payload: Dict[str, Any] = Depends(verify_token)
 ):
     """Call a specific tool (alternative endpoint)."""
-    server = get_proxmox_server()
-    
-    try:
-        # Create a mock MCP request
-        from mcp.types import CallToolRequest
-        mcp_request = CallToolRequest(
-            name=tool_name,
-            arguments=arguments or {}
-        )
-        
-        # Call the tool
-        result = await server._call_tool(mcp_request)
-        
-        # Extract content from result
-        content = ""
-        if result.content:
-            for item in result.content:
-                if hasattr(item, 'text'):
-                    content += item.text
-        
-        return {"content": content, "error": None}
-        
-    except Exception as e:
-        logger.error(f"Error calling tool {tool_name}: {e}")
-        return {"content": "", "error": str(e)}
+    response = await dispatch_tool(tool_name, arguments)
+    return {"content": response.content, "error": response.error}
 
 
 def run_server():
@@ -334,9 +381,9 @@ def run_server():
     port = int(os.getenv("SERVER_PORT", "8000"))
     host = os.getenv("SERVER_HOST", "0.0.0.0")
     debug = os.getenv("DEBUG", "false").lower() == "true"
-    
+
     logger.info(f"Starting Proxmox MCP HTTP server on {host}:{port}")
-    
+
     uvicorn.run(
         "src.http_server:app",
         host=host,
@@ -0,0 +1,316 @@
+"""Indexed in-memory cluster inventory with incremental refresh.
+
+ClusterInventory mirrors ``GET /cluster/resources`` (VMs, containers, nodes
+and storage) in memory and keeps hash indexes by VMID, name, tag, node and
+resource type, so lookups never touch the API:
+
+- a background thread refreshes the inventory every ``refresh_interval``
+  seconds with one /cluster/resources request
+- each refresh is applied as a diff against the previous snapshot: removed
+  resources are unindexed, new ones indexed, and changed ones only re-indexed
+  when an indexed field (vmid, name, tags, node, type) changed; counter-only
+  changes (cpu, mem, uptime, ...) just replace the stored entry
+- lookups intersect index buckets and cost O(size of the result)
+
+Example usage:
+    inventory = ClusterInventory(client, refresh_interval=30)
+    inventory.refresh()
+    inventory.start()
+    vms = inventory.lookup(tag="web", node="pve1")
+"""
+
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from .exceptions import (
+    ProxmoxConnectionError,
+    ProxmoxAuthenticationError,
+    ProxmoxAPIError,
+    ProxmoxTimeoutError,
+)
+from .guest_selection import _parse_tags
+
+try:
+    from .utils.mcp_logging import get_logger
+    logger = get_logger(__name__)
+except ImportError:
+    import logging
+    logger = logging.getLogger(__name__)
+
+# Default seconds between background refreshes
+DEFAULT_INVENTORY_REFRESH_SECONDS = 30
+
+# Resource types held by the inventory (values of the /cluster/resources 'type' field)
+INVENTORY_TYPES = ("qemu", "lxc", "node", "storage")
+
+# Fields whose change requires re-indexing a resource
+_INDEXED_FIELDS = ("vmid", "name", "tags", "node", "type")
+
+# Errors a refresh may raise; the previous snapshot stays in place
+_REFRESH_ERRORS = (ProxmoxConnectionError, ProxmoxTimeoutError, ProxmoxAuthenticationError, ProxmoxAPIError)
+
+
+def _resource_id(resource: Dict[str, Any]) -> Optional[str]:
+    """Return the stable key of a /cluster/resources entry, e.g. 'qemu/100'."""
+    resource_id = resource.get("id")
+    if resource_id:
+        return str(resource_id)
+    if resource.get("type") in ("qemu", "lxc") and resource.get("vmid") is not None:
+        return f"{resource['type']}/{resource['vmid']}"
+    if resource.get("type") == "node" and resource.get("node"):
+        return f"node/{resource['node']}"
+    if resource.get("type") == "storage" and resource.get("storage"):
+        return f"storage/{resource.get('node')}/{resource['storage']}"
+    return None
+
+
+class ClusterInventory:
+    """Cluster resources held in memory with vmid/name/tag/node/type indexes.
+
+    Thread-safe: refreshes apply their diff under a lock and lookups read
+    under the same lock, so a lookup never sees a half-applied refresh.
+    """
+
+    def __init__(self, client: Any, refresh_interval: float = DEFAULT_INVENTORY_REFRESH_SECONDS):
+        """
+        Initialize an empty inventory. No request is made until refresh().
+
+        Args:
+            client: ProxmoxClient used for /cluster/resources
+            refresh_interval: Seconds between background refreshes
+        """
+        self.client = client
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._resources: Dict[str, Dict[str, Any]] = {}
+        self._by_vmid: Dict[int, str] = {}
+        self._by_name: Dict[str, Set[str]] = {}
+        self._by_tag: Dict[str, Set[str]] = {}
+        self._by_node: Dict[str, Set[str]] = {}
+        self._by_type: Dict[str, Set[str]] = {}
+
+        self.generation = 0
+        self._refreshed_at: Optional[float] = None
+        self._last_diff: Dict[str, int] = {"added": 0, "removed": 0, "updated": 0, "reindexed": 0}
+        self._last_error: Optional[str] = None
+        self._refresh_count = 0
+        self._error_count = 0
+        self._last_refresh_seconds: Optional[float] = None
+
+        # Serializes refreshes (background thread vs. on-demand) without blocking lookups
+        self._refresh_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def loaded(self) -> bool:
+        """Whether at least one refresh has succeeded."""
+        return self._refreshed_at is not None
+
+    def refresh(self) -> Dict[str, int]:
+        """Fetch /cluster/resources once and apply the changes.
+
+        Returns:
+            Diff counts: added, removed, updated (any field changed) and
+            reindexed (an indexed field changed)
+
+        Raises:
+            ProxmoxAPIError: If the request or response parsing fails (the
+                previous snapshot is kept); also connection/timeout/auth errors
+        """
+        with self._refresh_lock:
+            started = time.monotonic()
+            try:
+                resources = self.client.get_cluster_resources()
+            except _REFRESH_ERRORS as e:
+                with self._lock:
+                    self._last_error = str(e)
+                    self._error_count += 1
+                raise
+
+            snapshot: Dict[str, Dict[str, Any]] = {}
+            for resource in resources:
+                if resource.get("type") not in INVENTORY_TYPES:
+                    continue
+                resource_id = _resource_id(resource)
+                if resource_id:
+                    snapshot[resource_id] = resource
+
+            with self._lock:
+                diff = self._apply(snapshot)
+                self.generation += 1
+                self._refreshed_at = time.monotonic()
+                self._last_diff = diff
+                self._last_error = None
+                self._refresh_count += 1
+                self._last_refresh_seconds = round(self._refreshed_at - started, 3)
+            if any(diff.values()):
+                logger.debug(f"Inventory refresh {self.generation}: {diff}")
+            return diff
+
+    def _apply(self, snapshot: Dict[str, Dict[str, Any]]) -> Dict[str, int]:
+        """Apply a new snapshot as a diff (called with the lock held)."""
+        diff = {"added": 0, "removed": 0, "updated": 0, "reindexed": 0}
+
+        for resource_id in [r for r in self._resources if r not in snapshot]:
+            self._unindex(resource_id, self._resources.pop(resource_id))
+            diff["removed"] += 1
+
+        for resource_id, resource in snapshot.items():
+            old = self._resources.get(resource_id)
+            if old is None:
+                self._resources[resource_id] = resource
+                self._index(resource_id, resource)
+                diff["added"] += 1
+            elif old != resource:
+                if any(old.get(f) != resource.get(f) for f in _INDEXED_FIELDS):
+                    self._unindex(resource_id, old)
+                    self._index(resource_id, resource)
+                    diff["reindexed"] += 1
+                self._resources[resource_id] = resource
+                diff["updated"] += 1
+        return diff
+
+    @staticmethod
+    def _add(index: Dict[Any, Set[str]], key: Any, resource_id: str) -> None:
+        index.setdefault(key, set()).add(resource_id)
+
+    @staticmethod
+    def _discard(index: Dict[Any, Set[str]], key: Any, resource_id: str) -> None:
+        bucket = index.get(key)
+        if bucket is not None:
+            bucket.discard(resource_id)
+            if not bucket:
+                del index[key]
+
+    def _index_keys(self, resource: Dict[str, Any]) -> Iterable[tuple]:
+        """Yield (index, key) pairs a resource is filed under."""
+        if resource.get("vmid") is not None and resource.get("type") in ("qemu", "lxc"):
+            if resource.get("name"):
+                yield self._by_name, str(resource["name"]).lower()
+            for tag in _parse_tags(resource.get("tags")):
+                yield self._by_tag, tag.lower()
+        if resource.get("node"):
+            yield self._by_node, resource["node"]
+        yield self._by_type, resource.get("type")
+
+    def _index(self, resource_id: str, resource: Dict[str, Any]) -> None:
+        if resource.get("vmid") is not None and resource.get("type") in ("qemu", "lxc"):
+            self._by_vmid[int(resource["vmid"])] = resource_id
+        for index, key in self._index_keys(resource):
+            self._add(index, key, resource_id)
+
+    def _unindex(self, resource_id: str, resource: Dict[str, Any]) -> None:
+        if resource.get("vmid") is not None and self._by_vmid.get(int(resource["vmid"])) == resource_id:
+            del self._by_vmid[int(resource["vmid"])]
+        for index, key in self._index_keys(resource):
+            self._discard(index, key, resource_id)
+
+    def get(self, vmid: int) -> Optional[Dict[str, Any]]:
+        """Look up a VM or container by VMID."""
+        with self._lock:
+            resource_id = self._by_vmid.get(int(vmid))
+            return dict(self._resources[resource_id]) if resource_id else None
+
+    def lookup(
+        self,
+        vmid: Optional[int] = None,
+        name: Optional[str] = None,
+        tag: Optional[str] = None,
+        node: Optional[str] = None,
+        resource_type: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Find resources matching all given criteria using the indexes.
+
+        Args:
+            vmid: VMID of a VM or container
+            name: Exact guest name (case-insensitive)
+            tag: Guest tag (case-insensitive)
+            node: Node name
+            resource_type: 'qemu', 'lxc', 'node' or 'storage'
+
+        Returns:
+            Copies of the matching resources sorted by id; every resource if
+            no criterion is given
+        """
+        with self._lock:
+            buckets: List[Set[str]] = []
+            if vmid is not None:
+                resource_id = self._by_vmid.get(int(vmid))
+                buckets.append({resource_id} if resource_id else set())
+            if name:
+                buckets.append(self._by_name.get(name.lower(), set()))
+            if tag:
+                buckets.append(self._by_tag.get(tag.lower(), set()))
+            if node:
+                buckets.append(self._by_node.get(node, set()))
+            if resource_type:
+                buckets.append(self._by_type.get(resource_type, set()))
+
+            if not buckets:
+                matches: Set[str] = set(self._resources)
+            else:
+                buckets.sort(key=len)
+                matches = set(buckets[0])
+                for bucket in buckets[1:]:
+                    matches &= bucket
+            return [dict(self._resources[r]) for r in sorted(matches)]
+
+    def status(self) -> Dict[str, Any]:
+        """Get inventory freshness, sizes and refresh counters."""
+        with self._lock:
+            counts = {t: len(self._by_type.get(t, ())) for t in INVENTORY_TYPES}
+            return {
+                "loaded": self._refreshed_at is not None,
+                "background_refresh": self._thread is not None and self._thread.is_alive(),
+                "refresh_interval_seconds": self.refresh_interval,
+                "generation": self.generation,
+                "age_seconds": (
+                    round(time.monotonic() - self._refreshed_at, 3) if self._refreshed_at is not None else None
+                ),
+                "counts": counts,
+                "index_sizes": {
+                    "vmid": len(self._by_vmid),
+                    "name": len(self._by_name),
+                    "tag": len(self._by_tag),
+                    "node": len(self._by_node),
+                },
+                "last_diff": dict(self._last_diff),
+                "last_refresh_seconds": self._last_refresh_seconds,
+                "refreshes": self._refresh_count,
+                "errors": self._error_count,
+                "last_error": self._last_error,
+            }
+
+    def start(self) -> None:
+        """Start the background refresh thread (no-op if already running)."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="proxmox-inventory", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the background refresh thread.
+
+        Args:
+            timeout: Seconds to wait for the thread to exit (None waits until
+                an in-flight refresh finishes, 0 does not wait)
+        """
+        self._stop_event.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread() and timeout != 0:
+            thread.join(timeout)
+
+    def _run(self) -> None:
+        """Background loop: refresh every refresh_interval until stopped."""
+        while not self._stop_event.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except _REFRESH_ERRORS as e:
+                logger.warning(f"Inventory refresh failed, keeping previous snapshot: {e}")
+            except Exception as e:
+                # Never let the refresh thread die on an unexpected error
+                logger.exception(f"Unexpected error refreshing inventory: {e}")
@@ -0,0 +1,246 @@
+"""Incremental tailing of Proxmox task logs and node syslogs.
+
+Both ``GET /nodes/{node}/tasks/{upid}/log`` and ``GET /nodes/{node}/syslog``
+return numbered lines and accept ``start`` (0-based line offset) and
+``limit``. LogTailer keeps one cursor per stream, so following a long
+vzdump or migration log costs O(new lines) per call instead of fetching the
+whole log again:
+
+- each call requests lines from the stream's cursor onwards, in pages of
+  at most TAIL_PAGE_LINES, and advances the cursor past what it returned
+- the first call on a task log starts at line 0; the first call on a
+  syslog starts ``initial_lines`` before the end (like ``tail -n``)
+- if a stream shrinks below its cursor (journal rotated), the cursor is
+  reset to the tail of the new content
+- the most recent lines of every stream are kept in a bounded ring buffer
+  and can be read back without an API request
+- at most MAX_LOG_STREAMS cursors are kept; the least recently used stream
+  is forgotten first
+
+Example usage:
+    tailer = LogTailer(client)
+    first = tailer.tail_task_log(upid)        # everything so far
+    more = tailer.tail_task_log(upid)         # only lines written since
+"""
+
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional
+from urllib.parse import quote
+
+from .exceptions import ProxmoxValidationError
+from .task_tracker import parse_upid
+from .utils.validation import is_valid_node_name, is_valid_service_name
+
+try:
+    from .utils.mcp_logging import get_logger
+    logger = get_logger(__name__)
+except ImportError:
+    import logging
+    logger = logging.getLogger(__name__)
+
+# Default and maximum number of new lines returned by one tail call
+DEFAULT_TAIL_LINES = 500
+MAX_TAIL_LINES = 5000
+
+# Lines requested per API call (the 'limit' parameter)
+TAIL_PAGE_LINES = 1000
+
+# Lines of existing syslog returned by the first call on a stream
+DEFAULT_SYSLOG_INITIAL_LINES = 100
+
+# Recent lines kept per stream for history reads
+DEFAULT_LOG_BUFFER_LINES = 1000
+
+# Streams whose cursor is kept (least recently used is evicted)
+MAX_LOG_STREAMS = 256
+
+
+class _LogStream:
+    """Cursor and recent-line ring buffer of one log stream."""
+
+    def __init__(self, endpoint: str, params: Dict[str, Any], initial_lines: Optional[int], buffer_lines: int):
+        self.endpoint = endpoint
+        self.params = params
+        self.initial_lines = initial_lines
+        self.cursor: Optional[int] = None
+        self.total: Optional[int] = None
+        self.buffer: Deque[Dict[str, Any]] = deque(maxlen=buffer_lines)
+        # Serializes tails of this stream so two callers never read the same lines
+        self.lock = threading.Lock()
+
+
+class LogTailer:
+    """Per-stream cursors over Proxmox task logs and syslogs.
+
+    Thread-safe: the stream table is guarded by one lock and each stream has
+    its own lock, so different streams are tailed concurrently.
+    """
+
+    def __init__(self, client: Any, buffer_lines: int = DEFAULT_LOG_BUFFER_LINES, max_streams: int = MAX_LOG_STREAMS):
+        """
+        Initialize the tailer. No request is made until the first tail.
+
+        Args:
+            client: ProxmoxClient used for the log requests
+            buffer_lines: Recent lines kept per stream
+            max_streams: Streams whose cursor is kept
+        """
+        self.client = client
+        self.buffer_lines = buffer_lines
+        self.max_streams = max_streams
+        self._lock = threading.Lock()
+        self._streams: "OrderedDict[str, _LogStream]" = OrderedDict()
+
+    def tail_task_log(
+        self,
+        upid: str,
+        max_lines: int = DEFAULT_TAIL_LINES,
+        reset: bool = False,
+        history: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Return the lines of a task log written since the previous call.
+
+        Args:
+            upid: Task ID; the node is taken from the UPID
+            max_lines: Maximum new lines to return
+            reset: Forget the cursor and start from the beginning
+            history: Instead of fetching, return up to this many buffered lines
+
+        Raises:
+            ProxmoxValidationError: If the UPID or a limit is invalid
+            ProxmoxAPIError: If the request fails; also connection/timeout/auth errors
+        """
+        node = parse_upid(upid)["node"]
+        endpoint = f"/nodes/{node}/tasks/{quote(upid, safe='')}/log"
+        return self._tail(f"task:{upid}", endpoint, {}, None, max_lines, reset, history)
+
+    def tail_syslog(
+        self,
+        node: str,
+        service: Optional[str] = None,
+        max_lines: int = DEFAULT_TAIL_LINES,
+        initial_lines: int = DEFAULT_SYSLOG_INITIAL_LINES,
+        reset: bool = False,
+        history: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Return the syslog lines of a node written since the previous call.
+
+        Args:
+            node: Node name
+            service: Only entries of this systemd unit (optional)
+            max_lines: Maximum new lines to return
+            initial_lines: Existing lines returned by the first call
+            reset: Forget the cursor and start again from the tail
+            history: Instead of fetching, return up to this many buffered lines
+
+        Raises:
+            ProxmoxValidationError: If the node, service or a limit is invalid
+            ProxmoxAPIError: If the request fails; also connection/timeout/auth errors
+        """
+        if not is_valid_node_name(node):
+            raise ProxmoxValidationError(f"Invalid node name: {node!r}")
+        if service is not None and not is_valid_service_name(service):
+            raise ProxmoxValidationError(f"Invalid service name: {service!r}")
+        if isinstance(initial_lines, bool) or not isinstance(initial_lines, int) \
+                or not 0 <= initial_lines <= MAX_TAIL_LINES:
+            raise ProxmoxValidationError(f"initial_lines must be between 0 and {MAX_TAIL_LINES}")
+        params = {"service": service} if service else {}
+        key = f"syslog:{node}" + (f":{service}" if service else "")
+        return self._tail(key, f"/nodes/{node}/syslog", params, initial_lines, max_lines, reset, history)
+
+    def _stream(self, key: str, endpoint: str, params: Dict[str, Any], initial_lines: Optional[int],
+                reset: bool) -> _LogStream:
+        """Get or create the stream for key, marking it most recently used."""
+        with self._lock:
+            stream = self._streams.get(key)
+            if stream is None or reset:
+                stream = _LogStream(endpoint, params, initial_lines, self.buffer_lines)
+                self._streams[key] = stream
+            self._streams.move_to_end(key)
+            while len(self._streams) > self.max_streams:
+                evicted, _ = self._streams.popitem(last=False)
+                logger.debug(f"Dropped log cursor for {evicted}")
+            return stream
+
+    def _tail(self, key: str, endpoint: str, params: Dict[str, Any], initial_lines: Optional[int],
+              max_lines: int, reset: bool, history: Optional[int]) -> Dict[str, Any]:
+        """Advance the stream's cursor (or read its buffer) and build the result."""
+        if isinstance(max_lines, bool) or not isinstance(max_lines, int) or not 1 <= max_lines <= MAX_TAIL_LINES:
+            raise ProxmoxValidationError(f"max_lines must be between 1 and {MAX_TAIL_LINES}")
+        if history is not None and (isinstance(history, bool) or not isinstance(history, int) or history < 1):
+            raise ProxmoxValidationError("history must be a positive integer")
+
+        stream = self._stream(key, endpoint, params, initial_lines, reset)
+        with stream.lock:
+            if history is not None:
+                lines = list(stream.buffer)[-history:]
+                return {
+                    "status": "success",
+                    "stream": key,
+                    "source": "buffer",
+                    "lines": [line["t"] for line in lines],
+                    "next_start": stream.cursor,
+                    "total": stream.total,
+                }
+
+            rotated = False
+            if stream.cursor is None:
+                stream.cursor = self._initial_cursor(stream)
+            lines: List[Dict[str, Any]] = []
+            first_line = stream.cursor
+            while len(lines) < max_lines:
+                limit = min(TAIL_PAGE_LINES, max_lines - len(lines))
+                page, total = self._fetch(stream, stream.cursor, limit)
+                if total is not None and total < stream.cursor:
+                    # The log shrank under us (journal rotation): restart at its tail
+                    rotated = True
+                    stream.cursor = max(0, total - (stream.initial_lines or 0))
+                    first_line = stream.cursor
+                    lines = []
+                    continue
+                stream.total = total
+                lines.extend(page)
+                stream.cursor += len(page)
+                if len(page) < limit or (total is not None and stream.cursor >= total):
+                    break
+
+            stream.buffer.extend(lines)
+            more = stream.total is not None and stream.cursor < stream.total
+            return {
+                "status": "success",
+                "stream": key,
+                "source": "api",
+                "lines": [line["t"] for line in lines],
+                "first_line": first_line,
+                "next_start": stream.cursor,
+                "total": stream.total,
+                "more": more,
+                "rotated": rotated,
+            }
+
+    def _initial_cursor(self, stream: _LogStream) -> int:
+        """Starting offset of a new stream: 0, or initial_lines before the end."""
+        if stream.initial_lines is None:
+            return 0
+        _, total = self._fetch(stream, 0, 1)
+        return max(0, (total or 0) - stream.initial_lines)
+
+    def _fetch(self, stream: _LogStream, start: int, limit: int):
+        """Request one page; returns (lines, total) with lines as {'n', 't'} dicts."""
+        response = self.client._make_request(
+            'GET', stream.endpoint, params={**stream.params, "start": start, "limit": limit}
+        )
+        payload = response.json()
+        data = payload.get("data") or []
+        total = payload.get("total")
+        lines = [
+            {"n": entry.get("n"), "t": entry.get("t", "")}
+            for entry in data if isinstance(entry, dict)
+        ]
+        total = int(total) if total is not None else None
+        # An empty page (empty log, or no lines past the offset) is reported
+        # as a single "no content" line numbered 1
+        if len(lines) == 1 and lines[0]["n"] == 1 and lines[0]["t"] == "no content":
+            return [], (total if start > 0 else 0)
+        return lines, total
@@ -0,0 +1,326 @@
+"""RRD performance metrics for nodes, VMs and containers.
+
+Proxmox keeps round-robin time series for every node and guest, served by
+``GET /nodes/{node}/rrddata`` and ``GET /nodes/{node}/{qemu,lxc}/{vmid}/rrddata``.
+A single series is a list of per-sample dicts (70 samples for the 'hour'
+timeframe), so raw output for many guests is large and repetitive.
+
+MetricsCollector fetches the series for many targets concurrently on the
+client's node executor and reduces each one with NumPy to a fixed number of
+time buckets holding the avg, max and p95 of every metric. Results are
+columnar: one array per statistic and metric, aligned with a shared list of
+bucket start times.
+
+Example usage:
+    result = client.get_metrics(tag="web", timeframe="day", buckets=24)
+    result["targets"][0]["avg"]["cpu"]  # 24 values
+"""
+
+import re
+import warnings
+from concurrent.futures import as_completed
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .exceptions import (
+    ProxmoxConnectionError,
+    ProxmoxAuthenticationError,
+    ProxmoxAPIError,
+    ProxmoxResourceNotFoundError,
+    ProxmoxTimeoutError,
+    ProxmoxValidationError,
+)
+from .guest_selection import GUEST_TYPE_ALL, GUEST_TYPES, list_guests, select_guests
+
+# Timeframes and consolidation functions accepted by the rrddata endpoints
+RRD_TIMEFRAMES = ("hour", "day", "week", "month", "year")
+RRD_CONSOLIDATION_FUNCTIONS = ("AVERAGE", "MAX")
+
+# Bucket count limits
+DEFAULT_METRIC_BUCKETS = 12
+MAX_METRIC_BUCKETS = 500
+
+# Maximum number of nodes plus guests in one request
+MAX_METRIC_TARGETS = 500
+
+# Metrics returned when none are requested
+DEFAULT_GUEST_METRICS = ("cpu", "mem", "netin", "netout", "diskread", "diskwrite")
+DEFAULT_NODE_METRICS = ("cpu", "iowait", "loadavg", "memused", "netin", "netout")
+
+# Metric (RRD field) names accepted in a request
+MAX_METRICS_PER_REQUEST = 32
+_METRIC_NAME = re.compile(r'^[a-z][a-z0-9_]{0,31}$')
+
+# Statistics computed per bucket
+METRIC_STATISTICS = ("avg", "max", "p95")
+
+# Decimal places kept in the output
+_PRECISION = 4
+
+_FETCH_ERRORS = (ProxmoxConnectionError, ProxmoxTimeoutError, ProxmoxAuthenticationError, ProxmoxAPIError,
+                 ProxmoxResourceNotFoundError)
+
+
+def _column_matrix(samples: List[Dict[str, Any]], metrics: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Convert RRD samples to (times, values) arrays; missing values become NaN.
+
+    Returns:
+        Tuple of a 1-D int64 time array and a samples x metrics float array,
+        both sorted by time
+    """
+    metrics = list(metrics)
+    rows = [s for s in samples if isinstance(s, dict) and isinstance(s.get("time"), (int, float))]
+    times = np.fromiter((s["time"] for s in rows), dtype=np.int64, count=len(rows))
+    values = np.full((len(rows), len(metrics)), np.nan)
+    for j, metric in enumerate(metrics):
+        for i, sample in enumerate(rows):
+            value = sample.get(metric)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                values[i, j] = value
+    order = np.argsort(times, kind="stable")
+    return times[order], values[order]
+
+
+def _to_list(values: np.ndarray) -> List[Optional[float]]:
+    """Round an array and convert it to a JSON-friendly list (NaN -> None)."""
+    rounded = np.round(values, _PRECISION)
+    return [None if np.isnan(v) else float(v) for v in rounded]
+
+
+def aggregate_buckets(
+    times: np.ndarray, values: np.ndarray, edges: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """Reduce samples to per-bucket avg, max and p95.
+
+    Args:
+        times: Sample times (sorted)
+        values: Samples x metrics array (NaN = missing)
+        edges: Bucket edges (len = buckets + 1); a sample at the last edge
+            belongs to the last bucket
+
+    Returns:
+        Dict mapping 'avg', 'max' and 'p95' to buckets x metrics arrays
+        (NaN where a bucket has no data)
+    """
+    n_buckets = len(edges) - 1
+    n_metrics = values.shape[1]
+    stats = {name: np.full((n_buckets, n_metrics), np.nan) for name in METRIC_STATISTICS}
+    if not len(times):
+        return stats
+
+    index = np.clip(np.searchsorted(edges, times, side="right") - 1, 0, n_buckets - 1)
+    # Samples are sorted, so each bucket is one contiguous slice
+    bounds = np.searchsorted(index, np.arange(n_buckets + 1), side="left")
+    with warnings.catch_warnings():
+        # All-NaN slices are expected for metrics a guest doesn't report
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        for b in range(n_buckets):
+            chunk = values[bounds[b]:bounds[b + 1]]
+            if not len(chunk):
+                continue
+            stats["avg"][b] = np.nanmean(chunk, axis=0)
+            stats["max"][b] = np.nanmax(chunk, axis=0)
+            stats["p95"][b] = np.nanpercentile(chunk, 95, axis=0)
+    return stats
+
+
+def summarize(values: np.ndarray) -> Dict[str, np.ndarray]:
+    """Compute avg, max and p95 over the whole window (one value per metric)."""
+    if not len(values):
+        empty = np.full(values.shape[1], np.nan)
+        return {name: empty for name in METRIC_STATISTICS}
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        return {
+            "avg": np.nanmean(values, axis=0),
+            "max": np.nanmax(values, axis=0),
+            "p95": np.nanpercentile(values, 95, axis=0),
+        }
+
+
+class MetricsCollector:
+    """Fetches RRD series for many targets and downsamples them."""
+
+    def __init__(self, client: Any):
+        """
+        Initialize the collector.
+
+        Args:
+            client: ProxmoxClient used for inventory and requests
+        """
+        self.client = client
+
+    def collect(
+        self,
+        vmids: Optional[Iterable[int]] = None,
+        nodes: Optional[Iterable[str]] = None,
+        tag: Optional[str] = None,
+        name_pattern: Optional[str] = None,
+        guest_type: str = GUEST_TYPE_ALL,
+        timeframe: str = "hour",
+        cf: str = "AVERAGE",
+        metrics: Optional[List[str]] = None,
+        buckets: int = DEFAULT_METRIC_BUCKETS
+    ) -> Dict[str, Any]:
+        """Fetch and aggregate metrics for the selected nodes and guests.
+
+        Args:
+            vmids: Guests to include
+            nodes: Nodes to include (node-level metrics)
+            tag: Only guests with this tag
+            name_pattern: Only guests whose name matches this pattern
+            guest_type: 'qemu', 'lxc' or 'all' (applies to guest selectors)
+            timeframe: 'hour', 'day', 'week', 'month' or 'year'
+            cf: RRD consolidation function, 'AVERAGE' or 'MAX'
+            metrics: Metric names to return (defaults depend on target kind)
+            buckets: Number of time buckets
+
+        Returns:
+            Dict with the shared bucket start times and, per target, columnar
+            avg/max/p95 arrays and window summaries; targets that could not
+            be fetched are listed in errors
+
+        Raises:
+            ProxmoxValidationError: If the arguments are invalid or select too
+                many targets
+        """
+        if timeframe not in RRD_TIMEFRAMES:
+            raise ProxmoxValidationError(f"timeframe must be one of {list(RRD_TIMEFRAMES)}")
+        if cf not in RRD_CONSOLIDATION_FUNCTIONS:
+            raise ProxmoxValidationError(f"cf must be one of {list(RRD_CONSOLIDATION_FUNCTIONS)}")
+        if guest_type not in GUEST_TYPES:
+            raise ProxmoxValidationError(f"guest_type must be one of {list(GUEST_TYPES)}")
+        if isinstance(buckets, bool) or not isinstance(buckets, int) or not 1 <= buckets <= MAX_METRIC_BUCKETS:
+            raise ProxmoxValidationError(f"buckets must be between 1 and {MAX_METRIC_BUCKETS}")
+        if not (vmids or nodes or tag or name_pattern):
+            raise ProxmoxValidationError("At least one of vmids, nodes, tag or name_pattern is required")
+        if metrics is not None:
+            if not metrics or len(metrics) > MAX_METRICS_PER_REQUEST or not all(
+                isinstance(m, str) and _METRIC_NAME.match(m) for m in metrics
+            ):
+                raise ProxmoxValidationError(
+                    f"metrics must be 1-{MAX_METRICS_PER_REQUEST} RRD field names such as 'cpu' or 'netin'"
+                )
+
+        targets = self._resolve_targets(vmids, nodes, tag, name_pattern, guest_type)
+        if len(targets) > MAX_METRIC_TARGETS:
+            raise ProxmoxValidationError(
+                f"Selection matches {len(targets)} targets; at most {MAX_METRIC_TARGETS} can be queried at once"
+            )
+
+        fetched, errors = self._fetch_all(targets, timeframe, cf)
+        if vmids:
+            found = {t["vmid"] for t in targets}
+            errors.extend(
+                {"id": f"vmid/{vmid}", "node": None, "error": "Guest not found or excluded by selectors"}
+                for vmid in sorted({int(v) for v in vmids}) if vmid not in found
+            )
+
+        # Convert every series first so all targets share the same bucket edges
+        series = []
+        for target, samples in fetched:
+            names = list(metrics) if metrics else list(
+                DEFAULT_NODE_METRICS if target["type"] == "node" else DEFAULT_GUEST_METRICS
+            )
+            times, values = _column_matrix(samples, names)
+            series.append((target, names, times, values))
+
+        all_times = [s[2] for s in series if len(s[2])]
+        if all_times:
+            start = int(min(t[0] for t in all_times))
+            end = int(max(t[-1] for t in all_times))
+            edges = np.linspace(start, max(end, start + 1), buckets + 1)
+        else:
+            edges = np.zeros(buckets + 1)
+
+        results = []
+        for target, names, times, values in series:
+            stats = aggregate_buckets(times, values, edges)
+            summary = summarize(values)
+            entry = dict(target)
+            entry["samples"] = int(len(times))
+            for stat in METRIC_STATISTICS:
+                entry[stat] = {name: _to_list(stats[stat][:, j]) for j, name in enumerate(names)}
+            entry["summary"] = {
+                stat: {name: _to_list(summary[stat][j:j + 1])[0] for j, name in enumerate(names)}
+                for stat in METRIC_STATISTICS
+            }
+            results.append(entry)
+        results.sort(key=lambda r: r["id"])
+
+        return {
+            "status": "success",
+            "timeframe": timeframe,
+            "cf": cf,
+            "buckets": buckets,
+            "bucket_start": [int(e) for e in edges[:-1]] if all_times else [],
+            "bucket_seconds": round(float(edges[1] - edges[0]), 3) if all_times else None,
+            "statistics": list(METRIC_STATISTICS),
+            "targets": results,
+            "errors": errors,
+            "message": f"Metrics for {len(results)} target(s)" + (f", {len(errors)} failed" if errors else "")
+        }
+
+    def _resolve_targets(
+        self,
+        vmids: Optional[Iterable[int]],
+        nodes: Optional[Iterable[str]],
+        tag: Optional[str],
+        name_pattern: Optional[str],
+        guest_type: str
+    ) -> List[Dict[str, Any]]:
+        """Build the target list: the given nodes plus the selected guests.
+
+        Guest criteria (vmids, tag, name_pattern, guest_type) are combined
+        with AND, as for the bulk tools, and resolved from one inventory request.
+        """
+        targets = [
+            {"id": f"node/{node}", "type": "node", "node": node, "vmid": None}
+            for node in sorted(set(nodes or ()))
+        ]
+        if vmids or tag or name_pattern:
+            for guest in select_guests(list_guests(self.client), vmids, None, tag, name_pattern, guest_type):
+                targets.append({
+                    "id": f"{guest['type']}/{guest['vmid']}", "type": guest["type"], "node": guest["node"],
+                    "vmid": guest["vmid"], "name": guest["name"]
+                })
+        return targets
+
+    def _fetch_all(
+        self, targets: List[Dict[str, Any]], timeframe: str, cf: str
+    ) -> Tuple[List[Tuple[Dict[str, Any], List[Dict[str, Any]]]], List[Dict[str, str]]]:
+        """Fetch every target's series on the node executor."""
+        if not targets:
+            return [], []
+        executor = self.client._get_node_executor()
+        futures = [executor.submit(t["node"], self._fetch_one, t, timeframe, cf) for t in targets]
+        fetched = []
+        errors = []
+        for future in as_completed(futures):
+            target, samples, error = future.result()
+            if error:
+                errors.append({"id": target["id"], "node": target["node"], "error": error})
+            else:
+                fetched.append((target, samples))
+        errors.sort(key=lambda e: e["id"])
+        return fetched, errors
+
+    def _fetch_one(
+        self, target: Dict[str, Any], timeframe: str, cf: str
+    ) -> Tuple[Dict[str, Any], List[Dict[str, Any]], Optional[str]]:
+        """Fetch one RRD series."""
+        if target["type"] == "node":
+            endpoint = f"/nodes/{target['node']}/rrddata"
+        else:
+            endpoint = f"/nodes/{target['node']}/{target['type']}/{target['vmid']}/rrddata"
+        try:
+            response = self.client._make_request("GET", endpoint, params={"timeframe": timeframe, "cf": cf})
+            samples = response.json().get("data") or []
+        except _FETCH_ERRORS as e:
+            return target, [], str(e)
+        except ValueError as e:
+            return target, [], f"Invalid JSON response: {e}"
+        if not isinstance(samples, list):
+            return target, [], "Invalid rrddata response: 'data' is not a list"
+        return target, samples, None
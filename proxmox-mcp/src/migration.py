@@ -0,0 +1,553 @@
+"""Planned, throttled live migration of many guests.
+
+MigrationOrchestrator moves a selection of VMs/containers (for example every
+guest on a node that is about to be drained) to other nodes:
+
+- targets are planned up front from a fresh CapacityPlanner snapshot:
+  guests are placed largest memory first on the node with the most headroom
+  left, and each placement is subtracted before the next one is planned
+- running guests need free memory on the target; stopped guests only need
+  enough CPUs there, since they do not use memory until started
+- migrations are issued with ``POST /nodes/{node}/qemu/{vmid}/migrate`` (live
+  for running VMs) and ``POST /nodes/{node}/lxc/{vmid}/migrate`` (restart
+  mode for running containers)
+- a background thread per job keeps at most ``max_concurrent`` migrations in
+  flight, and at most ``max_per_source``/``max_per_target`` per node, and
+  checks all running UPIDs with one TaskTracker pass per tick
+- the limits can be changed and the job cancelled while it runs; status()
+  returns a progress report with per-guest rows at any time
+
+Example usage:
+    orchestrator = MigrationOrchestrator(client)
+    job = orchestrator.start(source_node="pve1", max_per_target=1)
+    report = orchestrator.status(job["job_id"])
+"""
+
+import itertools
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+from .exceptions import (
+    ProxmoxConnectionError,
+    ProxmoxAuthenticationError,
+    ProxmoxAPIError,
+    ProxmoxResourceNotFoundError,
+    ProxmoxTimeoutError,
+    ProxmoxValidationError,
+)
+from .guest_selection import GUEST_TYPE_ALL, GUEST_TYPE_VM, GUEST_TYPES, has_selector, list_guests, select_guests
+from .task_tracker import MAX_TASKS_PER_WAIT, TASK_STATE_COMPLETED, TASK_STATE_RUNNING
+from .utils.validation import is_valid_node_name
+
+try:
+    from .utils.mcp_logging import get_logger
+    logger = get_logger(__name__)
+except ImportError:
+    import logging
+    logger = logging.getLogger(__name__)
+
+# Default migrations in flight per job, per source node and per target node
+DEFAULT_MAX_CONCURRENT_MIGRATIONS = 4
+DEFAULT_MIGRATIONS_PER_SOURCE = 2
+DEFAULT_MIGRATIONS_PER_TARGET = 2
+
+# Upper bound for any of the concurrency limits
+MAX_CONCURRENT_MIGRATIONS = 32
+
+# Maximum number of guests a single job may move
+MAX_MIGRATION_TARGETS = MAX_TASKS_PER_WAIT
+
+# Seconds between scheduler ticks (task checks and new submissions)
+MIGRATION_POLL_INTERVAL_SECONDS = 2.0
+
+# Default and maximum run time of a job before remaining guests are abandoned
+DEFAULT_MIGRATION_TIMEOUT_SECONDS = 4 * 3600
+MAX_MIGRATION_TIMEOUT_SECONDS = 24 * 3600
+
+# Finished jobs kept for status queries (oldest is dropped first)
+MAX_FINISHED_MIGRATION_JOBS = 50
+
+# Job IDs handed out by start()
+MIGRATION_JOB_ID_PATTERN = re.compile(r'^mig-\d+$')
+
+# Per-guest states
+MOVE_PENDING = "pending"
+MOVE_MIGRATING = "migrating"
+MOVE_COMPLETED = "completed"
+MOVE_FAILED = "failed"
+MOVE_UNPLACED = "unplaced"
+MOVE_CANCELLED = "cancelled"
+MOVE_TIMED_OUT = "timed_out"
+
+# Job states
+JOB_RUNNING = "running"
+JOB_FINISHED = "finished"
+JOB_CANCELLED = "cancelled"
+JOB_TIMED_OUT = "timed_out"
+
+_MIB = 1024 * 1024
+
+
+def _check_limit(name: str, value: Any) -> int:
+    """Validate one concurrency limit."""
+    if isinstance(value, bool) or not isinstance(value, int) or not 1 <= value <= MAX_CONCURRENT_MIGRATIONS:
+        raise ProxmoxValidationError(f"{name} must be between 1 and {MAX_CONCURRENT_MIGRATIONS}")
+    return value
+
+
+class _MigrationJob:
+    """Plan, limits and progress of one migration job."""
+
+    def __init__(self, job_id: str, moves: List[Dict[str, Any]], limits: Dict[str, int],
+                 bwlimit: Optional[int], with_local_disks: bool, timeout: float):
+        self.job_id = job_id
+        self.moves = moves
+        self.limits = limits
+        self.bwlimit = bwlimit
+        self.with_local_disks = with_local_disks
+        self.timeout = timeout
+        self.state = JOB_RUNNING
+        self.started_at = time.monotonic()
+        self.finished_at: Optional[float] = None
+        self.cancel_requested = False
+        # Guards moves, limits and state; the scheduler and status() share them
+        self.lock = threading.Lock()
+        # Set to make the scheduler run its next tick immediately
+        self.wake = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+
+class MigrationOrchestrator:
+    """Plans migrations and runs them as throttled background jobs.
+
+    Thread-safe: the job table is guarded by one lock and each job by its
+    own; every job is driven by its own daemon thread.
+    """
+
+    def __init__(self, client: Any, poll_interval: float = MIGRATION_POLL_INTERVAL_SECONDS):
+        """
+        Initialize the orchestrator. No request is made until a job is planned.
+
+        Args:
+            client: ProxmoxClient used for inventory, capacity, requests and task tracking
+            poll_interval: Seconds between scheduler ticks
+        """
+        self.client = client
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, _MigrationJob]" = OrderedDict()
+        self._ids = itertools.count(1)
+        self._stop_event = threading.Event()
+
+    def plan(
+        self,
+        source_node: Optional[str] = None,
+        vmids: Optional[Iterable[int]] = None,
+        tag: Optional[str] = None,
+        name_pattern: Optional[str] = None,
+        guest_type: str = GUEST_TYPE_ALL,
+        target_nodes: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Choose a target node for every selected guest.
+
+        Templates are included, so planning with only source_node empties
+        the node completely.
+
+        Args:
+            source_node: Only guests on this node; it never receives guests
+            vmids: Explicit VMIDs to move
+            tag: Only guests with this tag
+            name_pattern: Shell-style guest name pattern
+            guest_type: 'qemu', 'lxc' or 'all'
+            target_nodes: Nodes allowed to receive guests (default: all others)
+
+        Returns:
+            One move row per guest, in the order the moves will be issued;
+            guests that fit nowhere are in state 'unplaced' with the reason
+
+        Raises:
+            ProxmoxValidationError: If a selector or node name is invalid, or
+                too many guests are selected
+            ProxmoxAPIError: If capacity cannot be read; also connection/timeout/auth errors
+        """
+        if guest_type not in GUEST_TYPES:
+            raise ProxmoxValidationError(f"guest_type must be one of {list(GUEST_TYPES)}")
+        if not has_selector(vmids, source_node, tag, name_pattern):
+            raise ProxmoxValidationError("At least one of source_node, vmids, tag or name_pattern is required")
+        if source_node is not None and not is_valid_node_name(source_node):
+            raise ProxmoxValidationError(f"Invalid node name: {source_node!r}")
+        if target_nodes is not None:
+            invalid = [n for n in target_nodes if not is_valid_node_name(n)]
+            if invalid or not target_nodes:
+                raise ProxmoxValidationError(f"Invalid target node(s): {invalid}")
+
+        vmids = sorted({int(v) for v in vmids}) if vmids else None
+        guests = select_guests(
+            list_guests(self.client), vmids, source_node, tag, name_pattern, guest_type, include_templates=True
+        )
+        if len(guests) > MAX_MIGRATION_TARGETS:
+            raise ProxmoxValidationError(
+                f"Selection matches {len(guests)} guests; at most {MAX_MIGRATION_TARGETS} can be migrated at once"
+            )
+
+        snapshot = self.client._capacity.snapshot(max_age=0)
+        nodes = {name: dict(node) for name, node in snapshot["nodes"].items() if name != source_node}
+        if target_nodes is not None:
+            unknown = sorted(set(target_nodes) - set(nodes))
+            if unknown:
+                raise ProxmoxValidationError(f"Target node(s) not available: {unknown}")
+            nodes = {name: node for name, node in nodes.items() if name in target_nodes}
+
+        moves: List[Dict[str, Any]] = []
+        if vmids:
+            found = {g["vmid"] for g in guests}
+            moves.extend(
+                self._move({"vmid": v, "name": None, "type": None, "node": None, "status": None},
+                           MOVE_UNPLACED, error="Guest not found or excluded by selectors")
+                for v in vmids if v not in found
+            )
+
+        # First-fit decreasing: large guests are placed while there is still room
+        for guest in sorted(guests, key=lambda g: (-g["maxmem"], g["vmid"])):
+            running = guest["status"] == "running"
+            cores = guest["maxcpu"]
+            memory = guest["maxmem"] // _MIB if running else 0
+            eligible = {name: node for name, node in nodes.items() if name != guest["node"]}
+            candidates, rejected = self.client._capacity.rank_nodes(eligible, cores, memory)
+            if not candidates:
+                reasons = "; ".join(f"{r['node']}: {r['reason']}" for r in rejected) or "no other node available"
+                moves.append(self._move(guest, MOVE_UNPLACED, error=f"No node has room ({reasons})"))
+                continue
+            target = candidates[0]["node"]
+            node = nodes[target]
+            if running:
+                node["cpu_free_cores"] = round(max(0.0, node["cpu_free_cores"] - cores), 2)
+                node["memory_free_mb"] = max(0, node["memory_free_mb"] - memory)
+            moves.append(self._move(guest, MOVE_PENDING, target=target))
+        return moves
+
+    @staticmethod
+    def _move(guest: Dict[str, Any], state: str, target: Optional[str] = None,
+              error: Optional[str] = None) -> Dict[str, Any]:
+        """Build one per-guest move row."""
+        return {
+            "vmid": guest["vmid"],
+            "name": guest["name"],
+            "type": guest["type"],
+            "source": guest["node"],
+            "target": target,
+            "online": guest["status"] == "running",
+            "memory_mb": guest.get("maxmem", 0) // _MIB,
+            "state": state,
+            "upid": None,
+            "error": error,
+            "duration_seconds": None,
+        }
+
+    def start(
+        self,
+        source_node: Optional[str] = None,
+        vmids: Optional[Iterable[int]] = None,
+        tag: Optional[str] = None,
+        name_pattern: Optional[str] = None,
+        guest_type: str = GUEST_TYPE_ALL,
+        target_nodes: Optional[List[str]] = None,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT_MIGRATIONS,
+        max_per_source: int = DEFAULT_MIGRATIONS_PER_SOURCE,
+        max_per_target: int = DEFAULT_MIGRATIONS_PER_TARGET,
+        bwlimit: Optional[int] = None,
+        with_local_disks: bool = False,
+        timeout: float = DEFAULT_MIGRATION_TIMEOUT_SECONDS,
+        dry_run: bool = False
+    ) -> Dict[str, Any]:
+        """Plan a migration job and run it in the background.
+
+        Args:
+            source_node, vmids, tag, name_pattern, guest_type, target_nodes:
+                Guest selection and allowed targets, as for plan()
+            max_concurrent: Migrations in flight across the whole job
+            max_per_source: Migrations in flight leaving any one node
+            max_per_target: Migrations in flight arriving at any one node
+            bwlimit: Per-migration bandwidth limit in KiB/s (default: the
+                cluster's datacenter setting)
+            with_local_disks: Also copy local disks of VMs
+            timeout: Seconds after which guests not yet migrated are abandoned
+            dry_run: Only return the plan
+
+        Returns:
+            The job's progress report (the plan alone when dry_run is set)
+
+        Raises:
+            ProxmoxValidationError: If a selector or limit is invalid
+            ProxmoxAPIError: If capacity cannot be read; also connection/timeout/auth errors
+        """
+        limits = {
+            "max_concurrent": _check_limit("max_concurrent", max_concurrent),
+            "max_per_source": _check_limit("max_per_source", max_per_source),
+            "max_per_target": _check_limit("max_per_target", max_per_target),
+        }
+        if bwlimit is not None and (isinstance(bwlimit, bool) or not isinstance(bwlimit, int) or bwlimit < 1):
+            raise ProxmoxValidationError("bwlimit must be a positive number of KiB/s")
+        if isinstance(timeout, bool) or not isinstance(timeout, (int, float)) \
+                or not 0 < timeout <= MAX_MIGRATION_TIMEOUT_SECONDS:
+            raise ProxmoxValidationError(f"timeout must be between 1 and {MAX_MIGRATION_TIMEOUT_SECONDS} seconds")
+
+        moves = self.plan(source_node, vmids, tag, name_pattern, guest_type, target_nodes)
+        if dry_run:
+            return {"dry_run": True, "limits": limits, **self._counts(moves), "moves": moves}
+
+        with self._lock:
+            if self._stop_event.is_set():
+                raise ProxmoxAPIError("Migration orchestrator is stopped")
+            job = _MigrationJob(f"mig-{next(self._ids)}", moves, limits, bwlimit, with_local_disks, timeout)
+            self._jobs[job.job_id] = job
+            self._prune()
+        job.thread = threading.Thread(target=self._run, args=(job,), name=f"proxmox-{job.job_id}", daemon=True)
+        job.thread.start()
+        logger.info(f"Started migration job {job.job_id} for {len(moves)} guest(s)")
+        return self.status(job.job_id)
+
+    def _prune(self) -> None:
+        """Drop the oldest finished jobs beyond MAX_FINISHED_MIGRATION_JOBS (lock held)."""
+        finished = [job_id for job_id, job in self._jobs.items() if job.state != JOB_RUNNING]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_MIGRATION_JOBS)]:
+            del self._jobs[job_id]
+
+    def _get_job(self, job_id: str) -> _MigrationJob:
+        """Look up a job by ID, raising ProxmoxValidationError if unknown."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            raise ProxmoxValidationError(f"Unknown migration job: {job_id!r}")
+        return job
+
+    def status(self, job_id: Optional[str] = None) -> Dict[str, Any]:
+        """Get the progress report of a job, or a one-line summary of every job.
+
+        Raises:
+            ProxmoxValidationError: If the job is unknown
+        """
+        if job_id is None:
+            with self._lock:
+                jobs = list(self._jobs.values())
+            summaries = []
+            for job in jobs:
+                report = self._report(job)
+                report.pop("moves")
+                summaries.append(report)
+            return {"jobs": summaries}
+        return self._report(self._get_job(job_id))
+
+    def update(
+        self,
+        job_id: str,
+        max_concurrent: Optional[int] = None,
+        max_per_source: Optional[int] = None,
+        max_per_target: Optional[int] = None,
+        cancel: bool = False
+    ) -> Dict[str, Any]:
+        """Change a running job's limits or cancel it.
+
+        Lowering a limit never interrupts migrations already in flight; it
+        only delays new ones. Cancelling stops new submissions and the job
+        finishes once the migrations in flight are done.
+
+        Raises:
+            ProxmoxValidationError: If the job is unknown or a limit is invalid
+        """
+        job = self._get_job(job_id)
+        changes = {
+            name: _check_limit(name, value)
+            for name, value in (("max_concurrent", max_concurrent), ("max_per_source", max_per_source),
+                                ("max_per_target", max_per_target))
+            if value is not None
+        }
+        with job.lock:
+            job.limits.update(changes)
+            if cancel:
+                job.cancel_requested = True
+        job.wake.set()
+        return self._report(job)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Cancel every job and stop the scheduler threads.
+
+        Migrations already running in Proxmox are not interrupted.
+
+        Args:
+            timeout: Seconds to wait for each thread to exit (0 does not wait)
+        """
+        self._stop_event.set()
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            job.wake.set()
+            if job.thread is not None and job.thread is not threading.current_thread() and timeout != 0:
+                job.thread.join(timeout)
+
+    def _run(self, job: _MigrationJob) -> None:
+        """Scheduler loop of one job: submit, check, sleep, until nothing is left."""
+        deadline = job.started_at + job.timeout
+        final_state = JOB_FINISHED
+        while True:
+            try:
+                if self._stop_event.is_set() or job.cancel_requested:
+                    final_state = JOB_CANCELLED
+                    self._abandon(job, MOVE_CANCELLED, include_active=self._stop_event.is_set())
+                elif time.monotonic() >= deadline:
+                    final_state = JOB_TIMED_OUT
+                    self._abandon(job, MOVE_TIMED_OUT, include_active=True)
+                else:
+                    self._submit_ready(job)
+                self._check_active(job)
+            except Exception as e:
+                # Never let the scheduler die and leave the job running forever
+                logger.exception(f"Unexpected error in migration job {job.job_id}: {e}")
+            with job.lock:
+                if not any(m["state"] in (MOVE_PENDING, MOVE_MIGRATING) for m in job.moves):
+                    job.state = final_state
+                    job.finished_at = time.monotonic()
+                    break
+            job.wake.wait(self.poll_interval)
+            job.wake.clear()
+        logger.info(f"Migration job {job.job_id} {job.state}: {self._counts(job.moves)['counts']}")
+
+    def _abandon(self, job: _MigrationJob, state: str, include_active: bool) -> None:
+        """Mark pending (and optionally in-flight) moves as no longer tracked."""
+        with job.lock:
+            for move in job.moves:
+                if move["state"] == MOVE_PENDING:
+                    move["state"] = state
+                elif move["state"] == MOVE_MIGRATING and include_active:
+                    move["state"] = state
+                    move["error"] = "Stopped tracking; the migration task may still be running"
+
+    def _submit_ready(self, job: _MigrationJob) -> None:
+        """Issue pending migrations while the job and per-node limits allow."""
+        with job.lock:
+            limits = dict(job.limits)
+            active = [m for m in job.moves if m["state"] == MOVE_MIGRATING]
+            pending = [m for m in job.moves if m["state"] == MOVE_PENDING]
+        per_source: Dict[str, int] = {}
+        per_target: Dict[str, int] = {}
+        for move in active:
+            per_source[move["source"]] = per_source.get(move["source"], 0) + 1
+            per_target[move["target"]] = per_target.get(move["target"], 0) + 1
+
+        in_flight = len(active)
+        for move in pending:
+            if in_flight >= limits["max_concurrent"]:
+                break
+            if per_source.get(move["source"], 0) >= limits["max_per_source"] \
+                    or per_target.get(move["target"], 0) >= limits["max_per_target"]:
+                continue
+            upid, error = self._submit_one(job, move)
+            with job.lock:
+                if upid:
+                    move["state"] = MOVE_MIGRATING
+                    move["upid"] = upid
+                    move["submitted_at"] = time.monotonic()
+                else:
+                    move["state"] = MOVE_FAILED
+                    move["error"] = error
+            if upid:
+                in_flight += 1
+                per_source[move["source"]] = per_source.get(move["source"], 0) + 1
+                per_target[move["target"]] = per_target.get(move["target"], 0) + 1
+
+    def _submit_one(self, job: _MigrationJob, move: Dict[str, Any]):
+        """POST one migration; returns (upid, error)."""
+        params: Dict[str, Any] = {"target": move["target"]}
+        if move["type"] == GUEST_TYPE_VM:
+            if move["online"]:
+                params["online"] = 1
+            if job.with_local_disks:
+                params["with-local-disks"] = 1
+        elif move["online"]:
+            # Containers cannot be live-migrated; restart mode stops and starts them
+            params["restart"] = 1
+        if job.bwlimit:
+            params["bwlimit"] = job.bwlimit
+
+        endpoint = f"/nodes/{move['source']}/{move['type']}/{move['vmid']}/migrate"
+        try:
+            upid = self.client._make_request("POST", endpoint, data=params).json().get("data")
+        except (ProxmoxConnectionError, ProxmoxTimeoutError, ProxmoxAuthenticationError, ProxmoxAPIError,
+                ProxmoxResourceNotFoundError) as e:
+            return None, str(e)
+        except ValueError as e:
+            return None, f"Invalid JSON response: {e}"
+        if not isinstance(upid, str) or not upid:
+            return None, "Migration request returned no task ID"
+        return upid, None
+
+    def _check_active(self, job: _MigrationJob) -> None:
+        """Check every in-flight migration task once and record finished ones."""
+        with job.lock:
+            active = {m["upid"]: m for m in job.moves if m["state"] == MOVE_MIGRATING}
+        if not active:
+            return
+        result = self.client.wait_for_tasks(list(active), 0)
+        if result.get("status") != "success":
+            logger.warning(f"Migration job {job.job_id}: task check failed: {result.get('message')}")
+            return
+        with job.lock:
+            for task in result["tasks"]:
+                move = active.get(task["upid"])
+                if move is None or move["state"] != MOVE_MIGRATING or task["state"] == TASK_STATE_RUNNING:
+                    continue
+                move["duration_seconds"] = task.get("duration_seconds") \
+                    or round(time.monotonic() - move["submitted_at"], 3)
+                if task["state"] == TASK_STATE_COMPLETED:
+                    move["state"] = MOVE_COMPLETED
+                else:
+                    move["state"] = MOVE_FAILED
+                    move["error"] = task.get("exitstatus")
+        if any(m["state"] == MOVE_COMPLETED for m in active.values()):
+            # Node headroom has moved; later placements must not use stale figures
+            self.client._capacity.invalidate()
+
+    @staticmethod
+    def _counts(moves: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Count move rows per state."""
+        counts: Dict[str, int] = {}
+        for move in moves:
+            counts[move["state"]] = counts.get(move["state"], 0) + 1
+        return {"total": len(moves), "counts": counts}
+
+    def _report(self, job: _MigrationJob) -> Dict[str, Any]:
+        """Build the progress report of a job."""
+        with job.lock:
+            moves = [{k: v for k, v in m.items() if k != "submitted_at"} for m in job.moves]
+            limits = dict(job.limits)
+            state = job.state
+            end = job.finished_at or time.monotonic()
+        summary = self._counts(moves)
+        counts = summary["counts"]
+        remaining = counts.get(MOVE_PENDING, 0) + counts.get(MOVE_MIGRATING, 0)
+        schedulable = sum(counts.values()) - counts.get(MOVE_UNPLACED, 0)
+        done = schedulable - remaining
+        durations = [m["duration_seconds"] for m in moves if m["state"] == MOVE_COMPLETED and m["duration_seconds"]]
+
+        eta = None
+        if state == JOB_RUNNING and durations and remaining:
+            # Remaining guests run in waves of up to max_concurrent
+            average = sum(durations) / len(durations)
+            eta = round(average * remaining / min(remaining, limits["max_concurrent"]), 1)
+
+        return {
+            "job_id": job.job_id,
+            "state": state,
+            "cancel_requested": job.cancel_requested,
+            "elapsed_seconds": round(end - job.started_at, 3),
+            "limits": limits,
+            "bwlimit": job.bwlimit,
+            **summary,
+            "progress_percent": round(100.0 * done / schedulable, 1) if schedulable else 100.0,
+            "in_flight": [m["vmid"] for m in moves if m["state"] == MOVE_MIGRATING],
+            "eta_seconds": eta,
+            "moves": moves,
+        }
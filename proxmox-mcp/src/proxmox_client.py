@@ -19,14 +19,16 @@ import sys
 import threading
 import time
 import warnings
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Any, Dict, List, Optional, Tuple
+from contextlib import contextmanager
+from concurrent.futures import as_completed
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.exceptions import InsecureRequestWarning
 
 from .exceptions import (
+    ProxmoxError,
     ProxmoxConnectionError,
     ProxmoxAuthenticationError,
     ProxmoxAPIError,
@@ -35,6 +37,31 @@ from .exceptions import (
     ProxmoxResourceNotFoundError,
     ProxmoxConfigurationError
 )
+from .bulk_power import BulkPowerRunner
+from .bulk_snapshot import BulkSnapshotRunner, DEFAULT_SNAPSHOTS_PER_NODE, DEFAULT_BULK_SNAPSHOT_TIMEOUT_SECONDS
+from .task_tracker import TaskTracker, DEFAULT_TASK_TIMEOUT_SECONDS
+from .vmid_allocator import VMIDAllocator
+from .inventory import ClusterInventory, DEFAULT_INVENTORY_REFRESH_SECONDS
+from .metrics import MetricsCollector, DEFAULT_METRIC_BUCKETS
+from .ticket_renewer import TicketRenewer, DEFAULT_TICKET_RENEWAL_FRACTION
+from .log_tail import LogTailer, DEFAULT_TAIL_LINES, DEFAULT_SYSLOG_INITIAL_LINES
+from .capacity import CapacityPlanner
+from .storage_content import StorageContentPager, DEFAULT_CONTENT_PAGE_SIZE
+from .guest_network import GuestNetworkIndex
+from .vm_config import VMConfigFetcher, validate_config_keys
+from .migration import (
+    MigrationOrchestrator,
+    DEFAULT_MAX_CONCURRENT_MIGRATIONS,
+    DEFAULT_MIGRATIONS_PER_SOURCE,
+    DEFAULT_MIGRATIONS_PER_TARGET,
+    DEFAULT_MIGRATION_TIMEOUT_SECONDS,
+)
+from .utils.node_executor import (
+    NodeExecutor,
+    DEFAULT_MAX_NODE_WORKERS,
+    DEFAULT_MAX_REQUESTS_PER_NODE,
+)
+from .utils.validation import is_valid_api_token
 from .utils.resilience import (
     create_circuit_breaker,
     create_retry_decorator,
@@ -48,39 +75,43 @@ def debug_print(message: str):
     print(f"DEBUG: {message}", file=sys.stderr)
 
 
-def suppress_insecure_request_warning(ssl_verify: bool):
-    """
-    Context manager to suppress InsecureRequestWarning when SSL verification is disabled.
-    
-    This is a helper to eliminate code duplication and ensure consistent warning handling.
+def build_api_token(api_token: str, username: Optional[str] = None, realm: Optional[str] = None) -> str:
+    """Normalize a Proxmox API token to "USER@REALM!TOKENID=SECRET".
+
+    Accepts the full token, or "TOKENID=SECRET" combined with the username
+    and realm (a username that already contains "@realm" is used as is).
+
+    Raises:
+        ProxmoxConfigurationError: If the token is malformed
     """
-    class WarningSuppressionContext:
-        def __init__(self, should_suppress: bool):
-            self.should_suppress = should_suppress
-            self.context = None
-            
-        def __enter__(self):
-            self.context = warnings.catch_warnings()
-            self.context.__enter__()
-            if self.should_suppress:
-                warnings.filterwarnings('ignore', category=InsecureRequestWarning)
-            return self
-            
-        def __exit__(self, *args):
-            return self.context.__exit__(*args)
-    
-    return WarningSuppressionContext(not ssl_verify)
+    token = api_token.strip()
+    if token.startswith("PVEAPIToken="):
+        token = token[len("PVEAPIToken="):]
+    if "!" not in token and username:
+        user = username if "@" in username or not realm else f"{username}@{realm}"
+        token = f"{user}!{token}"
+    if not is_valid_api_token(token):
+        # Never echo the token itself - it contains the secret
+        raise ProxmoxConfigurationError(
+            "api_token must have the form USER@REALM!TOKENID=SECRET "
+            "(or TOKENID=SECRET together with username and realm)"
+        )
+    return token
 
 
 class ProxmoxClient:
     """Client for interacting with Proxmox VE API.
 
-    WARNING: This client is NOT thread-safe. The underlying requests.Session
-    is not thread-safe, and concurrent use from multiple threads may cause
-    connection corruption, authentication issues, or other unexpected behavior.
-
-    For multi-threaded applications, create a separate ProxmoxClient instance
-    per thread, or implement external synchronization.
+    The client is thread-safe. requests.Session is not, so each request
+    borrows a session from a small pool and returns it afterwards; the pool
+    grows to the number of threads using the client concurrently. All
+    sessions share one connection-pooling adapter and one authentication
+    ticket and CSRF token, which are sent as explicit headers rather than
+    stored in per-session cookie jars. Ticket refresh is serialized by a lock,
+    and a background TicketRenewer replaces the ticket before it is due so
+    requests do not wait for a login in steady state.
+    With an API token the client skips the ticket handshake entirely and
+    sends a PVEAPIToken Authorization header instead.
 
     The client supports context manager protocol for automatic resource cleanup:
         with ProxmoxClient(...) as client:
@@ -90,7 +121,10 @@ class ProxmoxClient:
     # Maximum number of retries for VMID conflicts during VM creation
     VMID_CONFLICT_MAX_RETRIES = 3
 
-    def __init__(self, host: str, port: int, protocol: str, username: str, password: str, realm: str = "pve", ssl_verify: bool = False, ticket_expiry_seconds: int = 7200):
+    def __init__(self, host: str, port: int, protocol: str, username: Optional[str], password: Optional[str], realm: str = "pve", ssl_verify: bool = False, ticket_expiry_seconds: int = 7200,
+                 max_node_workers: int = DEFAULT_MAX_NODE_WORKERS, max_requests_per_node: int = DEFAULT_MAX_REQUESTS_PER_NODE,
+                 inventory_refresh_interval: float = DEFAULT_INVENTORY_REFRESH_SECONDS, api_token: Optional[str] = None,
+                 ticket_renewal_fraction: Optional[float] = DEFAULT_TICKET_RENEWAL_FRACTION):
         """
         Initialize Proxmox client.
 
@@ -98,11 +132,24 @@ class ProxmoxClient:
             host: Proxmox hostname or IP address
             port: Proxmox API port (usually 8006)
             protocol: Protocol to use ('https' or 'http')
-            username: Proxmox username
-            password: Proxmox password
+            username: Proxmox username (optional with a full api_token)
+            password: Proxmox password (not used with api_token)
             realm: Authentication realm (default: "pve" for Proxmox VE)
             ssl_verify: Whether to verify SSL certificates (default: False for self-signed)
             ticket_expiry_seconds: Proxmox ticket expiry time in seconds (default: 7200 = 2 hours)
+            max_node_workers: Global limit on concurrent per-node requests during
+                all-nodes queries (default: 10)
+            max_requests_per_node: Limit on concurrent requests to a single node
+                during all-nodes queries (default: 4)
+            inventory_refresh_interval: Seconds between background refreshes of
+                the in-memory inventory used by inventory_lookup (default: 30)
+            api_token: Proxmox API token "USER@REALM!TOKENID=SECRET" (or
+                "TOKENID=SECRET" together with username and realm). When set,
+                every request carries an "Authorization: PVEAPIToken=..." header
+                and no ticket, CSRF token or re-authentication is used.
+            ticket_renewal_fraction: Fraction of the ticket lifetime after which
+                a background thread renews the ticket (default: 0.5); None
+                disables background renewal and tickets are refreshed inline
 
         Raises:
             ProxmoxConfigurationError: If required parameters are empty or invalid
@@ -112,14 +159,33 @@ class ProxmoxClient:
         # Validate required parameters
         if not host:
             raise ProxmoxConfigurationError("host cannot be empty")
-        if not username:
-            raise ProxmoxConfigurationError("username cannot be empty")
-        if not password:
-            raise ProxmoxConfigurationError("password cannot be empty")
+        if api_token:
+            api_token = build_api_token(api_token, username, realm)
+        else:
+            if not username:
+                raise ProxmoxConfigurationError("username cannot be empty")
+            if not password:
+                raise ProxmoxConfigurationError("password cannot be empty")
         if not protocol:
             raise ProxmoxConfigurationError("protocol cannot be empty")
         if protocol not in ('http', 'https'):
             raise ProxmoxConfigurationError(f"protocol must be 'http' or 'https', got '{protocol}'")
+        if not isinstance(max_node_workers, int) or max_node_workers < 1:
+            raise ProxmoxConfigurationError(f"max_node_workers must be a positive integer, got {max_node_workers!r}")
+        if not isinstance(max_requests_per_node, int) or max_requests_per_node < 1:
+            raise ProxmoxConfigurationError(f"max_requests_per_node must be a positive integer, got {max_requests_per_node!r}")
+        if isinstance(inventory_refresh_interval, bool) or not isinstance(inventory_refresh_interval, (int, float)) \
+                or inventory_refresh_interval <= 0:
+            raise ProxmoxConfigurationError(
+                f"inventory_refresh_interval must be a positive number, got {inventory_refresh_interval!r}"
+            )
+        if ticket_renewal_fraction is not None and (
+                isinstance(ticket_renewal_fraction, bool)
+                or not isinstance(ticket_renewal_fraction, (int, float))
+                or not 0 < ticket_renewal_fraction < 1):
+            raise ProxmoxConfigurationError(
+                f"ticket_renewal_fraction must be a number between 0 and 1, got {ticket_renewal_fraction!r}"
+            )
             
         self.host = host
         self.port = port
@@ -128,29 +194,63 @@ class ProxmoxClient:
         self.password = password
         self.realm = realm
         self.ssl_verify = ssl_verify
+        if not ssl_verify:
+            # Installed once: warnings.catch_warnings() per request would swap the
+            # process-global filter list, which is not safe across threads
+            warnings.filterwarnings('ignore', category=InsecureRequestWarning)
         self.base_url = f"{protocol}://{host}:{port}/api2/json"
-        self.session = requests.Session()
+        # API-token mode: stateless header auth, no ticket handshake
+        self._api_token = api_token
 
         # Configure connection pooling for multi-node cluster efficiency
         # Default pool_connections=10 and pool_maxsize=10 is insufficient for large clusters
-        # where we may need to query 100+ nodes concurrently
-        adapter = HTTPAdapter(
+        # where we may need to query 100+ nodes concurrently. The adapter (and its
+        # thread-safe urllib3 pool) is shared by every session in the session pool.
+        self._adapter = HTTPAdapter(
             pool_connections=100,  # Number of connection pools to cache
             pool_maxsize=100,      # Max connections per pool
             max_retries=0          # Retries handled by our retry decorator
         )
-        self.session.mount('http://', adapter)
-        self.session.mount('https://', adapter)
+
+        # Idle sessions available for borrowing (see _borrow_session)
+        self._idle_sessions: List[requests.Session] = []
+        self._session_lock = threading.Lock()
+        self._closed = False
+
+        # Client-owned executor for all-nodes fan-out, created on first use and
+        # shut down in close(). Replaces a new thread pool per call.
+        self.max_node_workers = max_node_workers
+        self.max_requests_per_node = max_requests_per_node
+        self._node_executor: Optional[NodeExecutor] = None
+
+        # In-process VMID reservations; seeded from the cluster on first use
+        self._vmid_allocator = VMIDAllocator(self)
+
+        # Indexed cluster inventory for lookups; loaded and refreshed in the
+        # background once the first lookup arrives
+        self.inventory_refresh_interval = inventory_refresh_interval
+        self._inventory: Optional[ClusterInventory] = None
+
+        # Per-stream cursors for incremental task-log/syslog tailing
+        self._log_tailer = LogTailer(self)
+
+        # Briefly cached per-node headroom for placement decisions
+        self._capacity = CapacityPlanner(self)
+
+        # Cursor-paginated storage content listings
+        self._storage_content = StorageContentPager(self)
+
+        # Background migration jobs; each job starts its own scheduler thread
+        self._migrations = MigrationOrchestrator(self)
+
+        # Guest addresses from the guest agents, indexed by IP
+        self._guest_network = GuestNetworkIndex(self)
+
+        # Briefly cached VM configs for list_vms(include_config=True)
+        self._vm_configs = VMConfigFetcher(self)
 
         # Set up authentication
         self.auth_url = f"{self.base_url}/access/ticket"
-        self.session.verify = ssl_verify
-
-        # Set headers for Proxmox API (excluding Content-Type to avoid conflicts)
-        self.session.headers.update({
-            'Accept': 'application/json',
-            'User-Agent': 'Proxmox-MCP-Server/1.0'
-        })
 
         # Timeout configuration (seconds)
         self.timeout = 30
@@ -161,8 +261,18 @@ class ProxmoxClient:
         self._ticket_expiry_seconds = ticket_expiry_seconds
         self._ticket_refresh_threshold = int(self._ticket_expiry_seconds * 0.9)
         self._ticket_obtained_at: Optional[float] = None
-        # Lock to prevent concurrent ticket refresh attempts
-        self._auth_lock = threading.Lock()
+        # (ticket, CSRF token) shared by all sessions; replaced as one tuple so
+        # readers never see a ticket paired with another ticket's CSRF token
+        self._auth_state: Optional[Tuple[str, Optional[str]]] = None
+        # Lock to prevent concurrent ticket refresh attempts (re-entrant:
+        # _install_ticket takes it again when called from a refresh)
+        self._auth_lock = threading.RLock()
+        # Logins performed on the request path (expired ticket or 401); stays
+        # at zero in steady state while the background renewer keeps up
+        self._inline_auth_count = 0
+        # Background renewer, started once the first ticket is obtained
+        self.ticket_renewal_fraction = ticket_renewal_fraction
+        self._ticket_renewer: Optional[TicketRenewer] = None
 
         # Retry configuration
         self.retry_max_attempts = 3
@@ -193,29 +303,114 @@ class ProxmoxClient:
         # Apply decorator once during initialization for efficiency
         self._retried_execute_request = retry_decorator(self._execute_request)
 
+        # Cluster-wide inventory: answer all-node listings from a single
+        # GET /cluster/resources instead of one request per node. Falls back to
+        # the per-node fan-out when the endpoint is unavailable.
+        self.use_cluster_resources = True
+        self._cluster_resources_available = True
+
         # Response caching for static data (Issue #173)
         # Version info rarely changes, cache for 5 minutes by default
         self._version_cache: Optional[CachedResponse[Dict[str, Any]]] = None
         self._cache_ttl_seconds: int = DEFAULT_CACHE_TTL_SECONDS
         
-        # Get authentication ticket - close session on failure to prevent resource leak
+        # Get authentication ticket - close sessions on failure to prevent resource leak.
+        # API tokens need no handshake, so the first request is the first round trip.
         try:
-            self._authenticate()
+            if not self._api_token:
+                self._authenticate()
+                if ticket_renewal_fraction is not None and self._ticket_obtained_at is not None:
+                    self._ticket_renewer = TicketRenewer(self, renewal_fraction=ticket_renewal_fraction)
+                    self._ticket_renewer.start()
         except Exception:
-            # Clean up session if authentication fails during construction
-            if self.session is not None:
-                self.session.close()
-                self.session = None
+            # Clean up sessions if authentication fails during construction
+            self.close()
             raise
 
-        debug_print("Created Proxmox client (connection details redacted)")
+        debug_print(f"Created Proxmox client using {self.auth_mode} authentication (connection details redacted)")
         if not ssl_verify:
             debug_print("WARNING: SSL verification is disabled. This should only be used in development or with trusted self-signed certificates.")
         debug_print(f"SSL Verify: {ssl_verify}")
-        debug_print(f"Session headers: {dict(self.session.headers)}")
+
+    def _create_session(self) -> requests.Session:
+        """Create a session that uses the shared adapter."""
+        session = requests.Session()
+        session.mount('http://', self._adapter)
+        session.mount('https://', self._adapter)
+        session.verify = self.ssl_verify
+        # Set headers for Proxmox API (excluding Content-Type to avoid conflicts)
+        session.headers.update({
+            'Accept': 'application/json',
+            'User-Agent': 'Proxmox-MCP-Server/1.0'
+        })
+        return session
+
+    @contextmanager
+    def _borrow_session(self) -> Iterator[requests.Session]:
+        """Borrow a session for exclusive use by the calling thread.
+
+        Raises:
+            ProxmoxError: If the client has been closed
+        """
+        with self._session_lock:
+            if self._closed:
+                raise ProxmoxError("Proxmox client is closed")
+            session = self._idle_sessions.pop() if self._idle_sessions else None
+        if session is None:
+            session = self._create_session()
+        try:
+            yield session
+        finally:
+            with self._session_lock:
+                if not self._closed:
+                    self._idle_sessions.append(session)
+                    session = None
+            if session is not None:
+                session.close()
+
+    @property
+    def auth_mode(self) -> str:
+        """Authentication mode: 'api_token' or 'ticket'."""
+        return "api_token" if self._api_token else "ticket"
+
+    def _auth_headers(self, method: str) -> Dict[str, str]:
+        """Build the auth headers for a request.
+
+        API tokens are sent as an Authorization header on every request (no
+        CSRF token is needed). Otherwise the ticket cookie is sent and, for
+        write methods, the CSRF header.
+        """
+        if self._api_token:
+            return {'Authorization': f"PVEAPIToken={self._api_token}"}
+        auth_state = self._auth_state
+        if auth_state is None:
+            return {}
+        ticket, csrf_token = auth_state
+        headers = {'Cookie': f"PVEAuthCookie={ticket}"}
+        if method.upper() != 'GET' and csrf_token:
+            headers['CSRFPreventionToken'] = csrf_token
+        return headers
 
     def _authenticate(self):
-        """Authenticate with Proxmox and get ticket."""
+        """Authenticate with Proxmox and install the new ticket."""
+        self._install_ticket(self._request_ticket())
+        debug_print("Authentication successful")
+
+    def _install_ticket(self, auth_state: Tuple[str, Optional[str]]) -> None:
+        """Swap in a new (ticket, CSRF token) pair.
+
+        The pair is replaced as one tuple, so requests already holding the old
+        ticket finish with it and later requests use the new one.
+        """
+        with self._auth_lock:
+            self._auth_state = auth_state
+            self._ticket_obtained_at = time.time()
+
+    def _request_ticket(self) -> Tuple[str, Optional[str]]:
+        """Log in to Proxmox and return the new (ticket, CSRF token) pair.
+
+        The ticket is not installed; see _authenticate and TicketRenewer.
+        """
         try:
             # Handle realm properly - use default "pve" if not specified or empty
             if self.realm and self.realm.strip():
@@ -234,9 +429,8 @@ class ProxmoxClient:
                 'Accept': 'application/json'
             }
 
-            # Context-specific warning suppression - only suppress when SSL verification is disabled
-            with suppress_insecure_request_warning(self.ssl_verify):
-                response = self.session.post(
+            with self._borrow_session() as session:
+                response = session.post(
                     self.auth_url,
                     data=auth_data,
                     headers=headers,
@@ -245,9 +439,10 @@ class ProxmoxClient:
                 response.raise_for_status()
             auth_result = response.json()
             if auth_result['data']:
-                self.session.cookies.set('PVEAuthCookie', auth_result['data']['ticket'])
-                self._ticket_obtained_at = time.time()
-                debug_print("Authentication successful")
+                return (
+                    auth_result['data']['ticket'],
+                    auth_result['data'].get('CSRFPreventionToken')
+                )
             else:
                 raise ProxmoxAuthenticationError("Authentication failed - no ticket received")
         except requests.exceptions.ConnectionError as e:
@@ -279,8 +474,10 @@ class ProxmoxClient:
         """Check if the authentication ticket needs refresh.
 
         Returns True if the ticket is expired or will expire soon
-        (within the refresh threshold).
+        (within the refresh threshold). API tokens never need a refresh.
         """
+        if self._api_token:
+            return False
         if self._ticket_obtained_at is None:
             return True
         elapsed = time.time() - self._ticket_obtained_at
@@ -305,22 +502,45 @@ class ProxmoxClient:
             # Double-check after acquiring lock (another thread may have refreshed)
             if self._is_ticket_expired():
                 debug_print("Authentication ticket expired or expiring soon, refreshing...")
+                self._inline_auth_count += 1
                 self._authenticate()
 
     def close(self):
-        """Close the session and release resources.
+        """Close all pooled sessions and release resources.
 
         Should be called when the client is no longer needed to prevent
-        resource leaks (file descriptors, TCP connections).
+        resource leaks (file descriptors, TCP connections). Sessions that are
+        borrowed at the time of the call are closed when they are returned.
         """
-        if self.session is not None:
-            try:
-                self.session.close()
-                debug_print(f"Closed Proxmox client session for {self.host}")
-            except Exception as e:
-                debug_print(f"Error closing session for {self.host}: {e}")
-            finally:
-                self.session = None
+        # __del__ may run on a partially constructed instance
+        session_lock = getattr(self, '_session_lock', None)
+        if session_lock is None:
+            return
+        with session_lock:
+            if self._closed:
+                return
+            self._closed = True
+            sessions, self._idle_sessions = self._idle_sessions, []
+            node_executor, self._node_executor = self._node_executor, None
+            inventory, self._inventory = self._inventory, None
+            renewer, self._ticket_renewer = getattr(self, '_ticket_renewer', None), None
+        try:
+            migrations = getattr(self, '_migrations', None)
+            if migrations is not None:
+                migrations.stop(timeout=0)
+            if renewer is not None:
+                renewer.stop(timeout=0)
+            if inventory is not None:
+                inventory.stop(timeout=0)
+            if node_executor is not None:
+                # Don't wait: close() may itself run on one of the executor's threads
+                node_executor.shutdown(wait=False)
+            for session in sessions:
+                session.close()
+            self._adapter.close()
+            debug_print(f"Closed Proxmox client session for {self.host}")
+        except Exception as e:
+            debug_print(f"Error closing session for {self.host}: {e}")
 
     def __enter__(self):
         """Context manager entry."""
@@ -368,26 +588,22 @@ class ProxmoxClient:
             ProxmoxResourceNotFoundError: If resource not found
             ProxmoxAPIError: If API returns error
         """
-        # Method mapping for cleaner code
-        method_handlers = {
-            'GET': self.session.get,
-            'POST': self.session.post,
-            'PUT': self.session.put,
-            'DELETE': self.session.delete
-        }
+        # Remember which ticket this request used so a 401 only triggers one
+        # re-authentication even when many threads fail at the same time
+        auth_state = self._auth_state
 
         try:
-            handler = method_handlers.get(method.upper())
-            if handler is None:
+            if method.upper() not in ('GET', 'POST', 'PUT', 'DELETE'):
                 raise ProxmoxValidationError(f"Unsupported HTTP method: {method}")
 
             # Add timeout if not specified
-            if 'timeout' not in kwargs:
-                kwargs['timeout'] = self.timeout
+            request_kwargs = dict(kwargs)
+            if 'timeout' not in request_kwargs:
+                request_kwargs['timeout'] = self.timeout
+            request_kwargs['headers'] = {**self._auth_headers(method), **request_kwargs.get('headers', {})}
 
-            # Context-specific warning suppression - only suppress when SSL verification is disabled
-            with suppress_insecure_request_warning(self.ssl_verify):
-                response = handler(url, **kwargs)
+            with self._borrow_session() as session:
+                response = session.request(method.upper(), url, **request_kwargs)
                 response.raise_for_status()
             return response
         except requests.exceptions.ConnectionError as e:
@@ -398,12 +614,16 @@ class ProxmoxClient:
             raise ProxmoxTimeoutError(f"Request timed out: {e}") from e
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 401:
-                # On 401, attempt re-authentication and retry once
-                if _auth_retry:
+                # On 401, attempt re-authentication and retry once. A rejected
+                # API token is final: there is nothing to refresh.
+                if _auth_retry and not self._api_token:
                     debug_print(f"Got 401 for {method} {url}, attempting re-authentication...")
                     try:
                         with self._auth_lock:
-                            self._authenticate()
+                            # Skip if another thread already replaced the rejected ticket
+                            if self._auth_state is auth_state:
+                                self._inline_auth_count += 1
+                                self._authenticate()
                         # Retry the request with _auth_retry=False to prevent infinite loop
                         return self._execute_request(method, url, _auth_retry=False, **kwargs)
                     except (ProxmoxAuthenticationError, ProxmoxConnectionError) as auth_e:
@@ -495,6 +715,35 @@ class ProxmoxClient:
 
         return result
 
+    def _make_guest_request(self, method: str, endpoint: str, **kwargs) -> requests.Response:
+        """Make a request that fails for reasons of one guest, not of the API.
+
+        Guest agent calls fail whenever an agent is not installed or not
+        running. Such requests are neither retried nor passed through the
+        circuit breaker: a cluster with many agentless VMs would otherwise
+        open the breaker and block every other request.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint
+            **kwargs: Additional arguments to pass to requests (e.g. a short timeout)
+
+        Returns:
+            Response object
+
+        Raises:
+            ProxmoxConnectionError: If connection fails
+            ProxmoxTimeoutError: If request times out
+            ProxmoxAuthenticationError: If authentication fails
+            ProxmoxResourceNotFoundError: If resource not found
+            ProxmoxAPIError: If API returns error
+        """
+        self._ensure_valid_ticket()
+
+        url = f"{self.base_url}{endpoint}"
+        debug_print(f"Making {method} guest request to: {endpoint}")
+        return self._execute_request(method, url, **kwargs)
+
     def test_connection(self) -> Dict[str, Any]:
         """Test connection to Proxmox."""
         try:
@@ -531,6 +780,227 @@ class ProxmoxClient:
             raise ProxmoxAPIError(f"Invalid JSON response: {e}") from e
         return nodes_data.get('data', [])
 
+    def _fan_out_nodes(
+        self, fetch_node: Callable[[str], Tuple[str, List[Dict[str, Any]], Optional[str]]]
+    ) -> Tuple[List[Dict[str, Any]], List[str], List[Dict[str, str]], int]:
+        """Run a per-node fetch against every node in parallel.
+
+        Args:
+            fetch_node: One of the _fetch_node_* methods
+
+        Returns:
+            Tuple of (items, successful_nodes, failed_nodes, node_count)
+        """
+        items: List[Dict[str, Any]] = []
+        failed_nodes: List[Dict[str, str]] = []
+        successful_nodes: List[str] = []
+        nodes = self.list_nodes()
+
+        # Validate node names first
+        valid_nodes = []
+        for node_info in nodes:
+            node_name = node_info.get("node")
+            if not node_name or not isinstance(node_name, str):
+                debug_print(f"Skipping node with invalid/missing name: {node_info}")
+                failed_nodes.append({"node": "unknown", "error": "Missing or invalid node name in response"})
+            else:
+                valid_nodes.append(node_name)
+
+        # Parallel execution on the client's node executor, which caps both the
+        # total number of requests in flight and the number per node
+        if valid_nodes:
+            executor = self._get_node_executor()
+            futures = [executor.submit(n, fetch_node, n) for n in valid_nodes]
+            for future in as_completed(futures):
+                node_name, node_items, error = future.result()
+                if error:
+                    failed_nodes.append({"node": node_name, "error": error})
+                else:
+                    items.extend(node_items)
+                    successful_nodes.append(node_name)
+
+        return items, successful_nodes, failed_nodes, len(nodes)
+
+    def _get_node_executor(self) -> NodeExecutor:
+        """Return the client's node executor, creating it on first use.
+
+        Raises:
+            ProxmoxError: If the client has been closed
+        """
+        with self._session_lock:
+            if self._closed:
+                raise ProxmoxError("Proxmox client is closed")
+            if self._node_executor is None:
+                self._node_executor = NodeExecutor(
+                    max_workers=self.max_node_workers,
+                    max_per_node=self.max_requests_per_node
+                )
+            return self._node_executor
+
+    def get_executor_stats(self) -> Dict[str, Any]:
+        """Get queue-depth and wait-time counters for the node executor.
+
+        Returns:
+            Dict of counters (see NodeExecutor.stats); all zero before the
+            first all-nodes query
+        """
+        executor = self._node_executor
+        if executor is not None:
+            return executor.stats()
+        return {
+            "max_workers": self.max_node_workers,
+            "max_per_node": self.max_requests_per_node,
+            "queue_depth": 0,
+            "max_queue_depth": 0,
+            "active": 0,
+            "submitted": 0,
+            "completed": 0,
+            "total_wait_seconds": 0.0,
+            "avg_wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+        }
+
+    def get_auth_stats(self) -> Dict[str, Any]:
+        """Get authentication mode, ticket age and background renewal counters.
+
+        Returns:
+            Dict with auth_mode, ticket_age_seconds, inline_refreshes (logins
+            a request had to wait for) and the TicketRenewer counters
+        """
+        stats: Dict[str, Any] = {"auth_mode": self.auth_mode}
+        if self._api_token:
+            return stats
+        obtained_at = self._ticket_obtained_at
+        stats["ticket_age_seconds"] = round(time.time() - obtained_at, 3) if obtained_at is not None else None
+        stats["ticket_expiry_seconds"] = self._ticket_expiry_seconds
+        stats["inline_refreshes"] = self._inline_auth_count
+        renewer = self._ticket_renewer
+        if renewer is not None:
+            stats.update(renewer.stats())
+            stats["next_renewal_in_seconds"] = round(renewer.seconds_until_renewal(), 3)
+        else:
+            stats["background_renewal"] = False
+        return stats
+
+    def get_cluster_resources(self, resource_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get the cluster-wide resource index from /cluster/resources.
+
+        A single call returns every node, guest and storage in the cluster
+        together with their current status and usage counters.
+
+        Args:
+            resource_type: Optional filter ('vm', 'storage', 'node', 'sdn')
+
+        Returns:
+            List of resource dicts as returned by Proxmox
+
+        Raises:
+            ProxmoxAPIError: If the response cannot be parsed
+        """
+        kwargs = {"params": {"type": resource_type}} if resource_type else {}
+        response = self._make_request('GET', '/cluster/resources', **kwargs)
+        try:
+            resources_data = response.json()
+        except json.JSONDecodeError as e:
+            debug_print(f"Failed to parse cluster resources response: {e}")
+            raise ProxmoxAPIError(f"Invalid JSON response: {e}") from e
+        resources = resources_data.get('data')
+        if not isinstance(resources, list):
+            raise ProxmoxAPIError("Invalid cluster resources response: 'data' is not a list")
+        return resources
+
+    @staticmethod
+    def _normalize_cluster_guest(resource: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a /cluster/resources guest entry to the /nodes/{node}/{qemu,lxc} shape."""
+        guest = {k: v for k, v in resource.items() if k not in ('id', 'maxcpu')}
+        if 'maxcpu' in resource:
+            guest['cpus'] = resource['maxcpu']
+        # Per-node qemu listings carry no 'type'; lxc listings report 'lxc'
+        if guest.get('type') == 'qemu':
+            del guest['type']
+        return guest
+
+    @staticmethod
+    def _normalize_cluster_storage(resource: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a /cluster/resources storage entry to the /nodes/{node}/storage shape."""
+        storage = {
+            "storage": resource.get("storage"),
+            "node": resource.get("node"),
+            "type": resource.get("plugintype"),
+            "content": resource.get("content"),
+            "shared": resource.get("shared", 0),
+            "enabled": 1,
+            "active": 1 if resource.get("status") == "available" else 0,
+        }
+        total = resource.get("maxdisk")
+        used = resource.get("disk")
+        if total is not None and used is not None:
+            storage["total"] = total
+            storage["used"] = used
+            storage["avail"] = max(total - used, 0)
+            storage["used_fraction"] = used / total if total else 0
+        return storage
+
+    def _list_from_cluster_resources(
+        self, kind: str
+    ) -> Optional[Tuple[List[Dict[str, Any]], List[str], List[Dict[str, str]], int]]:
+        """Build an all-node listing from a single /cluster/resources call.
+
+        Mirrors the per-node fan-out results: guests and storage on nodes that
+        are not online are reported in failed_nodes instead of the data, as the
+        per-node request to such a node would have failed.
+
+        Args:
+            kind: 'qemu', 'lxc' or 'storage'
+
+        Returns:
+            Tuple of (items, successful_nodes, failed_nodes, node_count), or
+            None if the cluster endpoint is unavailable and the caller should
+            fall back to the per-node fan-out.
+        """
+        if not (self.use_cluster_resources and self._cluster_resources_available):
+            return None
+
+        try:
+            resources = self.get_cluster_resources()
+        except ProxmoxResourceNotFoundError as e:
+            # Endpoint missing on this installation - don't ask again
+            debug_print(f"Cluster resources endpoint not available, using per-node queries: {e}")
+            self._cluster_resources_available = False
+            return None
+        except (ProxmoxConnectionError, ProxmoxTimeoutError, ProxmoxAPIError) as e:
+            debug_print(f"Cluster resources query failed, using per-node queries: {e}")
+            return None
+
+        failed_nodes: List[Dict[str, str]] = []
+        successful_nodes: List[str] = []
+        node_count = 0
+        for resource in resources:
+            if resource.get("type") != "node":
+                continue
+            node_count += 1
+            node_name = resource.get("node")
+            if not node_name or not isinstance(node_name, str):
+                debug_print(f"Skipping node with invalid/missing name: {resource}")
+                failed_nodes.append({"node": "unknown", "error": "Missing or invalid node name in response"})
+            elif resource.get("status") != "online":
+                failed_nodes.append({"node": node_name, "error": f"Node status is {resource.get('status', 'unknown')}"})
+            else:
+                successful_nodes.append(node_name)
+
+        online = set(successful_nodes)
+        if kind == 'storage':
+            items = [
+                self._normalize_cluster_storage(r) for r in resources
+                if r.get("type") == "storage" and r.get("node") in online
+            ]
+        else:
+            items = [
+                self._normalize_cluster_guest(r) for r in resources
+                if r.get("type") == kind and r.get("node") in online
+            ]
+        return items, successful_nodes, failed_nodes, node_count
+
     def _fetch_node_vms(self, node_name: str) -> Tuple[str, List[Dict[str, Any]], Optional[str]]:
         """Fetch VMs from a single node (for parallel execution).
 
@@ -561,23 +1031,36 @@ class ProxmoxClient:
             debug_print(f"Failed to get VMs from node {node_name}: {e}")
             return (node_name, [], str(e))
 
-    def list_vms(self, node: str = None, include_metadata: bool = False) -> Any:
+    def list_vms(self, node: str = None, include_metadata: bool = False, include_config: bool = False,
+                 config_keys: Optional[List[str]] = None) -> Any:
         """List all virtual machines.
 
-        When querying all nodes, uses parallel execution for improved performance.
+        When querying all nodes, uses a single /cluster/resources request, falling
+        back to parallel per-node queries if that endpoint is unavailable.
         Partial failures are tracked and logged. If ALL nodes fail, raises ProxmoxAPIError.
         If some succeed, returns available data with a warning logged about failed nodes.
 
         Args:
-            node: Optional node name to query. If None, queries all nodes in parallel.
+            node: Optional node name to query. If None, queries all nodes.
             include_metadata: If True and querying all nodes, returns a dict with
                 'data', 'failed_nodes', 'successful_nodes', and 'partial_failure'.
                 Default False for backward compatibility.
+            include_config: If True, attach each VM's config as 'config' (fetched
+                in parallel and briefly cached, see VMConfigFetcher); a VM whose
+                config cannot be read gets 'config_error' instead
+            config_keys: Only these config keys; a key without a number also
+                selects its numbered family ('net' -> net0, net1, ...)
 
         Returns:
             List of VMs when node is specified or include_metadata is False.
             Dict with metadata when include_metadata is True and querying all nodes.
+
+        Raises:
+            ProxmoxValidationError: If config_keys is invalid
         """
+        if include_config:
+            # Reject a bad key selection before listing anything
+            validate_config_keys(config_keys)
         if node:
             endpoint = f'/nodes/{node}/qemu'
             response = self._make_request('GET', endpoint)
@@ -586,40 +1069,19 @@ class ProxmoxClient:
             except json.JSONDecodeError as e:
                 debug_print(f"Failed to parse VMs list response: {e}")
                 raise ProxmoxAPIError(f"Invalid JSON response: {e}") from e
-            return vms_data.get('data', [])
+            vms = vms_data.get('data', [])
+            if include_config:
+                self._vm_configs.enrich(vms, config_keys, node=node)
+            return vms
         else:
-            # Get VMs from all nodes in parallel for O(1) time instead of O(n)
-            all_vms = []
-            failed_nodes = []
-            successful_nodes = []
-            nodes = self.list_nodes()
-
-            # Validate node names first
-            valid_nodes = []
-            for node_info in nodes:
-                node_name = node_info.get("node")
-                if not node_name or not isinstance(node_name, str):
-                    debug_print(f"Skipping node with invalid/missing name: {node_info}")
-                    failed_nodes.append({"node": "unknown", "error": "Missing or invalid node name in response"})
-                else:
-                    valid_nodes.append(node_name)
-
-            # Parallel execution using ThreadPoolExecutor
-            if valid_nodes:
-                # Limit workers to avoid overwhelming the Proxmox cluster
-                max_workers = min(len(valid_nodes), 10)
-                with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                    futures = {executor.submit(self._fetch_node_vms, n): n for n in valid_nodes}
-                    for future in as_completed(futures):
-                        node_name, vms, error = future.result()
-                        if error:
-                            failed_nodes.append({"node": node_name, "error": error})
-                        else:
-                            all_vms.extend(vms)
-                            successful_nodes.append(node_name)
+            # One /cluster/resources call when available, per-node fan-out otherwise
+            inventory = self._list_from_cluster_resources('qemu')
+            if inventory is None:
+                inventory = self._fan_out_nodes(self._fetch_node_vms)
+            all_vms, successful_nodes, failed_nodes, node_count = inventory
 
             # If ALL nodes failed (and we had nodes to query), raise an error
-            if nodes and failed_nodes and len(failed_nodes) == len(nodes):
+            if node_count and failed_nodes and len(failed_nodes) == node_count:
                 error_details = "; ".join([f"{n['node']}: {n['error']}" for n in failed_nodes])
                 raise ProxmoxAPIError(f"Failed to get VMs from all nodes: {error_details}")
 
@@ -628,6 +1090,9 @@ class ProxmoxClient:
                 failed_names = [n["node"] for n in failed_nodes]
                 debug_print(f"WARNING: Partial failure - could not get VMs from nodes: {failed_names}")
 
+            if include_config:
+                self._vm_configs.enrich(all_vms, config_keys)
+
             if include_metadata:
                 return {
                     "data": all_vms,
@@ -714,12 +1179,13 @@ class ProxmoxClient:
     def list_containers(self, node: str = None, include_metadata: bool = False) -> Any:
         """List all containers.
 
-        When querying all nodes, uses parallel execution for improved performance.
+        When querying all nodes, uses a single /cluster/resources request, falling
+        back to parallel per-node queries if that endpoint is unavailable.
         Partial failures are tracked and logged. If ALL nodes fail, raises ProxmoxAPIError.
         If some succeed, returns available data with a warning logged about failed nodes.
 
         Args:
-            node: Optional node name to query. If None, queries all nodes in parallel.
+            node: Optional node name to query. If None, queries all nodes.
             include_metadata: If True and querying all nodes, returns a dict with
                 'data', 'failed_nodes', 'successful_nodes', and 'partial_failure'.
                 Default False for backward compatibility.
@@ -738,37 +1204,14 @@ class ProxmoxClient:
                 raise ProxmoxAPIError(f"Invalid JSON response: {e}") from e
             return containers_data.get('data', [])
         else:
-            # Get containers from all nodes in parallel for O(1) time instead of O(n)
-            all_containers = []
-            failed_nodes = []
-            successful_nodes = []
-            nodes = self.list_nodes()
-
-            # Validate node names first
-            valid_nodes = []
-            for node_info in nodes:
-                node_name = node_info.get("node")
-                if not node_name or not isinstance(node_name, str):
-                    debug_print(f"Skipping node with invalid/missing name: {node_info}")
-                    failed_nodes.append({"node": "unknown", "error": "Missing or invalid node name in response"})
-                else:
-                    valid_nodes.append(node_name)
-
-            # Parallel execution using ThreadPoolExecutor
-            if valid_nodes:
-                max_workers = min(len(valid_nodes), 10)
-                with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                    futures = {executor.submit(self._fetch_node_containers, n): n for n in valid_nodes}
-                    for future in as_completed(futures):
-                        node_name, containers, error = future.result()
-                        if error:
-                            failed_nodes.append({"node": node_name, "error": error})
-                        else:
-                            all_containers.extend(containers)
-                            successful_nodes.append(node_name)
+            # One /cluster/resources call when available, per-node fan-out otherwise
+            inventory = self._list_from_cluster_resources('lxc')
+            if inventory is None:
+                inventory = self._fan_out_nodes(self._fetch_node_containers)
+            all_containers, successful_nodes, failed_nodes, node_count = inventory
 
             # If ALL nodes failed (and we had nodes to query), raise an error
-            if nodes and failed_nodes and len(failed_nodes) == len(nodes):
+            if node_count and failed_nodes and len(failed_nodes) == node_count:
                 error_details = "; ".join([f"{n['node']}: {n['error']}" for n in failed_nodes])
                 raise ProxmoxAPIError(f"Failed to get containers from all nodes: {error_details}")
 
@@ -819,12 +1262,13 @@ class ProxmoxClient:
     def list_storage(self, node: str = None, include_metadata: bool = False) -> Any:
         """List all storage pools.
 
-        When querying all nodes, uses parallel execution for improved performance.
+        When querying all nodes, uses a single /cluster/resources request, falling
+        back to parallel per-node queries if that endpoint is unavailable.
         Partial failures are tracked and logged. If ALL nodes fail, raises ProxmoxAPIError.
         If some succeed, returns available data with a warning logged about failed nodes.
 
         Args:
-            node: Optional node name to query. If None, queries all nodes in parallel.
+            node: Optional node name to query. If None, queries all nodes.
             include_metadata: If True and querying all nodes, returns a dict with
                 'data', 'failed_nodes', 'successful_nodes', and 'partial_failure'.
                 Default False for backward compatibility.
@@ -843,37 +1287,14 @@ class ProxmoxClient:
                 raise ProxmoxAPIError(f"Invalid JSON response: {e}") from e
             return storage_data.get('data', [])
         else:
-            # Get storage from all nodes in parallel for O(1) time instead of O(n)
-            all_storage = []
-            failed_nodes = []
-            successful_nodes = []
-            nodes = self.list_nodes()
-
-            # Validate node names first
-            valid_nodes = []
-            for node_info in nodes:
-                node_name = node_info.get("node")
-                if not node_name or not isinstance(node_name, str):
-                    debug_print(f"Skipping node with invalid/missing name: {node_info}")
-                    failed_nodes.append({"node": "unknown", "error": "Missing or invalid node name in response"})
-                else:
-                    valid_nodes.append(node_name)
-
-            # Parallel execution using ThreadPoolExecutor
-            if valid_nodes:
-                max_workers = min(len(valid_nodes), 10)
-                with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                    futures = {executor.submit(self._fetch_node_storage, n): n for n in valid_nodes}
-                    for future in as_completed(futures):
-                        node_name, storage, error = future.result()
-                        if error:
-                            failed_nodes.append({"node": node_name, "error": error})
-                        else:
-                            all_storage.extend(storage)
-                            successful_nodes.append(node_name)
+            # One /cluster/resources call when available, per-node fan-out otherwise
+            inventory = self._list_from_cluster_resources('storage')
+            if inventory is None:
+                inventory = self._fan_out_nodes(self._fetch_node_storage)
+            all_storage, successful_nodes, failed_nodes, node_count = inventory
 
             # If ALL nodes failed (and we had nodes to query), raise an error
-            if nodes and failed_nodes and len(failed_nodes) == len(nodes):
+            if node_count and failed_nodes and len(failed_nodes) == node_count:
                 error_details = "; ".join([f"{n['node']}: {n['error']}" for n in failed_nodes])
                 raise ProxmoxAPIError(f"Failed to get storage from all nodes: {error_details}")
 
@@ -983,61 +1404,85 @@ class ProxmoxClient:
                 "message": f"Exception getting VM status: {str(e)}"
             }
 
-    def create_vm(self, node: str, name: str, vmid: int = None, cores: int = 1, memory: int = 512) -> Dict[str, Any]:
+    def create_vm(self, node: Optional[str], name: str, vmid: int = None, cores: int = 1, memory: int = 512,
+                  storage: Optional[str] = None) -> Dict[str, Any]:
         """Create a new virtual machine.
 
-        If vmid is not specified, automatically allocates the next available VMID.
-        Handles VMID conflicts by retrying with a new VMID (up to VMID_CONFLICT_MAX_RETRIES times).
+        If vmid is not specified, a VMID is reserved from the client's VMIDAllocator,
+        so concurrent creates from this process never pick the same ID. A conflict
+        with a VM created elsewhere is retried with a new VMID (up to
+        VMID_CONFLICT_MAX_RETRIES times).
 
         Args:
-            node: Node name where the VM will be created
+            node: Node name where the VM will be created, or None to place it on
+                the node with the most headroom (see recommend_node)
             name: VM name
             vmid: Optional VM ID. If not specified, auto-allocates next available.
             cores: Number of CPU cores (default: 1)
             memory: Memory in MB (default: 512)
+            storage: Storage pool for the VM (optional); automatic placement
+                only considers nodes where it is active
 
         Returns:
-            Dict with status, vmid (on success), and message
+            Dict with status, vmid (on success), and message; with automatic
+            placement also the chosen node
         """
+        if node is None:
+            # Ranked and reserved in one step: concurrent placements see this VM
+            placement = self._place(self._capacity.reserve_best, cores=int(cores), memory=int(memory),
+                                    storage=storage)
+            if placement.get("status") == "error":
+                return placement
+            if placement["node"] is None:
+                return {
+                    "status": "error",
+                    "message": "No node has enough free CPU and memory (and the requested storage) for this VM",
+                    "rejected": placement["rejected"]
+                }
+            node = placement["node"]
+            debug_print(f"Auto-placing VM {name} on node {node}")
+            result = self._create_vm_on_node(node, name, vmid, cores, memory)
+            if result.get("status") != "success":
+                self._capacity.release(placement["reservation"])
+            return dict(result, node=node)
+        return self._create_vm_on_node(node, name, vmid, cores, memory)
+
+    def _create_vm_on_node(self, node: str, name: str, vmid: Optional[int], cores: int, memory: int) -> Dict[str, Any]:
+        """Create a VM on a given node, allocating a VMID if none is given."""
         # If user specified a VMID, use it directly without retry logic
         if vmid is not None:
-            return self._create_vm_with_vmid(node, name, vmid, cores, memory)
+            result = self._create_vm_with_vmid(node, name, vmid, cores, memory)
+            if result.get("status") == "success":
+                self._vmid_allocator.mark_used([vmid])
+            return result
 
         # Auto-allocate VMID with retry on conflict
         last_error = None
         for attempt in range(self.VMID_CONFLICT_MAX_RETRIES):
             try:
                 allocated_vmid = self._get_next_vmid()
-                debug_print(f"Attempting VM creation with VMID {allocated_vmid} (attempt {attempt + 1}/{self.VMID_CONFLICT_MAX_RETRIES})")
-
-                result = self._create_vm_with_vmid(node, name, int(allocated_vmid), cores, memory)
-
-                # Check if it was a VMID conflict error
-                if result.get("status") == "error":
-                    error_msg = result.get("message", "").lower()
-                    if "already exists" in error_msg or "vmid" in error_msg and "in use" in error_msg:
-                        debug_print(f"VMID {allocated_vmid} conflict detected, retrying...")
-                        last_error = result.get("message")
-                        continue  # Retry with new VMID
-
-                return result
-
-            except ProxmoxAPIError as e:
-                error_str = str(e).lower()
-                if "already exists" in error_str or ("vmid" in error_str and "in use" in error_str):
-                    debug_print(f"VMID conflict on attempt {attempt + 1}: {e}")
-                    last_error = str(e)
-                    continue  # Retry with new VMID
-                # Other API errors - don't retry
-                return {
-                    "status": "error",
-                    "message": f"Exception creating VM: {str(e)}"
-                }
-            except (ProxmoxConnectionError, ProxmoxTimeoutError, ProxmoxAuthenticationError) as e:
+            except (ProxmoxConnectionError, ProxmoxTimeoutError, ProxmoxAuthenticationError, ProxmoxAPIError) as e:
                 return {
                     "status": "error",
                     "message": f"Exception creating VM: {str(e)}"
                 }
+            debug_print(f"Attempting VM creation with VMID {allocated_vmid} (attempt {attempt + 1}/{self.VMID_CONFLICT_MAX_RETRIES})")
+
+            result = self._create_vm_with_vmid(node, name, allocated_vmid, cores, memory)
+            if result.get("status") == "success":
+                self._vmid_allocator.confirm([allocated_vmid])
+                return result
+
+            # Taken by another client since the last scan: record it and retry
+            error_msg = result.get("message", "").lower()
+            if "already exists" in error_msg or "vmid" in error_msg and "in use" in error_msg:
+                debug_print(f"VMID {allocated_vmid} conflict detected, retrying...")
+                self._vmid_allocator.mark_conflict(allocated_vmid)
+                last_error = result.get("message")
+                continue
+
+            self._vmid_allocator.release([allocated_vmid])
+            return result
 
         # Exhausted retries
         return {
@@ -1086,11 +1531,10 @@ class ProxmoxClient:
             }
 
     def _get_next_vmid(self) -> int:
-        """Get the next available VMID using Proxmox cluster API.
+        """Reserve the next available VMID.
 
-        Uses the /cluster/nextid endpoint to get a suggested VMID. Note that
-        this does NOT reserve the VMID - concurrent VM creation may still
-        cause conflicts. The create_vm method handles this with retry logic.
+        The VMID is reserved in the client's VMIDAllocator until it is passed
+        to confirm_vmids or release_vmids.
 
         Returns:
             Integer of the next available VMID
@@ -1098,65 +1542,45 @@ class ProxmoxClient:
         Raises:
             ProxmoxAPIError: If unable to determine next VMID
         """
-        # Try the cluster-wide nextid endpoint first
+        return self._vmid_allocator.allocate(1)[0]
+
+    def allocate_vmids(self, count: int = 1) -> Dict[str, Any]:
+        """Reserve a range of consecutive free VMIDs for a batch of creates.
+
+        Reserved VMIDs are never handed out again by this client. Pass them to
+        confirm_vmids once created and to release_vmids if a create fails.
+
+        Args:
+            count: Number of VMIDs to reserve
+
+        Returns:
+            Dict with status and the list of reserved vmids
+        """
         try:
-            response = self._make_request("GET", "/cluster/nextid")
-            if response.status_code == 200:
-                data = response.json()
-                next_id = data.get("data")
-                if next_id is not None:
-                    debug_print(f"Got suggested VMID {next_id} from cluster API")
-                    return int(next_id)
-        except json.JSONDecodeError as e:
-            debug_print(f"Failed to parse nextid response: {e}")
+            vmids = self._vmid_allocator.allocate(count)
+        except ProxmoxValidationError as e:
+            return {
+                "status": "error",
+                "message": str(e)
+            }
         except (ProxmoxConnectionError, ProxmoxTimeoutError, ProxmoxAuthenticationError, ProxmoxAPIError) as e:
-            debug_print(f"Cluster nextid API failed: {e}")
+            return {
+                "status": "error",
+                "message": f"Exception allocating VMIDs: {str(e)}"
+            }
+        return {
+            "status": "success",
+            "vmids": vmids,
+            "message": f"Reserved {len(vmids)} VMID(s): {vmids[0]}-{vmids[-1]}"
+        }
 
-        # Fallback: calculate from all VMs across all nodes (cluster-wide)
-        debug_print("Cluster nextid API failed, falling back to cluster-wide manual calculation")
-        try:
-            all_vmids = set()
-
-            # Get VMs from all nodes
-            nodes = self.list_nodes()
-            for node_info in nodes:
-                node_name = node_info.get("node")
-                if not node_name:
-                    continue
-                try:
-                    # Get VMs
-                    response = self._make_request("GET", f"/nodes/{node_name}/qemu")
-                    if response.status_code == 200:
-                        vms = response.json().get("data", [])
-                        for vm in vms:
-                            vmid = vm.get("vmid")
-                            if vmid is not None:
-                                all_vmids.add(int(vmid))
-
-                    # Get containers too - they share the VMID namespace
-                    response = self._make_request("GET", f"/nodes/{node_name}/lxc")
-                    if response.status_code == 200:
-                        containers = response.json().get("data", [])
-                        for ct in containers:
-                            vmid = ct.get("vmid")
-                            if vmid is not None:
-                                all_vmids.add(int(vmid))
-                except (ProxmoxConnectionError, ProxmoxTimeoutError, ProxmoxAPIError, json.JSONDecodeError) as e:
-                    debug_print(f"Failed to get VMs/containers from node {node_name}: {e}")
-                    continue
-
-            if all_vmids:
-                next_id = max(all_vmids) + 1
-                debug_print(f"Calculated next VMID {next_id} from cluster scan (found {len(all_vmids)} existing)")
-                return next_id
-
-            # No VMs found, start from default
-            debug_print("No existing VMs/containers found, starting from VMID 100")
-            return 100
+    def confirm_vmids(self, vmids: List[int]) -> None:
+        """Mark VMIDs from allocate_vmids as created."""
+        self._vmid_allocator.confirm(vmids)
 
-        except Exception as e:
-            debug_print(f"Failed to calculate next VMID: {e}")
-            raise ProxmoxAPIError(f"Unable to determine next available VMID: {e}") from e
+    def release_vmids(self, vmids: List[int]) -> None:
+        """Return VMIDs from allocate_vmids that were not used."""
+        self._vmid_allocator.release(vmids)
 
     def suspend_vm(self, node: str, vmid: int) -> Dict[str, Any]:
         """Suspend a running virtual machine."""
@@ -1310,30 +1734,9 @@ class ProxmoxClient:
                         "message": f"Failed to get storage usage: {response.status_code}"
                     }
             else:
-                # Get storage from all nodes in parallel for O(1) time instead of O(n)
-                nodes = self.list_nodes()
-                all_storage = []
-                failed_nodes = []
-
-                # Validate node names first
-                valid_nodes = []
-                for node_info in nodes:
-                    node_name = node_info.get("node")
-                    if node_name and isinstance(node_name, str):
-                        valid_nodes.append(node_name)
-
-                # Parallel execution using ThreadPoolExecutor
-                if valid_nodes:
-                    max_workers = min(len(valid_nodes), 10)
-                    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                        futures = {executor.submit(self._fetch_node_storage, n): n for n in valid_nodes}
-                        for future in as_completed(futures):
-                            node_name, storage, error = future.result()
-                            if error:
-                                failed_nodes.append(node_name)
-                                debug_print(f"Failed to get storage from node {node_name}: {error}")
-                            else:
-                                all_storage.extend(storage)
+                # Get storage from all nodes in parallel on the client's node executor
+                all_storage, _, failed, _ = self._fan_out_nodes(self._fetch_node_storage)
+                failed_nodes = [n["node"] for n in failed]
 
                 result = {
                     "status": "success",
@@ -1351,6 +1754,48 @@ class ProxmoxClient:
                 "message": f"Exception getting storage usage: {str(e)}"
             }
 
+    def list_storage_content(
+        self,
+        node: str,
+        storage: str,
+        content: Optional[str] = None,
+        vmid: Optional[int] = None,
+        name_prefix: Optional[str] = None,
+        limit: int = DEFAULT_CONTENT_PAGE_SIZE,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """List the volumes of a storage (backups, ISOs, disks, ...) one page at a time.
+
+        The content type and VMID filters are applied by Proxmox. Pass the
+        returned next_cursor to get the following page (see StorageContentPager).
+
+        Args:
+            node: Node name
+            storage: Storage name
+            content: Only this content type, e.g. 'backup' or 'iso' (optional)
+            vmid: Only volumes owned by this guest (optional)
+            name_prefix: Only volumes whose file name starts with this (optional)
+            limit: Maximum volumes per page
+            cursor: next_cursor from the previous page (optional)
+
+        Returns:
+            Dict with status, items, total, offset and next_cursor (None on the last page)
+        """
+        try:
+            return self._storage_content.list_content(
+                node, storage, content=content, vmid=vmid, name_prefix=name_prefix, limit=limit, cursor=cursor
+            )
+        except ProxmoxValidationError as e:
+            return {
+                "status": "error",
+                "message": str(e)
+            }
+        except (ProxmoxConnectionError, ProxmoxTimeoutError, ProxmoxAuthenticationError, ProxmoxAPIError) as e:
+            return {
+                "status": "error",
+                "message": f"Exception listing storage content: {str(e)}"
+            }
+
     def create_snapshot(self, node: str, vmid: int, snapname: str, description: str = "") -> Dict[str, Any]:
         """Create a snapshot of a VM or container."""
         try:
@@ -1428,3 +1873,593 @@ class ProxmoxClient:
                 "status": "error",
                 "message": f"Exception listing snapshots: {str(e)}"
             }
+
+    def wait_for_tasks(self, upids: List[str], timeout: float = DEFAULT_TASK_TIMEOUT_SECONDS) -> Dict[str, Any]:
+        """Wait for a batch of Proxmox tasks to finish.
+
+        Pending tasks are grouped by node and each node's task list is polled
+        once per tick, with adaptive backoff between ticks (see TaskTracker).
+
+        Args:
+            upids: Task IDs returned by start_vm, create_snapshot, etc.
+            timeout: Maximum time to wait in seconds; 0 checks once without waiting
+
+        Returns:
+            Dict with per-task state, exit status and timing plus overall counts
+        """
+        try:
+            return TaskTracker(self).wait_for_tasks(upids, timeout)
+        except ProxmoxValidationError as e:
+            return {
+                "status": "error",
+                "message": str(e)
+            }
+
+    def get_cluster_capacity(self) -> Dict[str, Any]:
+        """Get free CPU, memory and storage of every node plus cluster totals.
+
+        Node status and storage are fetched for all nodes in parallel and the
+        snapshot is cached briefly (see CapacityPlanner).
+
+        Returns:
+            Dict with status, per-node headroom, totals and failed nodes
+        """
+        try:
+            return {"status": "success", **self._capacity.summary()}
+        except (ProxmoxConnectionError, ProxmoxTimeoutError, ProxmoxAuthenticationError, ProxmoxAPIError) as e:
+            return {
+                "status": "error",
+                "message": f"Exception getting cluster capacity: {str(e)}"
+            }
+
+    def recommend_node(
+        self,
+        cores: int = 1,
+        memory: int = 512,
+        storage_gb: float = 0,
+        storage: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Recommend the node with the most headroom for a new guest.
+
+        Args:
+            cores: vCPUs of the guest
+            memory: Memory of the guest in MB
+            storage_gb: Disk space needed in GB (optional)
+            storage: Storage that must hold the disk (optional)
+
+        Returns:
+            Dict with status, the recommended node (None if nothing fits),
+            ranked candidates and rejected nodes with reasons
+        """
+        return self._place(self._capacity.recommend_node, cores=cores, memory=memory,
+                           storage_gb=storage_gb, storage=storage)
+
+    def _place(self, method: Callable[..., Dict[str, Any]], **requirements: Any) -> Dict[str, Any]:
+        """Call a CapacityPlanner placement method and wrap its result or error."""
+        try:
+            return {"status": "success", **method(**requirements)}
+        except ProxmoxValidationError as e:
+            return {
+                "status": "error",
+                "message": str(e)
+            }
+        except (ProxmoxConnectionError, ProxmoxTimeoutError, ProxmoxAuthenticationError, ProxmoxAPIError) as e:
+            return {
+                "status": "error",
+                "message": f"Exception recommending node: {str(e)}"
+            }
+
+    def migrate_guests(
+        self,
+        source_node: Optional[str] = None,
+        vmids: Optional[List[int]] = None,
+        tag: Optional[str] = None,
+        name_pattern: Optional[str] = None,
+        guest_type: str = "all",
+        target_nodes: Optional[List[str]] = None,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT_MIGRATIONS,
+        max_per_source: int = DEFAULT_MIGRATIONS_PER_SOURCE,
+        max_per_target: int = DEFAULT_MIGRATIONS_PER_TARGET,
+        bwlimit: Optional[int] = None,
+        with_local_disks: bool = False,
+        timeout: float = DEFAULT_MIGRATION_TIMEOUT_SECONDS,
+        dry_run: bool = False
+    ) -> Dict[str, Any]:
+        """Migrate many guests to the nodes with the most free capacity.
+
+        Targets are planned up front; the migrations then run in the
+        background with bounded concurrency per job, source and target node
+        (see MigrationOrchestrator). Poll get_migration_status for progress.
+
+        Args:
+            source_node: Only guests on this node (drains the node)
+            vmids: Explicit VMIDs to move
+            tag: Only guests with this tag
+            name_pattern: Shell-style guest name pattern, e.g. "web-*"
+            guest_type: 'qemu', 'lxc' or 'all'
+            target_nodes: Nodes allowed to receive guests (default: all others)
+            max_concurrent: Migrations in flight across the job
+            max_per_source: Migrations in flight leaving any one node
+            max_per_target: Migrations in flight arriving at any one node
+            bwlimit: Per-migration bandwidth limit in KiB/s (optional)
+            with_local_disks: Also copy local disks of VMs
+            timeout: Seconds after which guests not yet migrated are abandoned
+            dry_run: Only return the plan
+
+        Returns:
+            Dict with status, job_id and the progress report (or the plan)
+        """
+        try:
+            return {
+                "status": "success",
+                **self._migrations.start(
+                    source_node=source_node, vmids=vmids, tag=tag, name_pattern=name_pattern,
+                    guest_type=guest_type, target_nodes=target_nodes, max_concurrent=max_concurrent,
+                    max_per_source=max_per_source, max_per_target=max_per_target, bwlimit=bwlimit,
+                    with_local_disks=with_local_disks, timeout=timeout, dry_run=dry_run
+                )
+            }
+        except ProxmoxValidationError as e:
+            return {
+                "status": "error",
+                "message": str(e)
+            }
+        except (ProxmoxConnectionError, ProxmoxTimeoutError, ProxmoxAuthenticationError, ProxmoxAPIError) as e:
+            return {
+                "status": "error",
+                "message": f"Exception planning migration: {str(e)}"
+            }
+
+    def get_migration_status(self, job_id: Optional[str] = None) -> Dict[str, Any]:
+        """Get the progress report of a migration job, or a summary of all jobs.
+
+        Args:
+            job_id: Job returned by migrate_guests (optional)
+
+        Returns:
+            Dict with status and the job's per-guest progress, counts and ETA
+        """
+        try:
+            return {"status": "success", **self._migrations.status(job_id)}
+        except ProxmoxValidationError as e:
+            return {
+                "status": "error",
+                "message": str(e)
+            }
+
+    def update_migration(
+        self,
+        job_id: str,
+        max_concurrent: Optional[int] = None,
+        max_per_source: Optional[int] = None,
+        max_per_target: Optional[int] = None,
+        cancel: bool = False
+    ) -> Dict[str, Any]:
+        """Change the concurrency limits of a running migration job, or cancel it.
+
+        Args:
+            job_id: Job returned by migrate_guests
+            max_concurrent: New job-wide limit (optional)
+            max_per_source: New per-source-node limit (optional)
+            max_per_target: New per-target-node limit (optional)
+            cancel: Stop starting new migrations; running ones finish
+
+        Returns:
+            Dict with status and the job's progress report
+        """
+        try:
+            return {
+                "status": "success",
+                **self._migrations.update(
+                    job_id, max_concurrent=max_concurrent, max_per_source=max_per_source,
+                    max_per_target=max_per_target, cancel=cancel
+                )
+            }
+        except ProxmoxValidationError as e:
+            return {
+                "status": "error",
+                "message": str(e)
+            }
+
+    def tail_task_log(
+        self,
+        upid: str,
+        max_lines: int = DEFAULT_TAIL_LINES,
+        reset: bool = False,
+        history: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Get the lines of a task log written since the previous call.
+
+        The client keeps a cursor per task, so repeated calls only transfer
+        new lines (see LogTailer).
+
+        Args:
+            upid: Task ID returned by start_vm, create_snapshot, etc.
+            max_lines: Maximum new lines to return
+            reset: Start again from the first line
+            history: Return up to this many recently seen lines from memory
+                instead of fetching
+
+        Returns:
+            Dict with status, lines, next_start offset, total and whether more
+            lines are available
+        """
+        try:
+            return self._log_tailer.tail_task_log(upid, max_lines=max_lines, reset=reset, history=history)
+        except ProxmoxValidationError as e:
+            return {
+                "status": "error",
+                "message": str(e)
+            }
+        except (ProxmoxConnectionError, ProxmoxTimeoutError, ProxmoxAuthenticationError, ProxmoxAPIError) as e:
+            return {
+                "status": "error",
+                "message": f"Exception reading task log: {str(e)}"
+            }
+
+    def tail_syslog(
+        self,
+        node: str,
+        service: Optional[str] = None,
+        max_lines: int = DEFAULT_TAIL_LINES,
+        initial_lines: int = DEFAULT_SYSLOG_INITIAL_LINES,
+        reset: bool = False,
+        history: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Get the syslog lines of a node written since the previous call.
+
+        Args:
+            node: Node name
+            service: Only entries of this systemd unit (optional)
+            max_lines: Maximum new lines to return
+            initial_lines: Existing lines returned by the first call
+            reset: Start again from the last initial_lines lines
+            history: Return up to this many recently seen lines from memory
+                instead of fetching
+
+        Returns:
+            Dict with status, lines, next_start offset, total and whether more
+            lines are available
+        """
+        try:
+            return self._log_tailer.tail_syslog(
+                node, service=service, max_lines=max_lines, initial_lines=initial_lines,
+                reset=reset, history=history
+            )
+        except ProxmoxValidationError as e:
+            return {
+                "status": "error",
+                "message": str(e)
+            }
+        except (ProxmoxConnectionError, ProxmoxTimeoutError, ProxmoxAuthenticationError, ProxmoxAPIError) as e:
+            return {
+                "status": "error",
+                "message": f"Exception reading syslog: {str(e)}"
+            }
+
+    def bulk_power_action(
+        self,
+        action: str,
+        vmids: Optional[List[int]] = None,
+        node: Optional[str] = None,
+        tag: Optional[str] = None,
+        name_pattern: Optional[str] = None,
+        guest_type: str = "all",
+        wait: bool = False,
+        timeout: float = DEFAULT_TASK_TIMEOUT_SECONDS
+    ) -> Dict[str, Any]:
+        """Start, stop, shut down or suspend many VMs/containers at once.
+
+        Targets are an explicit VMID list and/or selectors (node, tag, name
+        pattern), combined with AND. Requests run on the node executor, so the
+        global and per-node concurrency limits apply (see BulkPowerRunner).
+
+        Args:
+            action: 'start', 'stop', 'shutdown' or 'suspend'
+            vmids: Explicit VMIDs to target
+            node: Only guests on this node
+            tag: Only guests with this tag
+            name_pattern: Shell-style guest name pattern, e.g. "web-*"
+            guest_type: 'qemu', 'lxc' or 'all'
+            wait: Wait for the resulting tasks to finish
+            timeout: Maximum seconds to wait when wait is True
+
+        Returns:
+            Dict with a summary of counts and a per-target result table
+        """
+        try:
+            return BulkPowerRunner(self).run(action, vmids, node, tag, name_pattern, guest_type, wait, timeout)
+        except ProxmoxValidationError as e:
+            return {
+                "status": "error",
+                "message": str(e)
+            }
+        except (ProxmoxConnectionError, ProxmoxTimeoutError, ProxmoxAuthenticationError, ProxmoxAPIError) as e:
+            return {
+                "status": "error",
+                "message": f"Exception running bulk {action}: {str(e)}"
+            }
+
+    def bulk_snapshot(
+        self,
+        snapname: str,
+        vmids: Optional[List[int]] = None,
+        node: Optional[str] = None,
+        tag: Optional[str] = None,
+        name_pattern: Optional[str] = None,
+        guest_type: str = "all",
+        description: str = "",
+        vmstate: bool = False,
+        max_per_node: int = DEFAULT_SNAPSHOTS_PER_NODE,
+        timeout: float = DEFAULT_BULK_SNAPSHOT_TIMEOUT_SECONDS
+    ) -> Dict[str, Any]:
+        """Snapshot many VMs/containers under one name.
+
+        At most max_per_node snapshot tasks run per node; the call returns
+        when every task has finished or the timeout expires (see BulkSnapshotRunner).
+
+        Args:
+            snapname: Snapshot name
+            vmids: Explicit VMIDs to target
+            node: Only guests on this node
+            tag: Only guests with this tag
+            name_pattern: Shell-style guest name pattern, e.g. "web-*"
+            guest_type: 'qemu', 'lxc' or 'all'
+            description: Snapshot description
+            vmstate: Include the RAM of running VMs
+            max_per_node: Snapshot tasks running at once per node
+            timeout: Seconds after which guests not yet snapshotted are skipped
+
+        Returns:
+            Dict with a summary of counts and a per-guest result table
+        """
+        try:
+            return BulkSnapshotRunner(self).create(
+                snapname, vmids=vmids, node=node, tag=tag, name_pattern=name_pattern, guest_type=guest_type,
+                description=description, vmstate=vmstate, max_per_node=max_per_node, timeout=timeout
+            )
+        except ProxmoxValidationError as e:
+            return {
+                "status": "error",
+                "message": str(e)
+            }
+        except (ProxmoxConnectionError, ProxmoxTimeoutError, ProxmoxAuthenticationError, ProxmoxAPIError) as e:
+            return {
+                "status": "error",
+                "message": f"Exception running bulk snapshot: {str(e)}"
+            }
+
+    def prune_snapshots(
+        self,
+        keep_last: Optional[int] = None,
+        keep_within_hours: Optional[float] = None,
+        vmids: Optional[List[int]] = None,
+        node: Optional[str] = None,
+        tag: Optional[str] = None,
+        name_pattern: Optional[str] = None,
+        guest_type: str = "all",
+        name_prefix: Optional[str] = None,
+        max_per_node: int = DEFAULT_SNAPSHOTS_PER_NODE,
+        dry_run: bool = False,
+        timeout: float = DEFAULT_BULK_SNAPSHOT_TIMEOUT_SECONDS
+    ) -> Dict[str, Any]:
+        """Apply a snapshot retention policy to many VMs/containers.
+
+        Snapshot lists are fetched in parallel; every snapshot that is neither
+        among the keep_last newest of its guest nor younger than
+        keep_within_hours is deleted, with at most max_per_node deletion
+        tasks per node (see BulkSnapshotRunner).
+
+        Args:
+            keep_last: Newest snapshots to keep per guest
+            keep_within_hours: Keep snapshots younger than this
+            vmids: Explicit VMIDs to target
+            node: Only guests on this node
+            tag: Only guests with this tag
+            name_pattern: Shell-style guest name pattern
+            guest_type: 'qemu', 'lxc' or 'all'
+            name_prefix: Only prune snapshots whose name starts with this
+            max_per_node: Deletion tasks running at once per node
+            dry_run: Only report what would be deleted
+            timeout: Seconds after which remaining deletions are skipped
+
+        Returns:
+            Dict with the policy, per-guest counts, a summary and a per-deletion result table
+        """
+        try:
+            return BulkSnapshotRunner(self).prune(
+                keep_last=keep_last, keep_within_hours=keep_within_hours, vmids=vmids, node=node, tag=tag,
+                name_pattern=name_pattern, guest_type=guest_type, name_prefix=name_prefix,
+                max_per_node=max_per_node, dry_run=dry_run, timeout=timeout
+            )
+        except ProxmoxValidationError as e:
+            return {
+                "status": "error",
+                "message": str(e)
+            }
+        except (ProxmoxConnectionError, ProxmoxTimeoutError, ProxmoxAuthenticationError, ProxmoxAPIError) as e:
+            return {
+                "status": "error",
+                "message": f"Exception pruning snapshots: {str(e)}"
+            }
+
+    def discover_guest_ips(
+        self,
+        vmids: Optional[List[int]] = None,
+        node: Optional[str] = None,
+        tag: Optional[str] = None,
+        name_pattern: Optional[str] = None,
+        guest_type: str = "all",
+        refresh: bool = False
+    ) -> Dict[str, Any]:
+        """Discover the IP addresses of running VMs/containers through their guest agents.
+
+        Guests are queried in parallel with a short timeout; results are
+        cached and indexed by IP for find_guest_by_ip (see GuestNetworkIndex).
+
+        Args:
+            vmids: Explicit VMIDs (all guests if no selector is given)
+            node: Only guests on this node
+            tag: Only guests with this tag
+            name_pattern: Shell-style guest name pattern
+            guest_type: 'qemu', 'lxc' or 'all'
+            refresh: Query every selected guest even if its cached result is fresh
+
+        Returns:
+            Dict with a summary and the addresses or agent error per guest
+        """
+        try:
+            return self._guest_network.discover(
+                vmids=vmids, node=node, tag=tag, name_pattern=name_pattern, guest_type=guest_type, refresh=refresh
+            )
+        except ProxmoxValidationError as e:
+            return {
+                "status": "error",
+                "message": str(e)
+            }
+        except (ProxmoxConnectionError, ProxmoxTimeoutError, ProxmoxAuthenticationError, ProxmoxAPIError) as e:
+            return {
+                "status": "error",
+                "message": f"Exception discovering guest IPs: {str(e)}"
+            }
+
+    def find_guest_by_ip(self, address: str) -> Dict[str, Any]:
+        """Find the VMs/containers that report an IP address (or an address in a network).
+
+        Answered from the cached IP index; the cluster is only discovered
+        when the index is empty, or nothing matches and the index is stale.
+
+        Args:
+            address: IP address ('10.1.2.3') or network ('10.1.2.0/24')
+
+        Returns:
+            Dict with the matching guests, interfaces and MAC addresses
+        """
+        try:
+            return self._guest_network.lookup(address)
+        except ProxmoxValidationError as e:
+            return {
+                "status": "error",
+                "message": str(e)
+            }
+        except (ProxmoxConnectionError, ProxmoxTimeoutError, ProxmoxAuthenticationError, ProxmoxAPIError) as e:
+            return {
+                "status": "error",
+                "message": f"Exception looking up guest IP: {str(e)}"
+            }
+
+    def _get_inventory(self) -> ClusterInventory:
+        """Return the client's inventory, creating it on first use.
+
+        Raises:
+            ProxmoxError: If the client has been closed
+        """
+        with self._session_lock:
+            if self._closed:
+                raise ProxmoxError("Proxmox client is closed")
+            if self._inventory is None:
+                self._inventory = ClusterInventory(self, refresh_interval=self.inventory_refresh_interval)
+            return self._inventory
+
+    def inventory_lookup(
+        self,
+        vmid: Optional[int] = None,
+        name: Optional[str] = None,
+        tag: Optional[str] = None,
+        node: Optional[str] = None,
+        resource_type: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Find VMs, containers, nodes or storage in the in-memory inventory.
+
+        The first call loads the inventory from /cluster/resources and starts
+        the background refresh; later calls are answered from the indexes
+        without any API request (see ClusterInventory).
+
+        Args:
+            vmid: VMID of a VM or container
+            name: Exact guest name (case-insensitive)
+            tag: Guest tag (case-insensitive)
+            node: Node name
+            resource_type: 'qemu', 'lxc', 'node' or 'storage'
+
+        Returns:
+            Dict with status, count, the matching resources and the inventory
+            generation and age
+        """
+        try:
+            inventory = self._get_inventory()
+            if not inventory.loaded:
+                inventory.refresh()
+            inventory.start()
+        except (ProxmoxConnectionError, ProxmoxTimeoutError, ProxmoxAuthenticationError, ProxmoxAPIError) as e:
+            return {
+                "status": "error",
+                "message": f"Exception loading inventory: {str(e)}"
+            }
+
+        items = inventory.lookup(vmid=vmid, name=name, tag=tag, node=node, resource_type=resource_type)
+        status = inventory.status()
+        return {
+            "status": "success",
+            "count": len(items),
+            "items": items,
+            "generation": status["generation"],
+            "age_seconds": status["age_seconds"]
+        }
+
+    def get_inventory_status(self) -> Dict[str, Any]:
+        """Get freshness, size and refresh counters of the in-memory inventory."""
+        inventory = self._inventory
+        if inventory is None:
+            return {
+                "status": "success",
+                "loaded": False,
+                "message": "Inventory not loaded yet; it is loaded by the first lookup"
+            }
+        return {"status": "success", **inventory.status()}
+
+    def get_metrics(
+        self,
+        vmids: Optional[List[int]] = None,
+        nodes: Optional[List[str]] = None,
+        tag: Optional[str] = None,
+        name_pattern: Optional[str] = None,
+        guest_type: str = "all",
+        timeframe: str = "hour",
+        cf: str = "AVERAGE",
+        metrics: Optional[List[str]] = None,
+        buckets: int = DEFAULT_METRIC_BUCKETS
+    ) -> Dict[str, Any]:
+        """Get downsampled RRD performance metrics for nodes, VMs and containers.
+
+        Series are fetched concurrently on the node executor and reduced to
+        per-bucket avg/max/p95 columns (see MetricsCollector).
+
+        Args:
+            vmids: Guests to include
+            nodes: Nodes to include (node-level metrics)
+            tag: Only guests with this tag
+            name_pattern: Shell-style guest name pattern, e.g. "web-*"
+            guest_type: 'qemu', 'lxc' or 'all'
+            timeframe: 'hour', 'day', 'week', 'month' or 'year'
+            cf: RRD consolidation function, 'AVERAGE' or 'MAX'
+            metrics: RRD field names to return (default depends on target kind)
+            buckets: Number of time buckets
+
+        Returns:
+            Dict with bucket start times and columnar statistics per target
+        """
+        try:
+            return MetricsCollector(self).collect(
+                vmids, nodes, tag, name_pattern, guest_type, timeframe, cf, metrics, buckets
+            )
+        except ProxmoxValidationError as e:
+            return {
+                "status": "error",
+                "message": str(e)
+            }
+        except (ProxmoxConnectionError, ProxmoxTimeoutError, ProxmoxAuthenticationError, ProxmoxAPIError) as e:
+            return {
+                "status": "error",
+                "message": f"Exception getting metrics: {str(e)}"
+            }
@@ -6,7 +6,7 @@ from typing import Any, Dict, List
 from mcp.server import Server
 from mcp.types import Tool
 
-from ..proxmox_client import ProxmoxClient
+from ..async_proxmox_client import AsyncProxmoxClient
 from ..utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -15,7 +15,7 @@ logger = get_logger(__name__)
 class BaseResource(ABC):
     """Base class for all resource handlers."""
     
-    def __init__(self, client: ProxmoxClient):
+    def __init__(self, client: AsyncProxmoxClient):
         """Initialize the resource handler.
         
         Args:
@@ -134,7 +134,16 @@ class ContainerResource(BaseResource):
         self.log_tool_call("proxmox_ct_create", args)
         
         try:
-            result = await self.client.create_container(args)
+            result = await self.client.create_container(
+                args["node"], args["name"], args["ostemplate"],
+                vmid=args.get("vmid"),
+                cores=args.get("cores", 1),
+                memory=args.get("memory", 512),
+                storage=args.get("storage", "local-lvm"),
+                disk_size=args.get("disk_size", "10G"),
+                password=args.get("password"),
+                ssh_keys=args.get("ssh_keys")
+            )
             self.log_tool_result("proxmox_ct_create", result)
             return result
         except Exception as e:
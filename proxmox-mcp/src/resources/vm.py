@@ -203,7 +203,9 @@ class VMResource(BaseResource):
         self.log_tool_call("proxmox_vm_create", args)
         
         try:
-            result = await self.client.create_vm(args)
+            result = await self.client.create_vm(
+                args["node"], args["name"], args.get("vmid"), args.get("cores", 1), args.get("memory", 512)
+            )
             self.log_tool_result("proxmox_vm_create", result)
             return result
         except Exception as e:
@@ -0,0 +1,248 @@
+"""Cursor-paginated listing of storage contents (volumes).
+
+``GET /nodes/{node}/storage/{storage}/content`` returns every volume of a
+storage in one response, which on backup and ISO stores means tens of
+thousands of entries. StorageContentPager turns that into bounded pages:
+
+- ``content`` (type) and ``vmid`` filters are passed to Proxmox, so the
+  node filters before anything is sent; the name prefix is applied as the
+  response is reduced
+- each volume is reduced to a compact row (volid, name, content, format,
+  size, vmid, ctime, ...) and the rows are sorted by volid once
+- the filtered listing is kept under a random cursor token; every page
+  returns at most ``limit`` rows plus ``next_cursor``, so no single call
+  serializes the whole listing
+- listings expire ``ttl`` seconds after their last page was read, and at
+  most MAX_CONTENT_LISTINGS are kept (least recently used is dropped)
+
+Example usage:
+    pager = StorageContentPager(client)
+    page = pager.list_content("pve1", "backup-nfs", content="backup", vmid=100)
+    while page["next_cursor"]:
+        page = pager.list_content("pve1", "backup-nfs", cursor=page["next_cursor"])
+"""
+
+import re
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from .exceptions import ProxmoxAPIError, ProxmoxValidationError
+from .utils.validation import is_valid_node_name, is_valid_storage_name, is_valid_vmid, is_valid_volume_prefix
+
+try:
+    from .utils.mcp_logging import get_logger
+    logger = get_logger(__name__)
+except ImportError:
+    import logging
+    logger = logging.getLogger(__name__)
+
+# Default and maximum rows per page
+DEFAULT_CONTENT_PAGE_SIZE = 200
+MAX_CONTENT_PAGE_SIZE = 1000
+
+# Seconds a listing is kept after its last page was read
+CONTENT_LISTING_TTL_SECONDS = 300
+
+# Listings kept for cursors (least recently used is dropped)
+MAX_CONTENT_LISTINGS = 32
+
+# Content types a storage can hold
+STORAGE_CONTENT_TYPES = ("images", "rootdir", "vztmpl", "iso", "backup", "snippets", "import")
+
+# Cursors handed out by list_content: listing token and row offset
+CONTENT_CURSOR_PATTERN = re.compile(r'^(?P<token>[0-9a-f]{16}):(?P<offset>\d+)$')
+
+
+def _volume_row(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce a storage content entry to the fields worth returning."""
+    volid = str(entry.get("volid", ""))
+    # "local:iso/debian-12.iso" -> "debian-12.iso"; "local-lvm:vm-100-disk-0" -> "vm-100-disk-0"
+    name = volid.split(":", 1)[-1].rsplit("/", 1)[-1]
+    vmid = entry.get("vmid")
+    row = {
+        "volid": volid,
+        "name": name,
+        "content": entry.get("content"),
+        "format": entry.get("format"),
+        "size": int(entry.get("size") or 0),
+        "vmid": int(vmid) if vmid not in (None, "") else None,
+        "ctime": entry.get("ctime"),
+    }
+    if entry.get("used") is not None:
+        row["used"] = int(entry["used"])
+    if entry.get("protected"):
+        row["protected"] = True
+    if entry.get("notes"):
+        row["notes"] = entry["notes"]
+    return row
+
+
+class _ContentListing:
+    """Filtered, sorted rows of one storage listing."""
+
+    def __init__(self, node: str, storage: str, filters: Dict[str, Any], rows: List[Dict[str, Any]]):
+        self.node = node
+        self.storage = storage
+        self.filters = filters
+        self.rows = rows
+        self.fetched_at = time.monotonic()
+        self.last_used = self.fetched_at
+
+
+class StorageContentPager:
+    """Pages through storage contents with opaque cursors.
+
+    Thread-safe: the listing table is guarded by one lock; listings are
+    never modified after they are built, so pages are sliced without it.
+    """
+
+    def __init__(self, client: Any, ttl: float = CONTENT_LISTING_TTL_SECONDS,
+                 max_listings: int = MAX_CONTENT_LISTINGS):
+        """
+        Initialize the pager. No request is made until the first listing.
+
+        Args:
+            client: ProxmoxClient used for the content requests
+            ttl: Seconds a listing is kept after its last page was read
+            max_listings: Listings kept for cursors
+        """
+        self.client = client
+        self.ttl = ttl
+        self.max_listings = max_listings
+        self._lock = threading.Lock()
+        self._listings: "OrderedDict[str, _ContentListing]" = OrderedDict()
+
+    def list_content(
+        self,
+        node: str,
+        storage: str,
+        content: Optional[str] = None,
+        vmid: Optional[int] = None,
+        name_prefix: Optional[str] = None,
+        limit: int = DEFAULT_CONTENT_PAGE_SIZE,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Return one page of a storage's volumes.
+
+        Without a cursor the storage is listed with the given filters and
+        the first page is returned; with a cursor the next page of that
+        listing is returned and the filters are taken from it.
+
+        Args:
+            node: Node name
+            storage: Storage name
+            content: Only volumes of this content type (e.g. 'backup', 'iso')
+            vmid: Only volumes owned by this guest
+            name_prefix: Only volumes whose file name starts with this
+            limit: Maximum rows in the page
+            cursor: next_cursor of the previous page
+
+        Returns:
+            Dict with rows, offset, total, next_cursor (None on the last page)
+            and the listing's filters and age
+
+        Raises:
+            ProxmoxValidationError: If an argument is invalid or the cursor is
+                unknown or expired
+            ProxmoxAPIError: If the request fails; also connection/timeout/auth errors
+        """
+        if not is_valid_node_name(node):
+            raise ProxmoxValidationError(f"Invalid node name: {node!r}")
+        if not is_valid_storage_name(storage):
+            raise ProxmoxValidationError(f"Invalid storage name: {storage!r}")
+        if isinstance(limit, bool) or not isinstance(limit, int) or not 1 <= limit <= MAX_CONTENT_PAGE_SIZE:
+            raise ProxmoxValidationError(f"limit must be between 1 and {MAX_CONTENT_PAGE_SIZE}")
+
+        if cursor is not None:
+            token, listing, offset = self._resume(cursor, node, storage)
+        else:
+            if content is not None and content not in STORAGE_CONTENT_TYPES:
+                raise ProxmoxValidationError(f"content must be one of {list(STORAGE_CONTENT_TYPES)}")
+            if vmid is not None and (isinstance(vmid, bool) or not is_valid_vmid(vmid)):
+                raise ProxmoxValidationError(f"Invalid VMID: {vmid!r}")
+            if name_prefix is not None and not is_valid_volume_prefix(name_prefix):
+                raise ProxmoxValidationError(f"Invalid name prefix: {name_prefix!r}")
+            filters = {"content": content, "vmid": int(vmid) if vmid is not None else None, "name_prefix": name_prefix}
+            listing = _ContentListing(node, storage, filters, self._fetch(node, storage, filters))
+            token = self._store(listing)
+            offset = 0
+
+        rows = listing.rows[offset:offset + limit]
+        next_offset = offset + len(rows)
+        more = next_offset < len(listing.rows)
+        if not more:
+            # Last page: nobody needs this listing any more
+            with self._lock:
+                self._listings.pop(token, None)
+        return {
+            "status": "success",
+            "node": node,
+            "storage": storage,
+            "filters": listing.filters,
+            "items": rows,
+            "offset": offset,
+            "returned": len(rows),
+            "total": len(listing.rows),
+            "next_cursor": f"{token}:{next_offset}" if more else None,
+            "age_seconds": round(time.monotonic() - listing.fetched_at, 3),
+        }
+
+    def _fetch(self, node: str, storage: str, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """List the storage and reduce the matching volumes to sorted rows."""
+        params = {key: filters[key] for key in ("content", "vmid") if filters[key] is not None}
+        response = self.client._make_request('GET', f'/nodes/{node}/storage/{storage}/content', params=params)
+        try:
+            data = response.json().get('data')
+        except ValueError as e:
+            raise ProxmoxAPIError(f"Invalid JSON response: {e}") from e
+        if not isinstance(data, list):
+            raise ProxmoxAPIError("Invalid storage content response: 'data' is not a list")
+
+        prefix = filters["name_prefix"]
+        rows = []
+        for entry in data:
+            if not isinstance(entry, dict) or not entry.get("volid"):
+                continue
+            row = _volume_row(entry)
+            if prefix and not row["name"].startswith(prefix):
+                continue
+            rows.append(row)
+        rows.sort(key=lambda r: r["volid"])
+        logger.debug(f"Listed {len(data)} volume(s) on {node}/{storage}, {len(rows)} match")
+        return rows
+
+    def _store(self, listing: _ContentListing) -> str:
+        """Keep a listing under a new token, dropping expired and excess listings."""
+        token = secrets.token_hex(8)
+        with self._lock:
+            self._expire()
+            self._listings[token] = listing
+            while len(self._listings) > self.max_listings:
+                self._listings.popitem(last=False)
+        return token
+
+    def _expire(self) -> None:
+        """Drop listings not read for ttl seconds (lock held)."""
+        now = time.monotonic()
+        for token in [t for t, listing in self._listings.items() if now - listing.last_used >= self.ttl]:
+            del self._listings[token]
+
+    def _resume(self, cursor: str, node: str, storage: str) -> Tuple[str, _ContentListing, int]:
+        """Look up the listing and offset a cursor points to."""
+        match = CONTENT_CURSOR_PATTERN.match(cursor) if isinstance(cursor, str) else None
+        if not match:
+            raise ProxmoxValidationError(f"Invalid cursor: {cursor!r}")
+        token, offset = match.group("token"), int(match.group("offset"))
+        with self._lock:
+            self._expire()
+            listing = self._listings.get(token)
+            if listing is None:
+                raise ProxmoxValidationError("Cursor expired or unknown; list the storage again without a cursor")
+            if (listing.node, listing.storage) != (node, storage):
+                raise ProxmoxValidationError(f"Cursor belongs to {listing.node}/{listing.storage}")
+            listing.last_used = time.monotonic()
+            self._listings.move_to_end(token)
+        return token, listing, offset
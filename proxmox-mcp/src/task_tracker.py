@@ -0,0 +1,309 @@
+"""Batched completion tracking for Proxmox tasks (UPIDs).
+
+Most write operations in Proxmox (start, stop, create, snapshot, delete, ...)
+return a task ID (UPID) and run in the background. TaskTracker waits for many
+such tasks at once without polling each task separately:
+
+- pending UPIDs are grouped by the node encoded in the UPID
+- each tick polls ``GET /nodes/{node}/tasks`` once per node, concurrently on
+  the client's node executor, and matches the returned entries against every
+  pending UPID for that node
+- tasks that do not show up in the node's task list are checked individually
+  via ``GET /nodes/{node}/tasks/{upid}/status``; a task the node does not know
+  (404) is reported as failed instead of being polled until the timeout
+- the poll interval starts short and backs off while nothing finishes, and
+  resets as soon as a tick sees progress
+
+Example usage:
+    result = client.wait_for_tasks([upid1, upid2], timeout=120)
+    if result["all_succeeded"]:
+        ...
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+from .exceptions import (
+    ProxmoxConnectionError,
+    ProxmoxAuthenticationError,
+    ProxmoxAPIError,
+    ProxmoxResourceNotFoundError,
+    ProxmoxTimeoutError,
+    ProxmoxValidationError,
+)
+from .utils.validation import UPID_PATTERN, is_valid_upid
+
+try:
+    from .utils.mcp_logging import get_logger
+    logger = get_logger(__name__)
+except ImportError:
+    import logging
+    logger = logging.getLogger(__name__)
+
+# Default time to wait for tasks to finish (seconds)
+DEFAULT_TASK_TIMEOUT_SECONDS = 300
+
+# Maximum number of tasks accepted by a single wait
+MAX_TASKS_PER_WAIT = 1000
+
+# Adaptive poll interval (seconds)
+MIN_POLL_INTERVAL_SECONDS = 0.5
+MAX_POLL_INTERVAL_SECONDS = 5.0
+POLL_BACKOFF_FACTOR = 1.5
+
+# Lower bound on the task list size requested from a node per poll
+MIN_TASK_LIST_LIMIT = 500
+
+# Task states reported by the tracker
+TASK_STATE_RUNNING = "running"
+TASK_STATE_COMPLETED = "completed"
+TASK_STATE_FAILED = "failed"
+
+# Errors that a single poll may raise; the task stays pending and the node is retried
+_POLL_ERRORS = (ProxmoxConnectionError, ProxmoxTimeoutError, ProxmoxAuthenticationError, ProxmoxAPIError,
+                ProxmoxResourceNotFoundError)
+
+
+def parse_upid(upid: str) -> Dict[str, Any]:
+    """Split a UPID into its fields.
+
+    Args:
+        upid: Task ID, e.g. "UPID:pve1:000A1B2C:0012D687:66F1E2A0:qmstart:100:root@pam:"
+
+    Returns:
+        Dict with upid, node, pid, type, id, user and starttime (Unix seconds)
+
+    Raises:
+        ProxmoxValidationError: If the UPID is malformed
+    """
+    if not is_valid_upid(upid):
+        raise ProxmoxValidationError(f"Invalid UPID: {upid!r}")
+    match = UPID_PATTERN.match(upid)
+    return {
+        "upid": upid,
+        "node": match.group("node"),
+        "pid": int(match.group("pid"), 16),
+        "type": match.group("type"),
+        "id": match.group("id"),
+        "user": match.group("user"),
+        "starttime": int(match.group("starttime"), 16),
+    }
+
+
+def _state_from_exitstatus(exitstatus: Optional[str]) -> str:
+    """Map a Proxmox task exit status to a tracker state."""
+    if exitstatus == "OK" or (exitstatus or "").startswith("WARNINGS"):
+        return TASK_STATE_COMPLETED
+    return TASK_STATE_FAILED
+
+
+class TaskTracker:
+    """Waits for batches of Proxmox tasks with one poll per node per tick.
+
+    The tracker uses the client's request and executor machinery and holds no
+    state between calls, so one tracker can serve concurrent waits.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        min_interval: float = MIN_POLL_INTERVAL_SECONDS,
+        max_interval: float = MAX_POLL_INTERVAL_SECONDS,
+        backoff_factor: float = POLL_BACKOFF_FACTOR
+    ):
+        """
+        Initialize the tracker.
+
+        Args:
+            client: ProxmoxClient used for API requests
+            min_interval: First and post-progress poll interval in seconds
+            max_interval: Upper bound on the poll interval in seconds
+            backoff_factor: Interval multiplier applied after a tick without progress
+        """
+        self.client = client
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+
+    def wait_for_tasks(self, upids: List[str], timeout: float = DEFAULT_TASK_TIMEOUT_SECONDS) -> Dict[str, Any]:
+        """Wait until all tasks have finished or the timeout expires.
+
+        Args:
+            upids: Task IDs to wait for (duplicates are ignored)
+            timeout: Maximum time to wait in seconds; 0 checks once without waiting
+
+        Returns:
+            Dict with overall counts, a timed_out flag, elapsed time, number of
+            API requests made, per-node poll errors and one entry per task
+            (state, exitstatus, starttime, endtime and duration_seconds)
+
+        Raises:
+            ProxmoxValidationError: If a UPID is malformed or too many are given
+        """
+        if len(upids) > MAX_TASKS_PER_WAIT:
+            raise ProxmoxValidationError(f"Cannot wait for more than {MAX_TASKS_PER_WAIT} tasks at once")
+
+        tasks: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        for upid in upids:
+            if upid not in tasks:
+                info = parse_upid(upid)
+                info.update({
+                    "state": TASK_STATE_RUNNING,
+                    "exitstatus": None,
+                    "endtime": None,
+                    "duration_seconds": None,
+                })
+                tasks[upid] = info
+
+        started = time.monotonic()
+        deadline = started + max(timeout, 0)
+        interval = self.min_interval
+        requests_made = 0
+        poll_errors: Dict[str, str] = {}
+
+        while True:
+            pending_by_node: Dict[str, Dict[str, Dict[str, Any]]] = {}
+            for upid, task in tasks.items():
+                if task["state"] == TASK_STATE_RUNNING:
+                    pending_by_node.setdefault(task["node"], {})[upid] = task
+            if not pending_by_node:
+                break
+
+            finished, tick_requests, tick_errors = self._poll(pending_by_node)
+            requests_made += tick_requests
+            poll_errors.update(tick_errors)
+            for node in pending_by_node:
+                if node not in tick_errors:
+                    poll_errors.pop(node, None)
+            for upid, update in finished.items():
+                tasks[upid].update(update)
+
+            if all(t["state"] != TASK_STATE_RUNNING for t in tasks.values()):
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+
+            # Adaptive backoff: poll quickly while tasks are finishing, slow down otherwise
+            if finished:
+                interval = self.min_interval
+            else:
+                interval = min(interval * self.backoff_factor, self.max_interval)
+            time.sleep(min(interval, remaining))
+
+        counts = {TASK_STATE_COMPLETED: 0, TASK_STATE_FAILED: 0, TASK_STATE_RUNNING: 0}
+        for task in tasks.values():
+            counts[task["state"]] += 1
+
+        return {
+            "status": "success",
+            "all_succeeded": counts[TASK_STATE_COMPLETED] == len(tasks),
+            "timed_out": counts[TASK_STATE_RUNNING] > 0,
+            "counts": counts,
+            "elapsed_seconds": round(time.monotonic() - started, 3),
+            "requests": requests_made,
+            "poll_errors": poll_errors,
+            "tasks": list(tasks.values()),
+            "message": (
+                f"{counts[TASK_STATE_COMPLETED]} completed, {counts[TASK_STATE_FAILED]} failed, "
+                f"{counts[TASK_STATE_RUNNING]} still running"
+            )
+        }
+
+    def _poll(
+        self, pending_by_node: Dict[str, Dict[str, Dict[str, Any]]]
+    ) -> Tuple[Dict[str, Dict[str, Any]], int, Dict[str, str]]:
+        """Poll every node with pending tasks once, in parallel.
+
+        Returns:
+            Tuple of (updates for finished tasks keyed by UPID, requests made,
+            errors keyed by node)
+        """
+        executor = self.client._get_node_executor()
+        futures = [
+            executor.submit(node, self._poll_node, node, pending)
+            for node, pending in pending_by_node.items()
+        ]
+        finished: Dict[str, Dict[str, Any]] = {}
+        requests_made = 0
+        errors: Dict[str, str] = {}
+        for future in futures:
+            node, node_finished, node_requests, error = future.result()
+            finished.update(node_finished)
+            requests_made += node_requests
+            if error:
+                errors[node] = error
+        return finished, requests_made, errors
+
+    def _poll_node(
+        self, node: str, pending: Dict[str, Dict[str, Any]]
+    ) -> Tuple[str, Dict[str, Dict[str, Any]], int, Optional[str]]:
+        """Check all pending tasks on one node with a single task-list request.
+
+        Tasks missing from the list are looked up individually.
+
+        Returns:
+            Tuple of (node, updates for finished tasks, requests made, error message)
+        """
+        finished: Dict[str, Dict[str, Any]] = {}
+        params = {
+            "source": "all",
+            "since": min(task["starttime"] for task in pending.values()),
+            "limit": max(MIN_TASK_LIST_LIMIT, 2 * len(pending)),
+        }
+        try:
+            response = self.client._make_request("GET", f"/nodes/{node}/tasks", params=params)
+            entries = response.json().get("data", [])
+        except _POLL_ERRORS as e:
+            logger.debug(f"Task list poll failed for node {node}: {e}")
+            return node, finished, 1, str(e)
+        except ValueError as e:
+            return node, finished, 1, f"Invalid JSON response: {e}"
+        requests_made = 1
+
+        seen = set()
+        for entry in entries:
+            upid = entry.get("upid")
+            if upid not in pending:
+                continue
+            seen.add(upid)
+            if entry.get("endtime"):
+                finished[upid] = self._finished_update(pending[upid], entry.get("status"), entry.get("endtime"))
+
+        # Tasks not in the list (list limit reached or not indexed yet): ask directly
+        for upid in pending:
+            if upid in seen:
+                continue
+            requests_made += 1
+            try:
+                response = self.client._make_request("GET", f"/nodes/{node}/tasks/{quote(upid, safe='')}/status")
+                status = response.json().get("data", {})
+            except ProxmoxResourceNotFoundError as e:
+                logger.debug(f"Task {upid} not found on node {node}: {e}")
+                finished[upid] = self._finished_update(pending[upid], None, None)
+                finished[upid]["error"] = f"Task not found on node {node}"
+                continue
+            except _POLL_ERRORS as e:
+                logger.debug(f"Task status poll failed for {upid}: {e}")
+                continue
+            except ValueError:
+                continue
+            if status.get("status") == "stopped":
+                finished[upid] = self._finished_update(pending[upid], status.get("exitstatus"), status.get("endtime"))
+
+        return node, finished, requests_made, None
+
+    @staticmethod
+    def _finished_update(task: Dict[str, Any], exitstatus: Optional[str], endtime: Optional[int]) -> Dict[str, Any]:
+        """Build the fields recorded for a task that has stopped."""
+        update = {
+            "state": _state_from_exitstatus(exitstatus),
+            "exitstatus": exitstatus,
+            "endtime": endtime,
+            "duration_seconds": None,
+        }
+        if endtime:
+            update["duration_seconds"] = max(int(endtime) - task["starttime"], 0)
+        return update
@@ -0,0 +1,175 @@
+"""Background renewal of Proxmox authentication tickets.
+
+Without a renewer the first request after the ticket reaches its refresh
+threshold re-authenticates inline, and every other thread waits behind the
+client's auth lock for that round trip. TicketRenewer instead renews the
+ticket on a daemon thread once ``renewal_fraction`` of its lifetime has
+passed:
+
+- the new ticket is requested without holding the auth lock, then swapped in
+  as one (ticket, CSRF token) tuple, so in-flight requests keep using the old
+  ticket (still valid) and later requests pick up the new one
+- a failed renewal is retried with exponential backoff while the current
+  ticket is still valid; the inline refresh in _ensure_valid_ticket remains
+  the fallback if it expires anyway
+- renewal latency and failures are counted for get_auth_stats()
+
+Example usage:
+    renewer = TicketRenewer(client, renewal_fraction=0.5)
+    renewer.start()
+    ...
+    renewer.stop()
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from .exceptions import (
+    ProxmoxConnectionError,
+    ProxmoxAuthenticationError,
+    ProxmoxAPIError,
+    ProxmoxTimeoutError,
+)
+
+try:
+    from .utils.mcp_logging import get_logger
+    logger = get_logger(__name__)
+except ImportError:
+    import logging
+    logger = logging.getLogger(__name__)
+
+# Default point in the ticket lifetime (fraction) at which it is renewed
+DEFAULT_TICKET_RENEWAL_FRACTION = 0.5
+
+# Backoff bounds (seconds) between retries of a failed renewal
+RENEWAL_RETRY_MIN_SECONDS = 5.0
+RENEWAL_RETRY_MAX_SECONDS = 300.0
+
+# Errors a renewal may raise; the current ticket stays in place
+_RENEWAL_ERRORS = (ProxmoxConnectionError, ProxmoxTimeoutError, ProxmoxAuthenticationError, ProxmoxAPIError)
+
+
+class TicketRenewer:
+    """Renews a ProxmoxClient's ticket on a background thread.
+
+    The client provides ``_request_ticket()`` (performs the login and returns
+    the new auth state without installing it), ``_install_ticket()`` (swaps
+    it in under the auth lock), ``_ticket_obtained_at`` and
+    ``_ticket_expiry_seconds``.
+    """
+
+    def __init__(self, client: Any, renewal_fraction: float = DEFAULT_TICKET_RENEWAL_FRACTION):
+        """
+        Initialize the renewer. Nothing runs until start().
+
+        Args:
+            client: ProxmoxClient whose ticket is renewed
+            renewal_fraction: Fraction of the ticket lifetime (0 < f < 1)
+                after which the ticket is renewed
+        """
+        self.client = client
+        self.renewal_fraction = renewal_fraction
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._renewals = 0
+        self._failures = 0
+        self._consecutive_failures = 0
+        self._last_error: Optional[str] = None
+        self._last_latency_seconds: Optional[float] = None
+        self._max_latency_seconds = 0.0
+        self._total_latency_seconds = 0.0
+
+    def seconds_until_renewal(self) -> float:
+        """Seconds until the next renewal attempt is due."""
+        with self._lock:
+            failures = self._consecutive_failures
+        if failures:
+            return min(RENEWAL_RETRY_MAX_SECONDS, RENEWAL_RETRY_MIN_SECONDS * 2 ** (failures - 1))
+        obtained_at = self.client._ticket_obtained_at
+        if obtained_at is None:
+            return 0.0
+        due = obtained_at + self.client._ticket_expiry_seconds * self.renewal_fraction
+        return max(0.0, due - time.time())
+
+    def renew(self) -> None:
+        """Request a new ticket and swap it in.
+
+        Raises:
+            ProxmoxAuthenticationError: If the credentials are rejected (the
+                current ticket is kept); also connection/timeout/API errors
+        """
+        started = time.monotonic()
+        try:
+            auth_state = self.client._request_ticket()
+        except _RENEWAL_ERRORS as e:
+            with self._lock:
+                self._failures += 1
+                self._consecutive_failures += 1
+                self._last_error = str(e)
+            raise
+        self.client._install_ticket(auth_state)
+        latency = time.monotonic() - started
+        with self._lock:
+            self._renewals += 1
+            self._consecutive_failures = 0
+            self._last_error = None
+            self._last_latency_seconds = round(latency, 3)
+            self._max_latency_seconds = max(self._max_latency_seconds, latency)
+            self._total_latency_seconds += latency
+
+    def stats(self) -> Dict[str, Any]:
+        """Get renewal counters and latencies."""
+        with self._lock:
+            return {
+                "background_renewal": self._thread is not None and self._thread.is_alive(),
+                "renewal_fraction": self.renewal_fraction,
+                "renewals": self._renewals,
+                "failures": self._failures,
+                "consecutive_failures": self._consecutive_failures,
+                "last_error": self._last_error,
+                "last_latency_seconds": self._last_latency_seconds,
+                "avg_latency_seconds": (
+                    round(self._total_latency_seconds / self._renewals, 3) if self._renewals else 0.0
+                ),
+                "max_latency_seconds": round(self._max_latency_seconds, 3),
+            }
+
+    def start(self) -> None:
+        """Start the background renewal thread (no-op if already running)."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="proxmox-ticket-renewer", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the background renewal thread.
+
+        Args:
+            timeout: Seconds to wait for the thread to exit (None waits until
+                an in-flight renewal finishes, 0 does not wait)
+        """
+        self._stop_event.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread() and timeout != 0:
+            thread.join(timeout)
+
+    def _run(self) -> None:
+        """Background loop: sleep until the renewal is due, then renew."""
+        while not self._stop_event.wait(self.seconds_until_renewal()):
+            try:
+                self.renew()
+                logger.debug(f"Renewed Proxmox ticket in {self._last_latency_seconds}s")
+            except _RENEWAL_ERRORS as e:
+                logger.warning(f"Ticket renewal failed, keeping current ticket: {e}")
+            except Exception as e:
+                # Never let the renewal thread die on an unexpected error
+                with self._lock:
+                    self._failures += 1
+                    self._consecutive_failures += 1
+                    self._last_error = str(e)
+                logger.exception(f"Unexpected error renewing ticket: {e}")
@@ -0,0 +1,211 @@
+"""
+Long-lived, node-aware thread pool for Proxmox fan-out requests.
+
+NodeExecutor wraps one ThreadPoolExecutor that lives as long as the client.
+It enforces two limits:
+
+- a global limit (the number of worker threads), which caps how many
+  requests the client sends to pveproxy at once
+- a per-node limit, which caps how many of those requests target the same
+  node
+
+Tasks over a node's limit wait in a per-node queue. They are handed to the
+thread pool only when an earlier task for that node finishes, so a busy
+node never ties up worker threads that other nodes could use.
+
+Queue-depth and wait-time counters are available from stats() for tuning.
+"""
+
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Tuple
+
+# Default global worker count (matches the previous per-call pool cap)
+DEFAULT_MAX_NODE_WORKERS = 10
+
+# Default number of concurrent requests against a single node
+DEFAULT_MAX_REQUESTS_PER_NODE = 4
+
+# (future, fn, args, kwargs, submitted_at)
+_Task = Tuple[Future, Callable[..., Any], tuple, dict, float]
+
+
+class NodeExecutor:
+    """
+    Thread pool with a global and a per-node concurrency limit.
+
+    Thread-safe. Worker threads are created on demand by the underlying
+    ThreadPoolExecutor and reused across calls until shutdown().
+
+    Example usage:
+        executor = NodeExecutor(max_workers=10, max_per_node=4)
+        future = executor.submit("pve1", fetch, "pve1")
+        result = future.result()
+        executor.shutdown()
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_NODE_WORKERS,
+        max_per_node: int = DEFAULT_MAX_REQUESTS_PER_NODE,
+        thread_name_prefix: str = "proxmox-node"
+    ):
+        """
+        Initialize the executor.
+
+        Args:
+            max_workers: Global limit on concurrently running tasks
+            max_per_node: Limit on concurrently running tasks per node
+
+        Raises:
+            ValueError: If either limit is less than 1
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if max_per_node < 1:
+            raise ValueError("max_per_node must be at least 1")
+
+        self.max_workers = max_workers
+        self.max_per_node = max_per_node
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        self._lock = threading.Lock()
+        self._shutdown = False
+
+        # Tasks running or handed to the thread pool, per node
+        self._in_flight: Dict[str, int] = defaultdict(int)
+        # Tasks held back by the per-node limit
+        self._waiting: Dict[str, Deque[_Task]] = defaultdict(deque)
+
+        # Counters
+        self._submitted = 0
+        self._completed = 0
+        self._queue_depth = 0
+        self._max_queue_depth = 0
+        self._active = 0
+        self._total_wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+    def submit(self, node: str, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """
+        Schedule fn(*args, **kwargs) against the given node.
+
+        Args:
+            node: Node the task talks to (used for the per-node limit)
+            fn: Callable to run in a worker thread
+
+        Returns:
+            Future resolving to the callable's result
+
+        Raises:
+            RuntimeError: If the executor has been shut down
+        """
+        future: Future = Future()
+        task: _Task = (future, fn, args, kwargs, time.monotonic())
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new tasks after shutdown")
+            self._submitted += 1
+            self._queue_depth += 1
+            self._max_queue_depth = max(self._max_queue_depth, self._queue_depth)
+            if self._in_flight[node] < self.max_per_node:
+                self._in_flight[node] += 1
+                dispatch = True
+            else:
+                self._waiting[node].append(task)
+                dispatch = False
+        if dispatch:
+            self._dispatch(node, task)
+        return future
+
+    def _dispatch(self, node: str, task: _Task) -> None:
+        """Hand a task to the thread pool, cancelling it if the pool is gone."""
+        try:
+            self._executor.submit(self._run, node, task)
+        except RuntimeError:
+            # Pool shut down between scheduling and dispatch
+            with self._lock:
+                self._queue_depth -= 1
+                self._release_node(node)
+            task[0].cancel()
+
+    def _run(self, node: str, task: _Task) -> None:
+        """Execute one task in a worker thread, then start the node's next task."""
+        future, fn, args, kwargs, submitted_at = task
+        waited = time.monotonic() - submitted_at
+        with self._lock:
+            self._queue_depth -= 1
+            self._active += 1
+            self._total_wait_seconds += waited
+            self._max_wait_seconds = max(self._max_wait_seconds, waited)
+
+        try:
+            if future.set_running_or_notify_cancel():
+                try:
+                    result = fn(*args, **kwargs)
+                except BaseException as e:
+                    future.set_exception(e)
+                else:
+                    future.set_result(result)
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._completed += 1
+                next_task = self._waiting[node].popleft() if self._waiting[node] else None
+                if next_task is None:
+                    self._release_node(node)
+            if next_task is not None:
+                self._dispatch(node, next_task)
+
+    def _release_node(self, node: str) -> None:
+        """Free one per-node slot (caller holds the lock)."""
+        self._in_flight[node] -= 1
+        if self._in_flight[node] <= 0:
+            del self._in_flight[node]
+            self._waiting.pop(node, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return a snapshot of the executor's counters.
+
+        Returns:
+            Dict with limits, current queue depth and active count, the
+            high-water queue depth, task totals and queue wait times in seconds
+        """
+        with self._lock:
+            started = self._completed + self._active
+            return {
+                "max_workers": self.max_workers,
+                "max_per_node": self.max_per_node,
+                "queue_depth": self._queue_depth,
+                "max_queue_depth": self._max_queue_depth,
+                "active": self._active,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "total_wait_seconds": self._total_wait_seconds,
+                "avg_wait_seconds": self._total_wait_seconds / started if started else 0.0,
+                "max_wait_seconds": self._max_wait_seconds,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop accepting tasks and release the worker threads.
+
+        Tasks still held back by a per-node limit are cancelled. Tasks
+        already handed to the thread pool still run, so every future returned
+        by submit() is eventually resolved.
+
+        Args:
+            wait: Block until running tasks have finished
+        """
+        with self._lock:
+            if self._shutdown:
+                return
+            self._shutdown = True
+            held_back = [task for queue in self._waiting.values() for task in queue]
+            self._waiting.clear()
+            self._queue_depth -= len(held_back)
+        for task in held_back:
+            task[0].cancel()
+        self._executor.shutdown(wait=wait)
@@ -190,6 +190,19 @@ def _normalize_exception_types(exceptions):
     return exceptions
 
 
+class _LoggingCircuitBreakerListener(pybreaker.CircuitBreakerListener):
+    """Logs circuit breaker state transitions."""
+
+    def state_change(self, cb: pybreaker.CircuitBreaker, old_state, new_state) -> None:
+        """Called when the circuit changes state."""
+        if new_state.name == pybreaker.STATE_OPEN:
+            logger.warning(f"Circuit breaker '{cb.name}' opened after {cb.fail_counter} failures")
+        elif new_state.name == pybreaker.STATE_HALF_OPEN:
+            logger.info(f"Circuit breaker '{cb.name}' half-open, testing connection")
+        elif new_state.name == pybreaker.STATE_CLOSED:
+            logger.info(f"Circuit breaker '{cb.name}' closed")
+
+
 def create_circuit_breaker(
     fail_max: int = DEFAULT_CIRCUIT_BREAKER_FAILURES,
     timeout_duration: int = DEFAULT_CIRCUIT_BREAKER_TIMEOUT,
@@ -212,31 +225,15 @@ def create_circuit_breaker(
         # Don't count validation errors as circuit breaker failures
         exclude = (ValueError, TypeError)
     
-    # Create listeners for logging
-    def on_open(breaker: pybreaker.CircuitBreaker, *args, **kwargs):
-        """Called when circuit opens."""
-        logger.warning(f"Circuit breaker '{breaker.name}' opened after {breaker.fail_counter} failures")
-    
-    def on_close(breaker: pybreaker.CircuitBreaker, *args, **kwargs):
-        """Called when circuit closes."""
-        logger.info(f"Circuit breaker '{breaker.name}' closed")
-    
-    def on_half_open(breaker: pybreaker.CircuitBreaker, *args, **kwargs):
-        """Called when circuit moves to half-open state."""
-        logger.info(f"Circuit breaker '{breaker.name}' half-open, testing connection")
-    
     breaker = pybreaker.CircuitBreaker(
         fail_max=fail_max,
         reset_timeout=timeout_duration,
         exclude=exclude,
-        name=name or "default"
+        name=name or "default",
+        # pybreaker calls listener methods, so plain functions cannot be used here
+        listeners=[_LoggingCircuitBreakerListener()]
     )
     
-    # Add listeners
-    breaker.add_listener(on_open)
-    breaker.add_listener(on_close)
-    breaker.add_listener(on_half_open)
-    
     return breaker
 
 
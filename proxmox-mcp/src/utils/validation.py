@@ -1,5 +1,6 @@
 """Input validation utilities for Proxmox MCP Server."""
 
+import ipaddress
 import re
 from typing import Any, Dict, List, Optional, Union
 
@@ -19,6 +20,19 @@ MAX_MEMORY_MB = 1048576  # 1TB - Proxmox maximum memory per VM
 MAX_NAME_LENGTH = 128  # Maximum length for VM/container/node names
 MIN_NAME_LENGTH = 1  # Minimum name length
 MAX_SNAPSHOT_NAME_LENGTH = 128  # Maximum length for snapshot names
+MAX_UPID_LENGTH = 512  # Proxmox task IDs are well under this
+MAX_API_TOKEN_LENGTH = 512  # USER@REALM!TOKENID=SECRET
+
+# Proxmox task ID: UPID:node:pid:pstart:starttime:type:id:user:
+UPID_PATTERN = re.compile(
+    r'^UPID:(?P<node>[a-zA-Z0-9\-_]+):(?P<pid>[0-9A-Fa-f]+):(?P<pstart>[0-9A-Fa-f]+):'
+    r'(?P<starttime>[0-9A-Fa-f]+):(?P<type>[^:/\s]*):(?P<id>[^:/\s]*):(?P<user>[^:/\s]+):$'
+)
+
+# Proxmox API token: USER@REALM!TOKENID=SECRET (the secret is a UUID)
+API_TOKEN_PATTERN = re.compile(
+    r'^[a-zA-Z0-9\-_.]+@[a-zA-Z0-9\-_.]+![a-zA-Z][a-zA-Z0-9\-_.]*=[a-zA-Z0-9\-]+$'
+)
 
 
 class VMConfig(BaseModel):
@@ -318,6 +332,127 @@ def validate_snapshot_name(snapshot: str) -> bool:
     return True
 
 
+def is_valid_upid(upid: str) -> bool:
+    """Check if a Proxmox task ID (UPID) is well formed.
+
+    Args:
+        upid: Task ID, e.g. "UPID:pve1:000A1B2C:0012D687:66F1E2A0:qmstart:100:root@pam:"
+
+    Returns:
+        True if valid, False otherwise
+    """
+    if not upid or not isinstance(upid, str) or len(upid) > MAX_UPID_LENGTH:
+        return False
+    return bool(UPID_PATTERN.match(upid))
+
+
+def is_valid_api_token(token: str) -> bool:
+    """Check if a Proxmox API token is well-formed (boolean check).
+
+    Args:
+        token: Full token "USER@REALM!TOKENID=SECRET"
+
+    Returns:
+        True if valid, False otherwise
+    """
+    if not token or not isinstance(token, str):
+        return False
+    return bool(API_TOKEN_PATTERN.match(token)) and len(token) <= MAX_API_TOKEN_LENGTH
+
+
+def is_valid_service_name(service: str) -> bool:
+    """Check if a systemd unit name (syslog service filter) is valid (boolean check).
+
+    Args:
+        service: Unit name, e.g. "pvedaemon" or "pve-cluster.service"
+
+    Returns:
+        True if valid, False otherwise
+    """
+    if not service or not isinstance(service, str):
+        return False
+    return bool(re.match(r'^[a-zA-Z0-9\-_.@]+$', service)) and len(service) <= MAX_NAME_LENGTH
+
+
+def is_valid_tag(tag: str) -> bool:
+    """Check if a guest tag is valid (boolean check).
+
+    Args:
+        tag: Tag name as used in Proxmox guest tags
+
+    Returns:
+        True if valid, False otherwise
+    """
+    if not tag or not isinstance(tag, str):
+        return False
+    return bool(re.match(r'^[a-zA-Z0-9\-_+.]+$', tag)) and len(tag) <= MAX_NAME_LENGTH
+
+
+def is_valid_guest_name(name: str) -> bool:
+    """Check if a VM/container name is valid (boolean check).
+
+    Args:
+        name: Guest name (DNS-style: letters, digits, hyphens, dots, underscores)
+
+    Returns:
+        True if valid, False otherwise
+    """
+    if not name or not isinstance(name, str):
+        return False
+    return bool(re.match(r'^[a-zA-Z0-9\-_.]+$', name)) and len(name) <= MAX_NAME_LENGTH
+
+
+def is_valid_name_pattern(pattern: str) -> bool:
+    """Check if a shell-style guest name pattern is valid (boolean check).
+
+    Allows name characters plus the wildcards '*', '?' and '[...]'.
+
+    Args:
+        pattern: Pattern such as "web-*" or "db-[0-9]?"
+
+    Returns:
+        True if valid, False otherwise
+    """
+    if not pattern or not isinstance(pattern, str):
+        return False
+    return bool(re.match(r'^[a-zA-Z0-9\-_.*?\[\]!]+$', pattern)) and len(pattern) <= MAX_NAME_LENGTH
+
+
+def is_valid_volume_prefix(prefix: str) -> bool:
+    """Check if a storage volume name prefix is valid (boolean check).
+
+    Args:
+        prefix: Start of a volume file name, e.g. "vzdump-qemu-100" or "debian-12"
+
+    Returns:
+        True if valid, False otherwise
+    """
+    if not prefix or not isinstance(prefix, str):
+        return False
+    return bool(re.match(r'^[a-zA-Z0-9\-_.+]+$', prefix)) and len(prefix) <= MAX_NAME_LENGTH
+
+
+def is_valid_ip_or_network(value: str) -> bool:
+    """Check if a value is an IPv4/IPv6 address or a network in CIDR notation (boolean check).
+
+    Args:
+        value: Address such as "10.1.2.3" or network such as "10.1.2.0/24"
+
+    Returns:
+        True if valid, False otherwise
+    """
+    if not value or not isinstance(value, str):
+        return False
+    try:
+        if "/" in value:
+            ipaddress.ip_network(value.strip(), strict=False)
+        else:
+            ipaddress.ip_address(value.strip())
+    except ValueError:
+        return False
+    return True
+
+
 def validate_cores_range(cores: Union[int, str]) -> bool:
     """Validate CPU cores range.
     
@@ -0,0 +1,175 @@
+"""Batched, briefly cached VM config fetching for list enrichment.
+
+``GET /nodes/{node}/qemu`` lists VMs without their configuration, so an
+agent that needs disks, NICs or tags calls get_vm_info once per VM.
+VMConfigFetcher attaches ``GET /nodes/{node}/qemu/{vmid}/config`` to a whole
+listing in one call:
+
+- configs are fetched in parallel on the client's node executor, so every
+  node sees at most ``max_requests_per_node`` requests at a time
+- each config is cached for ``ttl`` seconds; repeated listings within that
+  window make no config requests at all
+- ``keys`` reduces each config to the given keys; a key without a number
+  also selects its numbered family ("net" -> net0, net1, ...; "scsi" ->
+  scsi0, ...), which keeps the payload small
+- a failing config request is reported on its VM as ``config_error`` and
+  does not fail the listing
+
+Example usage:
+    fetcher = VMConfigFetcher(client)
+    vms = fetcher.enrich(client.list_vms(), keys=["net", "scsi", "tags"])
+"""
+
+import re
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .exceptions import (
+    ProxmoxConnectionError,
+    ProxmoxAuthenticationError,
+    ProxmoxAPIError,
+    ProxmoxTimeoutError,
+    ProxmoxResourceNotFoundError,
+    ProxmoxValidationError,
+)
+
+try:
+    from .utils.mcp_logging import get_logger
+    logger = get_logger(__name__)
+except ImportError:
+    import logging
+    logger = logging.getLogger(__name__)
+
+# Seconds a fetched VM config is reused
+VM_CONFIG_TTL_SECONDS = 30
+
+# Maximum number of config keys a caller may select
+MAX_CONFIG_KEYS = 64
+
+# Config keys (and key families) a caller may select, e.g. "net", "scsi0", "tags"
+CONFIG_KEY_PATTERN = re.compile(r'^[a-z][a-z0-9_-]{0,31}$')
+
+
+def validate_config_keys(keys: Optional[Iterable[str]]) -> Optional[List[str]]:
+    """Validate a config key selection.
+
+    Returns:
+        The keys as a list, or None to keep whole configs
+
+    Raises:
+        ProxmoxValidationError: If a key is malformed or too many are given
+    """
+    if keys is None:
+        return None
+    if isinstance(keys, str):
+        raise ProxmoxValidationError("config_keys must be a list of config keys")
+    keys = list(keys)
+    if not keys or len(keys) > MAX_CONFIG_KEYS:
+        raise ProxmoxValidationError(f"config_keys must hold between 1 and {MAX_CONFIG_KEYS} keys")
+    invalid = [k for k in keys if not isinstance(k, str) or not CONFIG_KEY_PATTERN.match(k)]
+    if invalid:
+        raise ProxmoxValidationError(f"Invalid config key(s): {invalid[:5]}")
+    return keys
+
+
+def select_config_keys(config: Dict[str, Any], keys: List[str]) -> Dict[str, Any]:
+    """Reduce a config to the selected keys and numbered key families."""
+    selected = {}
+    for key, value in config.items():
+        family = key.rstrip("0123456789")
+        if key in keys or (family != key and family in keys):
+            selected[key] = value
+    return selected
+
+
+class VMConfigFetcher:
+    """Fetches the configs of many VMs in parallel, with a short-lived cache.
+
+    Thread-safe: the cache is guarded by one lock; requests are made without it.
+    """
+
+    def __init__(self, client: Any, ttl: float = VM_CONFIG_TTL_SECONDS):
+        """
+        Initialize the fetcher.
+
+        Args:
+            client: ProxmoxClient used for the config requests
+            ttl: Seconds a fetched config is reused
+        """
+        self.client = client
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._cache: Dict[Tuple[str, int], Tuple[float, Dict[str, Any]]] = {}
+
+    def enrich(self, vms: List[Dict[str, Any]], keys: Optional[Iterable[str]] = None,
+               node: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Attach each VM's config to its listing entry.
+
+        Args:
+            vms: VM listing entries (vmid and node; see list_vms)
+            keys: Only these config keys/key families (all keys if None)
+            node: Node of entries without a 'node' field (single-node listings)
+
+        Returns:
+            The same entries, each with 'config' (or 'config_error')
+
+        Raises:
+            ProxmoxValidationError: If the key selection is invalid
+        """
+        keys = validate_config_keys(keys)
+        now = time.monotonic()
+        targets: Dict[Tuple[str, int], None] = {}
+        configs: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        with self._lock:
+            for key in [k for k, (fetched_at, _) in self._cache.items() if now - fetched_at >= self.ttl]:
+                del self._cache[key]
+            for vm in vms:
+                if vm.get("vmid") is None or not (vm.get("node") or node):
+                    continue
+                key = (vm.get("node") or node, int(vm["vmid"]))
+                if key in self._cache:
+                    configs[key] = self._cache[key][1]
+                else:
+                    targets[key] = None
+
+        errors = {}
+        if targets:
+            executor = self.client._get_node_executor()
+            futures = [executor.submit(target[0], self._fetch, *target) for target in targets]
+            fetched_at = time.monotonic()
+            for target, future in zip(targets, futures):
+                config, error = future.result()
+                if error is not None:
+                    errors[target] = error
+                else:
+                    configs[target] = config
+            with self._lock:
+                for target in targets:
+                    if target in configs:
+                        self._cache[target] = (fetched_at, configs[target])
+            logger.debug(f"Fetched {len(targets)} VM config(s), {len(errors)} failed")
+
+        for vm in vms:
+            if vm.get("vmid") is None:
+                continue
+            key = (vm.get("node") or node, int(vm["vmid"]))
+            if key in configs:
+                vm["config"] = select_config_keys(configs[key], keys) if keys else dict(configs[key])
+            else:
+                vm["config"] = None
+                vm["config_error"] = errors.get(key, "VM has no node")
+        return vms
+
+    def _fetch(self, node: str, vmid: int) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Fetch one VM config (runs on the node executor); returns (config, error)."""
+        try:
+            data = self.client._make_request('GET', f'/nodes/{node}/qemu/{vmid}/config').json().get('data')
+        except (ProxmoxConnectionError, ProxmoxTimeoutError, ProxmoxAuthenticationError,
+                ProxmoxResourceNotFoundError, ProxmoxAPIError) as e:
+            return None, str(e)
+        except ValueError as e:
+            return None, f"Invalid JSON response: {e}"
+        if not isinstance(data, dict):
+            return None, "Invalid config response: 'data' is not an object"
+        return data, None
@@ -0,0 +1,228 @@
+"""In-process VMID allocation without conflict retries.
+
+``GET /cluster/nextid`` only suggests an ID and reserves nothing, so parallel
+creates from one process keep colliding on the same VMID. VMIDAllocator keeps
+the set of IDs in use, seeded by one cluster scan, plus the set of IDs handed
+out but not yet created. Every allocation takes the lowest free IDs while
+holding a lock, so concurrent callers never get the same VMID:
+
+- ``allocate(count)`` reserves ``count`` consecutive free VMIDs (a range for
+  batch creates)
+- ``confirm(vmids)`` marks reserved IDs as created
+- ``release(vmids)`` returns reserved IDs after a failed create
+- ``mark_conflict(vmid)`` records an ID that turned out to be taken outside
+  this process and forces a rescan before the next allocation
+
+The seed comes from a single ``/cluster/resources`` request. If that endpoint
+is unavailable the qemu and lxc lists of all nodes are scanned in parallel on
+the client's node executor. The seed is refreshed after ``seed_ttl`` seconds so
+guests created by other clients are picked up.
+
+Example usage:
+    allocator = VMIDAllocator(client)
+    vmids = allocator.allocate(3)
+    ...
+    allocator.confirm(created)
+    allocator.release(failed)
+"""
+
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .exceptions import (
+    ProxmoxConnectionError,
+    ProxmoxAPIError,
+    ProxmoxTimeoutError,
+    ProxmoxResourceNotFoundError,
+    ProxmoxValidationError,
+)
+from .utils.validation import MIN_VMID, MAX_VMID
+
+try:
+    from .utils.mcp_logging import get_logger
+    logger = get_logger(__name__)
+except ImportError:
+    import logging
+    logger = logging.getLogger(__name__)
+
+# Seconds after which the set of used VMIDs is rescanned before allocating
+DEFAULT_VMID_SEED_TTL_SECONDS = 60
+
+# Maximum number of VMIDs a single allocation may reserve
+MAX_VMIDS_PER_ALLOCATION = 1000
+
+
+class VMIDAllocator:
+    """Hands out VMIDs from an in-process reserved set.
+
+    The allocator is thread-safe and is shared by all callers of one client.
+    It only prevents conflicts between callers in this process; a VMID taken
+    by another client since the last scan is reported by Proxmox on create and
+    handled with mark_conflict.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        min_vmid: int = MIN_VMID,
+        max_vmid: int = MAX_VMID,
+        seed_ttl: float = DEFAULT_VMID_SEED_TTL_SECONDS
+    ):
+        """
+        Initialize the allocator. No request is made until the first allocation.
+
+        Args:
+            client: ProxmoxClient used for the cluster scan
+            min_vmid: Lowest VMID to hand out
+            max_vmid: Highest VMID to hand out
+            seed_ttl: Seconds before the used set is rescanned
+        """
+        self.client = client
+        self.min_vmid = min_vmid
+        self.max_vmid = max_vmid
+        self.seed_ttl = seed_ttl
+        self._lock = threading.Lock()
+        self._used: Set[int] = set()
+        self._reserved: Set[int] = set()
+        # VMID -> time created here; a new guest can take a moment to show up in
+        # listings, so these survive rescans for one seed_ttl
+        self._recent: Dict[int, float] = {}
+        self._seeded_at: Optional[float] = None
+        self.scans = 0
+
+    def allocate(self, count: int = 1) -> List[int]:
+        """Reserve the lowest run of ``count`` consecutive free VMIDs.
+
+        Args:
+            count: Number of VMIDs to reserve
+
+        Returns:
+            Sorted list of reserved VMIDs
+
+        Raises:
+            ProxmoxValidationError: If count is out of range
+            ProxmoxAPIError: If the cluster scan fails or no free range is left
+        """
+        if isinstance(count, bool) or not isinstance(count, int) or not 1 <= count <= MAX_VMIDS_PER_ALLOCATION:
+            raise ProxmoxValidationError(f"count must be between 1 and {MAX_VMIDS_PER_ALLOCATION}")
+
+        with self._lock:
+            if self._seeded_at is None or time.monotonic() - self._seeded_at >= self.seed_ttl:
+                self._seed()
+
+            taken = self._used | self._reserved
+            start = self.min_vmid
+            while start + count - 1 <= self.max_vmid:
+                blocker = next((v for v in range(start + count - 1, start - 1, -1) if v in taken), None)
+                if blocker is None:
+                    vmids = list(range(start, start + count))
+                    self._reserved.update(vmids)
+                    return vmids
+                start = blocker + 1
+            raise ProxmoxAPIError(f"No range of {count} free VMIDs left between {self.min_vmid} and {self.max_vmid}")
+
+    def confirm(self, vmids: Iterable[int]) -> None:
+        """Mark reserved VMIDs as created."""
+        with self._lock:
+            for vmid in vmids:
+                self._reserved.discard(int(vmid))
+                self._used.add(int(vmid))
+                self._recent[int(vmid)] = time.monotonic()
+
+    def release(self, vmids: Iterable[int]) -> None:
+        """Return reserved VMIDs that were not used, e.g. after a failed create."""
+        with self._lock:
+            for vmid in vmids:
+                self._reserved.discard(int(vmid))
+
+    def mark_used(self, vmids: Iterable[int]) -> None:
+        """Record VMIDs created without an allocation (explicit VMID creates)."""
+        with self._lock:
+            for vmid in vmids:
+                self._used.add(int(vmid))
+                self._recent[int(vmid)] = time.monotonic()
+
+    def mark_conflict(self, vmid: int) -> None:
+        """Record a VMID that Proxmox reported as taken and rescan before the next allocation.
+
+        Another client created guests since the last scan, so the seed is stale.
+        """
+        with self._lock:
+            self._reserved.discard(int(vmid))
+            self._used.add(int(vmid))
+            self._recent[int(vmid)] = time.monotonic()
+            self._seeded_at = None
+
+    def invalidate(self) -> None:
+        """Force a rescan before the next allocation. Reservations are kept."""
+        with self._lock:
+            self._seeded_at = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the allocator's counters."""
+        with self._lock:
+            return {
+                "used": len(self._used),
+                "reserved": len(self._reserved),
+                "scans": self.scans,
+                "seed_age_seconds": (
+                    round(time.monotonic() - self._seeded_at, 3) if self._seeded_at is not None else None
+                ),
+            }
+
+    def _seed(self) -> None:
+        """Replace the used set with a fresh cluster scan (called with the lock held).
+
+        Reservations survive the rescan, so IDs handed out for creates that
+        are still in flight are never handed out twice.
+        """
+        used = self._scan_cluster_resources()
+        if used is None:
+            used = self._scan_nodes()
+        now = time.monotonic()
+        self._recent = {v: t for v, t in self._recent.items() if now - t < self.seed_ttl}
+        self._used = used | set(self._recent)
+        self._seeded_at = now
+        self.scans += 1
+        logger.debug(f"Seeded VMID allocator with {len(self._used)} used VMIDs")
+
+    def _scan_cluster_resources(self) -> Optional[Set[int]]:
+        """Collect used VMIDs from one /cluster/resources request, or None if unavailable."""
+        if not (self.client.use_cluster_resources and self.client._cluster_resources_available):
+            return None
+        try:
+            resources = self.client.get_cluster_resources("vm")
+        except ProxmoxResourceNotFoundError:
+            self.client._cluster_resources_available = False
+            return None
+        except (ProxmoxConnectionError, ProxmoxTimeoutError, ProxmoxAPIError) as e:
+            logger.debug(f"Cluster resources scan failed, scanning nodes: {e}")
+            return None
+        return {int(r["vmid"]) for r in resources if r.get("vmid") is not None}
+
+    def _scan_nodes(self) -> Set[int]:
+        """Collect used VMIDs from every node's qemu and lxc lists in parallel.
+
+        Raises:
+            ProxmoxAPIError: If no node could be scanned
+        """
+        items, successful, failed, node_count = self.client._fan_out_nodes(self._fetch_node_vmids)
+        if node_count and not successful:
+            raise ProxmoxAPIError(
+                "Unable to determine used VMIDs: "
+                + "; ".join(f"{f['node']}: {f['error']}" for f in failed)
+            )
+        if failed:
+            logger.warning(f"VMID scan skipped {len(failed)} unreachable node(s); conflicts there are retried on create")
+        return {int(item["vmid"]) for item in items if item.get("vmid") is not None}
+
+    def _fetch_node_vmids(self, node: str) -> Tuple[str, List[Dict[str, Any]], Optional[str]]:
+        """Fetch the VMs and containers of one node (a single fan-out task)."""
+        _, vms, error = self.client._fetch_node_vms(node)
+        if error:
+            return node, [], error
+        _, containers, error = self.client._fetch_node_containers(node)
+        if error:
+            return node, [], error
+        return node, vms + containers, None
@@ -2,12 +2,13 @@
 
 import os
 import sys
+from contextlib import ExitStack
 
 # Add the project root directory to the Python path for CI
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 import pytest
-from unittest.mock import Mock, MagicMock
+from unittest.mock import Mock, MagicMock, patch
 
 
 @pytest.fixture
@@ -51,6 +52,39 @@ def mock_proxmox_client(mock_proxmox_config, monkeypatch):
     return client
 
 
+@pytest.fixture
+def fake_api(mock_proxmox_client):
+    """Route mock_proxmox_client's API requests to a fake for the rest of the test.
+
+    fake_api(fake) patches _make_request with ``fake`` (any callable taking
+    method, endpoint and request kwargs, e.g. a tests.fakes.FakeCluster) and
+    returns it.
+    """
+    with ExitStack() as stack:
+        def route(fake):
+            stack.enter_context(patch.object(mock_proxmox_client, '_make_request', side_effect=fake))
+            return fake
+
+        yield route
+
+
+@pytest.fixture
+def mcp_server(request, mock_proxmox_config):
+    """WorkingProxmoxMCPServer on a mocked ProxmoxClient.
+
+    Parametrize indirectly with {client method: return value} to stub the
+    client methods the tools under test call, e.g.
+    @pytest.mark.parametrize("mcp_server", [{"get_metrics": {...}}], indirect=True)
+    """
+    from working_proxmox_server import WorkingProxmoxMCPServer
+
+    with patch('working_proxmox_server.load_config', return_value=mock_proxmox_config), \
+         patch('working_proxmox_server.ProxmoxClient') as client_class:
+        for method, return_value in getattr(request, "param", {}).items():
+            getattr(client_class.return_value, method).return_value = return_value
+        yield WorkingProxmoxMCPServer()
+
+
 @pytest.fixture
 def sample_vm_config():
     """Sample VM configuration for tests."""
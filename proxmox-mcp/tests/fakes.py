@@ -0,0 +1,102 @@
+"""Fake Proxmox API shared by the feature tests.
+
+Feature tests route ProxmoxClient._make_request to a fake through the
+``fake_api`` fixture in conftest.py. Fakes of cluster-wide features subclass
+FakeCluster, which serves the cluster resources, node list, node status and
+task list, and add the endpoints of the feature under test in ``handle``.
+"""
+
+import itertools
+import threading
+from unittest.mock import Mock
+
+GIB = 1024 ** 3
+STARTTIME = 0x66F1E2A0
+
+
+def json_response(data, **fields):
+    """Mock 200 response whose JSON body is a Proxmox API envelope ({"data": data, ...})."""
+    response = Mock()
+    response.status_code = 200
+    response.json.return_value = {"data": data, **fields}
+    return response
+
+
+def node_status(cpus, cpu, mem_total_gb, mem_used_gb):
+    """GET /nodes/{node}/status data of a node with ``cpus`` CPUs at ``cpu`` load."""
+    return {"cpuinfo": {"cpus": cpus}, "cpu": cpu, "loadavg": ["0.5", "0.4", "0.3"],
+            "memory": {"total": mem_total_gb * GIB, "used": mem_used_gb * GIB}}
+
+
+class FakeCluster:
+    """Serves /cluster/resources, /nodes, /nodes/{node}/status and /nodes/{node}/tasks.
+
+    ``resources`` and ``status`` (node -> status data) describe the cluster.
+    A task recorded with ``start_task`` finishes after it has been listed
+    ``polls_to_finish`` times, with the exit status in ``task_status`` for its
+    guest (``default_status`` otherwise). ``count`` tracks in-flight work per
+    key in ``active`` and the high-water mark in ``peak``.
+    """
+
+    task_seconds = 3
+
+    def __init__(self):
+        self.resources = []
+        self.status = {}
+        self.lock = threading.Lock()
+        self.polls_to_finish = 1
+        self.task_status = {}
+        self.default_status = "OK"
+        self.tasks = {}
+        self.pids = itertools.count(1)
+        self.active = {}
+        self.peak = {}
+
+    def __call__(self, method, endpoint, **kwargs):
+        if endpoint == "/cluster/resources":
+            return json_response(self.resources)
+        if endpoint == "/nodes":
+            return json_response([{"node": node, "status": "online"} for node in self.status])
+        parts = endpoint.split("/")
+        if len(parts) == 4 and parts[3] == "status":
+            return json_response(self.status[parts[2]])
+        if len(parts) == 4 and parts[3] == "tasks":
+            return json_response(self.task_list(parts[2]))
+        return self.handle(method, endpoint, parts, **kwargs)
+
+    def handle(self, method, endpoint, parts, **kwargs):
+        """Answer a request for the feature under test; ``parts`` is the split endpoint."""
+        raise AssertionError(f"unexpected request: {method} {endpoint}")
+
+    def count(self, key, delta):
+        """Adjust the in-flight count of ``key``; call with the lock held."""
+        self.active[key] = self.active.get(key, 0) + delta
+        self.peak[key] = max(self.peak.get(key, 0), self.active[key])
+
+    def start_task(self, node, task_type, vmid, keys=(), **fields):
+        """Record a task and return its UPID; it counts against ``keys`` until it finishes."""
+        with self.lock:
+            upid = f"UPID:{node}:{next(self.pids):08X}:00000001:{STARTTIME:08X}:{task_type}:{vmid}:root@pam:"
+            self.tasks[upid] = {"node": node, "vmid": vmid, "keys": tuple(keys), "polls": 0, **fields}
+            for key in keys:
+                self.count(key, 1)
+        return upid
+
+    def task_list(self, node):
+        """GET /nodes/{node}/tasks entries; listing a task advances it towards finishing."""
+        entries = []
+        with self.lock:
+            for upid, task in self.tasks.items():
+                if task["node"] != node:
+                    continue
+                entry = {"upid": upid, "starttime": STARTTIME}
+                if task["polls"] < self.polls_to_finish:
+                    task["polls"] += 1
+                    if task["polls"] == self.polls_to_finish:
+                        for key in task["keys"]:
+                            self.count(key, -1)
+                if task["polls"] >= self.polls_to_finish:
+                    entry.update(endtime=STARTTIME + self.task_seconds,
+                                 status=self.task_status.get(task["vmid"], self.default_status))
+                entries.append(entry)
+        return entries
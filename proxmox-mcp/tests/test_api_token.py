@@ -0,0 +1,218 @@
+"""Tests for API-token authentication."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.async_proxmox_client import AsyncProxmoxClient
+from src.exceptions import ProxmoxAuthenticationError, ProxmoxConfigurationError
+from src.proxmox_client import ProxmoxClient, build_api_token
+
+TOKEN = "root@pam!mcp=0b3f1c2e-7d4a-4e55-9a61-2c8f0d9e1a77"
+
+
+class TokenAPI:
+    """Local HTTP server that only accepts one API token and records request headers."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = []
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def _handle(self):
+                length = int(self.headers.get("Content-Length", 0))
+                if length:
+                    self.rfile.read(length)
+                with api.lock:
+                    api.requests.append((self.command, self.path, dict(self.headers)))
+                if self.headers.get("Authorization") != f"PVEAPIToken={TOKEN}":
+                    status, payload = 401, {}
+                elif self.command == "POST":
+                    status, payload = 200, {"data": "UPID:pve:start"}
+                else:
+                    status, payload = 200, {"data": {"version": "8.2.4"}}
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = _handle
+            do_POST = _handle
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def token_api():
+    with TokenAPI() as api:
+        yield api
+
+
+def _client(api, **kwargs):
+    kwargs.setdefault("api_token", TOKEN)
+    return ProxmoxClient(host="127.0.0.1", port=api.port, protocol="http",
+                         username=kwargs.pop("username", None), password=None, realm="pam", **kwargs)
+
+
+class TestBuildApiToken:
+    """Test cases for API token normalization."""
+
+    @pytest.mark.parametrize("token,username,realm", [
+        (TOKEN, None, None),
+        (f"PVEAPIToken={TOKEN}", None, None),
+        ("mcp=0b3f1c2e-7d4a-4e55-9a61-2c8f0d9e1a77", "root", "pam"),
+        ("mcp=0b3f1c2e-7d4a-4e55-9a61-2c8f0d9e1a77", "root@pam", "pve"),
+    ])
+    def test_accepted_forms(self, token, username, realm):
+        assert build_api_token(token, username, realm) == TOKEN
+
+    @pytest.mark.parametrize("token", [
+        "mcp=s3cr3t",                       # no user and none given
+        "root@pam!mcp",                     # no secret
+        "root@pam!mcp=s3c r3t",
+        "root@pam!mcp=s3cr3t\nX-Injected: 1",
+    ])
+    def test_rejects_malformed(self, token):
+        with pytest.raises(ProxmoxConfigurationError) as exc_info:
+            build_api_token(token)
+        assert "s3c" not in str(exc_info.value)
+
+
+class TestTokenClient:
+    """Test cases for ProxmoxClient in API-token mode."""
+
+    def test_no_ticket_handshake(self, token_api):
+        with patch.object(ProxmoxClient, "_authenticate") as authenticate:
+            client = _client(token_api)
+        try:
+            assert client.auth_mode == "api_token"
+            assert token_api.requests == []
+            assert client.get_version()["status"] == "success"
+        finally:
+            client.close()
+        authenticate.assert_not_called()
+        assert [r[:2] for r in token_api.requests] == [("GET", "/api2/json/version")]
+
+    def test_token_header_without_csrf_on_writes(self, token_api):
+        client = _client(token_api)
+        try:
+            result = client.start_vm("pve", "100")
+        finally:
+            client.close()
+
+        assert result["status"] == "success"
+        method, path, headers = token_api.requests[-1]
+        assert (method, path) == ("POST", "/api2/json/nodes/pve/qemu/100/status/start")
+        assert headers["Authorization"] == f"PVEAPIToken={TOKEN}"
+        assert "CSRFPreventionToken" not in headers
+        assert "Cookie" not in headers
+
+    def test_rejected_token_is_not_retried(self, token_api):
+        client = _client(token_api, api_token="root@pam!mcp=wrong")
+        try:
+            with patch.object(client, "_authenticate") as authenticate:
+                with pytest.raises(ProxmoxAuthenticationError):
+                    client._make_request_no_retry("GET", "/version")
+        finally:
+            client.close()
+
+        authenticate.assert_not_called()
+        assert len(token_api.requests) == 1
+
+    def test_short_token_with_username(self, token_api):
+        client = _client(token_api, api_token="mcp=0b3f1c2e-7d4a-4e55-9a61-2c8f0d9e1a77", username="root")
+        try:
+            assert client.get_version()["status"] == "success"
+        finally:
+            client.close()
+
+    def test_ticket_mode_still_requires_password(self):
+        with pytest.raises(ProxmoxConfigurationError):
+            ProxmoxClient(host="127.0.0.1", port=8006, protocol="http", username="root", password=None)
+
+
+class TestAsyncTokenClient:
+    """Test cases for AsyncProxmoxClient in API-token mode."""
+
+    @pytest.fixture
+    async def async_api(self):
+        seen = []
+
+        async def version(request):
+            seen.append(dict(request.headers))
+            if request.headers.get("Authorization") != f"PVEAPIToken={TOKEN}":
+                return web.Response(status=401)
+            return web.json_response({"data": {"version": "8.2.4"}})
+
+        async def ticket(request):
+            seen.append("ticket")
+            return web.Response(status=500)
+
+        app = web.Application()
+        app.router.add_get("/api2/json/version", version)
+        app.router.add_post("/api2/json/access/ticket", ticket)
+        server = TestServer(app)
+        await server.start_server()
+        yield server.port, seen
+        await server.close()
+
+    async def test_token_header_and_no_ticket(self, async_api):
+        port, seen = async_api
+        async with AsyncProxmoxClient(host="127.0.0.1", port=port, protocol="http",
+                                      username=None, password=None, api_token=TOKEN) as client:
+            result = await client.get_version()
+
+        assert result["status"] == "success"
+        assert "ticket" not in seen
+        assert seen[0]["Authorization"] == f"PVEAPIToken={TOKEN}"
+
+    async def test_rejected_token(self, async_api):
+        port, seen = async_api
+        async with AsyncProxmoxClient(host="127.0.0.1", port=port, protocol="http",
+                                      username=None, password=None, api_token="root@pam!mcp=wrong") as client:
+            result = await client.get_version()
+
+        assert result["status"] == "error"
+        assert len(seen) == 1
+
+
+class TestServerConfig:
+    """Test cases for passing api_token from config.json."""
+
+    def test_server_passes_api_token(self):
+        from working_proxmox_server import WorkingProxmoxMCPServer
+
+        config = {"host": "pve.example.com", "port": 8006, "protocol": "https", "api_token": TOKEN}
+        with patch('working_proxmox_server.load_config', return_value=config), \
+             patch('working_proxmox_server.ProxmoxClient') as client_class:
+            WorkingProxmoxMCPServer()
+
+        kwargs = client_class.call_args.kwargs
+        assert kwargs["api_token"] == TOKEN
+        assert kwargs["username"] is None
+        assert kwargs["password"] is None
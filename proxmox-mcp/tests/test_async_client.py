@@ -0,0 +1,267 @@
+"""Tests for AsyncProxmoxClient against a local fake Proxmox API."""
+
+import asyncio
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.async_proxmox_client import AsyncProxmoxClient
+from src.exceptions import (
+    ProxmoxAPIError,
+    ProxmoxAuthenticationError,
+    ProxmoxConfigurationError,
+    ProxmoxResourceNotFoundError,
+)
+
+
+class FakeProxmox:
+    """Minimal Proxmox API double that records requests."""
+
+    def __init__(self, nodes=("pve1", "pve2", "pve3"), node_delay=0.0):
+        self.nodes = list(nodes)
+        self.node_delay = node_delay
+        self.ticket_count = 0
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.cluster_resources_status = 200
+        self.reject_ticket = None
+        self.created = []
+
+    def app(self):
+        app = web.Application()
+        app.router.add_post('/api2/json/access/ticket', self.ticket)
+        app.router.add_get('/api2/json/version', self.version)
+        app.router.add_get('/api2/json/nodes', self.list_nodes)
+        app.router.add_get('/api2/json/cluster/resources', self.cluster_resources)
+        app.router.add_get('/api2/json/cluster/status', self.cluster_status)
+        app.router.add_get('/api2/json/cluster/nextid', self.next_id)
+        app.router.add_get('/api2/json/nodes/{node}/status', self.node_status)
+        app.router.add_get('/api2/json/nodes/{node}/{kind}', self.node_items)
+        app.router.add_post('/api2/json/nodes/{node}/qemu/{vmid}/status/start', self.start)
+        app.router.add_post('/api2/json/nodes/{node}/lxc', self.create_container)
+        return app
+
+    def _authorized(self, request):
+        ticket = request.cookies.get('PVEAuthCookie')
+        return ticket is not None and ticket != self.reject_ticket
+
+    async def ticket(self, request):
+        form = await request.post()
+        if form.get('password') != 'secret':
+            return web.Response(status=401)
+        self.ticket_count += 1
+        return web.json_response({'data': {
+            'ticket': f'PVE:ticket-{self.ticket_count}',
+            'CSRFPreventionToken': f'csrf-{self.ticket_count}',
+        }})
+
+    async def version(self, request):
+        self.requests.append(request.path)
+        if not self._authorized(request):
+            return web.Response(status=401)
+        return web.json_response({'data': {'version': '8.2.4'}})
+
+    async def list_nodes(self, request):
+        self.requests.append(request.path)
+        return web.json_response({'data': [{'node': n, 'status': 'online'} for n in self.nodes]})
+
+    async def cluster_resources(self, request):
+        self.requests.append(request.path)
+        if self.cluster_resources_status != 200:
+            return web.Response(status=self.cluster_resources_status)
+        data = [{'type': 'node', 'node': n, 'status': 'online'} for n in self.nodes]
+        data += [
+            {'id': f'qemu/{100 + i}', 'type': 'qemu', 'node': n, 'vmid': 100 + i,
+             'name': f'vm{i}', 'status': 'running', 'maxcpu': 2}
+            for i, n in enumerate(self.nodes)
+        ]
+        return web.json_response({'data': data})
+
+    async def cluster_status(self, request):
+        return web.json_response({'data': [{'type': 'cluster', 'name': 'lab', 'quorate': 1}]})
+
+    async def next_id(self, request):
+        return web.json_response({'data': '200'})
+
+    async def node_status(self, request):
+        return web.json_response({'data': {'uptime': 3600, 'cpuinfo': {'cpus': 8}}})
+
+    async def create_container(self, request):
+        self.created.append(dict(await request.post()))
+        return web.json_response({'data': f"UPID:{request.match_info['node']}:vzcreate"})
+
+    async def node_items(self, request):
+        self.requests.append(request.path)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.node_delay)
+        finally:
+            self.in_flight -= 1
+        node = request.match_info['node']
+        if request.match_info['kind'] != 'qemu':
+            return web.json_response({'data': []})
+        return web.json_response({'data': [{'vmid': 100 + self.nodes.index(node), 'name': f'vm-{node}'}]})
+
+    async def start(self, request):
+        self.requests.append(request.path)
+        csrf = request.headers.get('CSRFPreventionToken')
+        if csrf != f'csrf-{self.ticket_count}':
+            return web.Response(status=401)
+        return web.json_response({'data': 'UPID:pve1:start'})
+
+
+@pytest.fixture
+async def fake_proxmox():
+    fake = FakeProxmox()
+    server = TestServer(fake.app())
+    await server.start_server()
+    fake.port = server.port
+    yield fake
+    await server.close()
+
+
+def _client(fake, **kwargs):
+    return AsyncProxmoxClient(
+        host="127.0.0.1", port=fake.port, protocol="http",
+        username="root", password=kwargs.pop("password", "secret"), realm="pam",
+        **kwargs
+    )
+
+
+class TestAsyncProxmoxClient:
+    """Test cases for AsyncProxmoxClient."""
+
+    async def test_lazy_authentication_and_version_cache(self, fake_proxmox):
+        """The client authenticates on first use and caches version info."""
+        async with _client(fake_proxmox) as client:
+            first = await client.get_version()
+            second = await client.get_version()
+
+        assert first["status"] == "success"
+        assert first["version"] == {"version": "8.2.4"}
+        assert second is first
+        assert fake_proxmox.ticket_count == 1
+        assert fake_proxmox.requests.count('/api2/json/version') == 1
+
+    async def test_concurrent_callers_share_one_ticket(self, fake_proxmox):
+        """Many concurrent first requests trigger a single authentication."""
+        async with _client(fake_proxmox) as client:
+            results = await asyncio.gather(*(client.test_connection() for _ in range(20)))
+
+        assert all(r["status"] == "success" for r in results)
+        assert fake_proxmox.ticket_count == 1
+
+    async def test_reauthenticates_on_401(self, fake_proxmox):
+        """A rejected ticket is replaced once and the request retried."""
+        async with _client(fake_proxmox) as client:
+            await client.test_connection()
+            fake_proxmox.reject_ticket = 'PVE:ticket-1'
+            result = await client.test_connection()
+
+        assert result["status"] == "success"
+        assert fake_proxmox.ticket_count == 2
+
+    async def test_invalid_credentials(self, fake_proxmox):
+        """Bad credentials surface as an authentication error."""
+        async with _client(fake_proxmox, password="wrong") as client:
+            with pytest.raises(ProxmoxAuthenticationError):
+                await client.list_nodes()
+
+    async def test_csrf_token_sent_on_writes(self, fake_proxmox):
+        """POST requests carry the CSRF token from the ticket response."""
+        async with _client(fake_proxmox) as client:
+            result = await client.start_vm("pve1", 100)
+
+        assert result["status"] == "success"
+        assert result["data"] == "UPID:pve1:start"
+
+    async def test_list_vms_from_cluster_resources(self, fake_proxmox):
+        """All-node listings use one /cluster/resources request."""
+        async with _client(fake_proxmox) as client:
+            result = await client.list_vms(include_metadata=True)
+
+        assert sorted(vm["vmid"] for vm in result["data"]) == [100, 101, 102]
+        assert result["data"][0]["cpus"] == 2
+        assert result["successful_nodes"] == ["pve1", "pve2", "pve3"]
+        assert not any('/qemu' in p for p in fake_proxmox.requests)
+
+    async def test_parallel_node_fallback_is_bounded(self, fake_proxmox):
+        """Per-node fallback queries run concurrently up to the configured limit."""
+        fake_proxmox.cluster_resources_status = 404
+        fake_proxmox.nodes = [f"pve{i}" for i in range(8)]
+        fake_proxmox.node_delay = 0.05
+
+        async with _client(fake_proxmox, max_concurrent_node_requests=3) as client:
+            vms = await client.list_vms()
+            assert client._cluster_resources_available is False
+
+        assert len(vms) == 8
+        assert fake_proxmox.max_in_flight == 3
+
+    async def test_single_node_not_found(self, fake_proxmox):
+        """Unknown endpoints raise ProxmoxResourceNotFoundError."""
+        async with _client(fake_proxmox) as client:
+            with pytest.raises(ProxmoxResourceNotFoundError):
+                await client.get_vm_info("pve1", 100)
+
+    async def test_all_nodes_failed_raises(self, fake_proxmox):
+        """An error on every node is raised rather than returning an empty list."""
+        fake_proxmox.cluster_resources_status = 500
+
+        async def failing_fetch(node_name, path):
+            return (node_name, [], "boom")
+
+        async with _client(fake_proxmox) as client:
+            client._fetch_node_items = failing_fetch
+            with pytest.raises(ProxmoxAPIError):
+                await client.list_vms()
+
+    async def test_cluster_node_and_container_info(self, fake_proxmox):
+        """The info coroutines used by the async resource handlers return the API data."""
+        async with _client(fake_proxmox) as client:
+            cluster = await client.get_cluster_status()
+            node = await client.get_node_info("pve1")
+            with pytest.raises(ProxmoxResourceNotFoundError):
+                await client.get_container_info("pve1", 200)
+
+        assert cluster[0]["quorate"] == 1
+        assert node["cpuinfo"] == {"cpus": 8}
+
+    async def test_create_container(self, fake_proxmox):
+        """Containers get the next free VMID and a rootfs sized in GiB."""
+        async with _client(fake_proxmox) as client:
+            result = await client.create_container(
+                "pve1", "web", "local:vztmpl/debian-12.tar.zst", disk_size="512M", ssh_keys="ssh-ed25519 AAAA"
+            )
+            invalid = await client.create_container("pve1", "web", "local:vztmpl/debian-12.tar.zst", disk_size="10X")
+
+        assert result["status"] == "success"
+        assert result["vmid"] == 200
+        assert fake_proxmox.created == [{
+            "hostname": "web", "ostemplate": "local:vztmpl/debian-12.tar.zst", "cores": "1", "memory": "512",
+            "rootfs": "local-lvm:0.5", "ssh-public-keys": "ssh-ed25519 AAAA", "vmid": "200",
+        }]
+        assert invalid["status"] == "error"
+
+    async def test_shared_connector_left_open(self, fake_proxmox):
+        """Clients sharing a connector do not close it on exit."""
+        connector = aiohttp.TCPConnector()
+        try:
+            async with _client(fake_proxmox, connector=connector) as a, \
+                       _client(fake_proxmox, connector=connector) as b:
+                await asyncio.gather(a.list_nodes(), b.list_nodes())
+            assert not connector.closed
+        finally:
+            await connector.close()
+
+    def test_invalid_node_concurrency(self):
+        """A node concurrency limit below one is a configuration error."""
+        with pytest.raises(ProxmoxConfigurationError):
+            AsyncProxmoxClient(
+                host="127.0.0.1", port=8006, protocol="https",
+                username="root", password="secret", max_concurrent_node_requests=0
+            )
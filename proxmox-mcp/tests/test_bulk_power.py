@@ -0,0 +1,219 @@
+"""Tests for guest selectors and bulk power operations."""
+
+import json
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.exceptions import ProxmoxAPIError, ProxmoxResourceNotFoundError
+from src.guest_selection import list_guests, select_guests
+from tests.fakes import FakeCluster, json_response
+
+
+def _resources():
+    """Cluster inventory: 12 guests over 3 nodes."""
+    resources = [{"type": "node", "node": f"pve{i}", "status": "online"} for i in range(3)]
+    for i in range(12):
+        resources.append({
+            "id": f"{'lxc' if i >= 9 else 'qemu'}/{100 + i}",
+            "type": "lxc" if i >= 9 else "qemu",
+            "vmid": 100 + i,
+            "name": f"web-{i}" if i < 6 else f"db-{i}",
+            "node": f"pve{i % 3}",
+            "status": "running" if i % 4 == 0 else "stopped",
+            "tags": "prod;web" if i < 6 else "prod",
+            "template": 1 if i == 8 else 0,
+        })
+    return resources
+
+
+class FakePowerCluster(FakeCluster):
+    """Answers inventory and power action requests; tasks finish when first listed.
+
+    The power actions in flight per node are tracked.
+    """
+
+    def __init__(self, delay=0.0, fail_vmids=(), missing_vmids=(), task_status="OK"):
+        super().__init__()
+        self.resources = _resources()
+        self.delay = delay
+        self.fail_vmids = set(fail_vmids)
+        self.missing_vmids = set(missing_vmids)
+        self.default_status = task_status
+        self.posts = []
+
+    def __call__(self, method, endpoint, **kwargs):
+        if endpoint == "/cluster/resources" and (kwargs.get("params") or {}).get("type") == "vm":
+            return json_response([r for r in self.resources if r["type"] in ("qemu", "lxc")])
+        return super().__call__(method, endpoint, **kwargs)
+
+    def handle(self, method, endpoint, parts, **kwargs):
+        node, vmid = parts[2], int(parts[4])
+        with self.lock:
+            self.posts.append(endpoint)
+            self.count(node, 1)
+        time.sleep(self.delay)
+        with self.lock:
+            self.count(node, -1)
+        if vmid in self.fail_vmids:
+            raise ProxmoxAPIError("HTTP error 500: VM is locked")
+        if vmid in self.missing_vmids:
+            raise ProxmoxResourceNotFoundError(f"Resource not found: {endpoint}")
+        return json_response(self.start_task(node, f"qm{parts[-1]}", vmid))
+
+
+class TestGuestSelection:
+    """Test cases for guest inventory and selectors."""
+
+    def test_list_guests_from_cluster_resources(self, mock_proxmox_client, fake_api):
+        fake_api(FakePowerCluster())
+        guests = list_guests(mock_proxmox_client)
+
+        assert len(guests) == 12
+        assert guests[0]["tags"] == ["prod", "web"]
+        assert guests[9]["type"] == "lxc"
+        assert guests[8]["template"] is True
+
+    def test_list_guests_fallback(self, mock_proxmox_client):
+        """Without /cluster/resources the per-node listings are used."""
+        with patch.object(mock_proxmox_client, 'get_cluster_resources', side_effect=ProxmoxResourceNotFoundError("404")), \
+             patch.object(mock_proxmox_client, 'list_vms', return_value=[{"vmid": 100, "name": "a", "node": "pve0", "tags": "x"}]), \
+             patch.object(mock_proxmox_client, 'list_containers', return_value=[{"vmid": 200, "name": "b", "node": "pve0"}]):
+            guests = list_guests(mock_proxmox_client)
+
+        assert [(g["vmid"], g["type"]) for g in guests] == [(100, "qemu"), (200, "lxc")]
+
+    def test_selectors_combine_with_and(self):
+        from src.guest_selection import _normalize_guest
+        guests = [_normalize_guest(r) for r in _resources() if r["type"] != "node"]
+
+        assert [g["vmid"] for g in select_guests(guests, tag="web", node="pve0")] == [100, 103]
+        assert [g["vmid"] for g in select_guests(guests, name_pattern="db-*", guest_type="lxc")] == [109, 110, 111]
+        assert [g["vmid"] for g in select_guests(guests, vmids=[100, 108, 999])] == [100]
+        assert [g["vmid"] for g in select_guests(guests, tag="PROD", node="pve2")] == [102, 105, 111]
+
+
+class TestBulkPower:
+    """Test cases for ProxmoxClient.bulk_power_action."""
+
+    def test_start_by_tag_skips_running(self, mock_proxmox_client, fake_api):
+        cluster = fake_api(FakePowerCluster())
+        result = mock_proxmox_client.bulk_power_action("start", tag="web")
+
+        rows = {r["vmid"]: r for r in result["results"]}
+        assert result["status"] == "success"
+        assert sorted(rows) == [100, 101, 102, 103, 104, 105]
+        assert rows[100]["result"] == "skipped"
+        assert rows[104]["result"] == "skipped"
+        assert rows[101]["result"] == "submitted"
+        assert rows[101]["upid"].startswith("UPID:pve1:")
+        assert result["summary"] == {"targets": 6, "skipped": 2, "submitted": 4}
+        assert "/nodes/pve1/qemu/101/status/start" in cluster.posts
+
+    def test_containers_use_lxc_endpoint(self, mock_proxmox_client, fake_api):
+        cluster = fake_api(FakePowerCluster())
+        mock_proxmox_client.bulk_power_action("start", guest_type="lxc", name_pattern="db-*")
+
+        assert sorted(cluster.posts) == [
+            "/nodes/pve0/lxc/109/status/start",
+            "/nodes/pve1/lxc/110/status/start",
+            "/nodes/pve2/lxc/111/status/start",
+        ]
+
+    def test_wait_merges_task_results(self, mock_proxmox_client, fake_api):
+        fake_api(FakePowerCluster(fail_vmids={102}))
+        result = mock_proxmox_client.bulk_power_action("start", vmids=[101, 102, 103, 999], wait=True, timeout=10)
+
+        rows = {r["vmid"]: r for r in result["results"]}
+        assert result["waited"] is True
+        assert rows[101]["result"] == "ok"
+        assert rows[101]["duration_seconds"] == 3
+        assert rows[102]["result"] == "error"
+        assert "locked" in rows[102]["error"]
+        assert rows[999]["result"] == "error"
+
+    def test_missing_guest_is_an_error_row(self, mock_proxmox_client, fake_api):
+        """A guest deleted after the inventory was read does not abort the run."""
+        fake_api(FakePowerCluster(missing_vmids={102}))
+        result = mock_proxmox_client.bulk_power_action("start", vmids=[101, 102, 103])
+
+        rows = {r["vmid"]: r for r in result["results"]}
+        assert result["status"] == "success"
+        assert rows[102]["result"] == "error"
+        assert "not found" in rows[102]["error"]
+        assert rows[101]["upid"].startswith("UPID:pve1:")
+        assert rows[103]["upid"].startswith("UPID:pve0:")
+
+    def test_failed_task_reported(self, mock_proxmox_client, fake_api):
+        fake_api(FakePowerCluster(task_status="command failed: exit code 255"))
+        result = mock_proxmox_client.bulk_power_action("stop", vmids=[100], wait=True, timeout=10)
+
+        assert result["results"][0]["result"] == "failed"
+        assert result["results"][0]["error"] == "command failed: exit code 255"
+
+    def test_per_node_limit(self, mock_proxmox_client, fake_api):
+        """No node sees more concurrent actions than max_requests_per_node."""
+        mock_proxmox_client.max_requests_per_node = 2
+        cluster = FakePowerCluster(delay=0.02)
+        cluster.resources = [
+            {"type": "qemu", "vmid": 1000 + i, "name": f"vm{i}", "node": f"pve{i % 2}", "status": "stopped"}
+            for i in range(20)
+        ]
+        fake_api(cluster)
+        result = mock_proxmox_client.bulk_power_action("start", name_pattern="vm*")
+
+        assert result["summary"]["submitted"] == 20
+        assert max(cluster.peak.values()) == 2
+
+    def test_templates_never_targeted(self, mock_proxmox_client, fake_api):
+        cluster = fake_api(FakePowerCluster())
+        result = mock_proxmox_client.bulk_power_action("start", vmids=[108])
+
+        assert result["results"][0]["result"] == "error"
+        assert cluster.posts == []
+
+    @pytest.mark.parametrize("kwargs", [
+        {"action": "reboot", "vmids": [100]},
+        {"action": "start"},
+        {"action": "start", "vmids": [100], "guest_type": "vm"},
+    ])
+    def test_invalid_requests(self, mock_proxmox_client, kwargs):
+        result = mock_proxmox_client.bulk_power_action(**kwargs)
+        assert result["status"] == "error"
+
+
+@pytest.mark.parametrize("mcp_server", [{"bulk_power_action": {"status": "success", "results": []}}], indirect=True)
+class TestBulkPowerTools:
+    """Test cases for the proxmox_bulk_* MCP tools."""
+
+    def test_tools_listed(self, mcp_server):
+        names = {t["name"] for t in mcp_server._list_tools()["tools"]}
+        assert {"proxmox_bulk_start", "proxmox_bulk_stop", "proxmox_bulk_shutdown", "proxmox_bulk_suspend"} <= names
+
+    def test_shutdown_calls_client(self, mcp_server):
+        result = mcp_server._call_tool("proxmox_bulk_shutdown", {"node": "pve1", "tag": "web", "wait": True, "timeout": 60})
+
+        assert result["isError"] is False
+        assert json.loads(result["content"][0]["text"])["status"] == "success"
+        mcp_server.proxmox_client.bulk_power_action.assert_called_once_with(
+            "shutdown", vmids=None, node="pve1", tag="web", name_pattern=None,
+            guest_type="all", wait=True, timeout=60
+        )
+
+    @pytest.mark.parametrize("arguments", [
+        {},
+        {"vmids": "100"},
+        {"vmids": [5]},
+        {"vmids": [True]},
+        {"node": "../pve"},
+        {"tag": "a;b"},
+        {"name_pattern": "$(reboot)"},
+        {"node": "pve1", "guest_type": "vm"},
+        {"node": "pve1", "timeout": -5},
+    ])
+    def test_rejects_invalid_arguments(self, mcp_server, arguments):
+        result = mcp_server._call_tool("proxmox_bulk_start", arguments)
+
+        assert result["isError"] is True
+        mcp_server.proxmox_client.bulk_power_action.assert_not_called()
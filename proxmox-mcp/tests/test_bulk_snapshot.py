@@ -0,0 +1,227 @@
+"""Tests for bulk snapshot creation and retention pruning."""
+
+import json
+import time
+
+import pytest
+
+from src.bulk_snapshot import BulkSnapshotRunner
+from src.exceptions import ProxmoxAPIError, ProxmoxResourceNotFoundError, ProxmoxValidationError
+from tests.fakes import FakeCluster, json_response
+
+HOUR = 3600
+
+
+def _resources():
+    """8 guests over 2 nodes; 107 is a container."""
+    return [
+        {"type": "lxc" if vmid == 107 else "qemu", "vmid": vmid, "name": f"web-{vmid}",
+         "node": "pve1" if vmid < 105 else "pve2", "status": "running", "tags": "prod"}
+        for vmid in range(100, 108)
+    ]
+
+
+class FakeSnapshotCluster(FakeCluster):
+    """Answers inventory and snapshot list/create/delete requests.
+
+    A task finishes after it has been listed twice; the tasks running per
+    node and per guest are tracked.
+    """
+
+    task_seconds = 4
+
+    def __init__(self):
+        super().__init__()
+        self.resources = _resources()
+        self.snapshots = {}
+        self.polls_to_finish = 2
+        self.fail_vmids = set()
+        self.missing_vmids = set()
+        self.requests = []
+
+    def handle(self, method, endpoint, parts, **kwargs):
+        node, vmid = parts[2], int(parts[4])
+        with self.lock:
+            self.requests.append((method, endpoint, kwargs.get("data")))
+        if vmid in self.missing_vmids:
+            raise ProxmoxResourceNotFoundError(f"Resource not found: {endpoint}")
+        if method == "GET":
+            return json_response(self.snapshots.get(vmid, []) + [{"name": "current", "running": 1}])
+        if vmid in self.fail_vmids:
+            raise ProxmoxAPIError("HTTP error 500: VM is locked (backup)")
+        return json_response(self.start_task(node, "qmsnapshot", vmid, keys=(node, vmid)))
+
+
+@pytest.fixture
+def cluster(fake_api):
+    return fake_api(FakeSnapshotCluster())
+
+
+@pytest.fixture
+def runner(mock_proxmox_client):
+    return BulkSnapshotRunner(mock_proxmox_client, poll_interval=0.01)
+
+
+def _snap(name, age_hours):
+    return {"name": name, "snaptime": int(time.time() - age_hours * HOUR), "description": ""}
+
+
+class TestBulkSnapshotCreate:
+    """Test cases for bulk snapshot creation."""
+
+    def test_snapshots_with_per_node_limit(self, runner, cluster):
+        result = runner.create("pre-upgrade", tag="prod", max_per_node=2, vmstate=True)
+
+        assert result["summary"] == {"targets": 8, "ok": 8}
+        assert cluster.peak["pve1"] == 2
+        assert cluster.peak["pve2"] == 2
+        assert all(row["duration_seconds"] == 4 for row in result["results"])
+        posts = {endpoint: data for method, endpoint, data in cluster.requests}
+        assert posts["/nodes/pve1/qemu/100/snapshot"] == {"snapname": "pre-upgrade", "vmstate": 1}
+        # RAM state only applies to VMs
+        assert posts["/nodes/pve2/lxc/107/snapshot"] == {"snapname": "pre-upgrade"}
+
+    def test_errors_and_failed_tasks(self, runner, cluster):
+        cluster.fail_vmids = {101}
+        cluster.task_status = {102: "snapshot feature is not available"}
+        result = runner.create("pre-upgrade", vmids=[100, 101, 102, 999])
+
+        by_vmid = {row["vmid"]: row for row in result["results"]}
+        assert by_vmid[100]["result"] == "ok"
+        assert "locked" in by_vmid[101]["error"]
+        assert by_vmid[102]["result"] == "failed"
+        assert by_vmid[102]["error"] == "snapshot feature is not available"
+        assert by_vmid[999]["result"] == "error"
+
+    def test_deleted_guest_does_not_abort_run(self, runner, cluster):
+        """A guest removed after the inventory was read is an error row; the others are tracked."""
+        cluster.missing_vmids = {101}
+        result = runner.create("pre-upgrade", vmids=[100, 101, 102])
+
+        by_vmid = {row["vmid"]: row for row in result["results"]}
+        assert by_vmid[100]["result"] == "ok"
+        assert by_vmid[102]["result"] == "ok"
+        assert by_vmid[101]["result"] == "error"
+        assert "not found" in by_vmid[101]["error"]
+
+    def test_timeout_reports_running_and_skipped(self, runner, cluster):
+        cluster.polls_to_finish = 10 ** 6
+        result = runner.create("pre-upgrade", node="pve1", max_per_node=2, timeout=0.1)
+
+        assert result["summary"] == {"targets": 5, "running": 2, "skipped": 3}
+
+    @pytest.mark.parametrize("kwargs", [
+        {"snapname": "bad name", "tag": "prod"},
+        {"snapname": "ok"},
+        {"snapname": "ok", "tag": "prod", "max_per_node": 0},
+        {"snapname": "ok", "tag": "prod", "guest_type": "vm"},
+    ])
+    def test_invalid_arguments(self, runner, cluster, kwargs):
+        with pytest.raises(ProxmoxValidationError):
+            runner.create(**kwargs)
+
+
+class TestSnapshotPrune:
+    """Test cases for retention pruning."""
+
+    def test_policy(self, runner, cluster):
+        cluster.snapshots = {
+            100: [_snap(f"auto-{i}", age_hours=i * 24) for i in range(6)] + [_snap("manual", 1000)],
+            101: [_snap("auto-new", 1)],
+            105: [{"name": "auto-undated"}, _snap("auto-old", 500)],
+        }
+        result = runner.prune(keep_last=2, keep_within_hours=72, node="pve1", name_prefix="auto-", dry_run=True)
+
+        planned = [(row["vmid"], row["snapname"]) for row in result["results"]]
+        # auto-0/1 are the newest two, auto-2 is younger than 72h; 'manual' does not match the prefix
+        assert planned == [(100, "auto-5"), (100, "auto-4"), (100, "auto-3")]
+        assert result["summary"] == {"targets": 3, "planned": 3}
+        assert {g["vmid"]: (g["snapshots"], g["delete"]) for g in result["guests"]}[100] == (7, 3)
+        assert not any(method == "DELETE" for method, _, _ in cluster.requests)
+
+    def test_deletes_serially_per_guest(self, runner, cluster):
+        cluster.snapshots = {
+            100: [_snap(f"auto-{i}", i) for i in range(5)],
+            101: [_snap(f"auto-{i}", i) for i in range(5)],
+            106: [_snap(f"auto-{i}", i) for i in range(3)],
+        }
+        result = runner.prune(keep_last=1, tag="prod", max_per_node=4)
+
+        assert result["summary"] == {"targets": 10, "ok": 10}
+        deletes = [endpoint for method, endpoint, _ in cluster.requests if method == "DELETE"]
+        assert "/nodes/pve1/qemu/100/snapshot/auto-4" in deletes
+        # Proxmox locks the guest during a snapshot task: one at a time per guest
+        assert cluster.peak[100] == 1
+        assert cluster.peak["pve1"] == 2
+
+    def test_listing_failures_are_per_guest(self, runner, cluster, fake_api):
+        def flaky(method, endpoint, **kwargs):
+            if method == "GET" and endpoint == "/nodes/pve1/qemu/101/snapshot":
+                raise ProxmoxAPIError("HTTP error 500")
+            return cluster(method, endpoint, **kwargs)
+
+        cluster.snapshots = {100: [_snap("a", 1), _snap("b", 2)]}
+        fake_api(flaky)
+        result = runner.prune(keep_last=1, vmids=[100, 101])
+
+        by_vmid = {row["vmid"]: row for row in result["results"]}
+        assert by_vmid[100]["snapname"] == "b"
+        assert by_vmid[101]["result"] == "error"
+
+    def test_deleted_guest_is_reported(self, runner, cluster):
+        cluster.snapshots = {100: [_snap("a", 1), _snap("b", 2)]}
+        cluster.missing_vmids = {101}
+        result = runner.prune(keep_last=1, vmids=[100, 101])
+
+        by_vmid = {row["vmid"]: row for row in result["results"]}
+        assert by_vmid[100]["result"] == "ok"
+        assert by_vmid[101]["result"] == "error"
+        assert "not found" in by_vmid[101]["error"]
+
+    def test_requires_policy(self, runner, cluster):
+        with pytest.raises(ProxmoxValidationError):
+            runner.prune(tag="prod")
+
+
+@pytest.mark.parametrize("mcp_server", [{
+    "bulk_snapshot": {"status": "success", "summary": {"targets": 0}},
+    "prune_snapshots": {"status": "success", "summary": {"targets": 0}},
+}], indirect=True)
+class TestBulkSnapshotTools:
+    """Test cases for the bulk snapshot MCP tools."""
+
+    def test_bulk_snapshot_calls_client(self, mcp_server):
+        result = mcp_server._call_tool("proxmox_bulk_snapshot", {"snapname": "pre-upgrade", "tag": "prod", "max_per_node": 2})
+
+        assert json.loads(result["content"][0]["text"])["status"] == "success"
+        mcp_server.proxmox_client.bulk_snapshot.assert_called_once_with(
+            "pre-upgrade", vmids=None, node=None, tag="prod", name_pattern=None, guest_type="all",
+            description="", vmstate=False, max_per_node=2, timeout=1800
+        )
+
+    def test_prune_calls_client(self, mcp_server):
+        mcp_server._call_tool("proxmox_prune_snapshots", {"vmids": [100], "keep_last": 3, "name_prefix": "auto-", "dry_run": True})
+
+        mcp_server.proxmox_client.prune_snapshots.assert_called_once_with(
+            keep_last=3, keep_within_hours=None, vmids=[100], node=None, tag=None, name_pattern=None,
+            guest_type="all", name_prefix="auto-", max_per_node=4, dry_run=True, timeout=1800
+        )
+
+    @pytest.mark.parametrize("name,arguments", [
+        ("proxmox_bulk_snapshot", {"tag": "prod"}),
+        ("proxmox_bulk_snapshot", {"snapname": "x y", "tag": "prod"}),
+        ("proxmox_bulk_snapshot", {"snapname": "ok"}),
+        ("proxmox_bulk_snapshot", {"snapname": "ok", "tag": "prod", "max_per_node": 100}),
+        ("proxmox_bulk_snapshot", {"snapname": "ok", "tag": "prod", "timeout": 0}),
+        ("proxmox_prune_snapshots", {"tag": "prod"}),
+        ("proxmox_prune_snapshots", {"tag": "prod", "keep_last": -1}),
+        ("proxmox_prune_snapshots", {"tag": "prod", "keep_within_hours": 0}),
+        ("proxmox_prune_snapshots", {"tag": "prod", "keep_last": 1, "name_prefix": "a b"}),
+        ("proxmox_prune_snapshots", {"vmids": [1], "keep_last": 1}),
+    ])
+    def test_rejects_invalid_arguments(self, mcp_server, name, arguments):
+        result = mcp_server._call_tool(name, arguments)
+
+        assert result["isError"] is True
+        mcp_server.proxmox_client.bulk_snapshot.assert_not_called()
+        mcp_server.proxmox_client.prune_snapshots.assert_not_called()
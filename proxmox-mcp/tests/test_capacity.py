@@ -0,0 +1,286 @@
+"""Tests for the cluster capacity engine and placement recommendations."""
+
+import json
+import threading
+import time
+from collections import Counter
+from unittest.mock import patch
+
+import pytest
+
+from src.capacity import CapacityPlanner
+from src.exceptions import ProxmoxAPIError, ProxmoxConnectionError, ProxmoxResourceNotFoundError
+from tests.fakes import GIB, FakeCluster, json_response, node_status
+
+MIB = 1024 ** 2
+
+
+class FakeCapacityCluster(FakeCluster):
+    """Serves node status and /nodes/{node}/storage, counting calls; nodes can be down or missing."""
+
+    def __init__(self, delay=0.0):
+        super().__init__()
+        self.status = {
+            "pve1": node_status(16, 0.50, 64, 48),   # 8 cores, 16 GB free
+            "pve2": node_status(32, 0.25, 128, 32),  # 24 cores, 96 GB free
+            "pve3": node_status(8, 0.10, 32, 30),    # 7.2 cores, 2 GB free
+        }
+        self.storage = {
+            "pve1": [{"storage": "local-lvm", "content": "images,rootdir", "total": 500 * GIB, "avail": 400 * GIB, "active": 1, "enabled": 1}],
+            "pve2": [{"storage": "local-lvm", "content": "images,rootdir", "total": 500 * GIB, "avail": 20 * GIB, "active": 1, "enabled": 1},
+                     {"storage": "local", "content": "iso,vztmpl", "total": 100 * GIB, "avail": 90 * GIB, "active": 1, "enabled": 1}],
+            "pve3": [{"storage": "local-lvm", "content": "images", "total": 200 * GIB, "avail": 150 * GIB, "active": 1, "enabled": 1}],
+        }
+        self.delay = delay
+        self.down = set()
+        self.missing = set()
+        self.calls = []
+
+    def __call__(self, method, endpoint, **kwargs):
+        with self.lock:
+            self.calls.append(endpoint)
+        if endpoint != "/nodes":
+            time.sleep(self.delay)
+            node = endpoint.split("/")[2]
+            if node in self.down:
+                raise ProxmoxConnectionError(f"{node} unreachable")
+            if node in self.missing:
+                raise ProxmoxResourceNotFoundError(f"Resource not found: {endpoint}")
+        return super().__call__(method, endpoint, **kwargs)
+
+    def handle(self, method, endpoint, parts, **kwargs):
+        return json_response(self.storage[parts[2]])
+
+
+@pytest.fixture
+def cluster(fake_api):
+    return fake_api(FakeCapacityCluster())
+
+
+class TestCapacityPlanner:
+    """Test cases for headroom computation and ranking."""
+
+    def test_summary_headroom(self, mock_proxmox_client, cluster):
+        summary = CapacityPlanner(mock_proxmox_client).summary()
+
+        pve1 = summary["nodes"][0]
+        assert pve1["cpu_free_cores"] == 8.0
+        assert pve1["memory_free_mb"] == 16 * 1024
+        assert pve1["storage"]["local-lvm"]["free_gb"] == 400.0
+        assert summary["totals"]["cpus"] == 56
+        assert summary["totals"]["memory_free_mb"] == (16 + 96 + 2) * 1024
+
+    def test_snapshot_is_cached(self, mock_proxmox_client, cluster):
+        planner = CapacityPlanner(mock_proxmox_client, cache_ttl=60)
+        for _ in range(10):
+            planner.recommend_node(cores=2, memory=1024)
+        assert cluster.calls.count("/nodes") == 1
+        assert len(cluster.calls) == 7
+
+        planner.snapshot(max_age=0)
+        assert cluster.calls.count("/nodes") == 2
+
+    def test_nodes_queried_in_parallel(self, mock_proxmox_client, fake_api):
+        fake_api(FakeCapacityCluster(delay=0.05))
+        started = time.monotonic()
+        CapacityPlanner(mock_proxmox_client).snapshot()
+        elapsed = time.monotonic() - started
+        # 3 nodes x 2 sequential requests would take 0.3s
+        assert elapsed < 0.25
+
+    def test_recommend_prefers_most_headroom(self, mock_proxmox_client, cluster):
+        result = CapacityPlanner(mock_proxmox_client).recommend_node(cores=4, memory=8192)
+
+        assert result["node"] == "pve2"
+        assert [c["node"] for c in result["candidates"]] == ["pve2", "pve1"]
+        assert result["rejected"] == [{"node": "pve3", "reason": "only 2048 MB memory free"}]
+
+    def test_storage_requirement(self, mock_proxmox_client, cluster):
+        planner = CapacityPlanner(mock_proxmox_client)
+
+        result = planner.recommend_node(cores=2, memory=1024, storage_gb=100)
+        assert result["node"] == "pve1"
+        assert result["storage"] == "local-lvm"
+        assert {"node": "pve2", "reason": "no disk-image storage with 100 GB free"} in result["rejected"]
+
+        named = planner.recommend_node(cores=2, memory=1024, storage="local", storage_gb=10)
+        assert named["node"] == "pve2"
+        assert named["storage"] == "local"
+
+    def test_cpu_count_is_a_hard_limit(self, mock_proxmox_client, cluster):
+        result = CapacityPlanner(mock_proxmox_client).recommend_node(cores=20, memory=1024)
+        assert result["node"] == "pve2"
+        assert {"node": "pve1", "reason": "only 16 CPUs"} in result["rejected"]
+
+    def test_reservations_spread_placements(self, mock_proxmox_client, cluster):
+        planner = CapacityPlanner(mock_proxmox_client, cache_ttl=60)
+        placed = []
+        for _ in range(6):
+            node = planner.recommend_node(cores=4, memory=16 * 1024)["node"]
+            planner.reserve(node, 4, 16 * 1024)
+            placed.append(node)
+
+        assert placed == ["pve2"] * 5 + ["pve1"]
+        assert planner.recommend_node(cores=1, memory=96 * 1024)["node"] is None
+
+    def test_concurrent_reserve_best(self, mock_proxmox_client, cluster):
+        """Ranking and reserving are one step: concurrent callers never share headroom."""
+        sequential = CapacityPlanner(mock_proxmox_client, cache_ttl=60)
+        expected = [sequential.reserve_best(cores=4, memory=16 * 1024)["node"] for _ in range(8)]
+
+        planner = CapacityPlanner(mock_proxmox_client, cache_ttl=60)
+        planner.snapshot()
+        barrier = threading.Barrier(8)
+        placed = []
+
+        def place():
+            barrier.wait()
+            placed.append(planner.reserve_best(cores=4, memory=16 * 1024)["node"])
+
+        threads = [threading.Thread(target=place) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert None in expected
+        assert Counter(placed) == Counter(expected)
+
+    def test_release_keeps_other_reservations(self, mock_proxmox_client, cluster):
+        planner = CapacityPlanner(mock_proxmox_client, cache_ttl=60)
+        first = planner.reserve_best(cores=4, memory=8 * 1024)["reservation"]
+        planner.reserve_best(cores=4, memory=8 * 1024)
+        planner.release(first)
+
+        pve2 = planner.snapshot()["nodes"]["pve2"]
+        assert pve2["memory_free_mb"] == (96 - 8) * 1024
+        assert pve2["cpu_free_cores"] == 20.0
+
+        # A refresh already dropped every reservation; releasing must not add headroom
+        second = planner.reserve_best(cores=4, memory=8 * 1024)["reservation"]
+        planner.snapshot(max_age=0)
+        planner.release(second)
+        assert planner.snapshot()["nodes"]["pve2"]["memory_free_mb"] == 96 * 1024
+
+    def test_partial_and_total_failure(self, mock_proxmox_client, cluster):
+        cluster.down = {"pve2"}
+        result = CapacityPlanner(mock_proxmox_client).recommend_node(cores=1, memory=1024)
+        assert result["node"] == "pve1"
+        assert [f["node"] for f in result["failed_nodes"]] == ["pve2"]
+
+        cluster.down = {"pve1", "pve2", "pve3"}
+        with pytest.raises(ProxmoxAPIError):
+            CapacityPlanner(mock_proxmox_client).snapshot()
+
+    def test_node_not_found_is_a_failed_node(self, mock_proxmox_client, cluster):
+        """A node answering 404 (e.g. removed from the cluster) is skipped, not fatal."""
+        cluster.missing = {"pve2"}
+        result = CapacityPlanner(mock_proxmox_client).recommend_node(cores=1, memory=1024)
+
+        assert result["node"] == "pve1"
+        assert [f["node"] for f in result["failed_nodes"]] == ["pve2"]
+
+
+class TestAutoPlacement:
+    """Test cases for create_vm with automatic node placement."""
+
+    def test_create_vm_auto_places(self, mock_proxmox_client, cluster):
+        created = []
+
+        def create(node, name, vmid, cores, memory):
+            created.append(node)
+            return {"status": "success", "vmid": 100 + len(created)}
+
+        with patch.object(mock_proxmox_client, '_create_vm_on_node', side_effect=create):
+            first = mock_proxmox_client.create_vm(None, "web-1", cores="4", memory="65536")
+            second = mock_proxmox_client.create_vm(None, "web-2", cores="4", memory="65536")
+
+        # The first VM's reservation leaves no node with 64 GB free
+        assert first["node"] == "pve2"
+        assert created == ["pve2"]
+        assert second["status"] == "error"
+
+    def test_failed_create_releases_only_its_reservation(self, mock_proxmox_client, cluster):
+        results = iter([{"status": "success", "vmid": 101}, {"status": "error", "message": "storage full"}])
+        with patch.object(mock_proxmox_client, '_create_vm_on_node', side_effect=lambda *args: next(results)):
+            mock_proxmox_client.create_vm(None, "web-1", cores=4, memory=8192)
+            failed = mock_proxmox_client.create_vm(None, "web-2", cores=4, memory=8192)
+
+        assert failed["status"] == "error"
+        # The successful VM is still reserved; no rescan was forced
+        assert mock_proxmox_client._capacity.snapshot()["nodes"]["pve2"]["memory_free_mb"] == (96 - 8) * 1024
+        assert cluster.calls.count("/nodes") == 1
+
+    def test_auto_placement_requires_storage(self, mock_proxmox_client, cluster):
+        """Only nodes that have the requested storage are considered."""
+        cluster.storage["pve1"].append({"storage": "nvme", "content": "images", "total": 100 * GIB,
+                                        "avail": 80 * GIB, "active": 1, "enabled": 1})
+        with patch.object(mock_proxmox_client, '_create_vm_on_node', return_value={"status": "success"}) as create:
+            result = mock_proxmox_client.create_vm(None, "web-1", cores=1, memory=512, storage="nvme")
+
+        # pve2 has the most headroom but no 'nvme' storage
+        assert result["node"] == "pve1"
+        create.assert_called_once_with("pve1", "web-1", None, 1, 512)
+
+        missing = mock_proxmox_client.create_vm(None, "web-2", cores=1, memory=512, storage="ceph")
+        assert missing["status"] == "error"
+        assert {"node": "pve1", "reason": "storage 'ceph' not available"} in missing["rejected"]
+
+    def test_nothing_fits(self, mock_proxmox_client, cluster):
+        result = mock_proxmox_client.create_vm(None, "huge", cores=1, memory=512 * 1024)
+        assert result["status"] == "error"
+        assert len(result["rejected"]) == 3
+
+    def test_explicit_node_skips_planner(self, mock_proxmox_client, cluster):
+        with patch.object(mock_proxmox_client, '_create_vm_on_node', return_value={"status": "success"}) as create:
+            mock_proxmox_client.create_vm("pve3", "db", cores=1, memory=512)
+        create.assert_called_once_with("pve3", "db", None, 1, 512)
+        assert "/nodes" not in cluster.calls
+
+
+@pytest.mark.parametrize("mcp_server", [{
+    "recommend_node": {"status": "success", "node": "pve2"},
+    "create_vm": {"status": "success", "vmid": 100, "node": "pve2"},
+}], indirect=True)
+class TestCapacityTools:
+    """Test cases for the capacity MCP tools."""
+
+    def test_recommend_node(self, mcp_server):
+        result = mcp_server._call_tool("proxmox_recommend_node", {"cores": 2, "memory": 2048, "storage_gb": 20})
+
+        assert json.loads(result["content"][0]["text"])["node"] == "pve2"
+        mcp_server.proxmox_client.recommend_node.assert_called_once_with(
+            cores=2, memory=2048, storage_gb=20, storage=None
+        )
+
+    def test_create_vm_auto(self, mcp_server):
+        mcp_server._call_tool("proxmox_create_vm", {"name": "web-1"})
+        mcp_server.proxmox_client.create_vm.assert_called_once_with(None, "web-1", None, 1, 512, storage=None)
+
+    def test_create_vm_on_node_named_auto(self, mcp_server):
+        """'auto' is an ordinary node name, not a placement keyword."""
+        mcp_server._call_tool("proxmox_create_vm", {"node": "auto", "name": "web-1"})
+        mcp_server.proxmox_client.create_vm.assert_called_once_with("auto", "web-1", None, 1, 512, storage=None)
+
+    def test_create_vm_rejects_empty_node(self, mcp_server):
+        result = mcp_server._call_tool("proxmox_create_vm", {"node": "", "name": "web-1"})
+
+        assert result["isError"] is True
+        mcp_server.proxmox_client.create_vm.assert_not_called()
+
+    def test_create_vm_passes_storage(self, mcp_server):
+        mcp_server._call_tool("proxmox_create_vm", {"name": "web-1", "storage": "local-lvm"})
+        mcp_server.proxmox_client.create_vm.assert_called_once_with(None, "web-1", None, 1, 512, storage="local-lvm")
+
+    @pytest.mark.parametrize("arguments", [
+        {"cores": 0},
+        {"cores": True},
+        {"memory": 10},
+        {"storage_gb": -1},
+        {"storage": "../x"},
+    ])
+    def test_recommend_rejects_invalid_arguments(self, mcp_server, arguments):
+        result = mcp_server._call_tool("proxmox_recommend_node", arguments)
+
+        assert result["isError"] is True
+        mcp_server.proxmox_client.recommend_node.assert_not_called()
@@ -0,0 +1,151 @@
+"""Tests for the concurrent stdio request dispatcher in WorkingProxmoxMCPServer."""
+
+import io
+import json
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.exceptions import ProxmoxConfigurationError
+
+
+def _tool_call(request_id, tool_name):
+    """Build a tools/call request line."""
+    return json.dumps({
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "method": "tools/call",
+        "params": {"name": tool_name, "arguments": {}}
+    }) + "\n"
+
+
+def _tools_list(request_id):
+    """Build a tools/list request line."""
+    return json.dumps({"jsonrpc": "2.0", "id": request_id, "method": "tools/list", "params": {}}) + "\n"
+
+
+def _ok(text):
+    return {"content": [{"type": "text", "text": text}], "isError": False}
+
+
+def _run_server(config, lines, call_tool):
+    """Run a server over the given stdin lines and return the decoded responses in write order."""
+    from working_proxmox_server import WorkingProxmoxMCPServer
+
+    with patch('working_proxmox_server.load_config', return_value=config), \
+         patch('working_proxmox_server.ProxmoxClient', return_value=Mock()), \
+         patch('sys.stdin', iter(lines)), \
+         patch('sys.stdout', new_callable=io.StringIO) as stdout:
+        server = WorkingProxmoxMCPServer()
+        server._call_tool = call_tool
+        server.run()
+        output = stdout.getvalue()
+
+    return [json.loads(line) for line in output.splitlines() if line.strip()]
+
+
+class TestConcurrentDispatcher:
+    """Test cases for dispatching tools/call requests on a worker pool."""
+
+    def test_slow_call_does_not_block_later_calls(self, mock_proxmox_config):
+        """A fast tool call completes while an earlier slow one is still running."""
+        fast_done = threading.Event()
+
+        def call_tool(name, arguments):
+            if name == "slow":
+                # Only finishes once the fast call has completed
+                fast_done.wait(timeout=5)
+                return _ok("slow")
+            fast_done.set()
+            return _ok("fast")
+
+        config = dict(mock_proxmox_config, max_concurrent_requests=4)
+        responses = _run_server(config, [_tool_call(1, "slow"), _tool_call(2, "fast")], call_tool)
+
+        assert [r["id"] for r in responses] == [2, 1]
+        assert responses[0]["result"]["content"][0]["text"] == "fast"
+        assert responses[1]["result"]["content"][0]["text"] == "slow"
+
+    def test_tools_list_skips_queue(self, mock_proxmox_config):
+        """tools/list is answered even while every worker is busy."""
+        from working_proxmox_server import WorkingProxmoxMCPServer
+
+        listed = threading.Event()
+        original_list_tools = WorkingProxmoxMCPServer._list_tools
+
+        def call_tool(name, arguments):
+            listed.wait(timeout=5)
+            return _ok(name)
+
+        def list_tools(self):
+            listed.set()
+            return original_list_tools(self)
+
+        config = dict(mock_proxmox_config, max_concurrent_requests=2)
+        with patch.object(WorkingProxmoxMCPServer, '_list_tools', list_tools):
+            responses = _run_server(
+                config,
+                [_tool_call(1, "busy1"), _tool_call(2, "busy2"), _tools_list(3)],
+                call_tool
+            )
+
+        assert responses[0]["id"] == 3
+        assert "tools" in responses[0]["result"]
+        assert sorted(r["id"] for r in responses[1:]) == [1, 2]
+
+    def test_responses_are_complete_lines(self, mock_proxmox_config):
+        """Concurrent writers never interleave partial JSON lines."""
+        def call_tool(name, arguments):
+            return _ok(name * 2000)
+
+        config = dict(mock_proxmox_config, max_concurrent_requests=8)
+        lines = [_tool_call(i, f"t{i}") for i in range(1, 51)]
+        responses = _run_server(config, lines, call_tool)
+
+        assert sorted(r["id"] for r in responses) == list(range(1, 51))
+
+    def test_single_worker_processes_inline(self, mock_proxmox_config):
+        """max_concurrent_requests=1 keeps the original sequential behavior."""
+        def call_tool(name, arguments):
+            return _ok(name)
+
+        config = dict(mock_proxmox_config, max_concurrent_requests=1)
+        responses = _run_server(config, [_tool_call(1, "a"), _tool_call(2, "b"), _tool_call(3, "c")], call_tool)
+
+        assert [r["id"] for r in responses] == [1, 2, 3]
+
+    def test_cancel_queued_request(self, mock_proxmox_config):
+        """A cancellation notification drops a call still waiting for a worker."""
+        release = threading.Event()
+
+        def call_tool(name, arguments):
+            release.wait(timeout=5)
+            return _ok(name)
+
+        def stdin_lines():
+            yield _tool_call(1, "busy1")
+            yield _tool_call(2, "busy2")
+            yield _tool_call(3, "queued")
+            yield json.dumps({
+                "jsonrpc": "2.0",
+                "method": "notifications/cancelled",
+                "params": {"requestId": 3}
+            }) + "\n"
+            release.set()
+
+        config = dict(mock_proxmox_config, max_concurrent_requests=2)
+        responses = _run_server(config, stdin_lines(), call_tool)
+
+        assert sorted(r["id"] for r in responses) == [1, 2]
+
+    @pytest.mark.parametrize("value", [0, -1, "many"])
+    def test_invalid_max_concurrent_requests(self, mock_proxmox_config, value):
+        """Invalid pool sizes are rejected as configuration errors."""
+        from working_proxmox_server import WorkingProxmoxMCPServer
+
+        config = dict(mock_proxmox_config, max_concurrent_requests=value)
+        with patch('working_proxmox_server.load_config', return_value=config), \
+             patch('working_proxmox_server.ProxmoxClient', return_value=Mock()):
+            with pytest.raises(ProxmoxConfigurationError):
+                WorkingProxmoxMCPServer()
@@ -0,0 +1,232 @@
+"""Tests for guest IP discovery and the reverse IP index."""
+
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.exceptions import ProxmoxAPIError, ProxmoxTimeoutError, ProxmoxValidationError
+from src.guest_network import GuestNetworkIndex
+from tests.fakes import FakeCluster, json_response
+
+
+def _agent_interfaces(vmid):
+    """network-get-interfaces answer of a VM: loopback plus eth0 with IPv4, IPv6 and link-local."""
+    return {"result": [
+        {"name": "lo", "hardware-address": "00:00:00:00:00:00", "ip-addresses": [
+            {"ip-address": "127.0.0.1", "ip-address-type": "ipv4", "prefix": 8},
+        ]},
+        {"name": "eth0", "hardware-address": f"bc:24:11:00:00:{vmid % 100:02x}", "ip-addresses": [
+            {"ip-address": f"10.1.2.{vmid % 100}", "ip-address-type": "ipv4", "prefix": 24},
+            {"ip-address": f"fd00::{vmid}", "ip-address-type": "ipv6", "prefix": 64},
+            {"ip-address": "fe80::1", "ip-address-type": "ipv6", "prefix": 64},
+        ]},
+    ]}
+
+
+class FakeNetworkCluster(FakeCluster):
+    """Six prod guests on pve1 and VM 200 on pve2; 103 has no agent, 104 is stopped, 105 is a container."""
+
+    def __init__(self):
+        super().__init__()
+        self.resources = [
+            {"type": "lxc" if vmid == 105 else "qemu", "vmid": vmid, "name": f"app-{vmid}", "node": "pve1",
+             "status": "stopped" if vmid == 104 else "running", "tags": "prod"}
+            for vmid in range(100, 106)
+        ]
+        self.resources.append({"type": "qemu", "vmid": 200, "name": "db-200", "node": "pve2",
+                               "status": "running", "tags": ""})
+        self.agent_requests = []
+        self.timeouts = []
+        self.hung = set()
+
+    def guest_request(self, method, endpoint, **kwargs):
+        vmid = int(endpoint.split("/")[4])
+        with self.lock:
+            self.agent_requests.append(endpoint)
+            self.timeouts.append(kwargs.get("timeout"))
+        if vmid in self.hung:
+            raise ProxmoxTimeoutError("Request timed out")
+        if vmid == 103:
+            raise ProxmoxAPIError("HTTP error 500: QEMU guest agent is not running")
+        if endpoint.endswith("/interfaces"):
+            return json_response([
+                {"name": "lo", "hwaddr": "00:00:00:00:00:00", "inet": "127.0.0.1/8"},
+                {"name": "eth0", "hwaddr": "bc:24:11:aa:bb:cc", "inet": "10.1.2.105/24"},
+            ])
+        return json_response(_agent_interfaces(vmid))
+
+
+@pytest.fixture
+def cluster(mock_proxmox_client, fake_api):
+    fake = fake_api(FakeNetworkCluster())
+    with patch.object(mock_proxmox_client, '_make_guest_request', side_effect=fake.guest_request):
+        yield fake
+
+
+@pytest.fixture
+def index(mock_proxmox_client):
+    return GuestNetworkIndex(mock_proxmox_client, agent_timeout=1.5)
+
+
+class TestGuestDiscovery:
+    """Test cases for discovering guest addresses."""
+
+    def test_discovers_running_guests(self, index, cluster):
+        result = index.discover(tag="prod")
+
+        assert result["summary"] == {
+            "guests": 5, "queried": 5, "cached": 0, "with_addresses": 4, "agent_errors": 1, "not_running": 1
+        }
+        by_vmid = {row["vmid"]: row for row in result["guests"]}
+        # Loopback and link-local addresses are dropped
+        assert by_vmid[100]["ips"] == ["10.1.2.0", "fd00::100"]
+        assert by_vmid[100]["interfaces"] == [
+            {"name": "eth0", "mac": "bc:24:11:00:00:00", "addresses": ["10.1.2.0/24", "fd00::100/64"]}
+        ]
+        assert by_vmid[105]["ips"] == ["10.1.2.105"]
+        assert "agent is not running" in by_vmid[103]["error"]
+        assert 104 not in by_vmid
+        assert set(cluster.timeouts) == {1.5}
+
+    def test_results_are_cached(self, index, cluster):
+        index.discover(tag="prod")
+        cached = index.discover(tag="prod")
+
+        assert cached["summary"]["queried"] == 0
+        assert cached["summary"]["cached"] == 5
+        assert len(cluster.agent_requests) == 5
+        assert index.discover(vmids=[100, 103], refresh=True)["summary"]["queried"] == 2
+
+        # A migrated guest is queried again
+        cluster.resources[0]["node"] = "pve2"
+        index.discover(tag="prod")
+        assert cluster.agent_requests[-1] == "/nodes/pve2/qemu/100/agent/network-get-interfaces"
+
+    def test_expired_results_are_queried_again(self, mock_proxmox_client, cluster):
+        index = GuestNetworkIndex(mock_proxmox_client, ttl=0)
+        index.discover(vmids=[100])
+        index.discover(vmids=[100])
+
+        assert len(cluster.agent_requests) == 2
+
+    def test_hung_agent_is_an_error(self, index, cluster):
+        cluster.hung = {101}
+        row = {r["vmid"]: r for r in index.discover(vmids=[100, 101])["guests"]}[101]
+
+        assert row["error"] == "No answer within 1.5s"
+        assert row["ips"] == []
+
+    def test_invalid_guest_type(self, index, cluster):
+        with pytest.raises(ProxmoxValidationError):
+            index.discover(guest_type="vm")
+
+
+class TestGuestLookup:
+    """Test cases for the reverse IP index."""
+
+    def test_first_lookup_builds_index(self, index, cluster):
+        result = index.lookup("10.1.2.2")
+
+        assert result["refreshed"] is True
+        assert [(m["vmid"], m["interface"], m["address"]) for m in result["matches"]] == [(102, "eth0", "10.1.2.2/24")]
+        requests = len(cluster.agent_requests)
+
+        # Later lookups are answered from the index
+        again = index.lookup("fd00::200")
+        assert again["refreshed"] is False
+        assert again["matches"][0]["name"] == "db-200"
+        assert len(cluster.agent_requests) == requests
+
+    def test_network_lookup(self, index, cluster):
+        index.discover()
+        result = index.lookup("10.1.2.0/30")
+
+        assert [(m["ip"], m["vmid"]) for m in result["matches"]] == [
+            ("10.1.2.0", 100), ("10.1.2.0", 200), ("10.1.2.1", 101), ("10.1.2.2", 102)
+        ]
+
+    def test_duplicate_address_warning(self, index, cluster):
+        # VMs 100 and 200 both report 10.1.2.0
+        index.discover()
+
+        result = index.lookup("10.1.2.0")
+        assert {m["vmid"] for m in result["matches"]} == {100, 200}
+        assert "2 guests" in result["warning"]
+
+    def test_stopped_guests_leave_the_index(self, index, cluster):
+        index.discover()
+        cluster.resources[1]["status"] = "stopped"
+        index.discover(vmids=[101])
+
+        assert index.lookup("10.1.2.1")["matches"] == []
+
+    def test_miss_on_stale_index_rediscovers(self, mock_proxmox_client, cluster):
+        index = GuestNetworkIndex(mock_proxmox_client, ttl=0)
+        index.discover()
+        result = index.lookup("192.0.2.1")
+
+        assert result["refreshed"] is True
+        assert result["matches"] == []
+        assert "could not be queried" in result["message"]
+
+    @pytest.mark.parametrize("address", ["", "10.1.2", "10.1.2.3/33", "host.example", None])
+    def test_invalid_address(self, index, cluster, address):
+        with pytest.raises(ProxmoxValidationError):
+            index.lookup(address)
+
+
+class TestGuestNetworkClient:
+    """Test cases for the client's discovery and lookup methods."""
+
+    def test_errors_are_reported(self, mock_proxmox_client, cluster):
+        assert mock_proxmox_client.find_guest_by_ip("not-an-ip")["status"] == "error"
+        with patch.object(mock_proxmox_client, '_make_request', side_effect=ProxmoxAPIError("HTTP error 500")), \
+             patch.object(mock_proxmox_client, 'list_vms', side_effect=ProxmoxAPIError("HTTP error 500")):
+            result = mock_proxmox_client.discover_guest_ips()
+        assert result["status"] == "error"
+        assert "discovering guest IPs" in result["message"]
+
+    def test_agent_errors_bypass_circuit_breaker(self, mock_proxmox_client):
+        breaker = Mock()
+        mock_proxmox_client.circuit_breaker = breaker
+        with patch.object(mock_proxmox_client, '_execute_request', side_effect=ProxmoxAPIError("HTTP error 500")):
+            with pytest.raises(ProxmoxAPIError):
+                mock_proxmox_client._make_guest_request('GET', '/nodes/pve1/qemu/100/agent/network-get-interfaces')
+        breaker.call.assert_not_called()
+
+
+@pytest.mark.parametrize("mcp_server", [{
+    "discover_guest_ips": {"status": "success", "summary": {"guests": 0}, "guests": []},
+    "find_guest_by_ip": {"status": "success", "matches": []},
+}], indirect=True)
+class TestGuestNetworkTools:
+    """Test cases for the guest IP MCP tools."""
+
+    def test_discover_without_selectors(self, mcp_server):
+        result = mcp_server._call_tool("proxmox_discover_guest_ips", {})
+
+        assert json.loads(result["content"][0]["text"])["status"] == "success"
+        mcp_server.proxmox_client.discover_guest_ips.assert_called_once_with(
+            vmids=None, node=None, tag=None, name_pattern=None, guest_type="all", refresh=False
+        )
+
+    def test_find_calls_client(self, mcp_server):
+        mcp_server._call_tool("proxmox_find_guest_by_ip", {"address": " 10.1.2.0/24 "})
+
+        mcp_server.proxmox_client.find_guest_by_ip.assert_called_once_with("10.1.2.0/24")
+
+    @pytest.mark.parametrize("name,arguments", [
+        ("proxmox_discover_guest_ips", {"vmids": [5]}),
+        ("proxmox_discover_guest_ips", {"node": "../pve"}),
+        ("proxmox_discover_guest_ips", {"guest_type": "vm"}),
+        ("proxmox_find_guest_by_ip", {}),
+        ("proxmox_find_guest_by_ip", {"address": "10.1.2.300"}),
+        ("proxmox_find_guest_by_ip", {"address": 167838211}),
+    ])
+    def test_rejects_invalid_arguments(self, mcp_server, name, arguments):
+        result = mcp_server._call_tool(name, arguments)
+
+        assert result["isError"] is True
+        mcp_server.proxmox_client.discover_guest_ips.assert_not_called()
+        mcp_server.proxmox_client.find_guest_by_ip.assert_not_called()
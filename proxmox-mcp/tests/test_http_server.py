@@ -0,0 +1,206 @@
+"""Tests for the HTTP front end, including a concurrent-request load test."""
+
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from src import http_server
+from working_proxmox_server import WorkingProxmoxMCPServer
+
+# Blocking time of one fake Proxmox call
+CALL_SECONDS = 0.1
+
+
+class SlowClient:
+    """Stands in for ProxmoxClient: list_nodes blocks its thread like a real request."""
+
+    def __init__(self, delay=CALL_SECONDS):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def test_connection(self):
+        return {"status": "success", "version": {"version": "8.2"}}
+
+    def list_nodes(self):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        return [{"node": "pve1", "status": "online"}]
+
+    def close(self):
+        pass
+
+
+def _config(workers):
+    return {
+        "host": "192.168.1.100",
+        "port": 8006,
+        "protocol": "https",
+        "username": None,
+        "password": None,
+        "api_token": "root@pam!mcp=00000000-0000-0000-0000-000000000000",
+        "realm": "pam",
+        "ssl_verify": False,
+        "max_concurrent_requests": workers,
+        "secret_key": "test-secret",
+    }
+
+
+@pytest.fixture
+def slow_client():
+    return SlowClient()
+
+
+@pytest.fixture
+async def start(slow_client):
+    """Start the HTTP server with a given pool size; yields an httpx client factory."""
+    async def _start(workers=8):
+        with patch('working_proxmox_server.ProxmoxClient', return_value=slow_client) as client_class:
+            await http_server.start_server(_config(workers))
+        token = http_server.auth_manager.create_access_token({"sub": "test", "type": "user"})
+        return httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=http_server.app),
+            base_url="http://test",
+            headers={"Authorization": f"Bearer {token}"},
+            timeout=30,
+        ), client_class
+
+    yield _start
+    await http_server.stop_server()
+
+
+class TestHttpServer:
+    """Test cases for startup, tool listing and dispatch."""
+
+    def test_env_config(self, monkeypatch):
+        monkeypatch.setenv("PROXMOX_HOST", "pve.example.com")
+        monkeypatch.setenv("PROXMOX_API_TOKEN", "root@pam!mcp=secret")
+        monkeypatch.setenv("PROXMOX_SSL_VERIFY", "false")
+        monkeypatch.setenv("MAX_CONCURRENT_REQUESTS", "12")
+        config = http_server.load_env_config()
+
+        assert config["host"] == "pve.example.com"
+        assert config["api_token"] == "root@pam!mcp=secret"
+        assert config["ssl_verify"] is False
+        assert config["max_concurrent_requests"] == "12"
+
+    async def test_client_is_built_from_config(self, start):
+        client, client_class = await start(workers=3)
+        async with client:
+            assert http_server.proxmox_server.max_concurrent_requests == 3
+        kwargs = client_class.call_args.kwargs
+        assert kwargs["api_token"] == "root@pam!mcp=00000000-0000-0000-0000-000000000000"
+        assert kwargs["host"] == "192.168.1.100"
+
+    async def test_lists_the_stdio_tool_table(self, start):
+        client, _ = await start()
+        async with client:
+            tools = (await client.get("/tools")).json()["tools"]
+            mcp_tools = (await client.post("/mcp/tools/list")).json()["tools"]
+
+        with patch('working_proxmox_server.ProxmoxClient'):
+            expected = WorkingProxmoxMCPServer(_config(1))._list_tools()["tools"]
+        assert [t["name"] for t in tools] == [t["name"] for t in expected]
+        assert mcp_tools == tools
+
+    async def test_calls_tools(self, start):
+        client, _ = await start()
+        async with client:
+            ok = (await client.post("/mcp/tools/call", json={"name": "proxmox_list_nodes"})).json()
+            bad = (await client.post("/tools/proxmox_get_vm_status", json={"node": "../x", "vmid": 100})).json()
+            health = (await client.get("/health")).json()
+
+        assert '"pve1"' in ok["content"]
+        assert ok["error"] is None
+        assert "Invalid node name" in bad["error"]
+        assert health["status"] == "healthy"
+
+    async def test_requires_token(self, start):
+        client, _ = await start()
+        async with client:
+            response = await client.get("/tools", headers={"Authorization": "Bearer invalid"})
+        assert response.status_code == 401
+
+    async def test_missing_config_leaves_server_uninitialized(self):
+        config = _config(1)
+        config["api_token"] = None
+        await http_server.start_server(config)
+
+        assert http_server.proxmox_server is None
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=http_server.app), base_url="http://test") as client:
+            assert (await client.get("/health")).json()["status"] == "error"
+
+    async def test_login_without_proxmox(self, monkeypatch):
+        """Login only needs the auth manager, not a working Proxmox connection."""
+        monkeypatch.setenv("MCP_PASSWORD", "s3cret")
+        # An invalid pool size makes the MCP server fail to initialize
+        await http_server.start_server(_config(0))
+
+        assert http_server.proxmox_server is None
+        assert http_server.executor is None
+        # Hashing itself is covered by the auth tests; this checks the endpoint's wiring
+        auth = http_server.auth_manager
+        with patch.object(auth, 'get_password_hash', side_effect=lambda p: f"hash:{p}"), \
+             patch.object(auth, 'verify_password', side_effect=lambda p, h: h == f"hash:{p}"):
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=http_server.app), base_url="http://test") as client:
+                ok = await client.post("/auth/login", json={"username": "admin", "password": "s3cret"})
+                bad = await client.post("/auth/login", json={"username": "admin", "password": "wrong"})
+
+        assert ok.status_code == 200
+        assert http_server.auth_manager.verify_token(ok.json()["access_token"])["sub"] == "admin"
+        assert bad.status_code == 401
+
+
+class TestHttpServerLoad:
+    """Load tests: blocking Proxmox calls must not serialize callers or stall the loop."""
+
+    async def test_concurrent_throughput(self, start, slow_client):
+        client, _ = await start(workers=8)
+        requests = 32
+        async with client:
+            started = time.monotonic()
+            responses = await asyncio.gather(*(
+                client.post("/mcp/tools/call", json={"name": "proxmox_list_nodes"}) for _ in range(requests)
+            ))
+            elapsed = time.monotonic() - started
+
+        assert all(r.status_code == 200 and r.json()["error"] is None for r in responses)
+        assert slow_client.peak == 8
+        # Serial execution manages 1 / CALL_SECONDS (10 req/s); 8 workers ~80 req/s
+        assert requests / elapsed > 4 / CALL_SECONDS
+
+    async def test_event_loop_stays_responsive(self, start, slow_client):
+        slow_client.delay = 1.0
+        client, _ = await start(workers=4)
+        async with client:
+            calls = [
+                asyncio.ensure_future(client.post("/mcp/tools/call", json={"name": "proxmox_list_nodes"}))
+                for _ in range(4)
+            ]
+            await asyncio.sleep(0.1)
+            started = time.monotonic()
+            assert (await client.get("/")).status_code == 200
+            assert time.monotonic() - started < 0.5
+            await asyncio.gather(*calls)
+
+    async def test_full_backlog_is_rejected(self, start, slow_client):
+        slow_client.delay = 0.3
+        client, _ = await start(workers=1)
+        async with client:
+            responses = await asyncio.gather(*(
+                client.post("/mcp/tools/call", json={"name": "proxmox_list_nodes"}) for _ in range(10)
+            ))
+
+        codes = sorted(r.status_code for r in responses)
+        # One running plus PENDING_REQUESTS_PER_WORKER waiting; the rest are turned away
+        assert codes.count(200) == 5
+        assert codes.count(503) == 5
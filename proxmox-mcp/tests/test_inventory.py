@@ -0,0 +1,203 @@
+"""Tests for the indexed in-memory cluster inventory."""
+
+import copy
+import json
+import threading
+import time
+
+import pytest
+
+from src.exceptions import ProxmoxConnectionError
+from src.inventory import ClusterInventory
+from tests.fakes import json_response
+
+
+def _resources():
+    return [
+        {"id": "node/pve1", "type": "node", "node": "pve1", "status": "online"},
+        {"id": "node/pve2", "type": "node", "node": "pve2", "status": "online"},
+        {"id": "qemu/100", "type": "qemu", "vmid": 100, "name": "web-1", "node": "pve1", "tags": "prod;web", "cpu": 0.1},
+        {"id": "qemu/101", "type": "qemu", "vmid": 101, "name": "web-2", "node": "pve2", "tags": "web", "cpu": 0.2},
+        {"id": "lxc/200", "type": "lxc", "vmid": 200, "name": "DNS", "node": "pve1", "tags": "prod"},
+        {"id": "storage/pve1/local", "type": "storage", "storage": "local", "node": "pve1"},
+        {"id": "sdn/pve1/localnetwork", "type": "sdn", "sdn": "localnetwork", "node": "pve1"},
+    ]
+
+
+class FakeResources:
+    """Serves a mutable /cluster/resources list and counts requests."""
+
+    def __init__(self):
+        self.resources = _resources()
+        self.requests = 0
+        self.fail = False
+
+    def __call__(self, method, endpoint, **kwargs):
+        assert endpoint == "/cluster/resources"
+        self.requests += 1
+        if self.fail:
+            raise ProxmoxConnectionError("connection refused")
+        return json_response(copy.deepcopy(self.resources))
+
+    def find(self, resource_id):
+        return next(r for r in self.resources if r["id"] == resource_id)
+
+
+@pytest.fixture
+def api(fake_api):
+    return fake_api(FakeResources())
+
+
+@pytest.fixture
+def inventory(mock_proxmox_client, api):
+    inventory = ClusterInventory(mock_proxmox_client)
+    inventory.refresh()
+    yield inventory
+    inventory.stop()
+
+
+def _ids(items):
+    return [item["id"] for item in items]
+
+
+class TestClusterInventory:
+    """Test cases for ClusterInventory indexes and diffs."""
+
+    def test_initial_load_indexes(self, inventory):
+        assert inventory.get(100)["name"] == "web-1"
+        assert inventory.get(999) is None
+        assert _ids(inventory.lookup(tag="WEB")) == ["qemu/100", "qemu/101"]
+        assert _ids(inventory.lookup(name="dns")) == ["lxc/200"]
+        assert _ids(inventory.lookup(node="pve1", resource_type="storage")) == ["storage/pve1/local"]
+        assert _ids(inventory.lookup(tag="prod", node="pve1", resource_type="qemu")) == ["qemu/100"]
+        assert len(inventory.lookup()) == 6  # sdn entries are not held
+
+    def test_lookups_do_not_call_api(self, inventory, api):
+        for _ in range(100):
+            inventory.lookup(tag="web")
+            inventory.get(101)
+        assert api.requests == 1
+
+    def test_counter_changes_do_not_reindex(self, inventory, api):
+        api.find("qemu/100")["cpu"] = 0.9
+
+        diff = inventory.refresh()
+
+        assert diff == {"added": 0, "removed": 0, "updated": 1, "reindexed": 0}
+        assert inventory.get(100)["cpu"] == 0.9
+
+    def test_diff_moves_renames_and_removals(self, inventory, api):
+        moved = api.find("qemu/101")
+        moved["node"] = "pve1"
+        moved["tags"] = "db"
+        api.find("lxc/200")["name"] = "dns-1"
+        api.resources = [r for r in api.resources if r["id"] != "qemu/100"]
+        api.resources.append({"id": "qemu/102", "type": "qemu", "vmid": 102, "name": "web-3", "node": "pve2", "tags": "web"})
+
+        diff = inventory.refresh()
+
+        assert diff == {"added": 1, "removed": 1, "updated": 2, "reindexed": 2}
+        assert inventory.get(100) is None
+        assert _ids(inventory.lookup(tag="web")) == ["qemu/102"]
+        assert _ids(inventory.lookup(tag="db", node="pve1")) == ["qemu/101"]
+        assert inventory.lookup(name="dns") == []
+        assert _ids(inventory.lookup(node="pve2")) == ["node/pve2", "qemu/102"]
+        assert "prod" in inventory._by_tag and "web-1" not in inventory._by_name
+
+    def test_failed_refresh_keeps_snapshot(self, inventory, api):
+        api.fail = True
+
+        with pytest.raises(ProxmoxConnectionError):
+            inventory.refresh()
+
+        status = inventory.status()
+        assert inventory.get(100) is not None
+        assert status["generation"] == 1
+        assert status["errors"] == 1
+        assert "refused" in status["last_error"]
+
+    def test_background_refresh(self, mock_proxmox_client, api):
+        inventory = ClusterInventory(mock_proxmox_client, refresh_interval=0.01)
+        inventory.refresh()
+        inventory.start()
+        try:
+            api.find("qemu/100")["name"] = "web-renamed"
+            deadline = time.monotonic() + 5
+            while not inventory.lookup(name="web-renamed") and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert _ids(inventory.lookup(name="web-renamed")) == ["qemu/100"]
+            assert inventory.status()["background_refresh"] is True
+        finally:
+            inventory.stop()
+        assert inventory.status()["background_refresh"] is False
+
+    def test_concurrent_lookups_during_refresh(self, inventory, api):
+        """Readers always see a consistent index while refreshes run."""
+        stop = threading.Event()
+        errors = []
+
+        def reader():
+            while not stop.is_set():
+                web = inventory.lookup(tag="web")
+                if len(web) not in (1, 2):
+                    errors.append(len(web))
+
+        threads = [threading.Thread(target=reader) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for i in range(50):
+            api.find("qemu/101")["tags"] = "web" if i % 2 else "db"
+            inventory.refresh()
+        stop.set()
+        for t in threads:
+            t.join()
+        assert errors == []
+
+
+class TestInventoryClient:
+    """Test cases for the client's inventory_lookup."""
+
+    def test_first_lookup_loads_and_starts_refresh(self, mock_proxmox_client, api):
+        result = mock_proxmox_client.inventory_lookup(vmid=200)
+        mock_proxmox_client.inventory_lookup(tag="web")
+
+        assert result["status"] == "success"
+        assert result["items"][0]["name"] == "DNS"
+        assert api.requests == 1
+        assert mock_proxmox_client.get_inventory_status()["background_refresh"] is True
+        mock_proxmox_client.close()
+        assert mock_proxmox_client._inventory is None
+
+    def test_load_failure_is_reported(self, mock_proxmox_client, api):
+        api.fail = True
+        result = mock_proxmox_client.inventory_lookup(name="web-1")
+        assert result["status"] == "error"
+        assert mock_proxmox_client.get_inventory_status()["loaded"] is False
+
+
+@pytest.mark.parametrize("mcp_server", [{"inventory_lookup": {"status": "success", "count": 0, "items": []}}], indirect=True)
+class TestInventoryTools:
+    """Test cases for the proxmox_inventory_* MCP tools."""
+
+    def test_lookup_calls_client(self, mcp_server):
+        result = mcp_server._call_tool("proxmox_inventory_lookup", {"tag": "web", "type": "qemu"})
+
+        assert result["isError"] is False
+        assert json.loads(result["content"][0]["text"])["count"] == 0
+        mcp_server.proxmox_client.inventory_lookup.assert_called_once_with(
+            vmid=None, name=None, tag="web", node=None, resource_type="qemu"
+        )
+
+    @pytest.mark.parametrize("arguments", [
+        {"vmid": 5},
+        {"vmid": True},
+        {"name": "web 1"},
+        {"tag": "a;b"},
+        {"node": "../pve"},
+        {"type": "sdn"},
+    ])
+    def test_rejects_invalid_arguments(self, mcp_server, arguments):
+        result = mcp_server._call_tool("proxmox_inventory_lookup", arguments)
+
+        assert result["isError"] is True
+        mcp_server.proxmox_client.inventory_lookup.assert_not_called()
@@ -0,0 +1,197 @@
+"""Tests for incremental task-log and syslog tailing."""
+
+import json
+
+import pytest
+
+from src.exceptions import ProxmoxConnectionError
+from src.log_tail import LogTailer, TAIL_PAGE_LINES
+from tests.fakes import json_response
+
+UPID = "UPID:pve1:000A1B2C:0012D687:66F1E2A0:vzdump:100:root@pam:"
+
+
+class FakeLogs:
+    """Serves growing task logs and syslogs honouring start/limit, counting lines transferred."""
+
+    def __init__(self):
+        self.logs = {}
+        self.requests = []
+        self.lines_sent = 0
+        self.fail = False
+
+    def append(self, endpoint, count):
+        log = self.logs.setdefault(endpoint, [])
+        log.extend([f"line {len(log) + i}" for i in range(count)])
+
+    def __call__(self, method, endpoint, **kwargs):
+        if self.fail:
+            raise ProxmoxConnectionError("connection refused")
+        params = kwargs["params"]
+        self.requests.append((endpoint, dict(params)))
+        log = self.logs.get(endpoint, [])
+        start, limit = params["start"], params["limit"]
+        page = log[start:start + limit]
+        self.lines_sent += len(page)
+        data = [{"n": start + i + 1, "t": t} for i, t in enumerate(page)] or [{"n": 1, "t": "no content"}]
+        return json_response(data, total=len(log))
+
+
+TASK_LOG = f"/nodes/pve1/tasks/{UPID.replace(':', '%3A').replace('@', '%40')}/log"
+SYSLOG = "/nodes/pve1/syslog"
+
+
+@pytest.fixture
+def logs(fake_api):
+    return fake_api(FakeLogs())
+
+
+class TestLogTailer:
+    """Test cases for LogTailer cursors and buffers."""
+
+    def test_task_log_returns_only_new_lines(self, mock_proxmox_client, logs):
+        tailer = LogTailer(mock_proxmox_client)
+        logs.append(TASK_LOG, 3)
+
+        first = tailer.tail_task_log(UPID)
+        logs.append(TASK_LOG, 2)
+        second = tailer.tail_task_log(UPID)
+        third = tailer.tail_task_log(UPID)
+
+        assert first["lines"] == ["line 0", "line 1", "line 2"]
+        assert second["lines"] == ["line 3", "line 4"]
+        assert second["first_line"] == 3
+        assert third["lines"] == []
+        assert third["next_start"] == 5
+        assert [r[1]["start"] for r in logs.requests] == [0, 3, 5]
+
+    def test_polling_cost_is_linear(self, mock_proxmox_client, logs):
+        tailer = LogTailer(mock_proxmox_client)
+        for _ in range(50):
+            logs.append(TASK_LOG, 20)
+            tailer.tail_task_log(UPID)
+
+        assert logs.lines_sent == 1000
+
+    def test_pages_and_max_lines(self, mock_proxmox_client, logs):
+        tailer = LogTailer(mock_proxmox_client)
+        logs.append(TASK_LOG, TAIL_PAGE_LINES + 500)
+
+        first = tailer.tail_task_log(UPID, max_lines=1200)
+        rest = tailer.tail_task_log(UPID, max_lines=5000)
+
+        assert len(first["lines"]) == 1200
+        assert first["more"] is True
+        assert [r[1]["limit"] for r in logs.requests[:2]] == [TAIL_PAGE_LINES, 200]
+        assert len(rest["lines"]) == 300
+        assert rest["more"] is False
+
+    def test_empty_task_log(self, mock_proxmox_client, logs):
+        result = LogTailer(mock_proxmox_client).tail_task_log(UPID)
+        assert result["lines"] == []
+        assert result["next_start"] == 0
+
+    def test_syslog_starts_at_tail(self, mock_proxmox_client, logs):
+        tailer = LogTailer(mock_proxmox_client)
+        logs.append(SYSLOG, 1000)
+
+        first = tailer.tail_syslog("pve1", initial_lines=10)
+        logs.append(SYSLOG, 1)
+        second = tailer.tail_syslog("pve1")
+
+        assert first["lines"][0] == "line 990"
+        assert len(first["lines"]) == 10
+        assert second["lines"] == ["line 1000"]
+        assert logs.lines_sent < 20
+
+    def test_syslog_service_filter_is_a_separate_stream(self, mock_proxmox_client, logs):
+        tailer = LogTailer(mock_proxmox_client)
+        tailer.tail_syslog("pve1", service="pvedaemon")
+        assert logs.requests[-1][1]["service"] == "pvedaemon"
+        assert set(tailer._streams) == {"syslog:pve1:pvedaemon"}
+
+    def test_rotation_resets_cursor(self, mock_proxmox_client, logs):
+        tailer = LogTailer(mock_proxmox_client)
+        logs.append(SYSLOG, 50)
+        tailer.tail_syslog("pve1", initial_lines=5)
+        logs.logs[SYSLOG] = ["new 0", "new 1", "new 2"]
+
+        result = tailer.tail_syslog("pve1")
+
+        assert result["rotated"] is True
+        assert result["lines"] == ["new 0", "new 1", "new 2"]
+
+    def test_history_from_ring_buffer(self, mock_proxmox_client, logs):
+        tailer = LogTailer(mock_proxmox_client, buffer_lines=4)
+        logs.append(TASK_LOG, 10)
+        tailer.tail_task_log(UPID)
+        sent = logs.lines_sent
+
+        result = tailer.tail_task_log(UPID, history=3)
+
+        assert result["source"] == "buffer"
+        assert result["lines"] == ["line 7", "line 8", "line 9"]
+        assert len(tailer.tail_task_log(UPID, history=100)["lines"]) == 4
+        assert logs.lines_sent == sent
+
+    def test_reset_and_stream_eviction(self, mock_proxmox_client, logs):
+        tailer = LogTailer(mock_proxmox_client, max_streams=2)
+        logs.append(TASK_LOG, 3)
+        tailer.tail_task_log(UPID)
+
+        assert len(tailer.tail_task_log(UPID, reset=True)["lines"]) == 3
+        tailer.tail_syslog("pve1")
+        tailer.tail_syslog("pve2")
+        assert list(tailer._streams) == ["syslog:pve1", "syslog:pve2"]
+
+
+class TestLogTailClient:
+    """Test cases for the client's tail methods."""
+
+    def test_errors_are_reported(self, mock_proxmox_client, logs):
+        assert mock_proxmox_client.tail_task_log("UPID:bad")["status"] == "error"
+        assert mock_proxmox_client.tail_syslog("pve1", max_lines=0)["status"] == "error"
+        logs.fail = True
+        result = mock_proxmox_client.tail_syslog("pve1")
+        assert result["status"] == "error"
+        assert "refused" in result["message"]
+
+
+@pytest.mark.parametrize("mcp_server", [{
+    "tail_task_log": {"status": "success", "lines": ["a"]},
+    "tail_syslog": {"status": "success", "lines": []},
+}], indirect=True)
+class TestLogTailTools:
+    """Test cases for the proxmox_tail_* MCP tools."""
+
+    def test_task_log_calls_client(self, mcp_server):
+        result = mcp_server._call_tool("proxmox_tail_task_log", {"upid": UPID, "max_lines": 50})
+
+        assert result["isError"] is False
+        assert json.loads(result["content"][0]["text"])["lines"] == ["a"]
+        mcp_server.proxmox_client.tail_task_log.assert_called_once_with(UPID, max_lines=50, reset=False, history=None)
+
+    def test_syslog_calls_client(self, mcp_server):
+        result = mcp_server._call_tool("proxmox_tail_syslog", {"node": "pve1", "service": "pveproxy", "reset": True})
+
+        assert result["isError"] is False
+        mcp_server.proxmox_client.tail_syslog.assert_called_once_with(
+            "pve1", service="pveproxy", max_lines=500, initial_lines=100, reset=True, history=None
+        )
+
+    @pytest.mark.parametrize("name,arguments", [
+        ("proxmox_tail_task_log", {}),
+        ("proxmox_tail_task_log", {"upid": "UPID:pve1"}),
+        ("proxmox_tail_task_log", {"upid": UPID, "max_lines": 0}),
+        ("proxmox_tail_task_log", {"upid": UPID, "history": "all"}),
+        ("proxmox_tail_syslog", {}),
+        ("proxmox_tail_syslog", {"node": "../pve1"}),
+        ("proxmox_tail_syslog", {"node": "pve1", "service": "a b"}),
+        ("proxmox_tail_syslog", {"node": "pve1", "initial_lines": -1}),
+    ])
+    def test_rejects_invalid_arguments(self, mcp_server, name, arguments):
+        result = mcp_server._call_tool(name, arguments)
+
+        assert result["isError"] is True
+        mcp_server.proxmox_client.tail_task_log.assert_not_called()
+        mcp_server.proxmox_client.tail_syslog.assert_not_called()
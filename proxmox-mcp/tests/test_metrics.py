@@ -0,0 +1,207 @@
+"""Tests for RRD metrics collection and downsampling."""
+
+import json
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from src.exceptions import ProxmoxAPIError, ProxmoxResourceNotFoundError
+from src.metrics import aggregate_buckets, summarize
+from tests.fakes import json_response
+
+T0 = 1_700_000_000
+STEP = 60
+
+
+def _series(vmid, samples=60, offset=0.0):
+    """A series where cpu ramps 0..samples-1 (scaled) and netin is missing every 10th sample."""
+    series = []
+    for i in range(samples):
+        point = {"time": T0 + i * STEP, "cpu": (i + offset) / 100, "mem": 1024 * (vmid + i), "maxmem": 4096}
+        if i % 10:
+            point["netin"] = float(i)
+        series.append(point)
+    return series
+
+
+class FakeRRD:
+    """Serves /cluster/resources and rrddata endpoints, tracking concurrency per node."""
+
+    def __init__(self, guests=20, delay=0.0, fail_vmids=(), deleted_vmids=()):
+        self.resources = [
+            {"type": "qemu" if i % 4 else "lxc", "vmid": 100 + i, "name": f"app-{i}",
+             "node": f"pve{i % 2}", "status": "running", "tags": "web" if i < 10 else "db"}
+            for i in range(guests)
+        ]
+        self.delay = delay
+        self.fail_vmids = set(fail_vmids)
+        self.deleted_vmids = set(deleted_vmids)
+        self.lock = threading.Lock()
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+
+    def __call__(self, method, endpoint, **kwargs):
+        if endpoint == "/cluster/resources":
+            return json_response(self.resources)
+        with self.lock:
+            self.calls.append((endpoint, kwargs.get("params")))
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        parts = endpoint.split("/")
+        if parts[3] == "rrddata":
+            return json_response([
+                {"time": T0 + i * STEP, "cpu": 0.5, "loadavg": 1.0 + i, "memused": 100} for i in range(60)
+            ])
+        vmid = int(parts[4])
+        if vmid in self.fail_vmids:
+            raise ProxmoxAPIError("HTTP error 500: rrd file missing")
+        if vmid in self.deleted_vmids:
+            raise ProxmoxResourceNotFoundError(f"Resource not found: {endpoint}")
+        return json_response(_series(vmid))
+
+
+class TestAggregation:
+    """Test cases for the NumPy bucket aggregation."""
+
+    def test_bucket_statistics(self):
+        times = np.arange(10, dtype=np.int64)
+        values = np.arange(10, dtype=float).reshape(-1, 1)
+        edges = np.linspace(0, 9, 3)  # [0, 4.5, 9]
+
+        stats = aggregate_buckets(times, values, edges)
+
+        assert stats["avg"][:, 0].tolist() == [2.0, 7.0]
+        assert stats["max"][:, 0].tolist() == [4.0, 9.0]
+        assert stats["p95"][:, 0].tolist() == pytest.approx([3.8, 8.8])
+
+    def test_missing_values_and_empty_buckets(self):
+        times = np.array([0, 1, 9], dtype=np.int64)
+        values = np.array([[1.0, np.nan], [3.0, np.nan], [5.0, 2.0]])
+        edges = np.linspace(0, 9, 4)
+
+        stats = aggregate_buckets(times, values, edges)
+
+        assert stats["avg"][0].tolist()[0] == 2.0
+        assert np.isnan(stats["avg"][0, 1])
+        assert np.isnan(stats["avg"][1]).all()
+        assert stats["max"][2].tolist() == [5.0, 2.0]
+
+    def test_summary(self):
+        summary = summarize(np.array([[1.0], [2.0], [3.0], [np.nan]]))
+        assert summary["avg"].tolist() == [2.0]
+        assert summary["max"].tolist() == [3.0]
+
+
+class TestMetricsCollector:
+    """Test cases for ProxmoxClient.get_metrics."""
+
+    def test_columnar_output(self, mock_proxmox_client, fake_api):
+        fake = fake_api(FakeRRD())
+        result = mock_proxmox_client.get_metrics(vmids=[101], nodes=["pve0"], buckets=6, metrics=["cpu", "netin"])
+
+        assert result["status"] == "success"
+        assert len(result["bucket_start"]) == 6
+        assert result["bucket_start"][0] == T0
+        node, vm = result["targets"]
+        assert node["id"] == "node/pve0"
+        assert vm["id"] == "qemu/101"
+        assert vm["samples"] == 60
+        assert set(vm["avg"]) == {"cpu", "netin"}
+        assert len(vm["avg"]["cpu"]) == 6
+        assert vm["max"]["cpu"][-1] == 0.59
+        assert vm["summary"]["max"]["cpu"] == 0.59
+        assert node["avg"]["cpu"] == [0.5] * 6
+        assert fake.calls[0][1] == {"timeframe": "hour", "cf": "AVERAGE"}
+
+    def test_default_metrics_per_kind(self, mock_proxmox_client, fake_api):
+        fake = fake_api(FakeRRD())
+        result = mock_proxmox_client.get_metrics(vmids=[104], nodes=["pve1"])
+
+        ct, node = result["targets"]
+        assert "loadavg" in node["avg"]
+        assert ct["type"] == "lxc"
+        assert "/nodes/pve0/lxc/104/rrddata" in [c[0] for c in fake.calls]
+        assert set(ct["avg"]) == {"cpu", "mem", "netin", "netout", "diskread", "diskwrite"}
+        assert ct["avg"]["netout"] == [None] * 12
+
+    def test_output_much_smaller_than_raw(self, mock_proxmox_client, fake_api):
+        fake = fake_api(FakeRRD(guests=100))
+        result = mock_proxmox_client.get_metrics(name_pattern="app-*", metrics=["cpu", "mem"], buckets=4)
+
+        raw = json.dumps([_series(100 + i) for i in range(100)])
+        assert len(result["targets"]) == 100
+        assert len(json.dumps(result)) * 3 < len(raw)
+
+    def test_concurrent_fetch_respects_node_limit(self, mock_proxmox_client, fake_api):
+        mock_proxmox_client.max_requests_per_node = 2
+        fake = fake_api(FakeRRD(guests=20, delay=0.02))
+        started = time.monotonic()
+        result = mock_proxmox_client.get_metrics(tag="web")
+        elapsed = time.monotonic() - started
+
+        assert len(result["targets"]) == 10
+        assert fake.peak == 4
+        assert elapsed < 10 * 0.02
+
+    def test_failed_and_missing_targets(self, mock_proxmox_client, fake_api):
+        fake = fake_api(FakeRRD(fail_vmids={102}))
+        result = mock_proxmox_client.get_metrics(vmids=[101, 102, 999])
+
+        assert [t["vmid"] for t in result["targets"]] == [101]
+        assert [e["id"] for e in result["errors"]] == ["qemu/102", "vmid/999"]
+
+    def test_guest_deleted_before_fetch(self, mock_proxmox_client, fake_api):
+        """A guest that 404s after target resolution is an error entry, not a failed call."""
+        fake = fake_api(FakeRRD(deleted_vmids={103}))
+        result = mock_proxmox_client.get_metrics(vmids=[101, 103])
+
+        assert result["status"] == "success"
+        assert [t["vmid"] for t in result["targets"]] == [101]
+        assert [e["id"] for e in result["errors"]] == ["qemu/103"]
+
+    @pytest.mark.parametrize("kwargs", [
+        {},
+        {"nodes": ["pve0"], "timeframe": "minute"},
+        {"nodes": ["pve0"], "cf": "MIN"},
+        {"nodes": ["pve0"], "buckets": 0},
+        {"nodes": ["pve0"], "metrics": ["cpu;rm"]},
+        {"nodes": ["pve0"], "metrics": []},
+    ])
+    def test_invalid_requests(self, mock_proxmox_client, kwargs):
+        result = mock_proxmox_client.get_metrics(**kwargs)
+        assert result["status"] == "error"
+
+
+@pytest.mark.parametrize("mcp_server", [{"get_metrics": {"status": "success", "targets": []}}], indirect=True)
+class TestMetricsTool:
+    """Test cases for the proxmox_get_metrics MCP tool."""
+
+    def test_calls_client(self, mcp_server):
+        result = mcp_server._call_tool("proxmox_get_metrics", {"tag": "web", "timeframe": "day", "buckets": 24})
+
+        assert result["isError"] is False
+        mcp_server.proxmox_client.get_metrics.assert_called_once_with(
+            vmids=None, nodes=None, tag="web", name_pattern=None, guest_type="all",
+            timeframe="day", cf="AVERAGE", metrics=None, buckets=24
+        )
+
+    @pytest.mark.parametrize("arguments", [
+        {},
+        {"vmids": [5]},
+        {"nodes": "pve0"},
+        {"nodes": ["../pve0"]},
+        {"nodes": ["pve0"], "timeframe": "minute"},
+        {"nodes": ["pve0"], "metrics": "cpu"},
+        {"nodes": ["pve0"], "buckets": "many"},
+    ])
+    def test_rejects_invalid_arguments(self, mcp_server, arguments):
+        result = mcp_server._call_tool("proxmox_get_metrics", arguments)
+
+        assert result["isError"] is True
+        mcp_server.proxmox_client.get_metrics.assert_not_called()
@@ -0,0 +1,293 @@
+"""Tests for planned, throttled guest migration."""
+
+import json
+import time
+
+import pytest
+
+from src.exceptions import ProxmoxAPIError, ProxmoxResourceNotFoundError, ProxmoxValidationError
+from src.migration import (
+    JOB_CANCELLED,
+    JOB_FINISHED,
+    JOB_TIMED_OUT,
+    MOVE_CANCELLED,
+    MOVE_COMPLETED,
+    MOVE_FAILED,
+    MOVE_PENDING,
+    MOVE_TIMED_OUT,
+    MOVE_UNPLACED,
+    MigrationOrchestrator,
+)
+from tests.fakes import GIB, FakeCluster, json_response, node_status
+
+def _guest(vmid, name, node, mem_gb, cpus=1, status="running", guest_type="qemu"):
+    return {"id": f"{guest_type}/{vmid}", "type": guest_type, "vmid": vmid, "name": name, "node": node,
+            "status": status, "maxmem": mem_gb * GIB, "maxcpu": cpus, "tags": "prod"}
+
+
+class FakeMigrationCluster(FakeCluster):
+    """Serves capacity, inventory and migrate requests.
+
+    A migration task finishes after it has been listed twice; in-flight
+    counts per source, target and overall are tracked.
+    """
+
+    task_seconds = 30
+
+    def __init__(self):
+        super().__init__()
+        self.status = {
+            "pve1": node_status(32, 0.50, 128, 100),
+            "pve2": node_status(32, 0.20, 128, 64),   # 64 GB free
+            "pve3": node_status(16, 0.10, 64, 40),    # 24 GB free
+        }
+        self.resources = [
+            _guest(101, "web-1", "pve1", 8, cpus=4),
+            _guest(102, "web-2", "pve1", 8, cpus=2),
+            _guest(103, "web-3", "pve1", 4),
+            _guest(104, "web-4", "pve1", 4),
+            _guest(105, "ct-5", "pve1", 2, guest_type="lxc"),
+            _guest(106, "big-6", "pve1", 96, cpus=8, status="stopped"),
+            _guest(107, "huge-7", "pve1", 200),
+            _guest(201, "other", "pve2", 4),
+        ]
+        self.polls_to_finish = 2
+        self.fail_vmids = set()
+        self.missing_vmids = set()
+        self.posts = []
+        self.active = {"all": 0}
+        self.peak = {"all": 0}
+
+    def handle(self, method, endpoint, parts, **kwargs):
+        node = parts[2]
+        if method == "GET":  # /nodes/{node}/storage
+            return json_response([])
+        vmid = int(parts[4])
+        if vmid in self.fail_vmids:
+            raise ProxmoxAPIError("HTTP error 500: VM is locked")
+        if vmid in self.missing_vmids:
+            raise ProxmoxResourceNotFoundError(f"Resource not found: {endpoint}")
+        data = kwargs["data"]
+        with self.lock:
+            self.posts.append((endpoint, dict(data)))
+        upid = self.start_task(node, f"{parts[3]}migrate", vmid,
+                               keys=("all", f"source:{node}", f"target:{data['target']}"))
+        return json_response(upid)
+
+
+@pytest.fixture
+def cluster(fake_api):
+    return fake_api(FakeMigrationCluster())
+
+
+@pytest.fixture
+def orchestrator(mock_proxmox_client, cluster):
+    orchestrator = MigrationOrchestrator(mock_proxmox_client, poll_interval=0.01)
+    yield orchestrator
+    # Scheduler threads must not outlive the patched _make_request
+    orchestrator.stop(timeout=5)
+
+
+def _wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def _run_job(orchestrator, **kwargs):
+    job_id = orchestrator.start(**kwargs)["job_id"]
+    assert _wait_for(lambda: orchestrator.status(job_id)["state"] != "running")
+    return orchestrator.status(job_id)
+
+
+class TestMigrationPlan:
+    """Test cases for target planning."""
+
+    def test_drain_plan(self, mock_proxmox_client, cluster):
+        moves = MigrationOrchestrator(mock_proxmox_client).plan(source_node="pve1")
+
+        # Largest first; the stopped 96 GB VM needs no free memory, the 200 GB one fits nowhere
+        assert [m["vmid"] for m in moves] == [107, 106, 101, 102, 103, 104, 105]
+        assert moves[0]["state"] == MOVE_UNPLACED
+        assert "pve2: only" in moves[0]["error"]
+        assert {m["vmid"]: m["target"] for m in moves[1:]} == {
+            106: "pve2", 101: "pve2", 102: "pve2", 103: "pve2", 104: "pve2", 105: "pve3"
+        }
+        assert all(m["state"] == MOVE_PENDING for m in moves[1:])
+
+    def test_placements_are_subtracted(self, mock_proxmox_client, cluster):
+        cluster.resources = [_guest(300 + i, f"vm-{i}", "pve1", 16) for i in range(6)]
+        moves = MigrationOrchestrator(mock_proxmox_client).plan(source_node="pve1")
+
+        # 64 GB free on pve2 and 24 GB on pve3: 4 + 1 guests fit
+        assert [m["target"] for m in moves].count("pve2") == 4
+        assert [m["target"] for m in moves].count("pve3") == 1
+        assert [m["state"] for m in moves].count(MOVE_UNPLACED) == 1
+
+    def test_target_nodes_and_vmids(self, mock_proxmox_client, cluster):
+        orchestrator = MigrationOrchestrator(mock_proxmox_client)
+        moves = orchestrator.plan(vmids=[103, 201, 999], target_nodes=["pve3"])
+
+        by_vmid = {m["vmid"]: m for m in moves}
+        assert by_vmid[103]["target"] == "pve3"
+        assert by_vmid[201]["target"] == "pve3"
+        assert by_vmid[999]["state"] == MOVE_UNPLACED
+
+        with pytest.raises(ProxmoxValidationError):
+            orchestrator.plan(source_node="pve1", target_nodes=["pve9"])
+        with pytest.raises(ProxmoxValidationError):
+            orchestrator.plan()
+
+
+class TestMigrationJobs:
+    """Test cases for job execution, limits and progress."""
+
+    def test_job_respects_limits(self, orchestrator, cluster):
+        report = _run_job(orchestrator, source_node="pve1", max_concurrent=3, max_per_source=2,
+                          max_per_target=1, bwlimit=51200)
+
+        assert report["state"] == JOB_FINISHED
+        assert report["counts"] == {MOVE_UNPLACED: 1, MOVE_COMPLETED: 6}
+        assert report["progress_percent"] == 100.0
+        assert cluster.peak["all"] <= 2
+        assert cluster.peak["source:pve1"] == 2
+        assert cluster.peak["target:pve2"] == 1
+        assert cluster.peak["target:pve3"] == 1
+        assert all(m["duration_seconds"] == 30 for m in report["moves"] if m["state"] == MOVE_COMPLETED)
+
+    def test_migrate_parameters(self, orchestrator, cluster):
+        _run_job(orchestrator, vmids=[101, 105, 106], bwlimit=51200, with_local_disks=True)
+
+        params = {endpoint: data for endpoint, data in cluster.posts}
+        assert params["/nodes/pve1/qemu/101/migrate"] == {
+            "target": "pve2", "online": 1, "with-local-disks": 1, "bwlimit": 51200
+        }
+        assert params["/nodes/pve1/lxc/105/migrate"] == {"target": "pve2", "restart": 1, "bwlimit": 51200}
+        assert params["/nodes/pve1/qemu/106/migrate"] == {"target": "pve2", "with-local-disks": 1, "bwlimit": 51200}
+
+    def test_failures_are_per_guest(self, orchestrator, cluster):
+        cluster.fail_vmids = {101}
+        cluster.task_status = {102: "migration aborted"}
+        report = _run_job(orchestrator, vmids=[101, 102, 103])
+
+        by_vmid = {m["vmid"]: m for m in report["moves"]}
+        assert "locked" in by_vmid[101]["error"]
+        assert by_vmid[102]["state"] == MOVE_FAILED
+        assert by_vmid[102]["error"] == "migration aborted"
+        assert by_vmid[103]["state"] == MOVE_COMPLETED
+
+    def test_deleted_guest_fails_once(self, orchestrator, cluster):
+        """A guest removed after planning fails its move instead of being resubmitted."""
+        cluster.missing_vmids = {101}
+        report = _run_job(orchestrator, vmids=[101, 102])
+
+        by_vmid = {m["vmid"]: m for m in report["moves"]}
+        assert report["state"] == JOB_FINISHED
+        assert by_vmid[101]["state"] == MOVE_FAILED
+        assert "not found" in by_vmid[101]["error"]
+        assert by_vmid[102]["state"] == MOVE_COMPLETED
+
+    def test_progress_tune_and_cancel(self, orchestrator, cluster):
+        cluster.polls_to_finish = 10 ** 6
+        job_id = orchestrator.start(source_node="pve1", max_concurrent=1, max_per_target=4)["job_id"]
+        assert _wait_for(lambda: len(cluster.posts) == 1)
+        time.sleep(0.05)
+        assert len(cluster.posts) == 1
+
+        orchestrator.update(job_id, max_concurrent=3, max_per_source=3)
+        assert _wait_for(lambda: len(cluster.posts) == 3)
+        report = orchestrator.status(job_id)
+        assert report["limits"]["max_concurrent"] == 3
+        assert len(report["in_flight"]) == 3
+        assert report["progress_percent"] == 0.0
+
+        orchestrator.update(job_id, cancel=True)
+        cluster.polls_to_finish = 0
+        assert _wait_for(lambda: orchestrator.status(job_id)["state"] == JOB_CANCELLED)
+        report = orchestrator.status(job_id)
+        assert report["counts"] == {MOVE_UNPLACED: 1, MOVE_COMPLETED: 3, MOVE_CANCELLED: 3}
+        assert len(cluster.posts) == 3
+        assert orchestrator.status()["jobs"][0]["job_id"] == job_id
+
+    def test_timeout_abandons_remaining(self, orchestrator, cluster):
+        cluster.polls_to_finish = 10 ** 6
+        report = _run_job(orchestrator, vmids=[101, 102, 103], max_concurrent=1, timeout=0.1)
+
+        assert report["state"] == JOB_TIMED_OUT
+        assert report["counts"] == {MOVE_TIMED_OUT: 3}
+        assert sum(1 for m in report["moves"] if m["upid"]) == 1
+
+    def test_stop_cancels_jobs(self, orchestrator, cluster):
+        cluster.polls_to_finish = 10 ** 6
+        job_id = orchestrator.start(vmids=[101, 102])["job_id"]
+        orchestrator.stop(timeout=5)
+
+        assert orchestrator.status(job_id)["state"] == JOB_CANCELLED
+        with pytest.raises(ProxmoxAPIError):
+            orchestrator.start(vmids=[103])
+
+
+class TestMigrationClient:
+    """Test cases for the client's migration methods."""
+
+    def test_dry_run_and_errors(self, mock_proxmox_client, cluster):
+        plan = mock_proxmox_client.migrate_guests(source_node="pve1", dry_run=True)
+        assert plan["status"] == "success"
+        assert plan["total"] == 7
+        assert cluster.posts == []
+
+        assert mock_proxmox_client.migrate_guests(source_node="pve1", max_per_target=0)["status"] == "error"
+        assert mock_proxmox_client.get_migration_status("mig-99")["status"] == "error"
+        assert mock_proxmox_client.update_migration("mig-99", cancel=True)["status"] == "error"
+
+
+@pytest.mark.parametrize("mcp_server", [{
+    "migrate_guests": {"status": "success", "job_id": "mig-1"},
+    "get_migration_status": {"status": "success", "jobs": []},
+    "update_migration": {"status": "success", "job_id": "mig-1"},
+}], indirect=True)
+class TestMigrationTools:
+    """Test cases for the migration MCP tools."""
+
+    def test_migrate_calls_client(self, mcp_server):
+        result = mcp_server._call_tool("proxmox_migrate_guests", {
+            "source_node": "pve1", "max_per_target": 1, "bwlimit": 10240, "dry_run": True
+        })
+
+        assert json.loads(result["content"][0]["text"])["job_id"] == "mig-1"
+        mcp_server.proxmox_client.migrate_guests.assert_called_once_with(
+            source_node="pve1", vmids=None, tag=None, name_pattern=None, guest_type="all", target_nodes=None,
+            max_concurrent=4, max_per_source=2, max_per_target=1, bwlimit=10240, with_local_disks=False,
+            timeout=4 * 3600, dry_run=True
+        )
+
+    def test_status_and_update(self, mcp_server):
+        mcp_server._call_tool("proxmox_migration_status", {})
+        mcp_server.proxmox_client.get_migration_status.assert_called_once_with(None)
+
+        mcp_server._call_tool("proxmox_update_migration", {"job_id": "mig-1", "max_concurrent": 8, "cancel": True})
+        mcp_server.proxmox_client.update_migration.assert_called_once_with(
+            "mig-1", max_concurrent=8, max_per_source=None, max_per_target=None, cancel=True
+        )
+
+    @pytest.mark.parametrize("name,arguments", [
+        ("proxmox_migrate_guests", {}),
+        ("proxmox_migrate_guests", {"source_node": "../pve1"}),
+        ("proxmox_migrate_guests", {"vmids": [1]}),
+        ("proxmox_migrate_guests", {"source_node": "pve1", "target_nodes": []}),
+        ("proxmox_migrate_guests", {"source_node": "pve1", "max_per_source": 0}),
+        ("proxmox_migrate_guests", {"source_node": "pve1", "max_concurrent": True}),
+        ("proxmox_migrate_guests", {"source_node": "pve1", "bwlimit": 0}),
+        ("proxmox_migrate_guests", {"source_node": "pve1", "timeout": 0}),
+        ("proxmox_migration_status", {"job_id": "job-1"}),
+        ("proxmox_update_migration", {}),
+        ("proxmox_update_migration", {"job_id": "mig-1", "max_per_target": 100}),
+    ])
+    def test_rejects_invalid_arguments(self, mcp_server, name, arguments):
+        result = mcp_server._call_tool(name, arguments)
+
+        assert result["isError"] is True
+        mcp_server.proxmox_client.migrate_guests.assert_not_called()
+        mcp_server.proxmox_client.get_migration_status.assert_not_called()
+        mcp_server.proxmox_client.update_migration.assert_not_called()
@@ -0,0 +1,198 @@
+"""Tests for the client-owned, node-aware fan-out executor."""
+
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.exceptions import ProxmoxConfigurationError, ProxmoxError
+from src.proxmox_client import ProxmoxClient
+from src.utils.node_executor import NodeExecutor
+
+
+class ConcurrencyProbe:
+    """Records peak concurrency overall and per node."""
+
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.node_active = {}
+        self.node_peak = {}
+
+    def __call__(self, node):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.node_active[node] = self.node_active.get(node, 0) + 1
+            self.node_peak[node] = max(self.node_peak.get(node, 0), self.node_active[node])
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+            self.node_active[node] -= 1
+        return node
+
+
+class TestNodeExecutor:
+    """Test cases for NodeExecutor."""
+
+    def test_global_and_per_node_limits(self):
+        """Neither the global nor the per-node limit is exceeded."""
+        executor = NodeExecutor(max_workers=6, max_per_node=2)
+        probe = ConcurrencyProbe()
+        try:
+            futures = [executor.submit(f"pve{i % 4}", probe, f"pve{i % 4}") for i in range(40)]
+            assert sorted(f.result(timeout=10) for f in futures) == sorted(f"pve{i % 4}" for i in range(40))
+        finally:
+            executor.shutdown()
+
+        assert probe.peak == 6
+        assert max(probe.node_peak.values()) == 2
+
+    def test_busy_node_does_not_block_other_nodes(self):
+        """Tasks for an idle node run while a saturated node's tasks are held back."""
+        executor = NodeExecutor(max_workers=4, max_per_node=1)
+        release = threading.Event()
+        try:
+            blocked = [executor.submit("busy", release.wait, 5) for _ in range(3)]
+            other = executor.submit("idle", lambda: "done")
+            assert other.result(timeout=2) == "done"
+            assert executor.stats()["queue_depth"] == 2
+            release.set()
+            assert all(f.result(timeout=5) for f in blocked)
+        finally:
+            release.set()
+            executor.shutdown()
+
+    def test_exceptions_propagate(self):
+        """An exception in a task is raised from its future and frees the node slot."""
+        executor = NodeExecutor(max_workers=2, max_per_node=1)
+
+        def fail():
+            raise ValueError("boom")
+
+        try:
+            with pytest.raises(ValueError):
+                executor.submit("pve1", fail).result(timeout=5)
+            assert executor.submit("pve1", lambda: 42).result(timeout=5) == 42
+        finally:
+            executor.shutdown()
+
+    def test_stats_counters(self):
+        """Queue depth and wait times are tracked across tasks."""
+        executor = NodeExecutor(max_workers=1, max_per_node=1)
+        try:
+            futures = [executor.submit("pve1", time.sleep, 0.02) for _ in range(5)]
+            for f in futures:
+                f.result(timeout=5)
+            stats = executor.stats()
+        finally:
+            executor.shutdown()
+
+        assert stats["submitted"] == 5
+        assert stats["completed"] == 5
+        assert stats["queue_depth"] == 0
+        assert stats["active"] == 0
+        assert stats["max_queue_depth"] >= 4
+        # The last task waited for the four before it
+        assert stats["max_wait_seconds"] >= 0.06
+        assert 0 < stats["avg_wait_seconds"] <= stats["max_wait_seconds"]
+
+    def test_shutdown_cancels_held_back_tasks(self):
+        """Tasks waiting on a per-node limit are cancelled by shutdown."""
+        executor = NodeExecutor(max_workers=2, max_per_node=1)
+        release = threading.Event()
+        running = executor.submit("pve1", release.wait, 5)
+        held_back = executor.submit("pve1", lambda: "never")
+
+        executor.shutdown(wait=False)
+        release.set()
+
+        assert held_back.cancelled()
+        assert running.result(timeout=5) is True
+        with pytest.raises(RuntimeError):
+            executor.submit("pve1", lambda: None)
+
+    @pytest.mark.parametrize("kwargs", [{"max_workers": 0}, {"max_per_node": 0}])
+    def test_invalid_limits(self, kwargs):
+        """Limits below one are rejected."""
+        with pytest.raises(ValueError):
+            NodeExecutor(**kwargs)
+
+
+class TestClientNodeExecutor:
+    """Test cases for the executor owned by ProxmoxClient."""
+
+    @pytest.fixture(autouse=True)
+    def per_node_listing(self, mock_proxmox_client):
+        mock_proxmox_client.use_cluster_resources = False
+
+    def _mock_cluster(self, client, node_count):
+        def make_request(method, endpoint, **kwargs):
+            response = Mock()
+            response.status_code = 200
+            if endpoint == "/nodes":
+                response.json.return_value = {"data": [{"node": f"pve{i}"} for i in range(node_count)]}
+            else:
+                response.json.return_value = {"data": [{"storage": "local"}]}
+            return response
+        return patch.object(client, '_make_request', side_effect=make_request)
+
+    def test_executor_reused_across_calls(self, mock_proxmox_client):
+        """Repeated all-node queries share one executor."""
+        with self._mock_cluster(mock_proxmox_client, 3):
+            mock_proxmox_client.list_vms()
+            executor = mock_proxmox_client._node_executor
+            mock_proxmox_client.list_containers()
+            mock_proxmox_client.get_storage_usage()
+
+        assert executor is not None
+        assert mock_proxmox_client._node_executor is executor
+        assert mock_proxmox_client.get_executor_stats()["completed"] == 9
+
+    def test_get_storage_usage_all_nodes(self, mock_proxmox_client):
+        """get_storage_usage fans out through the shared executor."""
+        with self._mock_cluster(mock_proxmox_client, 4):
+            result = mock_proxmox_client.get_storage_usage()
+
+        assert result["status"] == "success"
+        assert result["count"] == 4
+        assert {s["node"] for s in result["storage"]} == {"pve0", "pve1", "pve2", "pve3"}
+
+    def test_close_shuts_down_executor(self, mock_proxmox_client):
+        """close() releases the executor and later fan-outs fail."""
+        with self._mock_cluster(mock_proxmox_client, 2):
+            mock_proxmox_client.list_vms()
+        mock_proxmox_client.close()
+
+        assert mock_proxmox_client._node_executor is None
+        with pytest.raises(ProxmoxError):
+            mock_proxmox_client._get_node_executor()
+
+    def test_stats_before_first_use(self, mock_proxmox_client):
+        """Counters are available before any fan-out has happened."""
+        stats = mock_proxmox_client.get_executor_stats()
+
+        assert stats["submitted"] == 0
+        assert stats["max_workers"] == 10
+        assert stats["max_per_node"] == 4
+
+    @pytest.mark.parametrize("kwargs", [
+        {"max_node_workers": 0},
+        {"max_requests_per_node": -1},
+        {"max_node_workers": "ten"},
+    ])
+    def test_invalid_limits(self, mock_proxmox_config, kwargs):
+        """Invalid executor limits are configuration errors."""
+        with patch.object(ProxmoxClient, '_authenticate'):
+            with pytest.raises(ProxmoxConfigurationError):
+                ProxmoxClient(
+                    host=mock_proxmox_config["host"],
+                    port=mock_proxmox_config["port"],
+                    protocol="https",
+                    username=mock_proxmox_config["username"],
+                    password=mock_proxmox_config["password"],
+                    **kwargs
+                )
@@ -0,0 +1,162 @@
+"""Tests for cursor-paginated storage content listing."""
+
+import json
+
+import pytest
+
+from src.exceptions import ProxmoxConnectionError, ProxmoxValidationError
+from src.storage_content import StorageContentPager
+from tests.fakes import json_response
+
+ENDPOINT = "/nodes/pve1/storage/backup-nfs/content"
+
+
+def _volumes(count):
+    """Backups of 10 guests plus a few ISOs, in API (unsorted) order."""
+    volumes = []
+    for i in reversed(range(count)):
+        vmid = 100 + i % 10
+        volumes.append({
+            "volid": f"backup-nfs:backup/vzdump-qemu-{vmid}-2024_01_{i:05d}.vma.zst",
+            "content": "backup", "format": "vma.zst", "size": 1024 * (i + 1), "vmid": vmid,
+            "ctime": 1700000000 + i, "notes": "nightly" if i % 2 else "",
+        })
+    volumes.append({"volid": "backup-nfs:iso/debian-12.iso", "content": "iso", "format": "iso", "size": 600})
+    volumes.append({"volid": "backup-nfs:iso/ubuntu-24.04.iso", "content": "iso", "format": "iso", "size": 900})
+    return volumes
+
+
+class FakeStorage:
+    """Serves storage content, applying the content and vmid filters like Proxmox."""
+
+    def __init__(self, count=2500):
+        self.volumes = _volumes(count)
+        self.requests = []
+        self.fail = False
+
+    def __call__(self, method, endpoint, **kwargs):
+        if self.fail:
+            raise ProxmoxConnectionError("connection refused")
+        params = kwargs.get("params") or {}
+        self.requests.append((endpoint, dict(params)))
+        data = [
+            v for v in self.volumes
+            if ("content" not in params or v["content"] == params["content"])
+            and ("vmid" not in params or v.get("vmid") == params["vmid"])
+        ]
+        return json_response(data)
+
+
+@pytest.fixture
+def storage(fake_api):
+    return fake_api(FakeStorage())
+
+
+class TestStorageContentPager:
+    """Test cases for filtering and cursor paging."""
+
+    def test_pages_cover_listing_once(self, mock_proxmox_client, storage):
+        pager = StorageContentPager(mock_proxmox_client)
+        page = pager.list_content("pve1", "backup-nfs", limit=1000)
+        volids = [row["volid"] for row in page["items"]]
+        while page["next_cursor"]:
+            page = pager.list_content("pve1", "backup-nfs", cursor=page["next_cursor"], limit=1000)
+            volids.extend(row["volid"] for row in page["items"])
+
+        assert len(volids) == 2502
+        assert volids == sorted(volids)
+        assert page["offset"] == 2000
+        assert page["returned"] == 502
+        assert len(storage.requests) == 1
+        # The listing is dropped after its last page
+        assert pager._listings == {}
+
+    def test_filters(self, mock_proxmox_client, storage):
+        pager = StorageContentPager(mock_proxmox_client)
+
+        by_vmid = pager.list_content("pve1", "backup-nfs", content="backup", vmid=103)
+        assert storage.requests[-1] == (ENDPOINT, {"content": "backup", "vmid": 103})
+        assert by_vmid["total"] == 250
+        assert {row["vmid"] for row in by_vmid["items"]} == {103}
+
+        isos = pager.list_content("pve1", "backup-nfs", name_prefix="ubuntu")
+        assert [row["name"] for row in isos["items"]] == ["ubuntu-24.04.iso"]
+        assert isos["next_cursor"] is None
+
+    def test_rows_are_compact(self, mock_proxmox_client, storage):
+        row = StorageContentPager(mock_proxmox_client).list_content(
+            "pve1", "backup-nfs", vmid=101, limit=1)["items"][0]
+
+        assert row == {
+            "volid": "backup-nfs:backup/vzdump-qemu-101-2024_01_00001.vma.zst",
+            "name": "vzdump-qemu-101-2024_01_00001.vma.zst",
+            "content": "backup", "format": "vma.zst", "size": 2048, "vmid": 101,
+            "ctime": 1700000001, "notes": "nightly",
+        }
+
+    def test_cursor_keeps_filters_and_checks_storage(self, mock_proxmox_client, storage):
+        pager = StorageContentPager(mock_proxmox_client)
+        first = pager.list_content("pve1", "backup-nfs", vmid=105, limit=100)
+        second = pager.list_content("pve1", "backup-nfs", cursor=first["next_cursor"], limit=100)
+
+        assert second["filters"]["vmid"] == 105
+        assert second["offset"] == 100
+        with pytest.raises(ProxmoxValidationError):
+            pager.list_content("pve2", "backup-nfs", cursor=second["next_cursor"])
+        with pytest.raises(ProxmoxValidationError):
+            pager.list_content("pve1", "backup-nfs", cursor="not-a-cursor")
+
+    def test_cursors_expire_and_are_bounded(self, mock_proxmox_client, storage):
+        pager = StorageContentPager(mock_proxmox_client, ttl=0)
+        cursor = pager.list_content("pve1", "backup-nfs")["next_cursor"]
+        with pytest.raises(ProxmoxValidationError, match="expired"):
+            pager.list_content("pve1", "backup-nfs", cursor=cursor)
+
+        pager = StorageContentPager(mock_proxmox_client, max_listings=2)
+        cursors = [pager.list_content("pve1", "backup-nfs")["next_cursor"] for _ in range(3)]
+        with pytest.raises(ProxmoxValidationError):
+            pager.list_content("pve1", "backup-nfs", cursor=cursors[0])
+        assert pager.list_content("pve1", "backup-nfs", cursor=cursors[2])["offset"] == 200
+
+
+class TestStorageContentClient:
+    """Test cases for the client's list_storage_content."""
+
+    def test_errors_are_reported(self, mock_proxmox_client, storage):
+        assert mock_proxmox_client.list_storage_content("pve1", "backup-nfs", content="movies")["status"] == "error"
+        storage.fail = True
+        result = mock_proxmox_client.list_storage_content("pve1", "backup-nfs")
+        assert result["status"] == "error"
+        assert "refused" in result["message"]
+
+
+@pytest.mark.parametrize("mcp_server", [{"list_storage_content": {"status": "success", "items": [], "next_cursor": None}}], indirect=True)
+class TestStorageContentTool:
+    """Test cases for the proxmox_list_storage_content MCP tool."""
+
+    def test_calls_client(self, mcp_server):
+        result = mcp_server._call_tool("proxmox_list_storage_content", {
+            "node": "pve1", "storage": "backup-nfs", "content": "backup", "vmid": 100, "limit": 50
+        })
+
+        assert json.loads(result["content"][0]["text"])["next_cursor"] is None
+        mcp_server.proxmox_client.list_storage_content.assert_called_once_with(
+            "pve1", "backup-nfs", content="backup", vmid=100, name_prefix=None, limit=50, cursor=None
+        )
+
+    @pytest.mark.parametrize("arguments", [
+        {"storage": "local"},
+        {"node": "pve1"},
+        {"node": "pve1", "storage": "../etc"},
+        {"node": "pve1", "storage": "local", "content": "movies"},
+        {"node": "pve1", "storage": "local", "vmid": 5},
+        {"node": "pve1", "storage": "local", "name_prefix": "a/b"},
+        {"node": "pve1", "storage": "local", "limit": 0},
+        {"node": "pve1", "storage": "local", "limit": 5000},
+        {"node": "pve1", "storage": "local", "cursor": 7},
+    ])
+    def test_rejects_invalid_arguments(self, mcp_server, arguments):
+        result = mcp_server._call_tool("proxmox_list_storage_content", arguments)
+
+        assert result["isError"] is True
+        mcp_server.proxmox_client.list_storage_content.assert_not_called()
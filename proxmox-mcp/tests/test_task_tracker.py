@@ -0,0 +1,247 @@
+"""Tests for batched UPID task tracking."""
+
+import json
+import threading
+from unittest.mock import patch
+from urllib.parse import quote
+
+import pytest
+
+from src.exceptions import ProxmoxConnectionError, ProxmoxResourceNotFoundError, ProxmoxValidationError
+from src.task_tracker import TaskTracker, parse_upid
+from tests.fakes import STARTTIME, json_response
+
+
+def _upid(node, index, task_type="qmstart"):
+    return f"UPID:{node}:{index:08X}:0012D687:{STARTTIME + index:08X}:{task_type}:{100 + index}:root@pam:"
+
+
+class FakeTaskAPI:
+    """Serves /nodes/{node}/tasks and per-task status from a table of task outcomes.
+
+    A task finishes once its node has been polled ``finish_after`` times. UPIDs
+    in ``missing`` are unknown to their node and answer 404.
+    """
+
+    def __init__(self, outcomes, finish_after=2, listed=True):
+        self.outcomes = outcomes  # upid -> exit status
+        self.finish_after = finish_after
+        self.listed = listed
+        self.polls = {}
+        self.calls = []
+        self.fail_node_once = set()
+        self.missing = set()
+        self.lock = threading.Lock()
+
+    def __call__(self, method, endpoint, **kwargs):
+        with self.lock:
+            self.calls.append((endpoint, kwargs.get("params")))
+        parts = endpoint.split("/")
+        node = parts[2]
+        if endpoint.endswith("/tasks"):
+            if node in self.fail_node_once:
+                self.fail_node_once.discard(node)
+                raise ProxmoxConnectionError("node unreachable")
+            with self.lock:
+                self.polls[node] = self.polls.get(node, 0) + 1
+                done = self.polls[node] >= self.finish_after
+            if not self.listed:
+                return json_response([])
+            entries = []
+            for upid, exitstatus in self.outcomes.items():
+                if parse_upid(upid)["node"] != node:
+                    continue
+                entry = {"upid": upid, "starttime": parse_upid(upid)["starttime"]}
+                if done:
+                    entry.update({"status": exitstatus, "endtime": entry["starttime"] + 7})
+                entries.append(entry)
+            return json_response(entries)
+        # /nodes/{node}/tasks/{upid}/status
+        if parts[4] in {quote(u, safe='') for u in self.missing}:
+            raise ProxmoxResourceNotFoundError("Resource not found: 404")
+        with self.lock:
+            done = self.polls.get(node, 0) >= self.finish_after
+        upid = [u for u in self.outcomes if u.replace(":", "%3A").replace("@", "%40") == parts[4]][0]
+        if done:
+            return json_response({"status": "stopped", "exitstatus": self.outcomes[upid]})
+        return json_response({"status": "running"})
+
+
+@pytest.fixture
+def tracker(mock_proxmox_client):
+    return TaskTracker(mock_proxmox_client, min_interval=0.001, max_interval=0.01)
+
+
+class TestParseUpid:
+    """Test cases for UPID parsing."""
+
+    def test_fields(self):
+        info = parse_upid("UPID:pve1:000A1B2C:0012D687:66F1E2A0:qmstart:100:root@pam:")
+
+        assert info["node"] == "pve1"
+        assert info["pid"] == 0x000A1B2C
+        assert info["type"] == "qmstart"
+        assert info["id"] == "100"
+        assert info["user"] == "root@pam"
+        assert info["starttime"] == 0x66F1E2A0
+
+    @pytest.mark.parametrize("upid", ["", "not-a-upid", "UPID:../etc:1:2:3:a:b:c:", "UPID:pve1:1:2:3:a:b:"])
+    def test_invalid(self, upid):
+        with pytest.raises(ProxmoxValidationError):
+            parse_upid(upid)
+
+
+class TestTaskTracker:
+    """Test cases for TaskTracker.wait_for_tasks."""
+
+    def test_one_request_per_node_per_tick(self, tracker, fake_api):
+        """Hundreds of tasks on few nodes cost one list request per node per tick."""
+        upids = [_upid(f"pve{i % 3}", i) for i in range(300)]
+        api = fake_api(FakeTaskAPI({u: "OK" for u in upids}, finish_after=3))
+        result = tracker.wait_for_tasks(upids, timeout=10)
+
+        assert result["all_succeeded"] is True
+        assert result["counts"] == {"completed": 300, "failed": 0, "running": 0}
+        assert result["requests"] == 9
+        assert len(api.calls) == 9
+        assert [t["upid"] for t in result["tasks"]] == upids
+        assert result["tasks"][0]["duration_seconds"] == 7
+
+    def test_poll_params_cover_pending_tasks(self, tracker, fake_api):
+        """The task list request starts at the oldest pending task and is large enough."""
+        upids = [_upid("pve1", i) for i in range(600)]
+        api = fake_api(FakeTaskAPI({u: "OK" for u in upids}, finish_after=1))
+        tracker.wait_for_tasks(upids, timeout=10)
+
+        endpoint, params = api.calls[0]
+        assert endpoint == "/nodes/pve1/tasks"
+        assert params == {"source": "all", "since": STARTTIME, "limit": 1200}
+
+    def test_exit_status_mapping(self, tracker, fake_api):
+        """Errors are failures; warnings still count as completed."""
+        ok, warn, bad = _upid("pve1", 1), _upid("pve1", 2), _upid("pve1", 3)
+        api = fake_api(FakeTaskAPI({ok: "OK", warn: "WARNINGS: 2", bad: "command 'qm start 103' failed: exit code 1"}))
+        result = tracker.wait_for_tasks([ok, warn, bad], timeout=10)
+
+        states = {t["upid"]: t["state"] for t in result["tasks"]}
+        assert states == {ok: "completed", warn: "completed", bad: "failed"}
+        assert result["all_succeeded"] is False
+        assert result["timed_out"] is False
+
+    def test_timeout_leaves_tasks_running(self, tracker, fake_api):
+        """Tasks still running at the deadline are reported, not raised."""
+        upid = _upid("pve1", 1)
+        api = fake_api(FakeTaskAPI({upid: "OK"}, finish_after=10 ** 6))
+        result = tracker.wait_for_tasks([upid], timeout=0.05)
+
+        assert result["timed_out"] is True
+        assert result["counts"]["running"] == 1
+        assert result["tasks"][0]["state"] == "running"
+
+    def test_zero_timeout_checks_once(self, tracker, fake_api):
+        """timeout=0 makes exactly one pass."""
+        upid = _upid("pve1", 1)
+        api = fake_api(FakeTaskAPI({upid: "OK"}, finish_after=5))
+        result = tracker.wait_for_tasks([upid], timeout=0)
+
+        assert result["timed_out"] is True
+        assert len(api.calls) == 1
+
+    def test_unlisted_task_checked_directly(self, tracker, fake_api):
+        """A task missing from the node's list falls back to its status endpoint."""
+        upid = _upid("pve1", 1)
+        api = fake_api(FakeTaskAPI({upid: "OK"}, finish_after=1, listed=False))
+        result = tracker.wait_for_tasks([upid], timeout=10)
+
+        assert result["tasks"][0]["state"] == "completed"
+        assert api.calls[1][0].endswith("/status")
+
+    def test_unknown_task_fails_without_blocking_others(self, tracker, fake_api):
+        """A UPID the node answers 404 for is failed; the rest of the batch still completes."""
+        healthy, unknown = _upid("pve1", 1), _upid("pve1", 2)
+        api = FakeTaskAPI({healthy: "OK"}, finish_after=2)
+        api.missing.add(unknown)
+
+        fake_api(api)
+        result = tracker.wait_for_tasks([healthy, unknown], timeout=10)
+
+        tasks = {t["upid"]: t for t in result["tasks"]}
+        assert tasks[healthy]["state"] == "completed"
+        assert tasks[unknown]["state"] == "failed"
+        assert "not found" in tasks[unknown]["error"]
+        assert result["timed_out"] is False
+        status_calls = [endpoint for endpoint, _ in api.calls if endpoint.endswith("/status")]
+        assert len(status_calls) == 1
+
+    def test_node_error_is_retried(self, tracker, fake_api):
+        """A failed poll keeps the node's tasks pending until the next tick."""
+        upid = _upid("pve1", 1)
+        api = FakeTaskAPI({upid: "OK"}, finish_after=1)
+        api.fail_node_once.add("pve1")
+
+        fake_api(api)
+        result = tracker.wait_for_tasks([upid], timeout=10)
+
+        assert result["all_succeeded"] is True
+        assert result["poll_errors"] == {}
+
+    def test_adaptive_backoff(self, mock_proxmox_client, fake_api):
+        """The poll interval grows while nothing finishes and is capped."""
+        upid = _upid("pve1", 1)
+        api = FakeTaskAPI({upid: "OK"}, finish_after=6)
+        tracker = TaskTracker(mock_proxmox_client, min_interval=0.5, max_interval=1.0, backoff_factor=1.5)
+        sleeps = []
+
+        fake_api(api)
+        with patch('src.task_tracker.time.sleep', side_effect=sleeps.append):
+            tracker.wait_for_tasks([upid], timeout=60)
+
+        assert sleeps == [0.75, 1.0, 1.0, 1.0, 1.0]
+
+    def test_duplicates_and_too_many(self, tracker, fake_api):
+        """Duplicate UPIDs are tracked once; oversized batches are rejected."""
+        upid = _upid("pve1", 1)
+        api = fake_api(FakeTaskAPI({upid: "OK"}, finish_after=1))
+        result = tracker.wait_for_tasks([upid, upid], timeout=10)
+        assert len(result["tasks"]) == 1
+
+        with pytest.raises(ProxmoxValidationError):
+            tracker.wait_for_tasks([upid] * 1001)
+
+    def test_client_wait_for_tasks_invalid(self, mock_proxmox_client):
+        """The client method reports malformed UPIDs as an error result."""
+        result = mock_proxmox_client.wait_for_tasks(["bogus"])
+
+        assert result["status"] == "error"
+        assert "Invalid UPID" in result["message"]
+
+
+@pytest.mark.parametrize("mcp_server", [{"wait_for_tasks": {"status": "success", "tasks": []}}], indirect=True)
+class TestWaitForTasksTool:
+    """Test cases for the proxmox_wait_for_tasks MCP tool."""
+
+    def test_tool_listed(self, mcp_server):
+        names = [t["name"] for t in mcp_server._list_tools()["tools"]]
+        assert "proxmox_wait_for_tasks" in names
+
+    def test_calls_client(self, mcp_server):
+        upid = _upid("pve1", 1)
+        result = mcp_server._call_tool("proxmox_wait_for_tasks", {"upids": [upid], "timeout": 30})
+
+        assert result["isError"] is False
+        assert json.loads(result["content"][0]["text"])["status"] == "success"
+        mcp_server.proxmox_client.wait_for_tasks.assert_called_once_with([upid], 30)
+
+    @pytest.mark.parametrize("arguments", [
+        {},
+        {"upids": []},
+        {"upids": "UPID:pve1:1:2:3:a:b:c:"},
+        {"upids": ["UPID:pve1;rm:1:2:3:a:b:c:"]},
+        {"upids": [_upid("pve1", 1)], "timeout": -1},
+        {"upids": [_upid("pve1", 1)], "timeout": 999999},
+    ])
+    def test_rejects_invalid_arguments(self, mcp_server, arguments):
+        result = mcp_server._call_tool("proxmox_wait_for_tasks", arguments)
+
+        assert result["isError"] is True
+        mcp_server.proxmox_client.wait_for_tasks.assert_not_called()
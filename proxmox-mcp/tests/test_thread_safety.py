@@ -0,0 +1,199 @@
+"""Stress tests for using one ProxmoxClient from many threads."""
+
+import json
+import threading
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from urllib.parse import parse_qs
+
+import pytest
+
+from urllib3.exceptions import InsecureRequestWarning
+
+from src.exceptions import ProxmoxError
+from src.proxmox_client import ProxmoxClient
+
+THREADS = 32
+CALLS_PER_THREAD = 25
+
+
+class MockProxmoxAPI:
+    """Local HTTP server emulating Proxmox ticket auth, CSRF checks and VM endpoints."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.ticket_count = 0
+        self.valid_tickets = {}
+        self.rejected = 0
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status, payload=None):
+                body = json.dumps(payload or {}).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _ticket(self):
+                cookie = self.headers.get("Cookie", "")
+                prefix = "PVEAuthCookie="
+                return cookie[len(prefix):] if cookie.startswith(prefix) else None
+
+            def _read_body(self):
+                length = int(self.headers.get("Content-Length", 0))
+                return self.rfile.read(length).decode() if length else ""
+
+            def do_POST(self):
+                body = self._read_body()
+                if self.path == "/api2/json/access/ticket":
+                    form = parse_qs(body)
+                    if form.get("password") != ["secret"]:
+                        return self._send(401)
+                    with api.lock:
+                        api.ticket_count += 1
+                        ticket = f"PVE:ticket-{api.ticket_count}"
+                        csrf = f"csrf-{api.ticket_count}"
+                        api.valid_tickets[ticket] = csrf
+                    return self._send(200, {"data": {"ticket": ticket, "CSRFPreventionToken": csrf}})
+
+                ticket = self._ticket()
+                with api.lock:
+                    expected_csrf = api.valid_tickets.get(ticket)
+                if expected_csrf is None or self.headers.get("CSRFPreventionToken") != expected_csrf:
+                    with api.lock:
+                        api.rejected += 1
+                    return self._send(401)
+                # /api2/json/nodes/{node}/qemu/{vmid}/status/start
+                vmid = self.path.split("/")[6]
+                return self._send(200, {"data": f"UPID:pve:{vmid}:qmstart"})
+
+            def do_GET(self):
+                ticket = self._ticket()
+                with api.lock:
+                    valid = ticket in api.valid_tickets
+                if not valid:
+                    with api.lock:
+                        api.rejected += 1
+                    return self._send(401)
+                # /api2/json/nodes/{node}/qemu/{vmid}/status/current
+                parts = self.path.split("/")
+                return self._send(200, {"data": {"node": parts[4], "vmid": int(parts[6]), "status": "running"}})
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def expire_all_tickets(self):
+        with self.lock:
+            self.valid_tickets.clear()
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def mock_api():
+    with MockProxmoxAPI() as api:
+        yield api
+
+
+@pytest.fixture
+def client(mock_api):
+    client = ProxmoxClient(
+        host="127.0.0.1", port=mock_api.port, protocol="http",
+        username="root", password="secret", realm="pam"
+    )
+    yield client
+    client.close()
+
+
+def _hammer(client, barrier, thread_index, expire=None):
+    """Issue a mix of reads and writes and check every response belongs to its request."""
+    barrier.wait()
+    mismatches = []
+    for i in range(CALLS_PER_THREAD):
+        vmid = 1000 + thread_index * CALLS_PER_THREAD + i
+        node = f"pve{thread_index % 4}"
+        if expire is not None and thread_index == 0 and i == CALLS_PER_THREAD // 2:
+            expire()
+        if i % 5 == 0:
+            result = client.start_vm(node, vmid)
+            if result["status"] != "success" or result["data"] != f"UPID:pve:{vmid}:qmstart":
+                mismatches.append(result)
+        else:
+            info = client.get_vm_info(node, vmid)
+            if info.get("vmid") != vmid or info.get("node") != node:
+                mismatches.append(info)
+    return mismatches
+
+
+class TestThreadSafety:
+    """Test cases for concurrent use of a single ProxmoxClient."""
+
+    def test_concurrent_reads_and_writes(self, client, mock_api):
+        """32 threads share one ticket and never see each other's responses."""
+        barrier = threading.Barrier(THREADS)
+        with ThreadPoolExecutor(max_workers=THREADS) as pool:
+            results = list(pool.map(lambda i: _hammer(client, barrier, i), range(THREADS)))
+
+        assert [m for r in results for m in r] == []
+        assert mock_api.ticket_count == 1
+        assert mock_api.rejected == 0
+        # Sessions are reused, never more than one per concurrent thread
+        assert len(client._idle_sessions) <= THREADS
+
+    def test_ticket_invalidated_under_load(self, client, mock_api):
+        """Concurrent 401s trigger a single re-authentication, not one per thread."""
+        barrier = threading.Barrier(THREADS)
+        with ThreadPoolExecutor(max_workers=THREADS) as pool:
+            results = list(pool.map(
+                lambda i: _hammer(client, barrier, i, expire=mock_api.expire_all_tickets),
+                range(THREADS)
+            ))
+
+        assert [m for r in results for m in r] == []
+        assert mock_api.ticket_count == 2
+
+    def test_csrf_token_tracks_ticket(self, client, mock_api):
+        """Writes after re-authentication carry the new ticket's CSRF token."""
+        mock_api.expire_all_tickets()
+        result = client.start_vm("pve0", 100)
+
+        assert result["status"] == "success"
+        assert client._auth_state == ("PVE:ticket-2", "csrf-2")
+
+    def test_closed_client_rejects_requests(self, client):
+        """Requests after close() fail instead of reopening sessions."""
+        client.close()
+        with pytest.raises(ProxmoxError):
+            client.get_vm_info("pve0", 100)
+        assert client._idle_sessions == []
+
+    def test_requests_leave_warning_filters_alone(self, mock_api):
+        """The InsecureRequestWarning filter is installed once, not swapped per request."""
+        client = ProxmoxClient(
+            host="127.0.0.1", port=mock_api.port, protocol="http",
+            username="root", password="secret", realm="pam", ssl_verify=False
+        )
+        try:
+            assert any(f[0] == "ignore" and f[2] is InsecureRequestWarning for f in warnings.filters)
+            with patch.object(warnings, "catch_warnings", side_effect=AssertionError("per-request filter swap")):
+                assert client.get_vm_info("pve0", 100)["vmid"] == 100
+        finally:
+            client.close()
@@ -0,0 +1,207 @@
+"""Tests for background ticket renewal."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import pytest
+
+from src import ticket_renewer
+from src.exceptions import ProxmoxConfigurationError, ProxmoxConnectionError
+from src.proxmox_client import ProxmoxClient
+from src.ticket_renewer import TicketRenewer
+
+
+class FakeClient:
+    """Just the attributes TicketRenewer uses."""
+
+    def __init__(self, expiry=0.2):
+        self._ticket_expiry_seconds = expiry
+        self._ticket_obtained_at = time.time()
+        self._auth_state = ("PVE:ticket-0", "csrf-0")
+        self.logins = 0
+        self.fail = False
+
+    def _request_ticket(self):
+        if self.fail:
+            raise ProxmoxConnectionError("connection refused")
+        self.logins += 1
+        return (f"PVE:ticket-{self.logins}", f"csrf-{self.logins}")
+
+    def _install_ticket(self, auth_state):
+        self._auth_state = auth_state
+        self._ticket_obtained_at = time.time()
+
+
+class TicketAPI:
+    """Local HTTP server issuing tickets that expire after a fixed lifetime."""
+
+    def __init__(self, lifetime):
+        self.lifetime = lifetime
+        self.lock = threading.Lock()
+        self.issued = {}
+        self.logins = 0
+        self.rejected = 0
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status, payload=None):
+                body = json.dumps(payload or {}).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                form = parse_qs(self.rfile.read(length).decode())
+                if form.get("password") != ["secret"]:
+                    return self._send(401)
+                with api.lock:
+                    api.logins += 1
+                    ticket = f"PVE:ticket-{api.logins}"
+                    api.issued[ticket] = time.monotonic()
+                return self._send(200, {"data": {"ticket": ticket, "CSRFPreventionToken": "csrf"}})
+
+            def do_GET(self):
+                ticket = self.headers.get("Cookie", "").replace("PVEAuthCookie=", "")
+                with api.lock:
+                    issued = api.issued.get(ticket)
+                    if issued is None or time.monotonic() - issued > api.lifetime:
+                        api.rejected += 1
+                        return self._send(401)
+                return self._send(200, {"data": {"version": "8.2.4"}})
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+class TestTicketRenewer:
+    """Test cases for TicketRenewer scheduling and counters."""
+
+    def test_renews_at_fraction_of_lifetime(self):
+        client = FakeClient(expiry=10)
+        renewer = TicketRenewer(client, renewal_fraction=0.5)
+
+        assert 4.9 < renewer.seconds_until_renewal() <= 5
+        client._ticket_obtained_at -= 6
+        assert renewer.seconds_until_renewal() == 0
+
+    def test_background_renewal_swaps_ticket(self):
+        client = FakeClient(expiry=0.1)
+        renewer = TicketRenewer(client, renewal_fraction=0.5)
+        renewer.start()
+        try:
+            assert _wait_for(lambda: client.logins >= 3)
+        finally:
+            renewer.stop()
+
+        stats = renewer.stats()
+        assert stats["renewals"] >= 3
+        assert stats["failures"] == 0
+        assert stats["last_latency_seconds"] is not None
+        assert stats["max_latency_seconds"] >= stats["avg_latency_seconds"]
+        assert stats["background_renewal"] is False
+        assert client._auth_state[0].startswith("PVE:ticket-")
+
+    def test_failures_back_off_and_keep_ticket(self, monkeypatch):
+        monkeypatch.setattr(ticket_renewer, "RENEWAL_RETRY_MIN_SECONDS", 0.01)
+        client = FakeClient(expiry=0.01)
+        client.fail = True
+        renewer = TicketRenewer(client)
+        renewer.start()
+        try:
+            assert _wait_for(lambda: renewer.stats()["failures"] >= 3)
+            assert client._auth_state == ("PVE:ticket-0", "csrf-0")
+            assert renewer.seconds_until_renewal() > 0.01
+            assert "refused" in renewer.stats()["last_error"]
+
+            client.fail = False
+            assert _wait_for(lambda: renewer.stats()["renewals"] >= 1)
+        finally:
+            renewer.stop()
+        assert renewer.stats()["consecutive_failures"] == 0
+
+
+class TestClientRenewal:
+    """Test cases for ProxmoxClient with background renewal."""
+
+    def test_requests_never_wait_for_login(self):
+        """Tickets live 2s; the renewer replaces them every 0.5s under constant load."""
+        with TicketAPI(lifetime=2) as api:
+            client = ProxmoxClient(
+                host="127.0.0.1", port=api.port, protocol="http", username="root",
+                password="secret", realm="pam", ticket_expiry_seconds=2, ticket_renewal_fraction=0.25
+            )
+            errors = []
+            stop = threading.Event()
+
+            def worker():
+                while not stop.is_set():
+                    try:
+                        client._make_request_no_retry("GET", "/version")
+                    except Exception as e:
+                        errors.append(e)
+
+            threads = [threading.Thread(target=worker) for _ in range(4)]
+            for t in threads:
+                t.start()
+            time.sleep(2.5)
+            stop.set()
+            for t in threads:
+                t.join()
+            stats = client.get_auth_stats()
+            client.close()
+
+        assert errors == []
+        assert api.rejected == 0
+        assert stats["auth_mode"] == "ticket"
+        assert stats["inline_refreshes"] == 0
+        assert stats["renewals"] >= 3
+        assert stats["background_renewal"] is True
+        assert stats["ticket_age_seconds"] < 1
+        assert client._ticket_renewer is None
+
+    def test_renewal_can_be_disabled(self):
+        with TicketAPI(lifetime=60) as api:
+            client = ProxmoxClient(
+                host="127.0.0.1", port=api.port, protocol="http", username="root",
+                password="secret", realm="pam", ticket_renewal_fraction=None
+            )
+            stats = client.get_auth_stats()
+            client.close()
+
+        assert stats["background_renewal"] is False
+        assert "renewals" not in stats
+
+    @pytest.mark.parametrize("fraction", [0, 1, 1.5, -0.1, True, "0.5"])
+    def test_invalid_fraction(self, fraction):
+        with pytest.raises(ProxmoxConfigurationError):
+            ProxmoxClient(host="127.0.0.1", port=8006, protocol="http", username="root",
+                          password="secret", ticket_renewal_fraction=fraction)
@@ -326,6 +326,11 @@ class TestServerMock:
 class TestReliabilityFixes:
     """Test cases for reliability improvements (Issues #165, #166)."""
 
+    @pytest.fixture(autouse=True)
+    def per_node_listing(self, mock_proxmox_client):
+        """These tests cover the per-node fan-out path."""
+        mock_proxmox_client.use_cluster_resources = False
+
     def test_make_request_no_retry_exists(self, mock_proxmox_client):
         """Test that _make_request_no_retry method exists."""
         assert hasattr(mock_proxmox_client, '_make_request_no_retry')
@@ -531,3 +536,137 @@ class TestReliabilityFixes:
 
             assert len(result) == 1
             assert result[0]["storage"] == "local"
+
+
+class TestClusterResourcesInventory:
+    """Test cases for all-node listings served from /cluster/resources."""
+
+    CLUSTER_RESOURCES = [
+        {"id": "node/node1", "type": "node", "node": "node1", "status": "online"},
+        {"id": "node/node2", "type": "node", "node": "node2", "status": "online"},
+        {"id": "qemu/100", "type": "qemu", "node": "node1", "vmid": 100, "name": "vm1",
+         "status": "running", "maxcpu": 2, "mem": 512, "maxmem": 1024},
+        {"id": "qemu/101", "type": "qemu", "node": "node2", "vmid": 101, "name": "vm2",
+         "status": "stopped", "maxcpu": 4},
+        {"id": "lxc/200", "type": "lxc", "node": "node2", "vmid": 200, "name": "ct1",
+         "status": "running", "maxcpu": 1},
+        {"id": "storage/node1/local", "type": "storage", "node": "node1", "storage": "local",
+         "status": "available", "plugintype": "dir", "content": "iso,backup",
+         "shared": 0, "disk": 25, "maxdisk": 100},
+    ]
+
+    def _resources_response(self, resources):
+        response = Mock()
+        response.json.return_value = {"data": resources}
+        return response
+
+    def test_list_vms_single_request(self, mock_proxmox_client):
+        """All-node VM listing costs one request and matches the per-node shape."""
+        with patch.object(mock_proxmox_client, '_make_request') as mock_make_request:
+            mock_make_request.return_value = self._resources_response(self.CLUSTER_RESOURCES)
+
+            result = mock_proxmox_client.list_vms(include_metadata=True)
+
+            mock_make_request.assert_called_once()
+            assert mock_make_request.call_args[0][1] == '/cluster/resources'
+            assert sorted(vm["vmid"] for vm in result["data"]) == [100, 101]
+            vm = next(v for v in result["data"] if v["vmid"] == 100)
+            assert vm["node"] == "node1"
+            assert vm["cpus"] == 2
+            assert "id" not in vm and "type" not in vm and "maxcpu" not in vm
+            assert sorted(result["successful_nodes"]) == ["node1", "node2"]
+            assert result["partial_failure"] is False
+
+    def test_list_containers_keeps_lxc_type(self, mock_proxmox_client):
+        """Container entries keep type 'lxc' like /nodes/{node}/lxc does."""
+        with patch.object(mock_proxmox_client, '_make_request') as mock_make_request:
+            mock_make_request.return_value = self._resources_response(self.CLUSTER_RESOURCES)
+
+            result = mock_proxmox_client.list_containers()
+
+            assert [ct["vmid"] for ct in result] == [200]
+            assert result[0]["type"] == "lxc"
+
+    def test_list_storage_normalized(self, mock_proxmox_client):
+        """Storage entries are converted to the /nodes/{node}/storage shape."""
+        with patch.object(mock_proxmox_client, '_make_request') as mock_make_request:
+            mock_make_request.return_value = self._resources_response(self.CLUSTER_RESOURCES)
+
+            result = mock_proxmox_client.list_storage()
+
+            assert result == [{
+                "storage": "local", "node": "node1", "type": "dir", "content": "iso,backup",
+                "shared": 0, "enabled": 1, "active": 1,
+                "total": 100, "used": 25, "avail": 75, "used_fraction": 0.25,
+            }]
+
+    def test_offline_node_reported_as_partial_failure(self, mock_proxmox_client):
+        """Guests on offline nodes are dropped and the node is listed as failed."""
+        resources = [dict(r) for r in self.CLUSTER_RESOURCES]
+        resources[1]["status"] = "offline"
+        with patch.object(mock_proxmox_client, '_make_request') as mock_make_request:
+            mock_make_request.return_value = self._resources_response(resources)
+
+            result = mock_proxmox_client.list_vms(include_metadata=True)
+
+            assert [vm["vmid"] for vm in result["data"]] == [100]
+            assert result["successful_nodes"] == ["node1"]
+            assert result["failed_nodes"] == [{"node": "node2", "error": "Node status is offline"}]
+            assert result["partial_failure"] is True
+
+    def test_all_nodes_offline_raises(self, mock_proxmox_client):
+        """If no node is online the listing fails like the fan-out does."""
+        from src.exceptions import ProxmoxAPIError
+
+        resources = [dict(r, status="offline") if r["type"] == "node" else r for r in self.CLUSTER_RESOURCES]
+        with patch.object(mock_proxmox_client, '_make_request') as mock_make_request:
+            mock_make_request.return_value = self._resources_response(resources)
+
+            with pytest.raises(ProxmoxAPIError) as exc_info:
+                mock_proxmox_client.list_vms()
+
+            assert "Failed to get VMs from all nodes" in str(exc_info.value)
+
+    def test_falls_back_to_fan_out_when_endpoint_missing(self, mock_proxmox_client):
+        """A 404 from /cluster/resources switches to per-node queries for good."""
+        from src.exceptions import ProxmoxResourceNotFoundError
+
+        def make_request_side_effect(method, endpoint, **kwargs):
+            if endpoint == '/cluster/resources':
+                raise ProxmoxResourceNotFoundError("Not found")
+            response = Mock()
+            response.json.return_value = {"data": [{"vmid": 100}]}
+            return response
+
+        with patch.object(mock_proxmox_client, 'list_nodes') as mock_list_nodes, \
+             patch.object(mock_proxmox_client, '_make_request') as mock_make_request:
+            mock_list_nodes.return_value = [{"node": "node1"}]
+            mock_make_request.side_effect = make_request_side_effect
+
+            assert mock_proxmox_client.list_vms() == [{"vmid": 100, "node": "node1"}]
+            mock_make_request.reset_mock()
+            assert mock_proxmox_client.list_vms() == [{"vmid": 100, "node": "node1"}]
+
+            endpoints = [c[0][1] for c in mock_make_request.call_args_list]
+            assert '/cluster/resources' not in endpoints
+
+    def test_falls_back_on_api_error(self, mock_proxmox_client):
+        """Transient cluster endpoint errors fall back without disabling the endpoint."""
+        from src.exceptions import ProxmoxAPIError
+
+        def make_request_side_effect(method, endpoint, **kwargs):
+            if endpoint == '/cluster/resources':
+                raise ProxmoxAPIError("HTTP error 500")
+            response = Mock()
+            response.json.return_value = {"data": [{"storage": "local"}]}
+            return response
+
+        with patch.object(mock_proxmox_client, 'list_nodes') as mock_list_nodes, \
+             patch.object(mock_proxmox_client, '_make_request') as mock_make_request:
+            mock_list_nodes.return_value = [{"node": "node1"}]
+            mock_make_request.side_effect = make_request_side_effect
+
+            result = mock_proxmox_client.list_storage()
+
+            assert result == [{"storage": "local", "node": "node1"}]
+            assert mock_proxmox_client._cluster_resources_available is True
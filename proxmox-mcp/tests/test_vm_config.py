@@ -0,0 +1,130 @@
+"""Tests for batched VM config enrichment of list_vms."""
+
+import json
+import time
+
+import pytest
+
+from src.exceptions import ProxmoxAPIError, ProxmoxValidationError
+from src.vm_config import VMConfigFetcher
+from tests.fakes import FakeCluster, json_response
+
+
+def _config(vmid):
+    return {
+        "name": f"vm-{vmid}", "cores": 2, "memory": 2048, "tags": "prod",
+        "net0": "virtio=BC:24:11:00:00:01,bridge=vmbr0", "net1": "virtio=BC:24:11:00:00:02,bridge=vmbr1",
+        "scsi0": f"local-lvm:vm-{vmid}-disk-0,size=32G", "scsihw": "virtio-scsi-pci", "digest": "abc",
+    }
+
+
+class FakeConfigCluster(FakeCluster):
+    """Serves cluster resources and VM configs; config requests block briefly."""
+
+    def __init__(self):
+        super().__init__()
+        self.resources = [{"type": "node", "node": n, "status": "online"} for n in ("pve1", "pve2")]
+        self.resources += [
+            {"type": "qemu", "vmid": vmid, "name": f"vm-{vmid}", "node": "pve1" if vmid % 2 else "pve2",
+             "status": "running"}
+            for vmid in range(100, 120)
+        ]
+        self.config_requests = []
+        self.broken = set()
+
+    def handle(self, method, endpoint, parts, **kwargs):
+        if endpoint == "/nodes/pve1/qemu":
+            return json_response([{"vmid": 101, "name": "vm-101"}, {"vmid": 103, "name": "vm-103"}])
+        node, vmid = parts[2], int(parts[4])
+        with self.lock:
+            self.config_requests.append(vmid)
+            self.count(node, 1)
+        time.sleep(0.01)
+        with self.lock:
+            self.count(node, -1)
+        if vmid in self.broken:
+            raise ProxmoxAPIError("HTTP error 500: unable to parse config")
+        return json_response(_config(vmid))
+
+
+@pytest.fixture
+def cluster(fake_api):
+    return fake_api(FakeConfigCluster())
+
+
+class TestVMConfigFetcher:
+    """Test cases for config fetching, caching and key selection."""
+
+    def test_list_vms_attaches_configs(self, mock_proxmox_client, cluster):
+        vms = mock_proxmox_client.list_vms(include_config=True)
+
+        assert len(vms) == 20
+        assert all(vm["config"]["scsihw"] == "virtio-scsi-pci" for vm in vms)
+        assert sorted(cluster.config_requests) == list(range(100, 120))
+        # Requests run in parallel but within the per-node limit
+        assert max(cluster.peak.values()) <= mock_proxmox_client.max_requests_per_node
+        assert max(cluster.peak.values()) > 1
+
+    def test_single_node_listing(self, mock_proxmox_client, cluster):
+        vms = mock_proxmox_client.list_vms("pve1", include_config=True, config_keys=["tags"])
+
+        assert [vm["config"] for vm in vms] == [{"tags": "prod"}, {"tags": "prod"}]
+
+    def test_key_families(self, mock_proxmox_client, cluster):
+        vm = mock_proxmox_client.list_vms(include_config=True, config_keys=["net", "scsi", "memory"])[0]
+
+        # 'scsi' selects scsi0 but not scsihw
+        assert sorted(vm["config"]) == ["memory", "net0", "net1", "scsi0"]
+
+    def test_configs_are_cached(self, mock_proxmox_client, cluster):
+        fetcher = VMConfigFetcher(mock_proxmox_client)
+        fetcher.enrich(mock_proxmox_client.list_vms())
+        fetcher.enrich(mock_proxmox_client.list_vms(), keys=["tags"])
+        assert len(cluster.config_requests) == 20
+
+        expired = VMConfigFetcher(mock_proxmox_client, ttl=0)
+        expired.enrich(mock_proxmox_client.list_vms())
+        expired.enrich(mock_proxmox_client.list_vms())
+        assert len(cluster.config_requests) == 60
+
+    def test_failures_are_per_vm(self, mock_proxmox_client, cluster):
+        cluster.broken = {105}
+        vms = {vm["vmid"]: vm for vm in mock_proxmox_client.list_vms(include_config=True)}
+
+        assert vms[105]["config"] is None
+        assert "unable to parse" in vms[105]["config_error"]
+        assert vms[106]["config"]["name"] == "vm-106"
+
+    @pytest.mark.parametrize("keys", [[], "net", ["Net0"], ["net;rm"], ["a"] * 65])
+    def test_invalid_keys(self, mock_proxmox_client, cluster, keys):
+        with pytest.raises(ProxmoxValidationError):
+            mock_proxmox_client.list_vms(include_config=True, config_keys=keys)
+        assert cluster.config_requests == []
+
+
+@pytest.mark.parametrize("mcp_server", [{"list_vms": {
+    "data": [{"vmid": 100, "config": {"tags": "prod"}}, {"vmid": 101, "config": None, "config_error": "x"}],
+    "successful_nodes": ["pve1"], "failed_nodes": [], "partial_failure": False,
+}}], indirect=True)
+class TestListVmsConfigTool:
+    """Test cases for include_config on the proxmox_list_vms MCP tool."""
+
+    def test_passes_options(self, mcp_server):
+        result = mcp_server._call_tool("proxmox_list_vms", {"include_config": True, "config_keys": ["net", "tags"]})
+
+        assert json.loads(result["content"][0]["text"])["config_errors"] == 1
+        mcp_server.proxmox_client.list_vms.assert_called_once_with(
+            None, include_metadata=True, include_config=True, config_keys=["net", "tags"]
+        )
+
+    def test_without_config(self, mcp_server):
+        mcp_server._call_tool("proxmox_list_vms", {})
+
+        mcp_server.proxmox_client.list_vms.assert_called_once_with(None, include_metadata=True)
+
+    @pytest.mark.parametrize("keys", ["net", [], ["net", 5], ["$(id)"]])
+    def test_rejects_invalid_keys(self, mcp_server, keys):
+        result = mcp_server._call_tool("proxmox_list_vms", {"include_config": True, "config_keys": keys})
+
+        assert result["isError"] is True
+        mcp_server.proxmox_client.list_vms.assert_not_called()
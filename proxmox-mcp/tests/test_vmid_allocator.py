@@ -0,0 +1,176 @@
+"""Tests for in-process VMID reservation."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.exceptions import ProxmoxAPIError, ProxmoxResourceNotFoundError, ProxmoxValidationError
+from src.vmid_allocator import VMIDAllocator
+from tests.fakes import json_response
+
+
+class FakeVMIDCluster:
+    """Serves guest listings and VM creation for a set of existing VMIDs per node."""
+
+    def __init__(self, guests, cluster_resources=True):
+        self.guests = guests  # node -> {"qemu": [vmid...], "lxc": [vmid...]}
+        self.cluster_resources = cluster_resources
+        self.lock = threading.Lock()
+        self.calls = []
+        self.created = []
+
+    def __call__(self, method, endpoint, **kwargs):
+        with self.lock:
+            self.calls.append((method, endpoint))
+        if endpoint == "/cluster/resources":
+            if not self.cluster_resources:
+                raise ProxmoxResourceNotFoundError("HTTP error 404: Not Found")
+            return json_response([
+                {"type": kind, "vmid": vmid, "node": node}
+                for node, kinds in self.guests.items() for kind, vmids in kinds.items() for vmid in vmids
+            ])
+        if endpoint == "/nodes":
+            return json_response([{"node": node, "status": "online"} for node in self.guests])
+        node, kind = endpoint.split("/")[2], endpoint.split("/")[3]
+        if method == "POST":
+            vmid = int(kwargs["data"]["vmid"])
+            with self.lock:
+                if any(vmid in vmids for kinds in self.guests.values() for vmids in kinds.values()):
+                    raise ProxmoxAPIError(f"HTTP error 500: unable to create VM {vmid} - VM {vmid} already exists on node 'pve0'")
+                self.guests[node][kind].append(vmid)
+                self.created.append(vmid)
+            return json_response(f"UPID:{node}:00000001:00000001:66F1E2A0:qmcreate:{vmid}:root@pam:")
+        return json_response([{"vmid": vmid} for vmid in self.guests[node][kind]])
+
+    def count(self, endpoint):
+        return sum(1 for _, e in self.calls if e == endpoint)
+
+
+def _cluster(**kwargs):
+    return FakeVMIDCluster({
+        "pve0": {"qemu": [100, 101], "lxc": [103]},
+        "pve1": {"qemu": [107], "lxc": []},
+    }, **kwargs)
+
+
+class TestVMIDAllocator:
+    """Test cases for VMIDAllocator."""
+
+    def test_lowest_free_from_one_scan(self, mock_proxmox_client, fake_api):
+        cluster = _cluster()
+        allocator = VMIDAllocator(mock_proxmox_client)
+        fake_api(cluster)
+        assert allocator.allocate() == [102]
+        assert allocator.allocate() == [104]
+        assert allocator.allocate(3) == [108, 109, 110]
+
+        assert cluster.count("/cluster/resources") == 1
+        assert allocator.stats()["reserved"] == 5
+
+    def test_range_skips_gaps(self, mock_proxmox_client, fake_api):
+        cluster = _cluster()
+        allocator = VMIDAllocator(mock_proxmox_client)
+        fake_api(cluster)
+        assert allocator.allocate(3) == [104, 105, 106]
+        assert allocator.allocate(1) == [102]
+
+    def test_release_and_confirm(self, mock_proxmox_client, fake_api):
+        cluster = _cluster()
+        allocator = VMIDAllocator(mock_proxmox_client)
+        fake_api(cluster)
+        assert allocator.allocate(2) == [104, 105]
+        allocator.confirm([104])
+        allocator.release([105])
+        assert allocator.allocate(2) == [105, 106]
+
+        assert allocator.stats()["used"] == 5
+
+    def test_concurrent_allocations_are_unique(self, mock_proxmox_client, fake_api):
+        """Many threads allocating at once get distinct VMIDs from a single scan."""
+        cluster = _cluster()
+        allocator = VMIDAllocator(mock_proxmox_client)
+        fake_api(cluster)
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(lambda _: allocator.allocate(2), range(64)))
+
+        vmids = [v for pair in results for v in pair]
+        assert len(set(vmids)) == 128
+        assert not set(vmids) & {100, 101, 103, 107}
+        assert all(b == a + 1 for a, b in results)
+        assert cluster.count("/cluster/resources") == 1
+
+    def test_parallel_node_scan_fallback(self, mock_proxmox_client, fake_api):
+        """Without /cluster/resources every node's qemu and lxc lists are scanned."""
+        cluster = _cluster(cluster_resources=False)
+        allocator = VMIDAllocator(mock_proxmox_client)
+        fake_api(cluster)
+        assert allocator.allocate(4) == [108, 109, 110, 111]
+
+        assert cluster.count("/nodes/pve0/lxc") == 1
+        assert cluster.count("/nodes/pve1/qemu") == 1
+        assert mock_proxmox_client._cluster_resources_available is False
+
+    def test_rescan_keeps_reservations(self, mock_proxmox_client, fake_api):
+        """A TTL rescan picks up external guests and never re-issues reserved IDs."""
+        cluster = _cluster()
+        allocator = VMIDAllocator(mock_proxmox_client, seed_ttl=0)
+        fake_api(cluster)
+        assert allocator.allocate() == [102]
+        cluster.guests["pve1"]["qemu"].append(104)
+        assert allocator.allocate() == [105]
+
+        assert cluster.count("/cluster/resources") == 2
+
+    def test_invalid_count(self, mock_proxmox_client):
+        allocator = VMIDAllocator(mock_proxmox_client)
+        for count in (0, 1001, True, "2"):
+            with pytest.raises(ProxmoxValidationError):
+                allocator.allocate(count)
+
+
+class TestCreateVMAllocation:
+    """Test cases for create_vm and allocate_vmids on the client."""
+
+    def test_parallel_creates_without_conflicts(self, mock_proxmox_client, fake_api):
+        cluster = fake_api(_cluster())
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda i: mock_proxmox_client.create_vm("pve0", f"vm{i}"), range(20)))
+
+        assert all(r["status"] == "success" for r in results)
+        assert len({r["vmid"] for r in results}) == 20
+        assert len(cluster.created) == 20
+        assert cluster.count("/cluster/resources") == 1
+
+    def test_external_conflict_retries_with_rescan(self, mock_proxmox_client, fake_api):
+        cluster = fake_api(_cluster())
+        mock_proxmox_client._vmid_allocator.allocate()  # seed; reserves 102
+        cluster.guests["pve1"]["lxc"].extend([104, 105])  # created by another client
+        result = mock_proxmox_client.create_vm("pve0", "web")
+
+        assert result["status"] == "success"
+        assert result["vmid"] == 106
+        assert cluster.count("/cluster/resources") == 2
+
+    def test_failed_create_releases_vmid(self, mock_proxmox_client, fake_api):
+        cluster = _cluster()
+
+        def fail_create(method, endpoint, **kwargs):
+            if method == "POST":
+                raise ProxmoxAPIError("HTTP error 500: storage full")
+            return cluster(method, endpoint, **kwargs)
+
+        fake_api(fail_create)
+        result = mock_proxmox_client.create_vm("pve0", "web")
+
+        assert result["status"] == "error"
+        assert mock_proxmox_client._vmid_allocator.stats()["reserved"] == 0
+
+    def test_explicit_vmid_marked_used(self, mock_proxmox_client, fake_api):
+        cluster = fake_api(_cluster())
+        assert mock_proxmox_client.create_vm("pve0", "web", vmid=102)["status"] == "success"
+        assert mock_proxmox_client.allocate_vmids(2)["vmids"] == [104, 105]
+
+    def test_allocate_vmids_invalid_count(self, mock_proxmox_client):
+        result = mock_proxmox_client.allocate_vmids(0)
+        assert result["status"] == "error"
@@ -13,6 +13,7 @@ import os
 import signal
 import sys
 import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Any, Dict, List, Optional
 
 import urllib3
@@ -27,7 +28,17 @@ from src.utils.validation import (
     is_valid_storage_name,
     validate_snapshot_name,
     validate_cores_range,
-    validate_memory_range
+    validate_memory_range,
+    is_valid_upid,
+    is_valid_tag,
+    is_valid_name_pattern,
+    is_valid_guest_name,
+    is_valid_service_name,
+    is_valid_volume_prefix,
+    is_valid_ip_or_network,
+    MAX_CPU_CORES,
+    MIN_MEMORY_MB,
+    MAX_MEMORY_MB
 )
 from src.utils.mcp_logging import setup_mcp_logging, suppress_noisy_loggers
 from src.exceptions import (
@@ -41,6 +52,38 @@ from src.exceptions import (
     ProxmoxResourceNotFoundError
 )
 from src.proxmox_client import ProxmoxClient
+from src.task_tracker import DEFAULT_TASK_TIMEOUT_SECONDS, MAX_TASKS_PER_WAIT
+from src.bulk_power import MAX_BULK_TARGETS
+from src.bulk_snapshot import (
+    DEFAULT_BULK_SNAPSHOT_TIMEOUT_SECONDS,
+    DEFAULT_SNAPSHOTS_PER_NODE,
+    MAX_SNAPSHOT_TARGETS,
+    MAX_SNAPSHOTS_PER_NODE,
+)
+from src.guest_selection import GUEST_TYPES
+from src.storage_content import DEFAULT_CONTENT_PAGE_SIZE, MAX_CONTENT_PAGE_SIZE, STORAGE_CONTENT_TYPES
+from src.vm_config import CONFIG_KEY_PATTERN, MAX_CONFIG_KEYS
+from src.migration import (
+    DEFAULT_MAX_CONCURRENT_MIGRATIONS,
+    DEFAULT_MIGRATIONS_PER_SOURCE,
+    DEFAULT_MIGRATIONS_PER_TARGET,
+    DEFAULT_MIGRATION_TIMEOUT_SECONDS,
+    MAX_CONCURRENT_MIGRATIONS,
+    MAX_MIGRATION_TARGETS,
+    MAX_MIGRATION_TIMEOUT_SECONDS,
+    MIGRATION_JOB_ID_PATTERN,
+)
+from src.inventory import DEFAULT_INVENTORY_REFRESH_SECONDS, INVENTORY_TYPES
+from src.ticket_renewer import DEFAULT_TICKET_RENEWAL_FRACTION
+from src.log_tail import DEFAULT_TAIL_LINES, MAX_TAIL_LINES, DEFAULT_SYSLOG_INITIAL_LINES, DEFAULT_LOG_BUFFER_LINES
+from src.metrics import (
+    DEFAULT_METRIC_BUCKETS,
+    MAX_METRIC_BUCKETS,
+    MAX_METRIC_TARGETS,
+    RRD_CONSOLIDATION_FUNCTIONS,
+    RRD_TIMEFRAMES,
+)
+from src.utils.node_executor import DEFAULT_MAX_NODE_WORKERS, DEFAULT_MAX_REQUESTS_PER_NODE
 from src.secure_config import SecureConfigManager
 
 
@@ -50,6 +93,26 @@ logger = setup_mcp_logging("proxmox-mcp")
 suppress_noisy_loggers()
 
 
+# Number of tools/call requests executed concurrently by the stdio dispatcher.
+# Set "max_concurrent_requests": 1 in config.json to process requests inline.
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+
+# Tool calls allowed to wait for a free worker before stdin reading pauses
+# (expressed per worker, so the backlog scales with the pool size)
+PENDING_REQUESTS_PER_WORKER = 4
+
+# Upper bound on a single proxmox_wait_for_tasks call (it occupies a worker meanwhile)
+MAX_TASK_WAIT_SECONDS = 3600
+
+# Bulk power tools and the action each one performs
+BULK_POWER_TOOLS = {
+    "proxmox_bulk_start": "start",
+    "proxmox_bulk_stop": "stop",
+    "proxmox_bulk_shutdown": "shutdown",
+    "proxmox_bulk_suspend": "suspend",
+}
+
+
 def debug_print(message: str) -> None:
     """Print debug messages to stderr to avoid interfering with MCP protocol."""
     print(f"DEBUG: {message}", file=sys.stderr)
@@ -89,15 +152,32 @@ def load_config() -> Dict[str, Any]:
 class WorkingProxmoxMCPServer:
     """Working Proxmox MCP server using pure JSON-RPC."""
 
-    def __init__(self):
-        """Initialize the server."""
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """Initialize the server.
+
+        Args:
+            config: Configuration dict with the keys of config.json; loaded
+                from config.json if not given (the HTTP server passes one
+                built from environment variables)
+        """
         debug_print("Server starting...")
         self.proxmox_client = None
         # Lock for thread-safe cleanup (guards against concurrent cleanup calls)
         self._cleanup_lock = threading.Lock()
+        # Serializes writes to stdout so responses from worker threads never interleave
+        self._write_lock = threading.Lock()
 
         # Load configuration
-        self.config = load_config()
+        self.config = config if config is not None else load_config()
+
+        # Concurrent dispatcher state (executor is created lazily in run())
+        self.max_concurrent_requests = self._get_max_concurrent_requests()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending_requests: Dict[Any, Future] = {}
+        self._pending_lock = threading.Lock()
+        self._dispatch_slots = threading.BoundedSemaphore(
+            self.max_concurrent_requests * PENDING_REQUESTS_PER_WORKER
+        )
         
         try:
             debug_print("Initializing Proxmox client...")
@@ -105,10 +185,15 @@ class WorkingProxmoxMCPServer:
                 host=self.config['host'],
                 port=self.config['port'],
                 protocol=self.config['protocol'],
-                username=self.config['username'],
-                password=self.config['password'],
+                username=self.config.get('username'),
+                password=self.config.get('password'),
                 realm=self.config.get('realm', 'pve'),
-                ssl_verify=self.config.get('ssl_verify', False)
+                ssl_verify=self.config.get('ssl_verify', False),
+                max_node_workers=self.config.get('max_node_workers', DEFAULT_MAX_NODE_WORKERS),
+                max_requests_per_node=self.config.get('max_requests_per_node', DEFAULT_MAX_REQUESTS_PER_NODE),
+                inventory_refresh_interval=self.config.get('inventory_refresh_interval', DEFAULT_INVENTORY_REFRESH_SECONDS),
+                api_token=self.config.get('api_token'),
+                ticket_renewal_fraction=self.config.get('ticket_renewal_fraction', DEFAULT_TICKET_RENEWAL_FRACTION)
             )
             
             # Test connection in a non-blocking way
@@ -130,6 +215,38 @@ class WorkingProxmoxMCPServer:
         
         debug_print("Server initialization complete")
 
+    def _get_max_concurrent_requests(self) -> int:
+        """Read the dispatcher pool size from the configuration.
+
+        Returns:
+            Number of worker threads for tool calls (1 disables the dispatcher)
+
+        Raises:
+            ProxmoxConfigurationError: If the configured value is not a positive integer
+        """
+        value = self.config.get('max_concurrent_requests', DEFAULT_MAX_CONCURRENT_REQUESTS)
+        try:
+            workers = int(value)
+        except (TypeError, ValueError):
+            raise ProxmoxConfigurationError(f"max_concurrent_requests must be an integer, got '{value}'")
+        if workers < 1:
+            raise ProxmoxConfigurationError(f"max_concurrent_requests must be at least 1, got {workers}")
+        return workers
+
+    def _shutdown_dispatcher(self, wait: bool = True) -> None:
+        """Stop the tool-call worker pool.
+
+        Args:
+            wait: If True, let in-flight and queued tool calls finish and write
+                their responses. If False, queued calls are cancelled.
+        """
+        executor = self._executor
+        if executor is None:
+            return
+        self._executor = None
+        debug_print(f"Shutting down dispatcher (wait={wait})")
+        executor.shutdown(wait=wait, cancel_futures=not wait)
+
     def cleanup(self) -> None:
         """Clean up the Proxmox client session.
 
@@ -139,6 +256,8 @@ class WorkingProxmoxMCPServer:
         Thread-safe: uses a lock to prevent concurrent cleanup attempts
         (e.g., from signal handlers or multiple shutdown paths).
         """
+        # Cancel queued tool calls before the client they depend on goes away
+        self._shutdown_dispatcher(wait=False)
         with self._cleanup_lock:
             if self.proxmox_client is None:
                 debug_print("Cleanup called but client already None")
@@ -231,13 +350,22 @@ class WorkingProxmoxMCPServer:
                 },
                 {
                     "name": "proxmox_list_vms", 
-                    "description": "List all virtual machines",
+                    "description": "List all virtual machines. With include_config, each VM also carries its configuration (disks, NICs, tags, ...), fetched for all VMs in parallel in the same call",
                     "inputSchema": {
                         "type": "object",
                         "properties": {
                             "node": {
                                 "type": "string",
                                 "description": "Node name (optional)"
+                            },
+                            "include_config": {
+                                "type": "boolean",
+                                "description": "Attach each VM's config (default false)"
+                            },
+                            "config_keys": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": f"Only these config keys (max {MAX_CONFIG_KEYS}); 'net' selects net0, net1, ..., 'scsi' selects scsi0, ... (optional)"
                             }
                         },
                         "required": []
@@ -286,6 +414,7 @@ class WorkingProxmoxMCPServer:
                         "This operation will:\n"
                         "- Create a VM with specified configuration\n"
                         "- Auto-assign VMID if not provided (next available ID)\n"
+                        "- Place the VM on the node with the most headroom if node is omitted\n"
                         "- Allocate storage from specified pool\n\n"
                         "Example: Create a VM with 2 cores and 4GB RAM:\n"
                         '  {"node": "pve", "name": "test-vm", "cores": "2", "memory": "4096"}'
@@ -295,7 +424,7 @@ class WorkingProxmoxMCPServer:
                         "properties": {
                             "node": {
                                 "type": "string",
-                                "description": "Node name"
+                                "description": "Node name (optional; if omitted, the node with the most free CPU/memory is picked)"
                             },
                             "vmid": {
                                 "type": "integer",
@@ -312,9 +441,13 @@ class WorkingProxmoxMCPServer:
                             "memory": {
                                 "type": "string",
                                 "description": "Memory in MB (default: 512)"
+                            },
+                            "storage": {
+                                "type": "string",
+                                "description": "Storage pool (optional); automatic placement only picks nodes where it is active"
                             }
                         },
-                        "required": ["node", "name"],
+                        "required": ["name"],
                         "additionalProperties": False
                     }
                 },
@@ -495,6 +628,47 @@ class WorkingProxmoxMCPServer:
                         "required": []
                     }
                 },
+                {
+                    "name": "proxmox_list_storage_content",
+                    "description": "List the volumes on a storage (backups, ISOs, templates, disks) one page at a time. Filter by content type, VMID or file name prefix; pass next_cursor to get the following page",
+                    "inputSchema": {
+                        "type": "object",
+                        "properties": {
+                            "node": {
+                                "type": "string",
+                                "description": "Node name"
+                            },
+                            "storage": {
+                                "type": "string",
+                                "description": "Storage name"
+                            },
+                            "content": {
+                                "type": "string",
+                                "enum": list(STORAGE_CONTENT_TYPES),
+                                "description": "Only volumes of this content type (optional)"
+                            },
+                            "vmid": {
+                                "type": "integer",
+                                "description": "Only volumes owned by this VM/container (optional)"
+                            },
+                            "name_prefix": {
+                                "type": "string",
+                                "description": "Only volumes whose file name starts with this, e.g. 'vzdump-qemu-100' (optional)"
+                            },
+                            "limit": {
+                                "type": "integer",
+                                "description": f"Maximum volumes per page (default {DEFAULT_CONTENT_PAGE_SIZE})",
+                                "minimum": 1,
+                                "maximum": MAX_CONTENT_PAGE_SIZE
+                            },
+                            "cursor": {
+                                "type": "string",
+                                "description": "next_cursor from the previous page; the filters of the first call are kept"
+                            }
+                        },
+                        "required": ["node", "storage"]
+                    }
+                },
                 {
                     "name": "proxmox_create_snapshot", 
                     "description": "Create a snapshot of a VM or container",
@@ -547,10 +721,796 @@ class WorkingProxmoxMCPServer:
                         "properties": {},
                         "required": []
                     }
-                }
+                },
+                {
+                    "name": "proxmox_bulk_snapshot",
+                    "description": "Snapshot many VMs/containers under one name, e.g. before a risky change. Selectors are combined with AND. At most max_per_node snapshot tasks run per node; waits for all tasks and returns a per-guest result table",
+                    "inputSchema": {
+                        "type": "object",
+                        "properties": {
+                            "snapname": {
+                                "type": "string",
+                                "description": "Snapshot name"
+                            },
+                            **self._selector_properties(MAX_SNAPSHOT_TARGETS),
+                            "description": {
+                                "type": "string",
+                                "description": "Snapshot description (optional)"
+                            },
+                            "vmstate": {
+                                "type": "boolean",
+                                "description": "Include the RAM of running VMs (default false)"
+                            },
+                            **self._snapshot_limit_properties()
+                        },
+                        "required": ["snapname"]
+                    }
+                },
+                {
+                    "name": "proxmox_prune_snapshots",
+                    "description": "Apply a snapshot retention policy to many VMs/containers: delete every snapshot that is neither among the keep_last newest of its guest nor younger than keep_within_hours. Snapshot lists are read in parallel and deletions run with at most max_per_node tasks per node. Use dry_run to preview",
+                    "inputSchema": {
+                        "type": "object",
+                        "properties": {
+                            "keep_last": {
+                                "type": "integer",
+                                "description": "Newest snapshots to keep per guest",
+                                "minimum": 0
+                            },
+                            "keep_within_hours": {
+                                "type": "number",
+                                "description": "Keep snapshots younger than this many hours"
+                            },
+                            "name_prefix": {
+                                "type": "string",
+                                "description": "Only prune snapshots whose name starts with this, e.g. 'auto-' (optional)"
+                            },
+                            **self._selector_properties(MAX_SNAPSHOT_TARGETS),
+                            "dry_run": {
+                                "type": "boolean",
+                                "description": "Only report what would be deleted (default false)"
+                            },
+                            **self._snapshot_limit_properties()
+                        },
+                        "required": []
+                    }
+                },
+                {
+                    "name": "proxmox_wait_for_tasks",
+                    "description": "Wait for Proxmox tasks (UPIDs returned by start/stop/create/snapshot/delete) to finish and report exit status and timing",
+                    "inputSchema": {
+                        "type": "object",
+                        "properties": {
+                            "upids": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": f"Task IDs to wait for (max {MAX_TASKS_PER_WAIT})"
+                            },
+                            "timeout": {
+                                "type": "integer",
+                                "description": f"Maximum seconds to wait (default {DEFAULT_TASK_TIMEOUT_SECONDS}, 0 = check once, max {MAX_TASK_WAIT_SECONDS})",
+                                "minimum": 0,
+                                "maximum": MAX_TASK_WAIT_SECONDS
+                            }
+                        },
+                        "required": ["upids"]
+                    }
+                },
+                {
+                    "name": "proxmox_inventory_lookup",
+                    "description": "Find VMs, containers, nodes or storage by VMID, name, tag, node or type from the in-memory cluster inventory (no cluster scan per call). Criteria are combined with AND",
+                    "inputSchema": {
+                        "type": "object",
+                        "properties": {
+                            "vmid": {
+                                "type": "integer",
+                                "description": "VM/Container ID (optional)"
+                            },
+                            "name": {
+                                "type": "string",
+                                "description": "Exact VM/Container name, case-insensitive (optional)"
+                            },
+                            "tag": {
+                                "type": "string",
+                                "description": "Guest tag (optional)"
+                            },
+                            "node": {
+                                "type": "string",
+                                "description": "Node name (optional)"
+                            },
+                            "type": {
+                                "type": "string",
+                                "enum": list(INVENTORY_TYPES),
+                                "description": "Resource type (optional)"
+                            }
+                        },
+                        "required": []
+                    }
+                },
+                {
+                    "name": "proxmox_inventory_status",
+                    "description": "Show freshness, size and refresh counters of the in-memory cluster inventory",
+                    "inputSchema": {
+                        "type": "object",
+                        "properties": {},
+                        "required": []
+                    }
+                },
+                {
+                    "name": "proxmox_discover_guest_ips",
+                    "description": "Discover the IP addresses of running VMs (QEMU guest agent) and containers. Guests are queried in parallel with a short timeout and results are cached, so only guests without a fresh result are queried. Without selectors the whole cluster is discovered. Returns addresses or the agent error per guest",
+                    "inputSchema": {
+                        "type": "object",
+                        "properties": {
+                            **self._selector_properties(MAX_BULK_TARGETS),
+                            "refresh": {
+                                "type": "boolean",
+                                "description": "Query every selected guest even if its cached result is fresh (default false)"
+                            }
+                        },
+                        "required": []
+                    }
+                },
+                {
+                    "name": "proxmox_find_guest_by_ip",
+                    "description": "Find which VM/container owns an IP address, or every guest with an address in a network (CIDR). Answered from the cached IP index; the cluster is only discovered when the index is empty or stale and nothing matches",
+                    "inputSchema": {
+                        "type": "object",
+                        "properties": {
+                            "address": {
+                                "type": "string",
+                                "description": "IP address ('10.1.2.3') or network ('10.1.2.0/24')"
+                            }
+                        },
+                        "required": ["address"]
+                    }
+                },
+                {
+                    "name": "proxmox_get_metrics",
+                    "description": "Get RRD performance metrics (cpu, memory, network, disk) for nodes, VMs and containers, downsampled to fixed time buckets with avg/max/p95 per bucket and for the whole window. Returns compact columnar arrays",
+                    "inputSchema": {
+                        "type": "object",
+                        "properties": {
+                            "vmids": {
+                                "type": "array",
+                                "items": {"type": "integer"},
+                                "description": "VM/Container IDs (optional)"
+                            },
+                            "nodes": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": "Nodes to report node-level metrics for (optional)"
+                            },
+                            "tag": {
+                                "type": "string",
+                                "description": "Only guests with this tag (optional)"
+                            },
+                            "name_pattern": {
+                                "type": "string",
+                                "description": "Shell-style guest name pattern, e.g. 'web-*' (optional)"
+                            },
+                            "guest_type": {
+                                "type": "string",
+                                "enum": list(GUEST_TYPES),
+                                "description": "'qemu' (VMs), 'lxc' (containers) or 'all' (default)"
+                            },
+                            "timeframe": {
+                                "type": "string",
+                                "enum": list(RRD_TIMEFRAMES),
+                                "description": "Time window (default 'hour')"
+                            },
+                            "cf": {
+                                "type": "string",
+                                "enum": list(RRD_CONSOLIDATION_FUNCTIONS),
+                                "description": "RRD consolidation function (default 'AVERAGE')"
+                            },
+                            "metrics": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": "RRD fields to return, e.g. ['cpu', 'mem'] (optional)"
+                            },
+                            "buckets": {
+                                "type": "integer",
+                                "description": f"Number of time buckets (default {DEFAULT_METRIC_BUCKETS})",
+                                "minimum": 1,
+                                "maximum": MAX_METRIC_BUCKETS
+                            }
+                        },
+                        "required": []
+                    }
+                },
+                {
+                    "name": "proxmox_get_cluster_capacity",
+                    "description": "Show free CPU cores, memory and storage space of every node plus cluster totals (all nodes queried in parallel, cached for a few seconds)",
+                    "inputSchema": {
+                        "type": "object",
+                        "properties": {},
+                        "required": []
+                    }
+                },
+                {
+                    "name": "proxmox_recommend_node",
+                    "description": "Recommend the node with the most headroom for a new guest. Nodes without enough CPUs, free memory or storage are excluded (with the reason); the rest are ranked by remaining CPU/memory headroom",
+                    "inputSchema": {
+                        "type": "object",
+                        "properties": {
+                            "cores": {
+                                "type": "integer",
+                                "description": "vCPUs of the guest (default: 1)",
+                                "minimum": 1,
+                                "maximum": MAX_CPU_CORES
+                            },
+                            "memory": {
+                                "type": "integer",
+                                "description": "Memory in MB (default: 512)",
+                                "minimum": MIN_MEMORY_MB,
+                                "maximum": MAX_MEMORY_MB
+                            },
+                            "storage_gb": {
+                                "type": "number",
+                                "description": "Disk space needed in GB (optional)",
+                                "minimum": 0
+                            },
+                            "storage": {
+                                "type": "string",
+                                "description": "Storage that must hold the disk (optional, default: any disk-image storage)"
+                            }
+                        },
+                        "required": []
+                    }
+                },
+                {
+                    "name": "proxmox_migrate_guests",
+                    "description": "Migrate many VMs/containers, e.g. to drain a node. Targets are planned by free capacity (largest guests first); the migrations then run in the background with bounded concurrency per source and target node. Returns a job ID; poll proxmox_migration_status for progress",
+                    "inputSchema": {
+                        "type": "object",
+                        "properties": {
+                            "source_node": {
+                                "type": "string",
+                                "description": "Move guests off this node (it never receives guests)"
+                            },
+                            "vmids": {
+                                "type": "array",
+                                "items": {"type": "integer"},
+                                "description": f"VM/Container IDs to move (max {MAX_MIGRATION_TARGETS})"
+                            },
+                            "tag": {
+                                "type": "string",
+                                "description": "Only guests with this tag (optional)"
+                            },
+                            "name_pattern": {
+                                "type": "string",
+                                "description": "Shell-style name pattern, e.g. 'web-*' (optional)"
+                            },
+                            "guest_type": {
+                                "type": "string",
+                                "enum": list(GUEST_TYPES),
+                                "description": "'qemu' (VMs), 'lxc' (containers) or 'all' (default)"
+                            },
+                            "target_nodes": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": "Nodes allowed to receive guests (default: all other nodes)"
+                            },
+                            **self._migration_limit_properties(),
+                            "bwlimit": {
+                                "type": "integer",
+                                "description": "Bandwidth limit per migration in KiB/s (default: datacenter setting)",
+                                "minimum": 1
+                            },
+                            "with_local_disks": {
+                                "type": "boolean",
+                                "description": "Also copy local disks of VMs (default false)"
+                            },
+                            "timeout": {
+                                "type": "integer",
+                                "description": f"Seconds after which guests not yet migrated are abandoned (default {DEFAULT_MIGRATION_TIMEOUT_SECONDS})",
+                                "minimum": 1,
+                                "maximum": MAX_MIGRATION_TIMEOUT_SECONDS
+                            },
+                            "dry_run": {
+                                "type": "boolean",
+                                "description": "Only return the planned moves (default false)"
+                            }
+                        },
+                        "required": []
+                    }
+                },
+                {
+                    "name": "proxmox_migration_status",
+                    "description": "Progress report of a migration job: per-guest state, counts, guests in flight and an ETA. Without job_id, summarizes all jobs",
+                    "inputSchema": {
+                        "type": "object",
+                        "properties": {
+                            "job_id": {
+                                "type": "string",
+                                "description": "Job ID returned by proxmox_migrate_guests (optional)"
+                            }
+                        },
+                        "required": []
+                    }
+                },
+                {
+                    "name": "proxmox_update_migration",
+                    "description": "Change the concurrency limits of a running migration job, or cancel it. Migrations already in flight are never interrupted",
+                    "inputSchema": {
+                        "type": "object",
+                        "properties": {
+                            "job_id": {
+                                "type": "string",
+                                "description": "Job ID returned by proxmox_migrate_guests"
+                            },
+                            **self._migration_limit_properties(),
+                            "cancel": {
+                                "type": "boolean",
+                                "description": "Stop starting new migrations (default false)"
+                            }
+                        },
+                        "required": ["job_id"]
+                    }
+                },
+                {
+                    "name": "proxmox_tail_task_log",
+                    "description": "Follow a task log (e.g. vzdump, migration): each call returns only the lines written since the previous call for the same task",
+                    "inputSchema": {
+                        "type": "object",
+                        "properties": {
+                            "upid": {
+                                "type": "string",
+                                "description": "Task ID (UPID)"
+                            },
+                            "max_lines": {
+                                "type": "integer",
+                                "description": f"Maximum new lines to return (default {DEFAULT_TAIL_LINES})",
+                                "minimum": 1,
+                                "maximum": MAX_TAIL_LINES
+                            },
+                            "reset": {
+                                "type": "boolean",
+                                "description": "Start again from the first line (default false)"
+                            },
+                            "history": {
+                                "type": "integer",
+                                "description": f"Return up to this many recently seen lines (max {DEFAULT_LOG_BUFFER_LINES} kept) without fetching (optional)",
+                                "minimum": 1
+                            }
+                        },
+                        "required": ["upid"]
+                    }
+                },
+                {
+                    "name": "proxmox_tail_syslog",
+                    "description": "Follow a node's syslog: the first call returns the last lines, later calls only the lines written since the previous call",
+                    "inputSchema": {
+                        "type": "object",
+                        "properties": {
+                            "node": {
+                                "type": "string",
+                                "description": "Node name"
+                            },
+                            "service": {
+                                "type": "string",
+                                "description": "Only entries of this systemd unit, e.g. 'pvedaemon' (optional)"
+                            },
+                            "max_lines": {
+                                "type": "integer",
+                                "description": f"Maximum new lines to return (default {DEFAULT_TAIL_LINES})",
+                                "minimum": 1,
+                                "maximum": MAX_TAIL_LINES
+                            },
+                            "initial_lines": {
+                                "type": "integer",
+                                "description": f"Existing lines returned by the first call (default {DEFAULT_SYSLOG_INITIAL_LINES})",
+                                "minimum": 0,
+                                "maximum": MAX_TAIL_LINES
+                            },
+                            "reset": {
+                                "type": "boolean",
+                                "description": "Start again from the last initial_lines lines (default false)"
+                            },
+                            "history": {
+                                "type": "integer",
+                                "description": f"Return up to this many recently seen lines (max {DEFAULT_LOG_BUFFER_LINES} kept) without fetching (optional)",
+                                "minimum": 1
+                            }
+                        },
+                        "required": ["node"]
+                    }
+                },
+                self._bulk_power_tool("proxmox_bulk_start", "Start many VMs/containers selected by VMID list, node, tag or name pattern"),
+                self._bulk_power_tool("proxmox_bulk_stop", "Stop (hard) many VMs/containers selected by VMID list, node, tag or name pattern"),
+                self._bulk_power_tool("proxmox_bulk_shutdown", "Gracefully shut down many VMs/containers selected by VMID list, node, tag or name pattern"),
+                self._bulk_power_tool("proxmox_bulk_suspend", "Suspend many VMs selected by VMID list, node, tag or name pattern")
             ]
         }
 
+    @staticmethod
+    def _selector_properties(max_targets: int) -> Dict[str, Any]:
+        """Schema of the guest selectors shared by the bulk tools."""
+        return {
+            "vmids": {
+                "type": "array",
+                "items": {"type": "integer"},
+                "description": f"VM/Container IDs to target (max {max_targets})"
+            },
+            "node": {
+                "type": "string",
+                "description": "Only guests on this node (optional)"
+            },
+            "tag": {
+                "type": "string",
+                "description": "Only guests with this tag (optional)"
+            },
+            "name_pattern": {
+                "type": "string",
+                "description": "Shell-style name pattern, e.g. 'web-*' (optional)"
+            },
+            "guest_type": {
+                "type": "string",
+                "enum": list(GUEST_TYPES),
+                "description": "'qemu' (VMs), 'lxc' (containers) or 'all' (default)"
+            }
+        }
+
+    def _validate_selectors(self, arguments: Dict[str, Any], max_targets: int,
+                            require_selector: bool = True) -> Optional[Dict[str, Any]]:
+        """Validate the guest selectors of a bulk tool; returns an error response or None."""
+        vmids = arguments.get('vmids')
+        node = arguments.get('node')
+        tag = arguments.get('tag')
+        name_pattern = arguments.get('name_pattern')
+        guest_type = arguments.get('guest_type', 'all')
+
+        if vmids is not None:
+            if not isinstance(vmids, list):
+                return self._create_error_response("Error: 'vmids' must be a list of VM/Container IDs")
+            if len(vmids) > max_targets:
+                return self._create_error_response(f"Error: Cannot target more than {max_targets} guests at once")
+            invalid = [v for v in vmids if isinstance(v, bool) or not is_valid_vmid(v)]
+            if invalid:
+                return self._create_error_response(f"Error: Invalid VMID(s): {invalid[:5]}")
+        if node and not is_valid_node_name(node):
+            return self._create_error_response(f"Error: Invalid node name '{node}'. Must be alphanumeric with hyphens/underscores")
+        if tag and not is_valid_tag(tag):
+            return self._create_error_response(f"Error: Invalid tag '{tag}'")
+        if name_pattern and not is_valid_name_pattern(name_pattern):
+            return self._create_error_response(f"Error: Invalid name pattern '{name_pattern}'. Use name characters and *, ?, [...] wildcards")
+        if guest_type not in GUEST_TYPES:
+            return self._create_error_response(f"Error: guest_type must be one of {list(GUEST_TYPES)}")
+        if require_selector and not (vmids or node or tag or name_pattern):
+            return self._create_error_response("Error: At least one of 'vmids', 'node', 'tag' or 'name_pattern' is required")
+        return None
+
+    def _bulk_power_tool(self, name: str, description: str) -> Dict[str, Any]:
+        """Build the tool definition shared by the bulk power tools."""
+        return {
+            "name": name,
+            "description": f"{description}. Selectors are combined with AND; guests already in the target state are skipped. Returns a per-target result table",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    **self._selector_properties(MAX_BULK_TARGETS),
+                    "wait": {
+                        "type": "boolean",
+                        "description": "Wait for the resulting tasks to finish (default false)"
+                    },
+                    "timeout": {
+                        "type": "integer",
+                        "description": f"Maximum seconds to wait when wait is true (default {DEFAULT_TASK_TIMEOUT_SECONDS})",
+                        "minimum": 0,
+                        "maximum": MAX_TASK_WAIT_SECONDS
+                    }
+                },
+                "required": []
+            }
+        }
+
+    def _call_bulk_power_tool(self, action: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate bulk power arguments and run the action."""
+        vmids = arguments.get('vmids')
+        node = arguments.get('node')
+        tag = arguments.get('tag')
+        name_pattern = arguments.get('name_pattern')
+        guest_type = arguments.get('guest_type', 'all')
+        error = self._validate_selectors(arguments, MAX_BULK_TARGETS)
+        if error:
+            return error
+
+        timeout = arguments.get('timeout', DEFAULT_TASK_TIMEOUT_SECONDS)
+        try:
+            timeout = int(timeout)
+        except (TypeError, ValueError):
+            return self._create_error_response(f"Error: Invalid timeout: {timeout}")
+        if timeout < 0 or timeout > MAX_TASK_WAIT_SECONDS:
+            return self._create_error_response(f"Error: timeout must be between 0 and {MAX_TASK_WAIT_SECONDS} seconds")
+
+        result = self.proxmox_client.bulk_power_action(
+            action,
+            vmids=[int(v) for v in vmids] if vmids else None,
+            node=node,
+            tag=tag,
+            name_pattern=name_pattern,
+            guest_type=guest_type,
+            wait=bool(arguments.get('wait', False)),
+            timeout=timeout
+        )
+        return {
+            "content": [{"type": "text", "text": json.dumps(result, indent=2, default=str)}],
+            "isError": result.get("status") == "error"
+        }
+
+    @staticmethod
+    def _snapshot_limit_properties() -> Dict[str, Any]:
+        """Schema of the task limits shared by the bulk snapshot tools."""
+        return {
+            "max_per_node": {
+                "type": "integer",
+                "description": f"Snapshot tasks running at once per node (default {DEFAULT_SNAPSHOTS_PER_NODE})",
+                "minimum": 1,
+                "maximum": MAX_SNAPSHOTS_PER_NODE
+            },
+            "timeout": {
+                "type": "integer",
+                "description": f"Seconds after which remaining guests are skipped (default {DEFAULT_BULK_SNAPSHOT_TIMEOUT_SECONDS})",
+                "minimum": 1,
+                "maximum": MAX_TASK_WAIT_SECONDS
+            }
+        }
+
+    def _call_snapshot_tool(self, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate bulk snapshot arguments and create or prune snapshots."""
+        error = self._validate_selectors(arguments, MAX_SNAPSHOT_TARGETS)
+        if error:
+            return error
+        vmids = arguments.get('vmids')
+        max_per_node = arguments.get('max_per_node', DEFAULT_SNAPSHOTS_PER_NODE)
+        timeout = arguments.get('timeout', DEFAULT_BULK_SNAPSHOT_TIMEOUT_SECONDS)
+        if isinstance(max_per_node, bool) or not isinstance(max_per_node, int) \
+                or not 1 <= max_per_node <= MAX_SNAPSHOTS_PER_NODE:
+            return self._create_error_response(f"Error: max_per_node must be between 1 and {MAX_SNAPSHOTS_PER_NODE}")
+        if isinstance(timeout, bool) or not isinstance(timeout, int) or not 1 <= timeout <= MAX_TASK_WAIT_SECONDS:
+            return self._create_error_response(f"Error: timeout must be between 1 and {MAX_TASK_WAIT_SECONDS} seconds")
+        selectors = {
+            "vmids": [int(v) for v in vmids] if vmids else None,
+            "node": arguments.get('node'),
+            "tag": arguments.get('tag'),
+            "name_pattern": arguments.get('name_pattern'),
+            "guest_type": arguments.get('guest_type', 'all'),
+        }
+
+        if name == "proxmox_bulk_snapshot":
+            snapname = arguments.get('snapname')
+            description = arguments.get('description', '')
+            if not validate_snapshot_name(snapname):
+                return self._create_error_response(f"Error: Invalid snapshot name '{snapname}'. Must be alphanumeric with hyphens/underscores, max 128 characters")
+            if not isinstance(description, str):
+                return self._create_error_response("Error: 'description' must be a string")
+            result = self.proxmox_client.bulk_snapshot(
+                snapname, **selectors, description=description, vmstate=bool(arguments.get('vmstate', False)),
+                max_per_node=max_per_node, timeout=timeout
+            )
+        else:
+            keep_last = arguments.get('keep_last')
+            keep_within_hours = arguments.get('keep_within_hours')
+            name_prefix = arguments.get('name_prefix')
+            if keep_last is None and keep_within_hours is None:
+                return self._create_error_response("Error: At least one of 'keep_last' or 'keep_within_hours' is required")
+            if keep_last is not None and (isinstance(keep_last, bool) or not isinstance(keep_last, int) or keep_last < 0):
+                return self._create_error_response(f"Error: Invalid keep_last: {keep_last}")
+            if keep_within_hours is not None and (isinstance(keep_within_hours, bool)
+                                                  or not isinstance(keep_within_hours, (int, float))
+                                                  or keep_within_hours <= 0):
+                return self._create_error_response(f"Error: Invalid keep_within_hours: {keep_within_hours}")
+            if name_prefix is not None and not validate_snapshot_name(name_prefix):
+                return self._create_error_response(f"Error: Invalid snapshot name prefix '{name_prefix}'")
+            result = self.proxmox_client.prune_snapshots(
+                keep_last=keep_last, keep_within_hours=keep_within_hours, **selectors, name_prefix=name_prefix,
+                max_per_node=max_per_node, dry_run=bool(arguments.get('dry_run', False)), timeout=timeout
+            )
+        return {
+            "content": [{"type": "text", "text": json.dumps(result, indent=2, default=str)}],
+            "isError": result.get("status") == "error"
+        }
+
+    def _call_get_metrics(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate metrics arguments and fetch the aggregated series."""
+        vmids = arguments.get('vmids')
+        nodes = arguments.get('nodes')
+        tag = arguments.get('tag')
+        name_pattern = arguments.get('name_pattern')
+        guest_type = arguments.get('guest_type', 'all')
+        timeframe = arguments.get('timeframe', 'hour')
+        cf = arguments.get('cf', 'AVERAGE')
+        metrics = arguments.get('metrics')
+        buckets = arguments.get('buckets', DEFAULT_METRIC_BUCKETS)
+
+        error = self._validate_selectors(arguments, MAX_METRIC_TARGETS, require_selector=False)
+        if error:
+            return error
+        if nodes is not None:
+            if not isinstance(nodes, list):
+                return self._create_error_response("Error: 'nodes' must be a list of node names")
+            invalid = [n for n in nodes if not is_valid_node_name(n)]
+            if invalid:
+                return self._create_error_response(f"Error: Invalid node name(s): {invalid[:5]}")
+        if len(vmids or []) + len(nodes or []) > MAX_METRIC_TARGETS:
+            return self._create_error_response(f"Error: Cannot query more than {MAX_METRIC_TARGETS} targets at once")
+        if timeframe not in RRD_TIMEFRAMES:
+            return self._create_error_response(f"Error: timeframe must be one of {list(RRD_TIMEFRAMES)}")
+        if cf not in RRD_CONSOLIDATION_FUNCTIONS:
+            return self._create_error_response(f"Error: cf must be one of {list(RRD_CONSOLIDATION_FUNCTIONS)}")
+        if metrics is not None and (not isinstance(metrics, list) or not all(isinstance(m, str) for m in metrics)):
+            return self._create_error_response("Error: 'metrics' must be a list of metric names")
+        if isinstance(buckets, bool):
+            return self._create_error_response(f"Error: Invalid buckets: {buckets}")
+        try:
+            buckets = int(buckets)
+        except (TypeError, ValueError):
+            return self._create_error_response(f"Error: Invalid buckets: {buckets}")
+        if not (vmids or nodes or tag or name_pattern):
+            return self._create_error_response("Error: At least one of 'vmids', 'nodes', 'tag' or 'name_pattern' is required")
+
+        result = self.proxmox_client.get_metrics(
+            vmids=[int(v) for v in vmids] if vmids else None,
+            nodes=nodes or None,
+            tag=tag,
+            name_pattern=name_pattern,
+            guest_type=guest_type,
+            timeframe=timeframe,
+            cf=cf,
+            metrics=metrics,
+            buckets=buckets
+        )
+        return {
+            "content": [{"type": "text", "text": json.dumps(result, default=str)}],
+            "isError": result.get("status") == "error"
+        }
+
+    def _call_tail_log(self, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate log tail arguments and return the new lines."""
+        limits = {}
+        for key, default in (("max_lines", DEFAULT_TAIL_LINES), ("initial_lines", DEFAULT_SYSLOG_INITIAL_LINES),
+                             ("history", None)):
+            value = arguments.get(key, default)
+            if value is not None:
+                if isinstance(value, bool):
+                    return self._create_error_response(f"Error: Invalid {key}: {value}")
+                try:
+                    value = int(value)
+                except (TypeError, ValueError):
+                    return self._create_error_response(f"Error: Invalid {key}: {value}")
+            limits[key] = value
+        if not 1 <= limits["max_lines"] <= MAX_TAIL_LINES:
+            return self._create_error_response(f"Error: max_lines must be between 1 and {MAX_TAIL_LINES}")
+        if limits["history"] is not None and limits["history"] < 1:
+            return self._create_error_response("Error: history must be a positive integer")
+        reset = bool(arguments.get('reset', False))
+
+        if name == "proxmox_tail_task_log":
+            upid = arguments.get('upid')
+            if not is_valid_upid(upid):
+                return self._create_error_response(f"Error: Invalid UPID: {upid}")
+            result = self.proxmox_client.tail_task_log(
+                upid, max_lines=limits["max_lines"], reset=reset, history=limits["history"]
+            )
+        else:
+            node = arguments.get('node')
+            service = arguments.get('service')
+            if not node or not is_valid_node_name(node):
+                return self._create_error_response(f"Error: Invalid node name '{node}'. Must be alphanumeric with hyphens/underscores")
+            if service is not None and not is_valid_service_name(service):
+                return self._create_error_response(f"Error: Invalid service name '{service}'")
+            if not 0 <= limits["initial_lines"] <= MAX_TAIL_LINES:
+                return self._create_error_response(f"Error: initial_lines must be between 0 and {MAX_TAIL_LINES}")
+            result = self.proxmox_client.tail_syslog(
+                node, service=service, max_lines=limits["max_lines"], initial_lines=limits["initial_lines"],
+                reset=reset, history=limits["history"]
+            )
+        return {
+            "content": [{"type": "text", "text": json.dumps(result, indent=2, default=str)}],
+            "isError": result.get("status") == "error"
+        }
+
+    @staticmethod
+    def _migration_limit_properties() -> Dict[str, Any]:
+        """Schema of the concurrency limits shared by the migration tools."""
+        limits = (
+            ("max_concurrent", "Migrations in flight across the job", DEFAULT_MAX_CONCURRENT_MIGRATIONS),
+            ("max_per_source", "Migrations in flight leaving any one node", DEFAULT_MIGRATIONS_PER_SOURCE),
+            ("max_per_target", "Migrations in flight arriving at any one node", DEFAULT_MIGRATIONS_PER_TARGET),
+        )
+        return {
+            key: {
+                "type": "integer",
+                "description": f"{description} (default {default})",
+                "minimum": 1,
+                "maximum": MAX_CONCURRENT_MIGRATIONS
+            }
+            for key, description, default in limits
+        }
+
+    def _call_migration_tool(self, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate migration arguments and start, report on or update a job."""
+        job_id = arguments.get('job_id')
+        if job_id is not None and (not isinstance(job_id, str) or not MIGRATION_JOB_ID_PATTERN.match(job_id)):
+            return self._create_error_response(f"Error: Invalid migration job ID: {job_id}")
+        if name == "proxmox_migration_status":
+            result = self.proxmox_client.get_migration_status(job_id)
+            return {
+                "content": [{"type": "text", "text": json.dumps(result, indent=2, default=str)}],
+                "isError": result.get("status") == "error"
+            }
+
+        limits = {}
+        for key in ("max_concurrent", "max_per_source", "max_per_target", "bwlimit", "timeout"):
+            value = arguments.get(key)
+            if value is None:
+                continue
+            if isinstance(value, bool) or not isinstance(value, int):
+                return self._create_error_response(f"Error: Invalid {key}: {value}")
+            if key == "timeout" and not 1 <= value <= MAX_MIGRATION_TIMEOUT_SECONDS:
+                return self._create_error_response(f"Error: timeout must be between 1 and {MAX_MIGRATION_TIMEOUT_SECONDS} seconds")
+            if key == "bwlimit" and value < 1:
+                return self._create_error_response("Error: bwlimit must be a positive number of KiB/s")
+            if key.startswith("max_") and not 1 <= value <= MAX_CONCURRENT_MIGRATIONS:
+                return self._create_error_response(f"Error: {key} must be between 1 and {MAX_CONCURRENT_MIGRATIONS}")
+            limits[key] = value
+
+        if name == "proxmox_update_migration":
+            if job_id is None:
+                return self._create_error_response("Error: 'job_id' is required")
+            result = self.proxmox_client.update_migration(
+                job_id,
+                max_concurrent=limits.get("max_concurrent"),
+                max_per_source=limits.get("max_per_source"),
+                max_per_target=limits.get("max_per_target"),
+                cancel=bool(arguments.get('cancel', False))
+            )
+            return {
+                "content": [{"type": "text", "text": json.dumps(result, indent=2, default=str)}],
+                "isError": result.get("status") == "error"
+            }
+
+        source_node = arguments.get('source_node')
+        vmids = arguments.get('vmids')
+        tag = arguments.get('tag')
+        name_pattern = arguments.get('name_pattern')
+        guest_type = arguments.get('guest_type', 'all')
+        target_nodes = arguments.get('target_nodes')
+        # Same selectors as the bulk tools, with source_node in place of node
+        error = self._validate_selectors({**arguments, 'node': source_node}, MAX_MIGRATION_TARGETS,
+                                         require_selector=False)
+        if error:
+            return error
+        if target_nodes is not None:
+            if not isinstance(target_nodes, list) or not target_nodes:
+                return self._create_error_response("Error: 'target_nodes' must be a non-empty list of node names")
+            invalid = [n for n in target_nodes if not is_valid_node_name(n)]
+            if invalid:
+                return self._create_error_response(f"Error: Invalid node name(s): {invalid[:5]}")
+        if not (source_node or vmids or tag or name_pattern):
+            return self._create_error_response("Error: At least one of 'source_node', 'vmids', 'tag' or 'name_pattern' is required")
+
+        result = self.proxmox_client.migrate_guests(
+            source_node=source_node or None,
+            vmids=[int(v) for v in vmids] if vmids else None,
+            tag=tag,
+            name_pattern=name_pattern,
+            guest_type=guest_type,
+            target_nodes=target_nodes,
+            max_concurrent=limits.get("max_concurrent", DEFAULT_MAX_CONCURRENT_MIGRATIONS),
+            max_per_source=limits.get("max_per_source", DEFAULT_MIGRATIONS_PER_SOURCE),
+            max_per_target=limits.get("max_per_target", DEFAULT_MIGRATIONS_PER_TARGET),
+            bwlimit=limits.get("bwlimit"),
+            with_local_disks=bool(arguments.get('with_local_disks', False)),
+            timeout=limits.get("timeout", DEFAULT_MIGRATION_TIMEOUT_SECONDS),
+            dry_run=bool(arguments.get('dry_run', False))
+        )
+        return {
+            "content": [{"type": "text", "text": json.dumps(result, indent=2, default=str)}],
+            "isError": result.get("status") == "error"
+        }
+
     def _call_tool(self, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         """Call a tool by name."""
         debug_print(f"Calling tool: {name} with arguments: {arguments}")
@@ -605,12 +1565,21 @@ class WorkingProxmoxMCPServer:
                         "content": [{"type": "text", "text": f"Error: Invalid node name '{node}'. Must be alphanumeric with hyphens/underscores"}],
                         "isError": True
                     }
+                include_config = bool(arguments.get('include_config', False))
+                config_keys = arguments.get('config_keys')
+                if config_keys is not None:
+                    if not isinstance(config_keys, list) or not 1 <= len(config_keys) <= MAX_CONFIG_KEYS:
+                        return self._create_error_response(f"Error: 'config_keys' must be a list of 1 to {MAX_CONFIG_KEYS} config keys")
+                    invalid = [k for k in config_keys if not isinstance(k, str) or not CONFIG_KEY_PATTERN.match(k)]
+                    if invalid:
+                        return self._create_error_response(f"Error: Invalid config key(s): {invalid[:5]}")
+                config_options = {"include_config": True, "config_keys": config_keys} if include_config else {}
                 # Use include_metadata=True when querying all nodes to expose partial failures
                 if node:
-                    vms = self.proxmox_client.list_vms(node)
+                    vms = self.proxmox_client.list_vms(node, **config_options)
                     result = {"vms": vms, "count": len(vms)}
                 else:
-                    vms_result = self.proxmox_client.list_vms(node, include_metadata=True)
+                    vms_result = self.proxmox_client.list_vms(node, include_metadata=True, **config_options)
                     result = {
                         "vms": vms_result["data"],
                         "count": len(vms_result["data"]),
@@ -620,6 +1589,8 @@ class WorkingProxmoxMCPServer:
                     }
                     if vms_result["partial_failure"]:
                         result["warning"] = f"Data incomplete: failed to query nodes {[n['node'] for n in vms_result['failed_nodes']]}"
+                if include_config:
+                    result["config_errors"] = sum(1 for vm in result["vms"] if vm.get("config_error"))
                 result_text = json.dumps(result, indent=2, default=str)
                 return {
                     "content": [{"type": "text", "text": result_text}],
@@ -676,15 +1647,16 @@ class WorkingProxmoxMCPServer:
                     "isError": False
                 }
             elif name == "proxmox_create_vm":
+                # A missing node means automatic placement (node=None)
                 node = arguments.get('node')
                 name = arguments.get('name')
-                if not node or not name:
+                if not name:
                     return {
-                        "content": [{"type": "text", "text": "Error: Both 'node' and 'name' are required"}],
+                        "content": [{"type": "text", "text": "Error: 'name' is required"}],
                         "isError": True
                     }
                 # Validate node name
-                if not is_valid_node_name(node):
+                if node is not None and not is_valid_node_name(node):
                     return {
                         "content": [{"type": "text", "text": f"Error: Invalid node name '{node}'. Must be alphanumeric with hyphens/underscores"}],
                         "isError": True
@@ -716,7 +1688,7 @@ class WorkingProxmoxMCPServer:
                         "content": [{"type": "text", "text": f"Error: Invalid storage name '{storage}'. Must be alphanumeric with hyphens/underscores"}],
                         "isError": True
                     }
-                result = self.proxmox_client.create_vm(node, name, vmid, cores, memory)
+                result = self.proxmox_client.create_vm(node, name, vmid, cores, memory, storage=storage)
                 result_text = json.dumps(result, indent=2, default=str)
                 return {
                     "content": [{"type": "text", "text": result_text}],
@@ -876,6 +1848,36 @@ class WorkingProxmoxMCPServer:
                     "content": [{"type": "text", "text": result_text}],
                     "isError": False
                 }
+            elif name == "proxmox_list_storage_content":
+                node = arguments.get('node')
+                storage = arguments.get('storage')
+                content = arguments.get('content')
+                vmid = arguments.get('vmid')
+                name_prefix = arguments.get('name_prefix')
+                limit = arguments.get('limit', DEFAULT_CONTENT_PAGE_SIZE)
+                cursor = arguments.get('cursor')
+                if not node or not is_valid_node_name(node):
+                    return self._create_error_response(f"Error: Invalid node name '{node}'. Must be alphanumeric with hyphens/underscores")
+                if not storage or not is_valid_storage_name(storage):
+                    return self._create_error_response(f"Error: Invalid storage name '{storage}'. Must be alphanumeric with hyphens/underscores")
+                if content is not None and content not in STORAGE_CONTENT_TYPES:
+                    return self._create_error_response(f"Error: content must be one of {list(STORAGE_CONTENT_TYPES)}")
+                if vmid is not None and (isinstance(vmid, bool) or not is_valid_vmid(vmid)):
+                    return self._create_error_response(f"Error: Invalid VMID '{vmid}'. Must be between 100 and 999999")
+                if name_prefix is not None and not is_valid_volume_prefix(name_prefix):
+                    return self._create_error_response(f"Error: Invalid name prefix '{name_prefix}'")
+                if isinstance(limit, bool) or not isinstance(limit, int) or not 1 <= limit <= MAX_CONTENT_PAGE_SIZE:
+                    return self._create_error_response(f"Error: limit must be between 1 and {MAX_CONTENT_PAGE_SIZE}")
+                if cursor is not None and not isinstance(cursor, str):
+                    return self._create_error_response(f"Error: Invalid cursor: {cursor}")
+                result = self.proxmox_client.list_storage_content(
+                    node, storage, content=content, vmid=int(vmid) if vmid is not None else None,
+                    name_prefix=name_prefix, limit=limit, cursor=cursor
+                )
+                return {
+                    "content": [{"type": "text", "text": json.dumps(result, indent=2, default=str)}],
+                    "isError": result.get("status") == "error"
+                }
             elif name == "proxmox_create_snapshot":
                 node = arguments.get('node')
                 vmid = arguments.get('vmid')
@@ -921,6 +1923,127 @@ class WorkingProxmoxMCPServer:
                     "content": [{"type": "text", "text": result_text}],
                     "isError": False
                 }
+            elif name in ("proxmox_bulk_snapshot", "proxmox_prune_snapshots"):
+                return self._call_snapshot_tool(name, arguments)
+            elif name in BULK_POWER_TOOLS:
+                return self._call_bulk_power_tool(BULK_POWER_TOOLS[name], arguments)
+            elif name == "proxmox_get_metrics":
+                return self._call_get_metrics(arguments)
+            elif name == "proxmox_get_cluster_capacity":
+                result = self.proxmox_client.get_cluster_capacity()
+                result_text = json.dumps(result, indent=2, default=str)
+                return {
+                    "content": [{"type": "text", "text": result_text}],
+                    "isError": result.get("status") == "error"
+                }
+            elif name == "proxmox_recommend_node":
+                cores = arguments.get('cores', 1)
+                memory = arguments.get('memory', 512)
+                storage_gb = arguments.get('storage_gb', 0)
+                storage = arguments.get('storage')
+                if isinstance(cores, bool) or not validate_cores_range(cores):
+                    return self._create_error_response(f"Error: Invalid cores '{cores}'. Must be between 1 and {MAX_CPU_CORES}")
+                if isinstance(memory, bool) or not validate_memory_range(memory):
+                    return self._create_error_response(f"Error: Invalid memory '{memory}'. Must be between {MIN_MEMORY_MB} and {MAX_MEMORY_MB} MB")
+                if isinstance(storage_gb, bool) or not isinstance(storage_gb, (int, float)) or storage_gb < 0:
+                    return self._create_error_response(f"Error: Invalid storage_gb '{storage_gb}'. Must be a non-negative number")
+                if storage and not is_valid_storage_name(storage):
+                    return self._create_error_response(f"Error: Invalid storage name '{storage}'. Must be alphanumeric with hyphens/underscores")
+                result = self.proxmox_client.recommend_node(
+                    cores=int(cores), memory=int(memory), storage_gb=storage_gb, storage=storage or None
+                )
+                result_text = json.dumps(result, indent=2, default=str)
+                return {
+                    "content": [{"type": "text", "text": result_text}],
+                    "isError": result.get("status") == "error"
+                }
+            elif name in ("proxmox_migrate_guests", "proxmox_migration_status", "proxmox_update_migration"):
+                return self._call_migration_tool(name, arguments)
+            elif name in ("proxmox_tail_task_log", "proxmox_tail_syslog"):
+                return self._call_tail_log(name, arguments)
+            elif name == "proxmox_inventory_lookup":
+                vmid = arguments.get('vmid')
+                guest_name = arguments.get('name')
+                tag = arguments.get('tag')
+                node = arguments.get('node')
+                resource_type = arguments.get('type')
+                if vmid is not None and (isinstance(vmid, bool) or not is_valid_vmid(vmid)):
+                    return self._create_error_response(f"Error: Invalid VMID '{vmid}'. Must be between 100 and 999999")
+                if guest_name and not is_valid_guest_name(guest_name):
+                    return self._create_error_response(f"Error: Invalid name '{guest_name}'")
+                if tag and not is_valid_tag(tag):
+                    return self._create_error_response(f"Error: Invalid tag '{tag}'")
+                if node and not is_valid_node_name(node):
+                    return self._create_error_response(f"Error: Invalid node name '{node}'. Must be alphanumeric with hyphens/underscores")
+                if resource_type and resource_type not in INVENTORY_TYPES:
+                    return self._create_error_response(f"Error: type must be one of {list(INVENTORY_TYPES)}")
+                result = self.proxmox_client.inventory_lookup(
+                    vmid=int(vmid) if vmid is not None else None,
+                    name=guest_name,
+                    tag=tag,
+                    node=node,
+                    resource_type=resource_type
+                )
+                result_text = json.dumps(result, indent=2, default=str)
+                return {
+                    "content": [{"type": "text", "text": result_text}],
+                    "isError": result.get("status") == "error"
+                }
+            elif name == "proxmox_inventory_status":
+                result = self.proxmox_client.get_inventory_status()
+                result_text = json.dumps(result, indent=2, default=str)
+                return {
+                    "content": [{"type": "text", "text": result_text}],
+                    "isError": False
+                }
+            elif name == "proxmox_discover_guest_ips":
+                error = self._validate_selectors(arguments, MAX_BULK_TARGETS, require_selector=False)
+                if error:
+                    return error
+                vmids = arguments.get('vmids')
+                result = self.proxmox_client.discover_guest_ips(
+                    vmids=[int(v) for v in vmids] if vmids else None,
+                    node=arguments.get('node'),
+                    tag=arguments.get('tag'),
+                    name_pattern=arguments.get('name_pattern'),
+                    guest_type=arguments.get('guest_type', 'all'),
+                    refresh=bool(arguments.get('refresh', False))
+                )
+                return {
+                    "content": [{"type": "text", "text": json.dumps(result, indent=2, default=str)}],
+                    "isError": result.get("status") == "error"
+                }
+            elif name == "proxmox_find_guest_by_ip":
+                address = arguments.get('address')
+                if not isinstance(address, str) or not is_valid_ip_or_network(address):
+                    return self._create_error_response(f"Error: Invalid IP address or network '{address}'")
+                result = self.proxmox_client.find_guest_by_ip(address.strip())
+                return {
+                    "content": [{"type": "text", "text": json.dumps(result, indent=2, default=str)}],
+                    "isError": result.get("status") == "error"
+                }
+            elif name == "proxmox_wait_for_tasks":
+                upids = arguments.get('upids')
+                if not isinstance(upids, list) or not upids:
+                    return self._create_error_response("Error: 'upids' must be a non-empty list of task IDs")
+                if len(upids) > MAX_TASKS_PER_WAIT:
+                    return self._create_error_response(f"Error: Cannot wait for more than {MAX_TASKS_PER_WAIT} tasks at once")
+                invalid = [u for u in upids if not is_valid_upid(u)]
+                if invalid:
+                    return self._create_error_response(f"Error: Invalid UPID(s): {invalid[:5]}")
+                timeout = arguments.get('timeout', DEFAULT_TASK_TIMEOUT_SECONDS)
+                try:
+                    timeout = int(timeout)
+                except (TypeError, ValueError):
+                    return self._create_error_response(f"Error: Invalid timeout: {timeout}")
+                if timeout < 0 or timeout > MAX_TASK_WAIT_SECONDS:
+                    return self._create_error_response(f"Error: timeout must be between 0 and {MAX_TASK_WAIT_SECONDS} seconds")
+                result = self.proxmox_client.wait_for_tasks(upids, timeout)
+                result_text = json.dumps(result, indent=2, default=str)
+                return {
+                    "content": [{"type": "text", "text": result_text}],
+                    "isError": result.get("status") == "error"
+                }
             else:
                 return {
                     "content": [{"type": "text", "text": f"Unknown tool: {name}"}],
@@ -990,6 +2113,17 @@ class WorkingProxmoxMCPServer:
                 "isError": True
             }
 
+    def _write_message(self, message: Dict[str, Any]) -> None:
+        """Write a single JSON-RPC message to stdout.
+
+        Thread-safe: the dispatcher's worker threads all write through this
+        method, and the lock guarantees one complete line per message.
+        """
+        line = json.dumps(message)
+        with self._write_lock:
+            print(line)
+            sys.stdout.flush()
+
     def _send_response(self, request_id: int, result: Dict[str, Any]):
         """Send a response to the client."""
         response = {
@@ -997,8 +2131,7 @@ class WorkingProxmoxMCPServer:
             "id": request_id,
             "result": result
         }
-        print(json.dumps(response))
-        sys.stdout.flush()
+        self._write_message(response)
 
     def _send_error(self, request_id: int, error_code: int, error_message: str):
         """Send an error response to the client."""
@@ -1010,13 +2143,81 @@ class WorkingProxmoxMCPServer:
                 "message": error_message
             }
         }
-        print(json.dumps(response))
-        sys.stdout.flush()
+        self._write_message(response)
+
+    def _execute_tool_call(self, request_id: Any, tool_name: str, tool_args: Dict[str, Any]) -> None:
+        """Run a tool and write its response (executed on a worker thread)."""
+        try:
+            result = self._call_tool(tool_name, tool_args)
+        except Exception as e:
+            # _call_tool converts errors into MCP error results; this is a last resort
+            if logger:
+                logger.exception(f"Unexpected error in dispatched tool '{tool_name}': {e}")
+            self._send_error(request_id, -32603, "Internal error")
+            return
+        self._send_response(request_id, result)
+
+    def _on_tool_call_done(self, request_id: Any, future: Future) -> None:
+        """Release the dispatch slot and forget the request once it completes."""
+        self._dispatch_slots.release()
+        with self._pending_lock:
+            if self._pending_requests.get(request_id) is future:
+                del self._pending_requests[request_id]
+        if future.cancelled():
+            debug_print(f"Tool call for request {request_id} was cancelled before it started")
+
+    def _dispatch_tool_call(self, request_id: Any, tool_name: str, tool_args: Dict[str, Any]) -> None:
+        """Execute a tool call, on the worker pool when the dispatcher is enabled.
+
+        Responses are written as each call completes and are matched to the
+        request by JSON-RPC id, so they may arrive out of order. When all
+        dispatch slots are taken this blocks the reader until one frees up,
+        which bounds the backlog held in memory.
+        """
+        if self._executor is None:
+            self._execute_tool_call(request_id, tool_name, tool_args)
+            return
+
+        self._dispatch_slots.acquire()
+        try:
+            future = self._executor.submit(self._execute_tool_call, request_id, tool_name, tool_args)
+        except RuntimeError:
+            # Executor shut down underneath us (server is stopping)
+            self._dispatch_slots.release()
+            raise
+        # Register before attaching the callback: the callback may run immediately
+        with self._pending_lock:
+            self._pending_requests[request_id] = future
+        future.add_done_callback(lambda f, rid=request_id: self._on_tool_call_done(rid, f))
+
+    def _cancel_request(self, params: Dict[str, Any]) -> None:
+        """Cancel a queued tool call named by a cancellation notification.
+
+        Only calls that have not started yet can be cancelled; a cancelled
+        request gets no response, as the MCP cancellation flow expects.
+        """
+        request_id = params.get("requestId")
+        with self._pending_lock:
+            future = self._pending_requests.get(request_id)
+        if future is None:
+            debug_print(f"Cancellation for unknown or completed request {request_id}")
+            return
+        if future.cancel():
+            debug_print(f"Cancelled queued request {request_id}")
+        else:
+            debug_print(f"Request {request_id} already running, cannot cancel")
 
     def run(self):
         """Run the server using pure JSON-RPC over stdin/stdout."""
         debug_print("Server run method called - reading from stdin")
 
+        if self.max_concurrent_requests > 1:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrent_requests,
+                thread_name_prefix="proxmox-mcp-tool"
+            )
+            debug_print(f"Concurrent dispatcher enabled with {self.max_concurrent_requests} workers")
+
         try:
             for line in sys.stdin:
                 line = line.strip()
@@ -1036,20 +2237,14 @@ class WorkingProxmoxMCPServer:
 
                     if method == "initialize":
                         # Handle MCP initialization
-                        response = {
-                            "jsonrpc": "2.0",
-                            "id": request_id,
-                            "result": {
-                                "protocolVersion": "2025-06-18",
-                                "capabilities": {},
-                                "serverInfo": {
-                                    "name": "proxmox-mcp",
-                                    "version": "1.0.0"
-                                }
+                        self._send_response(request_id, {
+                            "protocolVersion": "2025-06-18",
+                            "capabilities": {},
+                            "serverInfo": {
+                                "name": "proxmox-mcp",
+                                "version": "1.0.0"
                             }
-                        }
-                        print(json.dumps(response))
-                        sys.stdout.flush()
+                        })
 
                     elif method == "tools/list":
                         # Handle tools listing
@@ -1067,17 +2262,17 @@ class WorkingProxmoxMCPServer:
                             self._send_error(request_id, -32602, "Invalid params: tool name is required")
                             continue
 
-                        result = self._call_tool(tool_name, tool_args)
-                        self._send_response(request_id, result)
+                        self._dispatch_tool_call(request_id, tool_name, tool_args)
 
                     elif method == "notifications/initialized":
                         # Handle initialization notification (no response needed)
                         debug_print("Handling notifications/initialized")
                         continue
 
-                    elif method == "notifications/cancel":
-                        # Handle notification cancellation (no-op for now)
-                        debug_print("Handling notifications/cancel")
+                    elif method in ("notifications/cancel", "notifications/cancelled"):
+                        # Cancel a tool call that is still waiting for a worker
+                        debug_print(f"Handling {method}")
+                        self._cancel_request(params or {})
                         continue
 
                     elif method == "resources/list":
@@ -1118,6 +2313,9 @@ class WorkingProxmoxMCPServer:
                         self._send_error(request_id, -32603, "Internal error")
                     continue
 
+            # stdin closed - let dispatched tool calls finish writing their responses
+            self._shutdown_dispatcher(wait=True)
+
         except KeyboardInterrupt:
             if logger:
                 logger.info("Server interrupted by user")